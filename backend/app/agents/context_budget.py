@@ -0,0 +1,139 @@
+"""토큰 예산 기반 프롬프트 컨텍스트 조립."""
+import logging
+import threading
+from typing import Dict, List, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # optional: 없으면 문자 수 기반 근사치 사용
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# 앞에서부터 시도할 tiktoken encoding
+ENCODINGS = ["o200k_base", "cl100k_base"]
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _load_encoding():
+    """tiktoken encoding (설치되지 않았거나 오프라인이라 encoding 파일을 받을 수 없으면 None)."""
+    if tiktoken is None:
+        return None
+    for name in ENCODINGS:
+        try:
+            return tiktoken.get_encoding(name)
+        except Exception as e:
+            logger.warning(f"Failed to load tiktoken encoding {name}: {e}")
+    logger.warning("Counting tokens approximately (4 chars per token)")
+    return None
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                # 실패해도 다시 시도하지 않음 (토큰을 셀 때마다 다운로드를 기다리지 않도록)
+                _encoding = _load_encoding()
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    텍스트 토큰 수.
+
+    tiktoken encoding을 쓸 수 있으면 정확히 세고, 없으면 4 chars ≈ 1 token으로 근사합니다.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return max(1, (len(text) + 3) // 4)
+
+
+def pack_items(items: List[Tuple[str, float]], budget: int) -> Tuple[List[int], int]:
+    """
+    score 내림차순으로 예산에 들어가는 item을 greedy하게 선택.
+
+    큰 item이 들어가지 않아도 뒤의 더 작은 item은 계속 시도합니다.
+
+    Args:
+        items: (text, score) 리스트 (각 text는 줄바꿈 포함 한 줄로 계산)
+        budget: 사용 가능한 토큰 수
+
+    Returns:
+        (선택된 item의 원래 index 오름차순 리스트, 사용한 토큰 수)
+    """
+    order = sorted(range(len(items)), key=lambda i: items[i][1], reverse=True)
+    selected = []
+    used = 0
+    for index in order:
+        cost = count_tokens(items[index][0] + "\n")
+        if used + cost <= budget:
+            selected.append(index)
+            used += cost
+    return sorted(selected), used
+
+
+class ContextBudget:
+    """
+    턴 하나의 section별 토큰 예산.
+
+    section은 SECTIONS 순서(우선순위)대로 채우며, 각 section은 전체 예산 × share에
+    앞 section들이 쓰고 남긴 토큰을 더한 만큼 쓸 수 있습니다.
+    """
+
+    # (section, share) - 우선순위 순서
+    SECTIONS = [
+        ("persona", 0.15),
+        ("facts", 0.20),
+        ("world", 0.10),
+        ("memories", 0.40),
+        ("conversation", 0.15),
+    ]
+
+    def __init__(self, total_tokens: int):
+        self.total_tokens = total_tokens
+        self.carry = 0
+        self.usage: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def resume(cls, total_tokens: int, usage: Dict[str, Dict[str, int]]) -> "ContextBudget":
+        """이미 채운 section들의 사용량(캐시된 정적 컨텍스트)에서 이어서 시작."""
+        budget = cls(total_tokens)
+        for section, _ in cls.SECTIONS:
+            if section in usage:
+                budget.consume(section, usage[section]["used"])
+        return budget
+
+    def available(self, section: str) -> int:
+        share = dict(self.SECTIONS)[section]
+        return int(self.total_tokens * share) + self.carry
+
+    def consume(self, section: str, used: int) -> None:
+        allocated = self.available(section)
+        self.usage[section] = {"allocated": allocated, "used": used}
+        self.carry = max(0, allocated - used)
+
+    def select(self, section: str, items: List[Tuple[str, float]], reserved: int = 0) -> List[int]:
+        """
+        section 예산에서 reserved(header 등)를 뺀 만큼 item을 골라 원래 index 순서로 반환.
+
+        호출자는 고른 item으로 최종 텍스트를 만든 뒤 consume()으로 실제 사용량을 기록합니다.
+        """
+        selected, _ = pack_items(items, max(0, self.available(section) - reserved))
+        return selected
+
+    def as_dict(self) -> Dict[str, object]:
+        used = sum(section["used"] for section in self.usage.values())
+        return {
+            "total_tokens": self.total_tokens,
+            "used_tokens": used,
+            "tokenizer": "tiktoken" if _get_encoding() is not None else "approx",
+            "sections": dict(self.usage)
+        }
@@ -2,6 +2,7 @@
 import json
 from typing import Dict, Any, Optional
 from app.services.llm_service import llm_service
+from app.prompts.registry import prompt_registry
 
 
 class ImportanceScorer:
@@ -9,14 +10,7 @@ class ImportanceScorer:
     
     @staticmethod
     def _load_importance_prompt() -> str:
-        import os
-        prompt_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            "prompts",
-            "importance.txt"
-        )
-        with open(prompt_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return prompt_registry.get_text("importance")
     
     @staticmethod
     def score_importance(
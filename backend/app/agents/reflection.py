@@ -4,6 +4,7 @@ import logging
 from typing import Dict, Any, Optional, List
 from app.services.llm_service import llm_service
 from app.core.config import settings
+from app.prompts.registry import prompt_registry
 from app.memory.mongo.repository.persona_repo import PersonaFactRepository
 from app.schemas.persona import PersonaFactCreate, PersonaFactDimension
 
@@ -52,14 +53,7 @@ class ReflectionService:
     
     @staticmethod
     def _load_reflection_prompt() -> str:
-        import os
-        prompt_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            "prompts",
-            "reflection.txt"
-        )
-        with open(prompt_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return prompt_registry.get_text("reflection")
     
     @staticmethod
     def reflect(
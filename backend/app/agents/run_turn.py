@@ -9,18 +9,28 @@ from app.agents.query_builder import QueryBuilder
 from app.agents.reflection import ReflectionService, ReflectionTrigger
 from app.memory.vector.vectorizer import Vectorizer
 from app.agents.importance import ImportanceScorer
+from app.agents.context_budget import ContextBudget, count_tokens
 from app.agents.tools.dispatcher import ToolDispatcher
 from app.agents.tools.schemas import Action
+from app.agents.tools.registry import tool_registry
+from app.core.config import settings
 from app.services.llm_service import llm_service
+from app.services.backends.llm import prompt_prefix_hash
+from app.services.retention import retention_days
+from app.prompts.registry import prompt_registry
 from app.memory.vector.retriever import VectorRetriever
-from app.memory.mongo.repository.npc_repo import NPCRepository
+from app.memory.vector.scoring import RetrievalWeights
 from app.memory.mongo.repository.persona_repo import PersonaRepository, PersonaFactRepository
 from app.memory.mongo.repository.world_repo import WorldRepository
 from app.memory.mongo.repository.memory_repo import MemoryRepository
 from app.memory.mongo.repository.trace_repo import TraceRepository
+from app.memory.mongo.repository.turn_context_repo import TurnContextRepository
+from app.memory.mongo.cache import entity_cache
+from app.schemas.npc import NPC
 from app.schemas.persona import PersonaFactDimension
 from app.schemas.memory import MemoryCreate
 from app.schemas.trace import TraceCreate
+from app.utils.timing import StageTimer
 
 
 class TurnOrchestrator:
@@ -28,25 +38,11 @@ class TurnOrchestrator:
     
     @staticmethod
     def _load_system_prompt() -> str:
-        import os
-        prompt_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            "prompts",
-            "system.txt"
-        )
-        with open(prompt_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return prompt_registry.get_text("system")
     
     @staticmethod
     def _load_planning_prompt() -> str:
-        import os
-        prompt_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            "prompts",
-            "planning.txt"
-        )
-        with open(prompt_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return prompt_registry.get_text("planning")
     
     # Dimension당 최대 fact 개수 (프롬프트 길이 제한)
     MAX_FACTS_PER_DIMENSION = 3
@@ -81,6 +77,20 @@ class TurnOrchestrator:
         if not facts:
             return ""
         
+        return TurnOrchestrator._format_persona_facts(facts, max_facts_per_dimension)
+    
+    # PersonaFact dimension별 프롬프트 라벨 (출력 순서)
+    FACT_DIMENSION_LABELS = {
+        PersonaFactDimension.CHARACTERISTIC: "Character Traits",
+        PersonaFactDimension.ROUTINE_HABIT: "Routines & Habits",
+        PersonaFactDimension.GOAL_PLAN: "Goals & Plans",
+        PersonaFactDimension.EXPERIENCE: "Experiences",
+        PersonaFactDimension.RELATIONSHIP: "Relationships",
+    }
+    
+    @staticmethod
+    def _format_persona_facts(facts: List[Any], max_facts_per_dimension: Optional[int]) -> str:
+        """PersonaFact를 dimension별로 그룹화해 문자열로 변환 (max_facts_per_dimension이 None이면 개수 제한 없음)."""
         # Static과 Dynamic 분리
         static_facts = [f for f in facts if f.is_static]
         dynamic_facts = [f for f in facts if not f.is_static]
@@ -104,15 +114,8 @@ class TurnOrchestrator:
         
         # 프롬프트 구성
         parts = []
-        dimension_labels = {
-            PersonaFactDimension.CHARACTERISTIC: "Character Traits",
-            PersonaFactDimension.ROUTINE_HABIT: "Routines & Habits",
-            PersonaFactDimension.GOAL_PLAN: "Goals & Plans",
-            PersonaFactDimension.EXPERIENCE: "Experiences",
-            PersonaFactDimension.RELATIONSHIP: "Relationships",
-        }
         
-        for dimension, label in dimension_labels.items():
+        for dimension, label in TurnOrchestrator.FACT_DIMENSION_LABELS.items():
             static_list = dimension_groups[dimension]["static"][:max_facts_per_dimension]
             dynamic_list = dimension_groups[dimension]["dynamic"][:max_facts_per_dimension]
             
@@ -193,6 +196,155 @@ class TurnOrchestrator:
         
         return "\n".join(parts)
     
+    @staticmethod
+    def _get_persona_context(persona_id: str, npc_id: Optional[str], max_facts_per_dimension: int) -> str:
+        """
+        컴파일된 persona 컨텍스트 조회 (persona/fact version을 key에 포함해 entity cache에 저장).
+        
+        version을 먼저 읽고 그 뒤에 persona/facts를 조회하므로, 그 사이 변경이 있으면
+        다음 턴에서 새 version key로 다시 컴파일됩니다.
+        """
+        facts_kind, facts_key = ("facts_by_npc", npc_id) if npc_id else ("facts_by_persona", persona_id)
+        key = (
+            persona_id,
+            npc_id,
+            max_facts_per_dimension,
+            entity_cache.version("persona", persona_id),
+            entity_cache.version(facts_kind, facts_key)
+        )
+        
+        def compile_context() -> Optional[str]:
+            persona = PersonaRepository.get_persona_by_id(persona_id)
+            if persona is None:
+                return None
+            return TurnOrchestrator._build_persona_context(
+                persona.model_dump(),
+                persona_id=persona_id,
+                npc_id=npc_id,
+                max_facts_per_dimension=max_facts_per_dimension
+            )
+        
+        return entity_cache.get_or_load("persona_context", key, compile_context) or ""
+    
+    @staticmethod
+    def _get_world_context(world_id: str) -> str:
+        """컴파일된 world 컨텍스트 조회 (world version을 key에 포함해 entity cache에 저장)."""
+        key = (world_id, entity_cache.version("world", world_id))
+        
+        def compile_context() -> Optional[str]:
+            world = WorldRepository.get_world_by_id(world_id)
+            if world is None:
+                return None
+            return TurnOrchestrator._build_world_context(world.model_dump())
+        
+        return entity_cache.get_or_load("world_context", key, compile_context) or ""
+    
+    @staticmethod
+    def _get_budgeted_static_context(persona_id: str, npc_id: str, world_id: str, token_budget: int) -> Optional[Dict[str, Any]]:
+        """
+        토큰 예산 모드의 persona/fact/world 컨텍스트.
+        
+        persona profile과 world는 앞줄부터, facts는 static 우선으로 dimension을 번갈아 가며
+        section 예산에 맞춰 채웁니다. 결과는 _get_persona_context와 같은 version key에
+        token_budget을 더한 key로 entity cache에 저장됩니다.
+        
+        Returns:
+            {"persona": str, "world": str, "usage": section별 사용량} (persona/world가 없으면 None)
+        """
+        facts_kind, facts_key = ("facts_by_npc", npc_id) if npc_id else ("facts_by_persona", persona_id)
+        key = (
+            persona_id,
+            npc_id,
+            world_id,
+            token_budget,
+            entity_cache.version("persona", persona_id),
+            entity_cache.version(facts_kind, facts_key),
+            entity_cache.version("world", world_id)
+        )
+        
+        def compile_context() -> Optional[Dict[str, Any]]:
+            persona = PersonaRepository.get_persona_by_id(persona_id)
+            world = WorldRepository.get_world_by_id(world_id)
+            if persona is None or world is None:
+                return None
+            
+            budget = ContextBudget(token_budget)
+            
+            profile_lines = TurnOrchestrator._build_persona_context(persona.model_dump()).split("\n")
+            selected = budget.select("persona", [(line, -i) for i, line in enumerate(profile_lines)])
+            persona_text = "\n".join(profile_lines[i] for i in selected)
+            budget.consume("persona", count_tokens(persona_text))
+            
+            if npc_id:
+                facts = PersonaFactRepository.get_facts_by_npc(npc_id)
+            else:
+                facts = PersonaFactRepository.get_facts_by_persona(persona_id)
+            
+            # static 우선, 같은 종류 안에서는 dimension별 순위가 낮을수록 우선 (dimension을 번갈아 채움)
+            ranks: Dict[Any, int] = {}
+            fact_items = []
+            for fact in sorted(facts, key=lambda f: not f.is_static):
+                rank = ranks.get((fact.dimension, fact.is_static), 0)
+                ranks[(fact.dimension, fact.is_static)] = rank + 1
+                line = f"  - {fact.content}" if fact.is_static else f"  - {fact.content} (learned)"
+                fact_items.append((fact, line, (1.0 if fact.is_static else 0.5) - 0.01 * rank))
+            
+            labels = ["Persona Facts:"] + [
+                f"{label}:" for dimension, label in TurnOrchestrator.FACT_DIMENSION_LABELS.items()
+                if any(item[0].dimension == dimension for item in fact_items)
+            ]
+            reserved = count_tokens("\n".join(labels)) if fact_items else 0
+            selected = budget.select("facts", [(line, score) for _, line, score in fact_items], reserved=reserved)
+            facts_text = TurnOrchestrator._format_persona_facts([fact_items[i][0] for i in selected], None)
+            if facts_text:
+                persona_text = f"{persona_text}\n\nPersona Facts:\n{facts_text}"
+            budget.consume("facts", count_tokens(f"Persona Facts:\n{facts_text}") if facts_text else 0)
+            
+            world_lines = TurnOrchestrator._build_world_context(world.model_dump()).split("\n")
+            selected = budget.select("world", [(line, -i) for i, line in enumerate(world_lines)])
+            world_text = "\n".join(world_lines[i] for i in selected)
+            budget.consume("world", count_tokens(world_text))
+            
+            return {"persona": persona_text, "world": world_text, "usage": budget.usage}
+        
+        return entity_cache.get_or_load("budgeted_context", key, compile_context)
+    
+    @staticmethod
+    def _build_budgeted_memory_context(retrieved_memories: List[Dict[str, Any]], budget: ContextBudget) -> str:
+        """retrieval 순위 점수 순으로 memories section 예산에 맞는 memory를 채움 (요약 길이 절단 없음)."""
+        lines = [
+            f"[{mem.get('source_type', 'unknown')}] {mem.get('summary', mem.get('content', ''))}"
+            for mem in retrieved_memories
+        ]
+        # 번호 접두사 비용까지 포함해 선택
+        items = [(f"1. {line}", mem.get('ranking_score', 0.0)) for line, mem in zip(lines, retrieved_memories)]
+        
+        header = "Relevant Memories:"
+        selected = budget.select("memories", items, reserved=count_tokens(header))
+        if not selected:
+            budget.consume("memories", count_tokens("No relevant memories."))
+            return "No relevant memories."
+        
+        parts = [header]
+        for number, index in enumerate(selected, 1):
+            parts.append(f"{number}. {lines[index]}")
+        context = "\n".join(parts)
+        budget.consume("memories", count_tokens(context))
+        return context
+    
+    @staticmethod
+    def _build_budgeted_conversation_context(recent_conversation: List[str], budget: ContextBudget) -> str:
+        """최근 대화부터 conversation section 예산에 맞게 채움."""
+        header = "RECENT CONVERSATION:"
+        items = [(f"- {item}", -i) for i, item in enumerate(recent_conversation)]
+        selected = budget.select("conversation", items, reserved=count_tokens(header))
+        if not selected:
+            budget.consume("conversation", 0)
+            return ""
+        context = "\n".join([header] + [items[i][0] for i in selected]) + "\n"
+        budget.consume("conversation", count_tokens(context))
+        return context
+    
     @staticmethod
     def _build_memory_context(retrieved_memories: List[Dict[str, Any]]) -> str:
         if not retrieved_memories:
@@ -207,24 +359,40 @@ class TurnOrchestrator:
         return "\n".join(parts)
     
     @staticmethod
-    def run_turn(npc_id: str, observation: Dict[str, Any], turn_id: Optional[str] = None) -> Dict[str, Any]:
-        """NPC 턴 실행 - 전체 인지 루프."""
+    def run_turn(
+        npc_id: str,
+        observation: Dict[str, Any],
+        turn_id: Optional[str] = None,
+        npc: Optional[NPC] = None
+    ) -> Dict[str, Any]:
+        """
+        NPC 턴 실행 - 전체 인지 루프.
+        
+        npc를 넘기면 (route에서 이미 조회한 경우) 그 NPC를 사용합니다. NPC/persona/world/facts/최근 대화는
+        entity cache가 비어 있으면 TurnContextRepository의 aggregation 한 번으로 읽습니다.
+        """
         if not turn_id:
             turn_id = f"turn_{uuid.uuid4().hex[:8]}"
         
-        # NPC 및 관련 데이터 조회
-        npc = NPCRepository.get_npc_by_id(npc_id)
-        if npc is None:
+        timer = StageTimer()
+        
+        # NPC 및 관련 데이터 조회 (최근 대화는 observation 저장 전에 가져와서 현재 observation 제외)
+        turn_context = TurnContextRepository.get_turn_context(npc_id, recent_limit=10)
+        if turn_context is None:
             raise ValueError(f"NPC {npc_id} not found")
+        if npc is None:
+            npc = turn_context["npc"]
         
-        persona = PersonaRepository.get_persona_by_id(npc.persona_id)
+        persona = turn_context["persona"]
         if persona is None:
             raise ValueError(f"Persona {npc.persona_id} not found")
         
-        world = WorldRepository.get_world_by_id(npc.world_id)
+        world = turn_context["world"]
         if world is None:
             raise ValueError(f"World {npc.world_id} not found")
         
+        recent_conversation = turn_context["recent_conversation"]
+        
         # NPC config 가져오기 (기본값 사용) - observation 저장 전에 필요
         npc_config = npc.config if npc.config else None
         if npc_config:
@@ -235,18 +403,21 @@ class TurnOrchestrator:
             importance_threshold = npc_config.importance_threshold
             reflection_threshold = npc_config.reflection_threshold
             max_facts_per_dimension = npc_config.max_facts_per_dimension
+            context_token_budget = npc_config.context_token_budget
         else:
             retrieval_top_k = 5
             importance_threshold = 0.7
             reflection_threshold = 0.7
             max_facts_per_dimension = 3
+            context_token_budget = None
         
-        # 최근 대화 히스토리 가져오기 (observation 저장 전에 가져와서 현재 observation 제외)
-        recent_memories = MemoryRepository.get_recent_memories(npc_id, limit=10, memory_type="short_term")
-        recent_conversation = []
-        for mem in recent_memories:
-            if mem.source == "observation":
-                recent_conversation.append(mem.content)
+        if context_token_budget is None:
+            context_token_budget = settings.context_token_budget
+        
+        memory_retention_days = retention_days("short_term_memory", npc_config)
+        trace_retention_days = retention_days("traces", npc_config)
+        
+        timer.lap("load_context")
         
         # observation 저장 (단기 메모리)
         observation_summary = QueryBuilder.build_observation_summary(observation)
@@ -257,7 +428,13 @@ class TurnOrchestrator:
             importance=0.3,
             tags=["observation"]
         )
-        observation_memory = MemoryRepository.insert_memory(memory_data, importance_threshold=importance_threshold)
+        MemoryRepository.insert_memory(
+            memory_data,
+            importance_threshold=importance_threshold,
+            retention_days=memory_retention_days
+        )
+        
+        timer.lap("store_observation")
         
         # retrieval query 구성 (대화 히스토리 포함)
         npc_goal = npc.current_state.get("goal", "")
@@ -273,14 +450,19 @@ class TurnOrchestrator:
             npc_id, 
             retrieval_query, 
             top_k_per_index=retrieval_top_k,
-            observation=observation
+            observation=observation,
+            weights=RetrievalWeights.for_npc(npc_config)
         )
         retrieved_memories = retrieval_result['retrieved_sources']
         retrieved_memory_ids = [mem.get('source_id') for mem in retrieved_memories if mem.get('source_id')]
         
+        timer.lap("retrieval")
+        
         # 예측 importance 계산
         predicted_importance = ImportanceScorer.predict_importance(observation_summary)
         
+        timer.lap("predict_importance")
+        
         # emotion_delta 계산
         previous_emotion = npc.current_state.get("emotion", "neutral")
         current_emotion = observation.get("details", {}).get("emotion", previous_emotion)
@@ -336,7 +518,11 @@ class TurnOrchestrator:
                 importance=reflection['importance_score'],
                 tags=["reflection"]
             )
-            MemoryRepository.insert_memory(reflection_memory, importance_threshold=importance_threshold)
+            MemoryRepository.insert_memory(
+                reflection_memory,
+                importance_threshold=importance_threshold,
+                retention_days=memory_retention_days
+            )
             
             # Update PersonaFacts from reflection
             persona_fact_updates = reflection.get('persona_fact_updates', [])
@@ -366,65 +552,98 @@ class TurnOrchestrator:
                             except Exception as e:
                                 logger.warning(f"Failed to index PersonaFact {fact_id}: {e}")
         
+        timer.lap("reflection")
+        
         # planning prompt 구성
         system_prompt = TurnOrchestrator._load_system_prompt()
         planning_prompt = TurnOrchestrator._load_planning_prompt()
+        prompt_versions = prompt_registry.versions()
+        
+        context_budget = {}
+        static_context = None
+        if context_token_budget:
+            static_context = TurnOrchestrator._get_budgeted_static_context(
+                npc.persona_id,
+                npc_id,
+                npc.world_id,
+                context_token_budget
+            )
         
-        persona_context = TurnOrchestrator._build_persona_context(
-            persona.model_dump() if hasattr(persona, 'model_dump') else {
-                'name': persona.name,
-                'traits': persona.traits,
-                'habits': persona.habits,
-                'goals': persona.goals,
-                'background': persona.background,
-                'speech_style': persona.speech_style,
-                'constraints': persona.constraints
-            },
-            persona_id=npc.persona_id,
-            npc_id=npc_id,
-            max_facts_per_dimension=max_facts_per_dimension
-        )
-        
-        world_context = TurnOrchestrator._build_world_context(
-            world.model_dump() if hasattr(world, 'model_dump') else {
-                'title': world.title,
-                'rules': world.rules
-            }
-        )
-        
-        memory_context = TurnOrchestrator._build_memory_context(retrieved_memories)
-        
-        # 최근 대화 히스토리를 컨텍스트에 추가
-        conversation_context = ""
-        if recent_conversation and len(recent_conversation) > 0:
-            conversation_items = recent_conversation[:5]  # 최근 5개만
-            conversation_context = "\n".join([f"- {item}" for item in conversation_items])
-            conversation_context = f"RECENT CONVERSATION:\n{conversation_context}\n"
+        if static_context is not None:
+            # 토큰 예산 모드: section 우선순위(persona > facts > world > memories > conversation)대로 채움
+            budget = ContextBudget.resume(context_token_budget, static_context["usage"])
+            persona_context = static_context["persona"]
+            world_context = static_context["world"]
+            memory_context = TurnOrchestrator._build_budgeted_memory_context(retrieved_memories, budget)
+            conversation_context = TurnOrchestrator._build_budgeted_conversation_context(recent_conversation, budget)
+            context_budget = budget.as_dict()
+        else:
+            persona_context = TurnOrchestrator._get_persona_context(
+                npc.persona_id,
+                npc_id,
+                max_facts_per_dimension
+            )
+            
+            world_context = TurnOrchestrator._get_world_context(npc.world_id)
+            
+            memory_context = TurnOrchestrator._build_memory_context(retrieved_memories)
+            
+            # 최근 대화 히스토리를 컨텍스트에 추가
+            conversation_context = ""
+            if recent_conversation and len(recent_conversation) > 0:
+                conversation_items = recent_conversation[:5]  # 최근 5개만
+                conversation_context = "\n".join([f"- {item}" for item in conversation_items])
+                conversation_context = f"RECENT CONVERSATION:\n{conversation_context}\n"
+        
+        dynamic_context = f"""{memory_context}
+
+{conversation_context}CURRENT OBSERVATION:
+{observation_summary}
+
+{f'REFLECTION: {reflection_summary}' if reflection_summary else ''}
+"""
         
-        full_context = f"""PERSONA:
+        if settings.prompt_layout == "stable_prefix":
+            # system + planning + persona + world를 NPC별로 byte 단위로 동일한 system message에 두고
+            # 매 턴 바뀌는 부분만 user message로 보내 provider prompt cache가 prefix를 재사용하도록 함
+            static_prefix = f"""{system_prompt}
+
+{planning_prompt}
+
+PERSONA:
 {persona_context}
 
 WORLD:
 {world_context}
+"""
+            messages = [
+                {"role": "system", "content": static_prefix},
+                {"role": "user", "content": dynamic_context}
+            ]
+            planning_prompt_full = f"{static_prefix}\n{dynamic_context}"
+        else:
+            full_context = f"""PERSONA:
+{persona_context}
 
-{memory_context}
-
-{conversation_context}CURRENT OBSERVATION:
-{observation_summary}
+WORLD:
+{world_context}
 
-{f'REFLECTION: {reflection_summary}' if reflection_summary else ''}
-"""
+{dynamic_context}"""
+            planning_prompt_full = f"{planning_prompt}\n\n{full_context}"
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": planning_prompt_full}
+            ]
         
-        planning_prompt_full = f"{planning_prompt}\n\n{full_context}"
+        prefix_hash = prompt_prefix_hash(messages[:1], tool_registry.get_all_tools())
         
-        # LLM 호출 (tool 선택)
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": planning_prompt_full}
-        ]
+        timer.lap("prompt_build")
         
+        # LLM 호출 (tool 선택)
         llm_result = llm_service.call_with_tools(messages, use_tools=True)
         
+        timer.lap("llm_plan")
+        
         # tool call 검증 및 파싱
         if not llm_result['tool_calls']:
             action = Action(
@@ -485,6 +704,8 @@ WORLD:
                 f"error={error_msg}"
             )
         
+        timer.lap("tool_execution")
+        
         # importance 점수 계산 (정확한 값)
         importance_score, importance_justification = ImportanceScorer.score_importance(
             observation_summary,
@@ -492,15 +713,24 @@ WORLD:
             reflection_summary
         )
         
+        timer.lap("score_importance")
+        
         # inference trace 기록
         trace_data = TraceCreate(
             npc_id=npc_id,
             turn_id=turn_id,
             observation=observation_summary,
+            observation_payload=observation,
             retrieved_memories=retrieved_memory_ids,
             persona_used=npc.persona_id,
             world_used=npc.world_id,
             llm_prompt_snapshot=planning_prompt_full,
+            llm_prompt_segments=[system_prompt, planning_prompt, persona_context, world_context],
+            prompt_layout=settings.prompt_layout,
+            prompt_prefix_hash=prefix_hash,
+            prompt_versions=prompt_versions,
+            llm_usage=llm_result['usage'] or {},
+            context_budget=context_budget,
             llm_output_raw=llm_result['raw_output'],
             chosen_action=action.action_type,
             tool_arguments=action.arguments,
@@ -508,10 +738,15 @@ WORLD:
             retrieval_query_text=retrieval_query,
             retrieval_indices_searched=retrieval_result['indices_searched'],
             retrieval_vector_ids=[int(vid) for vid in retrieval_result['retrieved_vector_ids'] if vid is not None],
-            retrieval_similarity_scores=retrieval_result['similarity_scores']
+            retrieval_similarity_scores=retrieval_result['similarity_scores'],
+            retrieval_relevance_scores=retrieval_result['relevance_scores'],
+            retrieval_ranking_scores=retrieval_result['ranking_scores'],
+            stage_timings_ms=timer.as_dict()
         )
         
-        trace = TraceRepository.insert_trace(trace_data)
+        trace = TraceRepository.insert_trace(trace_data, retention_days=trace_retention_days)
+        
+        timer.lap("trace_write")
         
         return {
             "action": action.model_dump() if hasattr(action, 'model_dump') else {
@@ -525,5 +760,6 @@ WORLD:
             "turn_id": turn_id,
             "importance_score": importance_score,
             "importance_justification": importance_justification,
-            "reflection_used": reflection_used
+            "reflection_used": reflection_used,
+            "stage_timings_ms": timer.as_dict()
         }
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.routes import health, npc, memory, action, vector, turn, persona, world, trace, tool
+from app.api.v1.routes import health, npc, memory, action, vector, turn, persona, world, trace, tool, admin, job
 
 api_router = APIRouter()
 
@@ -13,3 +13,5 @@ api_router.include_router(persona.router, tags=["persona"])
 api_router.include_router(world.router, tags=["world"])
 api_router.include_router(trace.router, tags=["trace"])
 api_router.include_router(tool.router, tags=["tool"])
+api_router.include_router(admin.router, tags=["admin"])
+api_router.include_router(job.router, tags=["job"])
@@ -1,5 +1,6 @@
 """Action API 엔드포인트 - NPC action 실행."""
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from typing import Dict, Any
 import uuid
 from datetime import datetime
@@ -7,8 +8,8 @@ from app.agents.tools.schemas import Action, ActionResult
 from app.schemas.trace import TraceCreate
 from app.agents.tools.dispatcher import ToolDispatcher
 from app.agents.tools.registry import tool_registry
-from app.memory.mongo.repository.npc_repo import NPCRepository
-from app.memory.mongo.repository.trace_repo import TraceRepository
+from app.memory.mongo.repository.npc_repo import AsyncNPCRepository
+from app.memory.mongo.repository.trace_repo import AsyncTraceRepository
 
 router = APIRouter()
 
@@ -20,14 +21,14 @@ async def act(
     turn_id: str = None
 ):
     """observation 기반 NPC action 실행."""
-    npc = NPCRepository.get_npc_by_id(npc_id)
+    npc = await AsyncNPCRepository.get_npc_by_id(npc_id)
     if npc is None:
         raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
     
     from app.agents.run_turn import TurnOrchestrator
     
     try:
-        result = TurnOrchestrator.run_turn(npc_id, observation, turn_id)
+        result = await run_in_threadpool(TurnOrchestrator.run_turn, npc_id, observation, turn_id, npc)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Action execution failed: {str(e)}")
@@ -43,7 +44,7 @@ async def force_action(
     reason: str = "Manually triggered action"
 ):
     """수동 action 실행 (프론트엔드 제어, 디버깅, 실험용)."""
-    npc = NPCRepository.get_npc_by_id(npc_id)
+    npc = await AsyncNPCRepository.get_npc_by_id(npc_id)
     if npc is None:
         raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
     
@@ -86,7 +87,7 @@ async def force_action(
             tool_execution_result=result.model_dump()
         )
         
-        trace = TraceRepository.insert_trace(trace_data)
+        trace = await AsyncTraceRepository.insert_trace(trace_data)
         
         return {
             "action": action.model_dump(),
@@ -0,0 +1,97 @@
+"""운영 관리 API 엔드포인트."""
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any, Optional
+from app.memory.mongo.indexes import IndexManager
+from app.memory.mongo.cache import entity_cache
+from app.memory.mongo.conversation_buffer import conversation_buffer
+from app.memory.mongo.write_buffer import write_buffer
+from app.services.retention import RetentionService, POLICIES
+from app.services.consolidation import ConsolidationService
+
+router = APIRouter()
+
+
+@router.get("/admin/indexes", response_model=Dict[str, Any])
+async def get_index_report():
+    """Mongo index 상태 및 사용량 조회."""
+    try:
+        return await run_in_threadpool(IndexManager.report)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get index report: {str(e)}")
+
+
+@router.post("/admin/indexes/ensure", response_model=Dict[str, Any])
+async def ensure_indexes():
+    """선언된 Mongo index 생성 (멱등)."""
+    try:
+        return await run_in_threadpool(IndexManager.ensure_indexes)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to ensure indexes: {str(e)}")
+
+
+@router.get("/admin/cache", response_model=Dict[str, Any])
+async def get_cache_stats():
+    """Entity cache (NPC/persona/world/persona fact) 및 conversation buffer 통계 조회."""
+    return {**entity_cache.stats(), "conversation_buffer": conversation_buffer.stats()}
+
+
+@router.post("/admin/cache/clear", response_model=Dict[str, Any])
+async def clear_cache():
+    """Entity cache 및 conversation buffer 비우기 (Mongo를 직접 수정한 뒤 사용)."""
+    entity_cache.clear()
+    conversation_buffer.invalidate()
+    return {**entity_cache.stats(), "conversation_buffer": conversation_buffer.stats()}
+
+
+@router.get("/admin/write_buffer", response_model=Dict[str, Any])
+async def get_write_buffer_stats():
+    """Memory/trace write buffer 통계 조회."""
+    return write_buffer.stats()
+
+
+@router.post("/admin/write_buffer/flush", response_model=Dict[str, Any])
+async def flush_write_buffer():
+    """대기 중인 memory/trace 문서 즉시 저장."""
+    try:
+        await run_in_threadpool(write_buffer.flush)
+        return write_buffer.stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to flush write buffer: {str(e)}")
+
+
+@router.post("/admin/retention/run", response_model=Dict[str, Any])
+async def run_retention(
+    preview: bool = Query(default=True, description="만료 대상 개수만 집계 (삭제/archive 안 함)"),
+    npc_id: Optional[str] = None,
+    policy: Optional[str] = Query(default=None, description="short_term_memory 또는 traces (없으면 전체)")
+):
+    """Short-term memory/trace retention 실행 또는 미리보기."""
+    if policy is not None and policy not in POLICIES:
+        raise HTTPException(status_code=400, detail=f"Unknown retention policy: {policy}")
+    try:
+        return await run_in_threadpool(
+            RetentionService.run,
+            preview=preview,
+            npc_id=npc_id,
+            policies=[policy] if policy else None
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to run retention: {str(e)}")
+
+
+@router.post("/admin/consolidation/run", response_model=Dict[str, Any])
+async def run_consolidation(npc_id: Optional[str] = None):
+    """오래된 long-term memory 통합 background job 시작 (진행 상황은 /jobs/{job_id})."""
+    try:
+        job, started = ConsolidationService.submit(npc_id=npc_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start memory consolidation: {str(e)}")
+    
+    if not started:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Memory consolidation is already running (job {job.job_id})"
+        )
+    
+    return {"status": "accepted", "npc_id": npc_id, "job_id": job.job_id}
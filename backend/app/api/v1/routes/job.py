@@ -0,0 +1,25 @@
+"""Background job API 엔드포인트."""
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional, Dict, Any
+from app.services.jobs import job_manager
+
+router = APIRouter()
+
+
+@router.get("/jobs", response_model=List[Dict[str, Any]])
+async def list_jobs(
+    job_type: Optional[str] = None,
+    status: Optional[str] = Query(default=None, description="pending, running, completed, failed"),
+    limit: int = Query(default=50, ge=1, le=1000)
+):
+    """최근 background job 목록 조회 (최신순, 이 worker에서 시작한 job만)."""
+    return [job.to_dict() for job in job_manager.list(job_type=job_type, status=status, limit=limit)]
+
+
+@router.get("/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_job(job_id: str):
+    """Background job 상태 및 진행 상황 조회."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
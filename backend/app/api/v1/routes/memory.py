@@ -1,9 +1,13 @@
 """Memory API 엔드포인트."""
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Union
 from app.schemas.memory import EpisodicMemory, MemoryCreate
-from app.memory.mongo.repository.memory_repo import MemoryRepository
-from app.memory.mongo.repository.npc_repo import NPCRepository
+from app.memory.mongo.repository.memory_repo import AsyncMemoryRepository
+from app.memory.mongo.repository.npc_repo import AsyncNPCRepository
+from app.memory.mongo.pagination import parse_exclude, projected_response
+from app.services.retention import retention_days
 
 router = APIRouter()
 
@@ -11,7 +15,7 @@ router = APIRouter()
 @router.post("/npc/{npc_id}/memory", response_model=EpisodicMemory, status_code=201)
 async def write_memory(npc_id: str, memory_data: MemoryCreate):
     """NPC episodic memory 작성 (importance >= 0.7이면 long_term으로 자동 전환)."""
-    npc = NPCRepository.get_npc_by_id(npc_id)
+    npc = await AsyncNPCRepository.get_npc_by_id(npc_id)
     if npc is None:
         raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
     
@@ -20,61 +24,100 @@ async def write_memory(npc_id: str, memory_data: MemoryCreate):
     memory_data_updated = MemoryCreate(**memory_data_dict)
     
     try:
-        memory = MemoryRepository.insert_memory(memory_data_updated)
+        memory = await AsyncMemoryRepository.insert_memory(
+            memory_data_updated,
+            retention_days=retention_days("short_term_memory", npc.config)
+        )
         return memory
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to write memory: {str(e)}")
 
 
-@router.get("/npc/{npc_id}/memory/recent", response_model=List[EpisodicMemory])
-async def get_recent_memories(
+async def _get_memories_page(
     npc_id: str,
-    limit: int = Query(default=50, ge=1, le=10000),
-    memory_type: Optional[str] = Query(default=None, regex="^(short_term|long_term)$")
-):
-    """NPC 최근 메모리 조회 (기본값: short_term만)."""
-    npc = NPCRepository.get_npc_by_id(npc_id)
+    response: Response,
+    limit: int,
+    memory_type: Optional[str],
+    cursor: Optional[str],
+    exclude: Optional[str]
+) -> Union[List[EpisodicMemory], Response]:
+    """memory 목록 한 페이지 조회 (다음 페이지 cursor는 X-Next-Cursor 헤더)."""
+    npc = await AsyncNPCRepository.get_npc_by_id(npc_id)
     if npc is None:
         raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
     
     try:
-        if memory_type:
-            memories = MemoryRepository.get_recent_memories(npc_id, limit, memory_type)
-        else:
-            memories = MemoryRepository.get_short_term_memories(npc_id, limit)
-        
-        return memories
+        exclude_fields = parse_exclude(exclude, EpisodicMemory)
+        memories, next_cursor = await AsyncMemoryRepository.get_memories_page(
+            npc_id, limit=limit, memory_type=memory_type, cursor=cursor, exclude=exclude_fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve memories: {str(e)}")
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    response.headers.update(headers)
+    return projected_response(memories, exclude_fields, headers)
+
+
+@router.get("/npc/{npc_id}/memory/recent", response_model=List[EpisodicMemory])
+async def get_recent_memories(
+    npc_id: str,
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=500),
+    memory_type: Optional[str] = Query(default=None, regex="^(short_term|long_term)$"),
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    exclude: Optional[str] = Query(default=None, description="제외할 필드 (쉼표 구분, 예: tags,linked_entities)")
+):
+    """NPC 최근 메모리 조회 (기본값: short_term만)."""
+    return await _get_memories_page(npc_id, response, limit, memory_type or "short_term", cursor, exclude)
 
 
 @router.get("/npc/{npc_id}/memory", response_model=List[EpisodicMemory])
 async def get_all_memories(
     npc_id: str,
-    limit: int = Query(default=50, ge=1, le=10000),
-    memory_type: Optional[str] = Query(default=None, regex="^(short_term|long_term)$")
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=500),
+    memory_type: Optional[str] = Query(default=None, regex="^(short_term|long_term)$"),
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    exclude: Optional[str] = Query(default=None, description="제외할 필드 (쉼표 구분, 예: tags,linked_entities)")
+):
+    """NPC 모든 메모리 조회 (최신순)."""
+    return await _get_memories_page(npc_id, response, limit, memory_type, cursor, exclude)
+
+
+@router.get("/npc/{npc_id}/memory/export")
+async def export_memories(
+    npc_id: str,
+    memory_type: Optional[str] = Query(default=None, regex="^(short_term|long_term)$"),
+    exclude: Optional[str] = Query(default=None, description="제외할 필드 (쉼표 구분)")
 ):
-    """NPC 모든 메모리 조회."""
-    npc = NPCRepository.get_npc_by_id(npc_id)
+    """NPC의 모든 memory를 NDJSON으로 streaming (최신순)."""
+    npc = await AsyncNPCRepository.get_npc_by_id(npc_id)
     if npc is None:
         raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
-    
     try:
-        memories = MemoryRepository.get_recent_memories(npc_id, limit, memory_type)
-        return memories
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve memories: {str(e)}")
+        exclude_fields = parse_exclude(exclude, EpisodicMemory)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def lines():
+        async for doc in AsyncMemoryRepository.iter_memories(npc_id, memory_type=memory_type, exclude=exclude_fields):
+            yield orjson.dumps(doc) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.delete("/npc/{npc_id}/memory/{memory_id}")
 async def delete_memory(npc_id: str, memory_id: str):
     """Memory 삭제."""
-    npc = NPCRepository.get_npc_by_id(npc_id)
+    npc = await AsyncNPCRepository.get_npc_by_id(npc_id)
     if npc is None:
         raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
     
     try:
-        success = MemoryRepository.delete_memory(memory_id)
+        success = await AsyncMemoryRepository.delete_memory(memory_id)
         if not success:
             raise HTTPException(status_code=404, detail=f"Memory {memory_id} not found")
         return {"status": "deleted", "memory_id": memory_id}
@@ -90,12 +133,12 @@ async def delete_memories_by_npc(
     memory_type: Optional[str] = Query(default=None, regex="^(short_term|long_term)$")
 ):
     """NPC의 모든 memory 삭제 (memory_type이 지정되면 해당 타입만)."""
-    npc = NPCRepository.get_npc_by_id(npc_id)
+    npc = await AsyncNPCRepository.get_npc_by_id(npc_id)
     if npc is None:
         raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
     
     try:
-        deleted_count = MemoryRepository.delete_memories_by_npc(npc_id, memory_type)
+        deleted_count = await AsyncMemoryRepository.delete_memories_by_npc(npc_id, memory_type)
         return {"status": "deleted", "npc_id": npc_id, "deleted_count": deleted_count, "memory_type": memory_type}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete memories: {str(e)}")
@@ -1,9 +1,12 @@
 """NPC API 엔드포인트."""
 from fastapi import APIRouter, HTTPException, Query, Body
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any
 from app.schemas.npc import NPC, NPCCreate, NPCConfig
-from app.memory.mongo.repository.npc_repo import NPCRepository
+from app.memory.mongo.repository.npc_repo import AsyncNPCRepository
 from app.services.npc_generator import NPCGenerator
+from app.services.cascade_delete import CascadeDeleteService
+from app.services.jobs import job_manager
 
 router = APIRouter()
 
@@ -12,7 +15,7 @@ router = APIRouter()
 async def create_npc(npc_data: NPCCreate):
     """NPC 생성."""
     try:
-        npc = NPCRepository.create_npc(npc_data)
+        npc = await AsyncNPCRepository.create_npc(npc_data)
         return npc
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create NPC: {str(e)}")
@@ -26,7 +29,7 @@ async def generate_npc(
 ):
     """LLM을 사용하여 NPC 자동 생성."""
     try:
-        result = NPCGenerator.create_npc_from_description(description, role, config)
+        result = await run_in_threadpool(NPCGenerator.create_npc_from_description, description, role, config)
         return {
             "npc": result["npc"].model_dump() if hasattr(result["npc"], 'model_dump') else result["npc"].dict(),
             "persona": result["persona"].model_dump() if hasattr(result["persona"], 'model_dump') else result["persona"].dict(),
@@ -41,7 +44,7 @@ async def generate_npc(
 @router.get("/npc/{npc_id}", response_model=NPC)
 async def get_npc(npc_id: str):
     """NPC 조회."""
-    npc = NPCRepository.get_npc_by_id(npc_id)
+    npc = await AsyncNPCRepository.get_npc_by_id(npc_id)
     
     if npc is None:
         raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
@@ -52,19 +55,19 @@ async def get_npc(npc_id: str):
 @router.get("/npc", response_model=list[NPC])
 async def list_npcs(limit: int = Query(default=100, ge=1, le=1000)):
     """NPC 목록 조회."""
-    npcs = NPCRepository.list_npcs(limit=limit)
+    npcs = await AsyncNPCRepository.list_npcs(limit=limit)
     return npcs
 
 
 @router.put("/npc/{npc_id}", response_model=NPC)
 async def update_npc(npc_id: str, updates: Dict[str, Any] = Body(...)):
     """NPC 업데이트 (config, current_state 등)."""
-    npc = NPCRepository.get_npc_by_id(npc_id)
+    npc = await AsyncNPCRepository.get_npc_by_id(npc_id)
     if npc is None:
         raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
     
     try:
-        updated_npc = NPCRepository.update_npc(npc_id, updates)
+        updated_npc = await AsyncNPCRepository.update_npc(npc_id, updates)
         if updated_npc is None:
             raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
         return updated_npc
@@ -77,13 +80,13 @@ async def update_npc(npc_id: str, updates: Dict[str, Any] = Body(...)):
 @router.put("/npc/{npc_id}/config", response_model=NPC)
 async def update_npc_config(npc_id: str, config: NPCConfig):
     """NPC config 업데이트."""
-    npc = NPCRepository.get_npc_by_id(npc_id)
+    npc = await AsyncNPCRepository.get_npc_by_id(npc_id)
     if npc is None:
         raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
     
     try:
         config_dict = config.model_dump() if hasattr(config, 'model_dump') else config.dict()
-        updated_npc = NPCRepository.update_npc_config(npc_id, config_dict)
+        updated_npc = await AsyncNPCRepository.update_npc_config(npc_id, config_dict)
         if updated_npc is None:
             raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
         return updated_npc
@@ -95,12 +98,18 @@ async def update_npc_config(npc_id: str, config: NPCConfig):
 
 @router.delete("/npc/{npc_id}")
 async def delete_npc(npc_id: str):
-    """NPC 삭제."""
+    """
+    NPC 삭제.
+    
+    NPC 문서는 바로 삭제하고, memory/trace/persona fact/vector는 background job으로 삭제합니다
+    (진행 상황은 GET /jobs/{job_id}).
+    """
     try:
-        success = NPCRepository.delete_npc(npc_id)
+        success = await AsyncNPCRepository.delete_npc(npc_id)
         if not success:
             raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
-        return {"status": "deleted", "npc_id": npc_id}
+        job = job_manager.submit("cascade_delete", CascadeDeleteService.delete_dependents, npc_ids=[npc_id])
+        return {"status": "deleted", "npc_id": npc_id, "job_id": job.job_id}
     except HTTPException:
         raise
     except Exception as e:
@@ -1,7 +1,9 @@
 """Persona API 엔드포인트."""
 from fastapi import APIRouter, HTTPException
 from app.schemas.persona import PersonaProfile, PersonaCreate, PersonaUpdate
-from app.memory.mongo.repository.persona_repo import PersonaRepository
+from app.memory.mongo.repository.persona_repo import AsyncPersonaRepository
+from app.memory.vector.reindex import sync_source
+from app.services.jobs import job_manager
 
 router = APIRouter()
 
@@ -10,7 +12,7 @@ router = APIRouter()
 async def create_persona(persona_data: PersonaCreate):
     """Persona 생성."""
     try:
-        persona = PersonaRepository.create_persona(persona_data)
+        persona = await AsyncPersonaRepository.create_persona(persona_data)
         return persona
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create persona: {str(e)}")
@@ -19,7 +21,7 @@ async def create_persona(persona_data: PersonaCreate):
 @router.get("/persona/{persona_id}", response_model=PersonaProfile)
 async def get_persona(persona_id: str):
     """Persona 조회."""
-    persona = PersonaRepository.get_persona_by_id(persona_id)
+    persona = await AsyncPersonaRepository.get_persona_by_id(persona_id)
     
     if persona is None:
         raise HTTPException(status_code=404, detail=f"Persona {persona_id} not found")
@@ -29,15 +31,17 @@ async def get_persona(persona_id: str):
 
 @router.put("/persona/{persona_id}", response_model=PersonaProfile)
 async def update_persona(persona_id: str, update_data: PersonaUpdate):
-    """Persona 수정."""
+    """Persona 수정 (persona chunk vector는 background job으로 바뀐 chunk만 갱신)."""
     update_dict = update_data.model_dump(exclude_unset=True)
     
     if not update_dict:
         raise HTTPException(status_code=400, detail="No fields to update")
     
-    persona = PersonaRepository.update_persona(persona_id, update_dict)
+    persona = await AsyncPersonaRepository.update_persona(persona_id, update_dict)
     
     if persona is None:
         raise HTTPException(status_code=404, detail=f"Persona {persona_id} not found")
     
+    job_manager.submit("vector_sync", sync_source, source_type="persona", source_id=persona_id)
+    
     return persona
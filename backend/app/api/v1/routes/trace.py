@@ -1,8 +1,11 @@
 """Inference trace API 엔드포인트."""
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Dict, Any
 from app.schemas.trace import InferenceTrace
-from app.memory.mongo.repository.trace_repo import TraceRepository
+from app.memory.mongo.repository.trace_repo import AsyncTraceRepository
+from app.memory.mongo.pagination import parse_exclude, projected_response
 
 router = APIRouter()
 
@@ -10,21 +13,77 @@ router = APIRouter()
 @router.get("/npc/{npc_id}/traces", response_model=List[InferenceTrace])
 async def get_traces(
     npc_id: str,
+    response: Response,
     limit: int = Query(default=50, ge=1, le=500),
-    offset: int = Query(default=0, ge=0)
+    offset: int = Query(default=0, ge=0, description="Deprecated: cursor 사용 권장"),
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    exclude: Optional[str] = Query(default=None, description="제외할 필드 (쉼표 구분, 예: llm_prompt_snapshot)")
 ):
-    """NPC inference trace 목록 조회."""
+    """
+    NPC inference trace 목록 조회 (최신순).
+    
+    다음 페이지가 있으면 X-Next-Cursor 헤더로 cursor를 반환합니다.
+    """
+    if offset and cursor:
+        raise HTTPException(status_code=400, detail="Use either offset or cursor, not both")
+    try:
+        exclude_fields = parse_exclude(exclude, InferenceTrace)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
-        traces = TraceRepository.get_traces_by_npc(npc_id, limit=limit, skip=offset)
-        return traces
+        if offset:
+            traces = await AsyncTraceRepository.get_traces_by_npc(
+                npc_id, limit=limit, skip=offset, exclude=exclude_fields
+            )
+            return projected_response(traces, exclude_fields)
+        traces, next_cursor = await AsyncTraceRepository.get_traces_page(
+            npc_id, limit=limit, cursor=cursor, exclude=exclude_fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get traces: {str(e)}")
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    response.headers.update(headers)
+    return projected_response(traces, exclude_fields, headers)
+
+
+@router.get("/npc/{npc_id}/traces/export")
+async def export_traces(
+    npc_id: str,
+    exclude: Optional[str] = Query(default=None, description="제외할 필드 (쉼표 구분, 예: llm_prompt_snapshot)")
+):
+    """NPC의 모든 inference trace를 NDJSON으로 streaming (최신순)."""
+    try:
+        exclude_fields = parse_exclude(exclude, InferenceTrace)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def lines():
+        async for doc in AsyncTraceRepository.iter_traces(npc_id, exclude=exclude_fields):
+            yield orjson.dumps(doc) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/traces/prompt_cache", response_model=Dict[str, Any])
+async def get_prompt_cache_stats(
+    npc_id: Optional[str] = None,
+    limit: int = Query(default=1000, ge=1, le=100000)
+):
+    """최근 trace의 prompt layout별 prefix 재사용률 및 cached token 비율 조회."""
+    try:
+        return await AsyncTraceRepository.get_prompt_cache_stats(npc_id=npc_id, limit=limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get prompt cache stats: {str(e)}")
 
 
 @router.get("/trace/{trace_id}", response_model=InferenceTrace)
 async def get_trace(trace_id: str):
     """Inference trace 조회."""
-    trace = TraceRepository.get_trace_by_id(trace_id)
+    trace = await AsyncTraceRepository.get_trace_by_id(trace_id)
     
     if trace is None:
         raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found")
@@ -36,7 +95,7 @@ async def get_trace(trace_id: str):
 async def delete_trace(trace_id: str):
     """Inference trace 삭제."""
     try:
-        success = TraceRepository.delete_trace(trace_id)
+        success = await AsyncTraceRepository.delete_trace(trace_id)
         if not success:
             raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found")
         return {"status": "deleted", "trace_id": trace_id}
@@ -48,7 +107,7 @@ async def delete_trace(trace_id: str):
 async def delete_traces_by_npc(npc_id: str):
     """NPC의 모든 inference trace 삭제."""
     try:
-        deleted_count = TraceRepository.delete_traces_by_npc(npc_id)
+        deleted_count = await AsyncTraceRepository.delete_traces_by_npc(npc_id)
         return {"status": "deleted", "npc_id": npc_id, "deleted_count": deleted_count}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete traces: {str(e)}")
@@ -1,5 +1,6 @@
 """Turn API 엔드포인트 - NPC 인지 루프."""
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from typing import Dict, Any, Optional
 from app.agents.run_turn import TurnOrchestrator
 
@@ -14,7 +15,7 @@ async def run_npc_turn(
 ):
     """NPC 턴 실행 - 전체 인지 루프."""
     try:
-        result = TurnOrchestrator.run_turn(npc_id, observation, turn_id)
+        result = await run_in_threadpool(TurnOrchestrator.run_turn, npc_id, observation, turn_id)
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -1,9 +1,12 @@
 """Vector memory API 엔드포인트."""
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Dict, Any, Optional
 from app.memory.vector.vectorizer import Vectorizer
+from app.memory.vector.reindex import INDEX_TYPES, start_reindex
 from app.memory.vector.retriever import VectorRetriever
-from app.memory.mongo.repository.npc_repo import NPCRepository
+from app.memory.vector.scoring import RetrievalWeights
+from app.memory.mongo.repository.npc_repo import AsyncNPCRepository
 from app.memory.mongo.repository.memory_repo import MemoryRepository
 from app.memory.mongo.repository.persona_repo import PersonaRepository
 from app.memory.mongo.repository.world_repo import WorldRepository
@@ -13,85 +16,33 @@ router = APIRouter()
 
 @router.post("/vector/reindex")
 async def reindex(
-    index_type: str = Query(..., description="Index type: episodic, persona, or world")
+    index_type: str = Query(..., description="Index type: episodic, persona, or world"),
+    resume: bool = Query(default=True, description="Continue from the last checkpoint of an interrupted reindex")
 ):
-    """MongoDB에서 vector index 재구성."""
-    if index_type not in ['episodic', 'persona', 'world']:
+    """MongoDB 문서로 vector index를 재구성하는 background job 시작 (진행 상황은 /jobs/{job_id})."""
+    if index_type not in INDEX_TYPES:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid index_type: {index_type}. Must be 'episodic', 'persona', or 'world'"
         )
     
     try:
-        vectorizer = Vectorizer(index_type)
-        vectorizer.reindex()
-        
-        count = 0
-        
-        if index_type == 'episodic':
-            from app.memory.mongo.client import get_collection
-            collection = get_collection('episodic_memory')
-            memories = collection.find({"memory_type": "long_term"})
-            
-            for mem in memories:
-                vectorizer.vectorize_episodic_memory(
-                    memory_id=mem['memory_id'],
-                    npc_id=mem['npc_id'],
-                    content=mem['content'],
-                    importance=mem.get('importance', 0.5),
-                    created_at=mem.get('created_at', '').isoformat() if hasattr(mem.get('created_at'), 'isoformat') else str(mem.get('created_at', ''))
-                )
-                count += 1
-        
-        elif index_type == 'persona':
-            from app.memory.mongo.client import get_collection
-            collection = get_collection('persona_profiles')
-            personas = collection.find()
-            
-            for persona in personas:
-                persona_dict = {
-                    'traits': persona.get('traits', []),
-                    'habits': persona.get('habits', []),
-                    'goals': persona.get('goals', []),
-                    'background': persona.get('background', ''),
-                    'speech_style': persona.get('speech_style', ''),
-                    'constraints': persona.get('constraints', {}),
-                    'created_at': persona.get('created_at', '').isoformat() if hasattr(persona.get('created_at'), 'isoformat') else str(persona.get('created_at', ''))
-                }
-                vector_ids = vectorizer.vectorize_persona_chunks(
-                    persona_id=persona['persona_id'],
-                    persona_data=persona_dict
-                )
-                count += len(vector_ids)
-        
-        elif index_type == 'world':
-            from app.memory.mongo.client import get_collection
-            collection = get_collection('world_knowledge')
-            worlds = collection.find()
-            
-            for world in worlds:
-                world_dict = {
-                    'rules': world.get('rules', {}),
-                    'locations': world.get('locations', {}),
-                    'danger_levels': world.get('danger_levels', {}),
-                    'global_constraints': world.get('global_constraints', {}),
-                    'created_at': world.get('created_at', '').isoformat() if hasattr(world.get('created_at'), 'isoformat') else str(world.get('created_at', ''))
-                }
-                vector_ids = vectorizer.vectorize_world_chunks(
-                    world_id=world['world_id'],
-                    world_data=world_dict
-                )
-                count += len(vector_ids)
-        
-        return {
-            "status": "success",
-            "index_type": index_type,
-            "vectors_indexed": count,
-            "message": f"Reindexed {index_type} index with {count} vectors"
-        }
-    
+        job, started = start_reindex(index_type, resume=resume)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Reindexing failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to start reindex: {str(e)}")
+    
+    if not started:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Reindex of {index_type} index is already running (job {job.job_id})"
+        )
+    
+    return {
+        "status": "accepted",
+        "index_type": index_type,
+        "job_id": job.job_id,
+        "resume": resume
+    }
 
 
 @router.get("/npc/{npc_id}/vector_memories")
@@ -101,7 +52,7 @@ async def get_vector_memories(
     top_k: int = Query(default=10, ge=1, le=50, description="Number of results to return")
 ):
     """NPC vector memory 조회 (메타데이터만 반환)."""
-    npc = NPCRepository.get_npc_by_id(npc_id)
+    npc = await AsyncNPCRepository.get_npc_by_id(npc_id)
     if npc is None:
         raise HTTPException(status_code=404, detail=f"NPC {npc_id} not found")
     
@@ -109,12 +60,16 @@ async def get_vector_memories(
         retriever = VectorRetriever()
         
         if query:
-            results = retriever.retrieve_for_npc(npc_id, query, top_k)
+            results = await run_in_threadpool(
+                retriever.retrieve_for_npc, npc_id, query, top_k,
+                weights=RetrievalWeights.for_npc(npc.config)
+            )
             return {
                 "npc_id": npc_id,
                 "query": query,
                 "results": results['retrieved_sources'],
-                "similarity_scores": results['similarity_scores']
+                "similarity_scores": results['similarity_scores'],
+                "ranking_scores": results['ranking_scores']
             }
         else:
             episodic_vectorizer = Vectorizer('episodic')
@@ -2,8 +2,11 @@
 from fastapi import APIRouter, HTTPException
 from typing import List
 from app.schemas.world import WorldKnowledge, WorldCreate
-from app.memory.mongo.repository.world_repo import WorldRepository
-from app.memory.mongo.repository.npc_repo import NPCRepository
+from app.memory.mongo.repository.world_repo import AsyncWorldRepository
+from app.memory.mongo.repository.npc_repo import AsyncNPCRepository
+from app.services.cascade_delete import CascadeDeleteService
+from app.services.jobs import job_manager
+from app.memory.vector.reindex import sync_source
 
 router = APIRouter()
 
@@ -12,7 +15,7 @@ router = APIRouter()
 async def list_worlds():
     """모든 World 목록 조회."""
     try:
-        worlds = WorldRepository.list_worlds()
+        worlds = await AsyncWorldRepository.list_worlds()
         return worlds
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list worlds: {str(e)}")
@@ -22,7 +25,7 @@ async def list_worlds():
 async def create_world(world_data: WorldCreate):
     """World 생성."""
     try:
-        world = WorldRepository.create_world(world_data)
+        world = await AsyncWorldRepository.create_world(world_data)
         return world
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create world: {str(e)}")
@@ -31,7 +34,7 @@ async def create_world(world_data: WorldCreate):
 @router.get("/world/{world_id}", response_model=WorldKnowledge)
 async def get_world(world_id: str):
     """World 조회."""
-    world = WorldRepository.get_world_by_id(world_id)
+    world = await AsyncWorldRepository.get_world_by_id(world_id)
     
     if world is None:
         raise HTTPException(status_code=404, detail=f"World {world_id} not found")
@@ -41,11 +44,12 @@ async def get_world(world_id: str):
 
 @router.put("/world/{world_id}", response_model=WorldKnowledge)
 async def update_world(world_id: str, update_data: dict):
-    """World 업데이트."""
+    """World 업데이트 (world chunk vector는 background job으로 바뀐 chunk만 갱신)."""
     try:
-        world = WorldRepository.update_world(world_id, update_data)
+        world = await AsyncWorldRepository.update_world(world_id, update_data)
         if world is None:
             raise HTTPException(status_code=404, detail=f"World {world_id} not found")
+        job_manager.submit("vector_sync", sync_source, source_type="world", source_id=world_id)
         return world
     except HTTPException:
         raise
@@ -55,11 +59,16 @@ async def update_world(world_id: str, update_data: dict):
 
 @router.delete("/world/{world_id}")
 async def delete_world(world_id: str, delete_npcs: bool = False):
-    """World 삭제. delete_npcs=True면 해당 월드의 모든 NPC도 삭제."""
+    """
+    World 삭제. delete_npcs=True면 해당 월드의 모든 NPC도 삭제.
+    
+    World/NPC 문서는 바로 삭제하고, NPC의 memory/trace/persona fact와 vector는 background job으로
+    삭제합니다 (진행 상황은 GET /jobs/{job_id}).
+    """
     try:
         # NPC 개수 확인
-        npcs = NPCRepository.get_npcs_by_world(world_id)
-        npc_count = len(npcs)
+        npc_ids = await AsyncNPCRepository.get_npc_ids_by_world(world_id)
+        npc_count = len(npc_ids)
         deleted_npcs = 0
         
         if npc_count > 0 and not delete_npcs:
@@ -70,17 +79,29 @@ async def delete_world(world_id: str, delete_npcs: bool = False):
         
         # NPC 삭제 (요청된 경우)
         if delete_npcs and npc_count > 0:
-            deleted_npcs = NPCRepository.delete_npcs_by_world(world_id)
+            deleted_npcs = await AsyncNPCRepository.delete_npcs_by_world(world_id)
         
         # World 삭제
-        success = WorldRepository.delete_world(world_id)
+        success = await AsyncWorldRepository.delete_world(world_id)
+        
+        # 종속 문서/vector 정리
+        job = None
+        if success or deleted_npcs:
+            job = job_manager.submit(
+                "cascade_delete",
+                CascadeDeleteService.delete_dependents,
+                npc_ids=npc_ids if deleted_npcs else [],
+                world_id=world_id
+            )
+        
         if not success:
             raise HTTPException(status_code=404, detail=f"World {world_id} not found")
         
         return {
             "status": "deleted",
             "world_id": world_id,
-            "deleted_npcs": deleted_npcs
+            "deleted_npcs": deleted_npcs,
+            "job_id": job.job_id
         }
     except HTTPException:
         raise
@@ -93,11 +114,11 @@ async def get_world_npcs(world_id: str):
     """World에 속한 NPC 목록 조회."""
     try:
         # World 존재 확인
-        world = WorldRepository.get_world_by_id(world_id)
+        world = await AsyncWorldRepository.get_world_by_id(world_id)
         if world is None:
             raise HTTPException(status_code=404, detail=f"World {world_id} not found")
         
-        npcs = NPCRepository.get_npcs_by_world(world_id)
+        npcs = await AsyncNPCRepository.get_npcs_by_world(world_id)
         return npcs
     except HTTPException:
         raise
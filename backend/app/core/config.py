@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
@@ -5,13 +6,201 @@ from pydantic import Field
 class Settings(BaseSettings):
     """환경 변수에서 로드되는 애플리케이션 설정."""
     
-    openai_api_key: str = Field(..., description="OpenAI API key")
+    openai_api_key: str = Field(default="", description="OpenAI API key (required for openai backends)")
     openai_chat_model: str = Field(default="gpt-4o-mini", description="GPT model for chat/completions")
     openai_embedding_model: str = Field(default="text-embedding-3-large", description="OpenAI embeddings model")
     openai_embedding_dim: int = Field(default=3072, description="Embedding dimension", gt=0)
     
+    llm_backend: Literal["openai", "stub", "record", "replay"] = Field(
+        default="openai",
+        description="Chat backend: openai, stub (rule-based, offline), record (openai + cassette) or replay (cassette, stub fallback)"
+    )
+    prompt_layout: Literal["inline", "stable_prefix"] = Field(
+        default="inline",
+        description="Planning prompt layout: inline (single user message) or stable_prefix (static persona/world in a cacheable prefix)"
+    )
+    context_token_budget: int = Field(
+        default=0,
+        description="Default planning context token budget for NPCs without one (0 = fixed per-section cuts)",
+        ge=0
+    )
+    retrieval_scorer: Literal["similarity", "weighted"] = Field(
+        default="weighted",
+        description="Retrieval ranking: similarity (cosine + persona fact boost) or weighted (relevance + recency + importance)"
+    )
+    retrieval_candidate_multiplier: int = Field(
+        default=4,
+        description="Candidates fetched per index as a multiple of top_k before weighted rescoring",
+        ge=1
+    )
+    retrieval_relevance_weight: float = Field(default=1.0, description="Default weight of similarity in weighted retrieval", ge=0)
+    retrieval_recency_weight: float = Field(default=1.0, description="Default weight of recency in weighted retrieval", ge=0)
+    retrieval_importance_weight: float = Field(default=1.0, description="Default weight of importance in weighted retrieval", ge=0)
+    retrieval_recency_decay: float = Field(
+        default=0.995,
+        description="Recency multiplier per hour since a memory was created (recency = decay ** hours)",
+        gt=0,
+        le=1
+    )
+    retrieval_hybrid: bool = Field(
+        default=True,
+        description="Fuse BM25 keyword hits with vector hits (reciprocal-rank fusion); keyword-only if query embedding fails"
+    )
+    retrieval_rrf_k: int = Field(
+        default=60,
+        description="Reciprocal-rank fusion constant (score = sum of 1 / (k + rank))",
+        ge=1
+    )
+    retrieval_mmr: bool = Field(
+        default=False,
+        description="Re-rank each index's candidates with maximal marginal relevance to drop near-duplicate memories"
+    )
+    retrieval_mmr_lambda: float = Field(
+        default=0.7,
+        description="MMR trade-off: 1 = relevance only, lower values favour diversity",
+        ge=0,
+        le=1
+    )
+    prompt_reload_interval_s: float = Field(
+        default=2.0,
+        description="How often prompt templates are checked for file changes (seconds, 0 = load once at startup)",
+        ge=0
+    )
+    llm_cassette_path: str = Field(default="storage/llm_cassette.jsonl", description="JSONL cassette for record/replay chat backends")
+    embedding_backend: Literal["openai", "hashing"] = Field(default="openai", description="Embedding backend: openai or hashing (deterministic, offline)")
+    stub_latency_distribution: Literal["none", "constant", "uniform", "normal", "lognormal"] = Field(
+        default="none", description="Latency distribution injected by stub backends"
+    )
+    stub_llm_latency_ms: float = Field(default=0.0, description="Mean injected latency per stub chat call (ms)", ge=0)
+    stub_llm_latency_jitter_ms: float = Field(default=0.0, description="Latency spread per stub chat call (ms)", ge=0)
+    stub_embedding_latency_ms: float = Field(default=0.0, description="Mean injected latency per stub embedding batch (ms)", ge=0)
+    stub_embedding_latency_jitter_ms: float = Field(default=0.0, description="Latency spread per stub embedding batch (ms)", ge=0)
+    stub_seed: int = Field(default=0, description="Random seed for stub latency sampling")
+    
     mongodb_uri: str = Field(default="mongodb://localhost:27017", description="MongoDB connection URI")
     mongodb_db: str = Field(default="ai_npc_framework", description="MongoDB database name")
+    mongodb_max_pool_size: int = Field(default=100, description="Max connections per Mongo client pool", gt=0)
+    mongodb_min_pool_size: int = Field(default=0, description="Connections kept open per Mongo client pool", ge=0)
+    mongodb_max_idle_time_ms: int = Field(default=0, description="Close pooled connections idle longer than this (0 = never)", ge=0)
+    mongodb_wait_queue_timeout_ms: int = Field(default=0, description="Max wait for a free pooled connection (0 = no limit)", ge=0)
+    mongodb_ensure_indexes: bool = Field(default=True, description="Create declared Mongo indexes in the background on startup")
+    entity_cache_enabled: bool = Field(default=True, description="Cache NPC/persona/world/persona-fact documents in process")
+    entity_cache_max_entries: int = Field(default=10000, description="Max cached entity entries (LRU)", gt=0)
+    conversation_buffer_size: int = Field(
+        default=10,
+        description="Recent short-term memories kept in process per NPC for planning conversation history (0 = read Mongo every turn)",
+        ge=0
+    )
+    conversation_buffer_max_npcs: int = Field(default=10000, description="Max NPCs with a conversation buffer (LRU)", gt=0)
+    turn_context_aggregation: bool = Field(
+        default=True,
+        description="Load a cold turn context (NPC/persona/world/facts/recent memories) with one $lookup aggregation (MongoDB 3.6+); false = sequential reads"
+    )
+    write_buffer_enabled: bool = Field(
+        default=False,
+        description="Batch turn memory/trace inserts into insert_many (written after a short delay, flushed on shutdown)"
+    )
+    write_buffer_batch_size: int = Field(default=100, description="Buffered documents per insert_many batch", gt=0)
+    write_buffer_flush_interval_ms: float = Field(default=200, description="Max time a buffered document waits before flush (ms)", gt=0)
+    write_buffer_max_pending: int = Field(default=10000, description="Pending documents above which writers flush synchronously", gt=0)
+    write_buffer_max_retries: int = Field(
+        default=5,
+        description="Times a buffered document rejected by the server (not a duplicate key) is written before it is dead-lettered",
+        gt=0
+    )
+    write_buffer_dead_letter_path: str = Field(
+        default="storage/write_buffer/dead_letter.jsonl",
+        description="JSONL file for buffered documents that can never be written (unencodable, too large, repeatedly rejected)"
+    )
+    trace_compaction_enabled: bool = Field(
+        default=True,
+        description="Store trace prompt snapshots as deduplicated segment references plus compressed dynamic text"
+    )
+    memory_dedup_threshold: float = Field(
+        default=0.95,
+        description="Cosine similarity above which a new long-term memory is merged into a recent one of the same NPC",
+        gt=0,
+        le=1
+    )
+    memory_dedup_window: int = Field(
+        default=50,
+        description="Recent long-term memory vectors per NPC checked for near-duplicates (0 = disabled)",
+        ge=0
+    )
+    memory_dedup_importance_boost: float = Field(
+        default=0.05,
+        description="Importance added to a memory each time a near-duplicate is merged into it (capped at 1.0)",
+        ge=0
+    )
+    memory_consolidation_min_age_days: float = Field(
+        default=0,
+        description="Long-term memories older than this are clustered and summarized by the consolidation job (0 = disabled, NPC config can override)",
+        ge=0
+    )
+    memory_consolidation_min_memories: int = Field(
+        default=50,
+        description="Consolidate an NPC only when it has at least this many eligible memories (NPC config can override)",
+        ge=2
+    )
+    memory_consolidation_similarity: float = Field(
+        default=0.8,
+        description="Cosine similarity to a cluster's seed memory required to join the cluster",
+        gt=0,
+        le=1
+    )
+    memory_consolidation_max_cluster_size: int = Field(
+        default=10,
+        description="Max memories summarized into one consolidated memory",
+        ge=2
+    )
+    memory_consolidation_batch_size: int = Field(
+        default=500,
+        description="Oldest eligible memories per NPC considered in one consolidation run",
+        gt=0
+    )
+    memory_consolidation_interval_minutes: float = Field(
+        default=60,
+        description="How often the consolidation job is submitted in the background (0 = only via the admin endpoint)",
+        ge=0
+    )
+    short_term_memory_retention_days: float = Field(
+        default=0,
+        description="Default retention for short-term memories in days (0 = keep forever, NPC config can override)",
+        ge=0
+    )
+    trace_retention_days: float = Field(
+        default=0,
+        description="Default retention for inference traces in days (0 = keep forever, NPC config can override)",
+        ge=0
+    )
+    retention_archive_dir: str = Field(
+        default="",
+        description="Archive expired documents here as compressed JSONL before deleting them (empty = TTL delete only)"
+    )
+    retention_interval_minutes: float = Field(
+        default=60,
+        description="How often the retention job runs in the background (0 = only via the admin endpoint)",
+        ge=0
+    )
+    job_workers: int = Field(default=2, description="Threads running background jobs (cascade deletes)", gt=0)
+    cascade_delete_batch_size: int = Field(
+        default=1000,
+        description="Documents removed per delete_many when cascading an NPC/world delete",
+        gt=0
+    )
+    reindex_batch_size: int = Field(default=500, description="Mongo documents streamed per reindex batch", gt=0)
+    reindex_embed_concurrency: int = Field(
+        default=4,
+        description="Embedding batches (100 texts each) requested concurrently during a reindex",
+        gt=0
+    )
+    reindex_checkpoint_interval_s: float = Field(
+        default=30,
+        description="Seconds between reindex checkpoints (shadow index + progress saved for resume)",
+        ge=0
+    )
+    reindex_resume_on_startup: bool = Field(default=True, description="Resume interrupted reindex jobs when the server starts")
+    entity_cache_change_streams: bool = Field(default=False, description="Invalidate the entity cache from Mongo change streams (replica set required)")
     
     faiss_index_dir: str = Field(default="storage/faiss/indices", description="FAISS index directory")
     faiss_meta_dir: str = Field(default="storage/faiss/meta", description="FAISS metadata directory")
@@ -7,7 +7,7 @@ from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.responses import HTMLResponse
 from app.core.config import settings
 from app.api.v1.router import api_router
-from app.memory.mongo.client import MongoClientManager
+from app.memory.mongo.client import MongoClientManager, AsyncMongoClientManager
 
 # 로깅 설정
 logging.basicConfig(
@@ -33,10 +33,46 @@ async def lifespan(app: FastAPI):
                 import logging
                 logging.error(f"FAISS index {index_name} dimension mismatch: {str(e)}")
     
+    from app.prompts.registry import prompt_registry
+    prompt_registry.load_all()
+    
     MongoClientManager.initialize()
+    AsyncMongoClientManager.initialize()
+    
+    if settings.mongodb_ensure_indexes:
+        from app.memory.mongo.indexes import IndexManager
+        IndexManager.ensure_indexes_in_background()
+    
+    if settings.entity_cache_change_streams:
+        from app.memory.mongo.cache import ChangeStreamInvalidator
+        ChangeStreamInvalidator.start()
+    
+    from app.memory.mongo.write_buffer import write_buffer
+    write_buffer.start()
+    
+    from app.services.retention import RetentionService
+    RetentionService.start()
+    
+    from app.services.consolidation import ConsolidationService
+    ConsolidationService.start()
+    
+    if settings.reindex_resume_on_startup:
+        from app.memory.vector.reindex import resume_pending_reindexes
+        resume_pending_reindexes()
     
     yield
     
+    from app.services.jobs import job_manager
+    job_manager.shutdown()
+    RetentionService.stop()
+    ConsolidationService.stop()
+    write_buffer.stop()
+    
+    if settings.entity_cache_change_streams:
+        from app.memory.mongo.cache import ChangeStreamInvalidator
+        ChangeStreamInvalidator.stop()
+    
+    AsyncMongoClientManager.close()
     MongoClientManager.close()
 
 
@@ -59,6 +95,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(api_router, prefix="/api/v1")
@@ -0,0 +1,267 @@
+"""NPC/Persona/World/PersonaFact 문서용 버전 기반 in-process read-through cache."""
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from pymongo.errors import OperationFailure, PyMongoError
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class EntityCache:
+    """
+    (kind, key) 단위 LRU cache.
+
+    항목마다 version을 두고, invalidate 시 version을 올립니다. 조회 전에 읽은 version이
+    그대로일 때만 put이 반영되므로, 조회 도중 쓰기가 끼어들어도 이전 문서가 캐시되지 않습니다.
+    조회 전에 key를 알 수 없는 경우(여러 kind를 한 번에 읽는 aggregation)는 전역 sequence로
+    같은 보장을 합니다 (put_many).
+    """
+
+    def __init__(self, max_entries: int = 10000, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple[str, Hashable], Any]" = OrderedDict()
+        self._versions: Dict[Tuple[str, Hashable], int] = {}
+        self._kind_versions: Dict[str, int] = {}
+        self._generation = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+    def _version_locked(self, kind: str, key: Hashable) -> Tuple[int, int, int]:
+        return self._generation, self._kind_versions.get(kind, 0), self._versions.get((kind, key), 0)
+
+    def version(self, kind: str, key: Hashable) -> Tuple[int, int, int]:
+        """(kind, key)의 현재 version (kind 전체 invalidate와 clear도 반영)."""
+        with self._lock:
+            return self._version_locked(kind, key)
+
+    def sequence(self) -> int:
+        """invalidate/clear마다 증가하는 전역 번호."""
+        with self._lock:
+            return self._sequence
+
+    def get(self, kind: str, key: Hashable) -> Any:
+        """캐시된 값의 복사본 (없으면 _MISSING)."""
+        if not self.enabled:
+            return _MISSING
+        with self._lock:
+            value = self._entries.get((kind, key), _MISSING)
+            if value is _MISSING:
+                self._stats["misses"] += 1
+                return _MISSING
+            self._entries.move_to_end((kind, key))
+            self._stats["hits"] += 1
+        return copy.deepcopy(value)
+
+    def put(self, kind: str, key: Hashable, value: Any, version: Tuple[int, int, int]) -> None:
+        """조회 전에 읽은 version이 바뀌지 않았을 때만 저장."""
+        if not self.enabled:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            if self._version_locked(kind, key) != version:
+                return
+            self._entries[(kind, key)] = value
+            self._entries.move_to_end((kind, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def put_many(self, items: Dict[Tuple[str, Hashable], Any], sequence: int) -> None:
+        """
+        여러 (kind, key) 항목을 저장 (조회 전에 읽은 sequence 이후 invalidate가 없었을 때만).
+
+        어떤 key든 invalidate되면 전부 버리므로 put보다 보수적입니다.
+        """
+        if not self.enabled:
+            return
+        items = copy.deepcopy(items)
+        with self._lock:
+            if self._sequence != sequence:
+                return
+            for entry_key, value in items.items():
+                self._entries[entry_key] = value
+                self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def get_or_load(self, kind: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Read-through 조회 (sync).
+
+        loader 결과가 None이면 캐시하지 않습니다 (이후 생성되는 문서를 놓치지 않도록).
+        """
+        value = self.get(kind, key)
+        if value is not _MISSING:
+            return value
+        version = self.version(kind, key)
+        value = loader()
+        if value is not None:
+            self.put(kind, key, value, version)
+        return value
+
+    async def get_or_load_async(self, kind: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Read-through 조회 (async, loader는 coroutine을 반환)."""
+        value = self.get(kind, key)
+        if value is not _MISSING:
+            return value
+        version = self.version(kind, key)
+        value = await loader()
+        if value is not None:
+            self.put(kind, key, value, version)
+        return value
+
+    def invalidate(self, kind: str, key: Hashable) -> None:
+        with self._lock:
+            self._versions[(kind, key)] = self._versions.get((kind, key), 0) + 1
+            self._sequence += 1
+            self._entries.pop((kind, key), None)
+            self._stats["invalidations"] += 1
+
+    def invalidate_kind(self, kind: str) -> None:
+        """kind의 모든 항목 invalidate (대상 key를 알 수 없는 bulk 쓰기용)."""
+        with self._lock:
+            self._kind_versions[kind] = self._kind_versions.get(kind, 0) + 1
+            self._sequence += 1
+            for entry_key in [k for k in self._entries if k[0] == kind]:
+                del self._entries[entry_key]
+            self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._sequence += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                **self._stats
+            }
+
+
+entity_cache = EntityCache(
+    max_entries=settings.entity_cache_max_entries,
+    enabled=settings.entity_cache_enabled
+)
+
+
+def invalidate_fact_lists(persona_id: Optional[str] = None, npc_id: Optional[str] = None) -> None:
+    """PersonaFact 목록 캐시 invalidate (id를 모르면 kind 전체)."""
+    if persona_id is None and npc_id is None:
+        entity_cache.invalidate_kind("facts_by_persona")
+        entity_cache.invalidate_kind("facts_by_npc")
+        return
+    if persona_id is not None:
+        entity_cache.invalidate("facts_by_persona", persona_id)
+    if npc_id is not None:
+        entity_cache.invalidate("facts_by_npc", npc_id)
+
+
+class ChangeStreamInvalidator:
+    """
+    Mongo change stream으로 다른 worker의 쓰기를 감지해 cache invalidate (replica set 필요).
+
+    delete 이벤트에는 문서 내용이 없으므로 해당 kind 전체를 invalidate합니다. stream이 끊기면
+    backoff 후 마지막 resume token부터 다시 감시하고, 끊긴 동안 놓친 이벤트가 있을 수 있으므로
+    다시 연결되면 cache 전체를 비웁니다.
+    """
+
+    # collection -> (cache kind, id 필드)
+    WATCHED = {
+        "npcs": ("npc", "npc_id"),
+        "persona_profiles": ("persona", "persona_id"),
+        "world_knowledge": ("world", "world_id"),
+        "persona_facts": (None, None),
+    }
+
+    # 재연결 대기 시간 (실패할 때마다 두 배, 최대 MAX_RECONNECT_DELAY_S)
+    RECONNECT_DELAY_S = 1.0
+    MAX_RECONNECT_DELAY_S = 30.0
+    # resume token으로 이어갈 수 없는 오류 (oplog에서 밀려난 token 등) - 현재 시점부터 다시 감시
+    RESUME_FAILED_CODES = {260, 280, 286}
+
+    _stop = threading.Event()
+    _threads: list = []
+
+    @staticmethod
+    def handle_event(collection_name: str, event: Dict[str, Any]) -> None:
+        kind, id_field = ChangeStreamInvalidator.WATCHED[collection_name]
+        document = event.get("fullDocument")
+
+        if collection_name == "persona_facts":
+            if document:
+                invalidate_fact_lists(document.get("persona_id"), document.get("npc_id"))
+            else:
+                invalidate_fact_lists()
+            return
+
+        if document and document.get(id_field):
+            entity_cache.invalidate(kind, document[id_field])
+        else:
+            entity_cache.invalidate_kind(kind)
+
+    @staticmethod
+    def _watch(collection_name: str) -> None:
+        from app.memory.mongo.client import get_collection
+
+        stop = ChangeStreamInvalidator._stop
+        resume_token = None
+        delay = ChangeStreamInvalidator.RECONNECT_DELAY_S
+        reconnecting = False
+        while not stop.is_set():
+            try:
+                with get_collection(collection_name).watch(
+                    full_document="updateLookup",
+                    max_await_time_ms=1000,
+                    resume_after=resume_token
+                ) as stream:
+                    if reconnecting:
+                        entity_cache.clear()
+                        logger.info(f"Change stream on {collection_name} reconnected, cleared entity cache")
+                        reconnecting = False
+                        delay = ChangeStreamInvalidator.RECONNECT_DELAY_S
+                    while not stop.is_set():
+                        event = stream.try_next()
+                        if event is not None:
+                            ChangeStreamInvalidator.handle_event(collection_name, event)
+                        resume_token = stream.resume_token
+            except PyMongoError as e:
+                if isinstance(e, OperationFailure) and e.code in ChangeStreamInvalidator.RESUME_FAILED_CODES:
+                    resume_token = None
+                logger.warning(f"Change stream on {collection_name} failed, reconnecting in {delay:.1f}s: {e}")
+                reconnecting = True
+                if stop.wait(delay):
+                    break
+                delay = min(delay * 2, ChangeStreamInvalidator.MAX_RECONNECT_DELAY_S)
+
+    @staticmethod
+    def start() -> None:
+        """감시 대상 collection별 daemon thread 시작."""
+        ChangeStreamInvalidator._stop.clear()
+        for collection_name in ChangeStreamInvalidator.WATCHED:
+            thread = threading.Thread(
+                target=ChangeStreamInvalidator._watch,
+                args=(collection_name,),
+                name=f"cache-invalidator-{collection_name}",
+                daemon=True
+            )
+            thread.start()
+            ChangeStreamInvalidator._threads.append(thread)
+
+    @staticmethod
+    def stop() -> None:
+        ChangeStreamInvalidator._stop.set()
+        for thread in ChangeStreamInvalidator._threads:
+            thread.join(timeout=2)
+        ChangeStreamInvalidator._threads = []
@@ -1,11 +1,25 @@
 """MongoDB connection manager."""
-from typing import Optional
+from typing import Optional, Dict, Any
 from pymongo import MongoClient
 from pymongo.database import Database
 from pymongo.collection import Collection
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
 from app.core.config import settings
 
 
+def client_options() -> Dict[str, Any]:
+    """Sync/async client가 공유하는 connection pool 설정."""
+    options = {
+        "maxPoolSize": settings.mongodb_max_pool_size,
+        "minPoolSize": settings.mongodb_min_pool_size,
+    }
+    if settings.mongodb_max_idle_time_ms:
+        options["maxIdleTimeMS"] = settings.mongodb_max_idle_time_ms
+    if settings.mongodb_wait_queue_timeout_ms:
+        options["waitQueueTimeoutMS"] = settings.mongodb_wait_queue_timeout_ms
+    return options
+
+
 class MongoClientManager:
     """Singleton MongoDB client manager."""
     
@@ -16,7 +30,7 @@ class MongoClientManager:
     def initialize(cls) -> None:
         """Initialize MongoDB client and database connection."""
         if cls._client is None:
-            cls._client = MongoClient(settings.mongodb_uri)
+            cls._client = MongoClient(settings.mongodb_uri, **client_options())
             cls._db = cls._client[settings.mongodb_db]
     
     @classmethod
@@ -41,6 +55,41 @@ class MongoClientManager:
         return db[name]
 
 
+class AsyncMongoClientManager:
+    """Singleton Motor client manager (async routes용, 프로세스당 하나의 pool 공유)."""
+    
+    _client: Optional[AsyncIOMotorClient] = None
+    _db: Optional[AsyncIOMotorDatabase] = None
+    
+    @classmethod
+    def initialize(cls) -> None:
+        """Initialize Motor client and database connection."""
+        if cls._client is None:
+            cls._client = AsyncIOMotorClient(settings.mongodb_uri, **client_options())
+            cls._db = cls._client[settings.mongodb_db]
+    
+    @classmethod
+    def close(cls) -> None:
+        """Close Motor connection."""
+        if cls._client is not None:
+            cls._client.close()
+            cls._client = None
+            cls._db = None
+    
+    @classmethod
+    def get_db(cls) -> AsyncIOMotorDatabase:
+        """Get database instance. Initializes if needed."""
+        if cls._db is None:
+            cls.initialize()
+        return cls._db
+    
+    @classmethod
+    def get_collection(cls, name: str) -> AsyncIOMotorCollection:
+        """Get collection by name."""
+        db = cls.get_db()
+        return db[name]
+
+
 # Convenience functions
 def get_db() -> Database:
     """Get database instance."""
@@ -50,3 +99,13 @@ def get_db() -> Database:
 def get_collection(name: str) -> Collection:
     """Get collection by name."""
     return MongoClientManager.get_collection(name)
+
+
+def get_async_db() -> AsyncIOMotorDatabase:
+    """Get async database instance."""
+    return AsyncMongoClientManager.get_db()
+
+
+def get_async_collection(name: str) -> AsyncIOMotorCollection:
+    """Get async collection by name."""
+    return AsyncMongoClientManager.get_collection(name)
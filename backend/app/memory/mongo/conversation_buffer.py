@@ -0,0 +1,118 @@
+"""NPC별 최근 short-term memory ring buffer (planning의 recent_conversation용)."""
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+
+# (memory_id, source, content)
+Entry = Tuple[str, str, str]
+
+
+class ConversationBuffer:
+    """
+    NPC별 최근 short-term memory를 최신순으로 capacity개까지 보관하는 in-process buffer.
+
+    buffer가 있는 NPC에는 insert 시 항목을 추가하고, 삭제/전환처럼 순서를 알 수 없는 변경은
+    해당 NPC buffer를 버립니다. buffer가 없으면 loader로 Mongo에서 다시 채우며, 채우는 도중
+    쓰기가 끼어들면(version 변경) 결과를 저장하지 않습니다. NPC 수는 LRU로 max_npcs개까지 유지합니다.
+    """
+
+    def __init__(self, capacity: int = 10, max_npcs: int = 10000):
+        self.capacity = capacity
+        self.max_npcs = max_npcs
+        self._buffers: "OrderedDict[str, deque]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _version_locked(self, npc_id: str) -> Tuple[int, int]:
+        return self._generation, self._versions.get(npc_id, 0)
+
+    def _bump_locked(self, npc_id: str) -> None:
+        self._versions[npc_id] = self._versions.get(npc_id, 0) + 1
+
+    def recent(self, npc_id: str, limit: int, loader: Callable[[int], List[Entry]]) -> List[Entry]:
+        """
+        최근 항목 최신순 조회 (buffer가 없거나 limit > capacity면 loader 사용).
+
+        Args:
+            npc_id: NPC ID
+            limit: 최대 항목 수
+            loader: limit을 받아 Mongo에서 최신순 항목을 읽는 함수
+        """
+        if not self.enabled or limit > self.capacity:
+            return loader(limit)
+
+        with self._lock:
+            buffer = self._buffers.get(npc_id)
+            if buffer is not None:
+                self._buffers.move_to_end(npc_id)
+                self._stats["hits"] += 1
+                return list(buffer)[:limit]
+            self._stats["misses"] += 1
+            version = self._version_locked(npc_id)
+
+        entries = loader(self.capacity)
+        self.fill(npc_id, entries, version)
+        return entries[:limit]
+
+    def version(self, npc_id: str) -> Tuple[int, int]:
+        """NPC buffer의 현재 version (Mongo 조회 전에 읽어 fill에 전달)."""
+        with self._lock:
+            return self._version_locked(npc_id)
+
+    def fill(self, npc_id: str, entries: List[Entry], version: Tuple[int, int]) -> None:
+        """
+        Mongo에서 읽은 최신순 항목(capacity개까지)으로 buffer 생성.
+
+        조회 전에 읽은 version이 바뀌었거나 이미 buffer가 있으면 저장하지 않습니다.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._version_locked(npc_id) == version and npc_id not in self._buffers:
+                self._buffers[npc_id] = deque(entries[:self.capacity], maxlen=self.capacity)
+                while len(self._buffers) > self.max_npcs:
+                    self._buffers.popitem(last=False)
+                    self._stats["evictions"] += 1
+
+    def append(self, npc_id: str, entry: Entry) -> None:
+        """새 short-term memory를 buffer 앞에 추가 (buffer가 없으면 version만 올림)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._bump_locked(npc_id)
+            buffer = self._buffers.get(npc_id)
+            if buffer is not None:
+                buffer.appendleft(entry)
+
+    def invalidate(self, npc_id: Optional[str] = None) -> None:
+        """NPC buffer 제거 (npc_id가 없으면 전체)."""
+        with self._lock:
+            if npc_id is None:
+                self._generation += 1
+                self._buffers.clear()
+            else:
+                self._bump_locked(npc_id)
+                self._buffers.pop(npc_id, None)
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "npcs": len(self._buffers),
+                "capacity": self.capacity,
+                "max_npcs": self.max_npcs,
+                **self._stats
+            }
+
+
+conversation_buffer = ConversationBuffer(
+    capacity=settings.conversation_buffer_size,
+    max_npcs=settings.conversation_buffer_max_npcs
+)
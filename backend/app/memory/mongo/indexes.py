@@ -0,0 +1,201 @@
+"""MongoDB index 선언 및 bootstrap."""
+import logging
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+from app.memory.mongo.client import get_collection
+
+logger = logging.getLogger(__name__)
+
+
+# collection별 index 선언 (app/memory/mongo/repository의 조회 패턴 기준)
+INDEX_SPECS: Dict[str, List[Dict[str, Any]]] = {
+    "npcs": [
+        {"name": "npc_id_unique", "keys": [("npc_id", ASCENDING)], "unique": True},
+        {"name": "world_id", "keys": [("world_id", ASCENDING)]},
+    ],
+    "persona_profiles": [
+        {"name": "persona_id_unique", "keys": [("persona_id", ASCENDING)], "unique": True},
+    ],
+    "persona_facts": [
+        {"name": "fact_id_unique", "keys": [("fact_id", ASCENDING)], "unique": True},
+        {"name": "persona_id_dimension", "keys": [("persona_id", ASCENDING), ("dimension", ASCENDING)]},
+        {"name": "npc_id_dimension", "keys": [("npc_id", ASCENDING), ("dimension", ASCENDING)]},
+    ],
+    "world_knowledge": [
+        {"name": "world_id_unique", "keys": [("world_id", ASCENDING)], "unique": True},
+    ],
+    "episodic_memory": [
+        {"name": "memory_id_unique", "keys": [("memory_id", ASCENDING)], "unique": True},
+        {
+            "name": "npc_id_memory_type_created_at_memory_id",
+            "keys": [
+                ("npc_id", ASCENDING), ("memory_type", ASCENDING),
+                ("created_at", DESCENDING), ("memory_id", DESCENDING)
+            ]
+        },
+        {
+            "name": "npc_id_created_at_memory_id",
+            "keys": [("npc_id", ASCENDING), ("created_at", DESCENDING), ("memory_id", DESCENDING)]
+        },
+        {"name": "expire_at_ttl", "keys": [("expire_at", ASCENDING)], "expire_after_seconds": 0},
+    ],
+    "inference_traces": [
+        {"name": "trace_id_unique", "keys": [("trace_id", ASCENDING)], "unique": True},
+        {
+            "name": "npc_id_created_at_trace_id",
+            "keys": [("npc_id", ASCENDING), ("created_at", DESCENDING), ("trace_id", DESCENDING)]
+        },
+        {"name": "turn_id_created_at", "keys": [("turn_id", ASCENDING), ("created_at", DESCENDING)]},
+        {"name": "expire_at_ttl", "keys": [("expire_at", ASCENDING)], "expire_after_seconds": 0},
+        # prompt segment sweep에서 segment 참조 여부 확인
+        {"name": "prompt_segment_ids", "keys": [("llm_prompt_compact.segment_ids", ASCENDING)]},
+    ],
+    "prompt_segments": [
+        {"name": "segment_id_unique", "keys": [("segment_id", ASCENDING)], "unique": True},
+    ],
+    "dynamic_tools": [
+        {"name": "tool_id_unique", "keys": [("tool_id", ASCENDING)], "unique": True},
+        {"name": "name_unique", "keys": [("name", ASCENDING)], "unique": True},
+    ],
+}
+
+
+class IndexManager:
+    """선언된 index를 멱등적으로 생성하고 상태/사용량을 보고."""
+
+    _status: Dict[str, Any] = {
+        "state": "pending",
+        "started_at": None,
+        "finished_at": None,
+        "created": [],
+        "errors": []
+    }
+    _lock = threading.Lock()
+
+    @staticmethod
+    def ensure_indexes() -> Dict[str, Any]:
+        """
+        INDEX_SPECS의 모든 index 생성 (이미 있으면 no-op).
+
+        index 하나가 실패해도(예: unique index 대상에 중복 데이터) 나머지는 계속 생성합니다.
+
+        Returns:
+            bootstrap 상태 딕셔너리
+        """
+        with IndexManager._lock:
+            status = IndexManager._status
+            status.update({
+                "state": "running",
+                "started_at": datetime.utcnow(),
+                "finished_at": None,
+                "created": [],
+                "errors": []
+            })
+
+            for collection_name, specs in INDEX_SPECS.items():
+                collection = get_collection(collection_name)
+                for spec in specs:
+                    options = {}
+                    if "expire_after_seconds" in spec:
+                        options["expireAfterSeconds"] = spec["expire_after_seconds"]
+                    try:
+                        collection.create_index(
+                            spec["keys"],
+                            name=spec["name"],
+                            unique=spec.get("unique", False),
+                            background=True,
+                            **options
+                        )
+                        status["created"].append(f"{collection_name}.{spec['name']}")
+                    except PyMongoError as e:
+                        logger.error(f"Failed to create index {collection_name}.{spec['name']}: {e}")
+                        status["errors"].append({
+                            "collection": collection_name,
+                            "index": spec["name"],
+                            "error": str(e)
+                        })
+
+            status["state"] = "failed" if status["errors"] else "done"
+            status["finished_at"] = datetime.utcnow()
+            logger.info(
+                f"Mongo index bootstrap {status['state']}: "
+                f"{len(status['created'])} ensured, {len(status['errors'])} failed"
+            )
+            return dict(status)
+
+    @staticmethod
+    def ensure_indexes_in_background() -> threading.Thread:
+        """ensure_indexes를 daemon thread에서 실행 (startup을 막지 않음)."""
+        thread = threading.Thread(target=IndexManager._run_safely, name="mongo-index-bootstrap", daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _run_safely() -> None:
+        try:
+            IndexManager.ensure_indexes()
+        except Exception as e:
+            logger.error(f"Mongo index bootstrap failed: {e}")
+            IndexManager._status.update({
+                "state": "failed",
+                "finished_at": datetime.utcnow(),
+                "errors": IndexManager._status["errors"] + [{"error": str(e)}]
+            })
+
+    @staticmethod
+    def get_status() -> Dict[str, Any]:
+        return dict(IndexManager._status)
+
+    @staticmethod
+    def _index_usage(collection) -> Optional[Dict[str, Dict[str, Any]]]:
+        """$indexStats로 index별 사용 횟수 조회 (지원하지 않으면 None)."""
+        try:
+            stats = collection.aggregate([{"$indexStats": {}}])
+            return {
+                stat["name"]: {
+                    "ops": int(stat.get("accesses", {}).get("ops", 0)),
+                    "since": stat.get("accesses", {}).get("since")
+                }
+                for stat in stats
+            }
+        except Exception:
+            return None
+
+    @staticmethod
+    def report() -> Dict[str, Any]:
+        """
+        collection별 선언/존재/누락 index와 사용량 보고.
+
+        Returns:
+            {"bootstrap": 상태, "collections": {name: {...}}}
+        """
+        collections = {}
+        for collection_name, specs in INDEX_SPECS.items():
+            collection = get_collection(collection_name)
+            existing = collection.index_information()
+            usage = IndexManager._index_usage(collection)
+            declared = [spec["name"] for spec in specs]
+
+            indexes = []
+            for name, info in existing.items():
+                indexes.append({
+                    "name": name,
+                    "keys": [[field, direction] for field, direction in info.get("key", [])],
+                    "unique": bool(info.get("unique", False)),
+                    "declared": name in declared,
+                    "usage": usage.get(name) if usage is not None else None
+                })
+
+            collections[collection_name] = {
+                "indexes": indexes,
+                "missing": [name for name in declared if name not in existing],
+                "usage_available": usage is not None
+            }
+
+        return {
+            "bootstrap": IndexManager.get_status(),
+            "collections": collections
+        }
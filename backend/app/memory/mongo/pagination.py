@@ -0,0 +1,90 @@
+"""Keyset(cursor) pagination 및 projection helper - (created_at, id) 내림차순 목록용."""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def encode_cursor(doc: Dict[str, Any], id_field: str) -> str:
+    """목록 마지막 문서의 (created_at, id)를 다음 페이지 cursor로 인코딩."""
+    payload = json.dumps([doc["created_at"].isoformat(), doc[id_field]])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """cursor를 (created_at, id)로 디코딩 (형식이 잘못되면 ValueError)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, doc_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(doc_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def keyset_filter(query: Dict[str, Any], cursor: Optional[str], id_field: str) -> Dict[str, Any]:
+    """(created_at, id) 내림차순 정렬에서 cursor 다음 문서만 조회하도록 query 확장."""
+    if not cursor:
+        return query
+    created_at, doc_id = decode_cursor(cursor)
+    return {
+        **query,
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, id_field: {"$lt": doc_id}}
+        ]
+    }
+
+
+def keyset_sort(id_field: str) -> List[Tuple[str, int]]:
+    return [("created_at", -1), (id_field, -1)]
+
+
+def parse_exclude(exclude: Optional[str], model: Type[BaseModel]) -> List[str]:
+    """
+    쉼표로 구분된 제외 필드 목록 검증.
+
+    응답 모델에 기본값이 있는 필드만 제외할 수 있습니다 (필수 필드는 ValueError).
+    """
+    if not exclude:
+        return []
+    fields = [field.strip() for field in exclude.split(",") if field.strip()]
+    invalid = [
+        field for field in fields
+        if field not in model.model_fields or model.model_fields[field].is_required() or field == "created_at"
+    ]
+    if invalid:
+        raise ValueError(f"Fields cannot be excluded: {', '.join(invalid)}")
+    return fields
+
+
+def exclusion_projection(fields: Iterable[str], extra: Iterable[str] = ()) -> Dict[str, int]:
+    """_id와 제외 필드를 뺀 projection."""
+    projection = {"_id": 0}
+    for field in list(fields) + list(extra):
+        projection[field] = 0
+    return projection
+
+
+def projected_response(
+    items: List[BaseModel],
+    exclude: List[str],
+    headers: Optional[Dict[str, str]] = None
+) -> Union[List[BaseModel], Response]:
+    """
+    제외 필드가 있으면 해당 필드를 뺀 JSON 응답 생성.
+
+    response_model로 직렬화하면 projection으로 빠진 필드가 모델 기본값으로 다시 채워지므로,
+    제외 요청이 있을 때는 직렬화를 직접 수행합니다 (없으면 items를 그대로 반환).
+    Response를 직접 반환하면 route의 Response 파라미터 header가 적용되지 않으므로 headers로 전달합니다.
+    """
+    if not exclude:
+        return items
+    fields = set(exclude)
+    return Response(
+        content=orjson.dumps([item.model_dump(mode="json", exclude=fields) for item in items]),
+        media_type="application/json",
+        headers=headers
+    )
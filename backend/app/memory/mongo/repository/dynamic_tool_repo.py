@@ -2,7 +2,7 @@
 from typing import Optional, List
 from datetime import datetime
 import uuid
-from app.memory.mongo.client import get_collection
+from app.memory.mongo.client import get_collection, get_async_collection
 from app.schemas.tool import DynamicTool, DynamicToolCreate, DynamicToolUpdate
 
 
@@ -14,8 +14,8 @@ class DynamicToolRepository:
         return get_collection("dynamic_tools")
     
     @staticmethod
-    def create_tool(tool_data: DynamicToolCreate) -> DynamicTool:
-        """동적 도구 생성."""
+    def _build_tool_doc(tool_data: DynamicToolCreate) -> dict:
+        """DynamicToolCreate에서 저장할 문서 생성."""
         tool_id = f"tool_{uuid.uuid4().hex[:8]}"
         now = datetime.utcnow()
         
@@ -28,6 +28,24 @@ class DynamicToolRepository:
             "created_at": now,
             "updated_at": now
         }
+        return tool_doc
+    
+    @staticmethod
+    def _build_update_dict(updates: DynamicToolUpdate) -> dict:
+        """DynamicToolUpdate에서 $set 대상 필드 추출."""
+        update_dict = {}
+        if updates.description is not None:
+            update_dict["description"] = updates.description
+        if updates.parameters_schema is not None:
+            update_dict["parameters_schema"] = updates.parameters_schema
+        if updates.code is not None:
+            update_dict["code"] = updates.code
+        return update_dict
+    
+    @staticmethod
+    def create_tool(tool_data: DynamicToolCreate) -> DynamicTool:
+        """동적 도구 생성."""
+        tool_doc = DynamicToolRepository._build_tool_doc(tool_data)
         
         collection = DynamicToolRepository._get_collection()
         collection.insert_one(tool_doc)
@@ -81,13 +99,7 @@ class DynamicToolRepository:
         """동적 도구 업데이트."""
         collection = DynamicToolRepository._get_collection()
         
-        update_dict = {}
-        if updates.description is not None:
-            update_dict["description"] = updates.description
-        if updates.parameters_schema is not None:
-            update_dict["parameters_schema"] = updates.parameters_schema
-        if updates.code is not None:
-            update_dict["code"] = updates.code
+        update_dict = DynamicToolRepository._build_update_dict(updates)
         
         if not update_dict:
             return DynamicToolRepository.get_tool_by_id(tool_id)
@@ -110,3 +122,71 @@ class DynamicToolRepository:
         collection = DynamicToolRepository._get_collection()
         result = collection.delete_one({"tool_id": tool_id})
         return result.deleted_count > 0
+
+
+class AsyncDynamicToolRepository:
+    """동적 도구 async 저장소 (Motor)."""
+    
+    @staticmethod
+    def _get_collection():
+        return get_async_collection("dynamic_tools")
+    
+    @staticmethod
+    async def create_tool(tool_data: DynamicToolCreate) -> DynamicTool:
+        """동적 도구 생성."""
+        tool_doc = DynamicToolRepository._build_tool_doc(tool_data)
+        
+        collection = AsyncDynamicToolRepository._get_collection()
+        await collection.insert_one(tool_doc)
+        
+        tool_doc.pop("_id", None)
+        return DynamicTool(**tool_doc)
+    
+    @staticmethod
+    async def get_tool_by_id(tool_id: str) -> Optional[DynamicTool]:
+        """ID로 도구 조회."""
+        collection = AsyncDynamicToolRepository._get_collection()
+        doc = await collection.find_one({"tool_id": tool_id}, {"_id": 0})
+        return DynamicTool(**doc) if doc is not None else None
+    
+    @staticmethod
+    async def get_tool_by_name(name: str) -> Optional[DynamicTool]:
+        """이름으로 도구 조회."""
+        collection = AsyncDynamicToolRepository._get_collection()
+        doc = await collection.find_one({"name": name}, {"_id": 0})
+        return DynamicTool(**doc) if doc is not None else None
+    
+    @staticmethod
+    async def list_tools(limit: int = 100) -> List[DynamicTool]:
+        """모든 동적 도구 목록 조회."""
+        collection = AsyncDynamicToolRepository._get_collection()
+        docs = await collection.find({}, {"_id": 0}).limit(limit).to_list(length=limit)
+        return [DynamicTool(**doc) for doc in docs]
+    
+    @staticmethod
+    async def update_tool(tool_id: str, updates: DynamicToolUpdate) -> Optional[DynamicTool]:
+        """동적 도구 업데이트."""
+        update_dict = DynamicToolRepository._build_update_dict(updates)
+        
+        if not update_dict:
+            return await AsyncDynamicToolRepository.get_tool_by_id(tool_id)
+        
+        update_dict["updated_at"] = datetime.utcnow()
+        
+        collection = AsyncDynamicToolRepository._get_collection()
+        result = await collection.update_one(
+            {"tool_id": tool_id},
+            {"$set": update_dict}
+        )
+        
+        if result.matched_count == 0:
+            return None
+        
+        return await AsyncDynamicToolRepository.get_tool_by_id(tool_id)
+    
+    @staticmethod
+    async def delete_tool(tool_id: str) -> bool:
+        """동적 도구 삭제."""
+        collection = AsyncDynamicToolRepository._get_collection()
+        result = await collection.delete_one({"tool_id": tool_id})
+        return result.deleted_count > 0
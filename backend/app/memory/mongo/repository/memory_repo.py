@@ -1,8 +1,15 @@
 """Memory repository - importance 기반 전환 포함 CRUD 작업."""
-from typing import List, Optional
+import asyncio
+from typing import List, Optional, Tuple, AsyncIterator
 from datetime import datetime
 import uuid
-from app.memory.mongo.client import get_collection
+from pymongo import ReturnDocument
+from app.memory.mongo.client import get_collection, get_async_collection
+from app.memory.mongo.conversation_buffer import conversation_buffer
+from app.memory.mongo.write_buffer import write_buffer
+from app.memory.mongo.pagination import encode_cursor, exclusion_projection, keyset_filter, keyset_sort
+from app.services.retention import expire_at
+from app.core.config import settings
 from app.schemas.memory import EpisodicMemory, MemoryCreate, LONG_TERM_THRESHOLD
 
 
@@ -14,8 +21,12 @@ class MemoryRepository:
         return get_collection("episodic_memory")
     
     @staticmethod
-    def insert_memory(memory_data: MemoryCreate, importance_threshold: float = None) -> EpisodicMemory:
-        """Memory 삽입 (importance >= threshold면 long_term으로 자동 전환)."""
+    def _build_memory_doc(
+        memory_data: MemoryCreate,
+        importance_threshold: float = None,
+        retention_days: Optional[float] = None
+    ) -> dict:
+        """MemoryCreate에서 저장할 문서 생성 (importance >= threshold면 long_term, short_term은 retention에 따라 expire_at)."""
         memory_id = f"mem_{uuid.uuid4().hex[:8]}"
         now = datetime.utcnow()
         
@@ -35,23 +46,104 @@ class MemoryRepository:
             "created_at": now
         }
         
+        if memory_type == "short_term":
+            expires = expire_at(now, retention_days)
+            if expires is not None:
+                memory_doc["expire_at"] = expires
+        
+        return memory_doc
+    
+    @staticmethod
+    def _buffer_short_term(memory_doc: dict) -> None:
+        """short_term memory를 NPC conversation buffer에 추가."""
+        if memory_doc["memory_type"] == "short_term":
+            conversation_buffer.append(
+                memory_doc["npc_id"],
+                (memory_doc["memory_id"], memory_doc["source"], memory_doc["content"])
+            )
+    
+    @staticmethod
+    def _vectorize_long_term(memory_doc: dict, dedup: bool = True) -> Optional[dict]:
+        """
+        long_term memory를 episodic FAISS index에 추가 (실패 시 경고만).
+        
+        dedup이면 같은 NPC의 최근 memory와 거의 같을 때 새 vector를 추가하지 않고 그 memory의
+        vector metadata에 병합한 뒤 병합 정보({"memory_id", "importance", ...})를 반환합니다.
+        """
+        try:
+            from app.memory.vector.vectorizer import Vectorizer
+            vectorizer = Vectorizer('episodic')
+            return vectorizer.vectorize_or_merge_episodic_memory(
+                memory_id=memory_doc["memory_id"],
+                npc_id=memory_doc["npc_id"],
+                content=memory_doc["content"],
+                importance=memory_doc["importance"],
+                created_at=memory_doc["created_at"].isoformat(),
+                threshold=settings.memory_dedup_threshold,
+                window=settings.memory_dedup_window if dedup else 0,
+                importance_boost=settings.memory_dedup_importance_boost
+            )
+        except Exception as e:
+            import logging
+            logging.warning(f"Failed to vectorize memory {memory_doc['memory_id']}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _merge_update(duplicate: dict, memory_doc: dict) -> dict:
+        """새 memory를 거의 같은 기존 memory에 병합하는 update (repeat_count, importance, last_seen_at, tag 갱신)."""
+        return {
+            "$set": {"importance": duplicate["importance"], "last_seen_at": memory_doc["created_at"]},
+            "$inc": {"repeat_count": 1},
+            "$addToSet": {
+                "tags": {"$each": memory_doc["tags"]},
+                "linked_entities": {"$each": memory_doc["linked_entities"]}
+            }
+        }
+    
+    @staticmethod
+    def _merge_into(duplicate: dict, memory_doc: dict) -> Optional[EpisodicMemory]:
+        """기존 memory 문서에 병합 (아직 write buffer에 있으면 flush 후 재시도, 문서가 없으면 None)."""
         collection = MemoryRepository._get_collection()
-        collection.insert_one(memory_doc)
-        
-        if memory_type == "long_term":
-            try:
-                from app.memory.vector.vectorizer import Vectorizer
-                vectorizer = Vectorizer('episodic')
-                vectorizer.vectorize_episodic_memory(
-                    memory_id=memory_id,
-                    npc_id=memory_data.npc_id,
-                    content=memory_data.content,
-                    importance=memory_data.importance,
-                    created_at=now.isoformat()
-                )
-            except Exception as e:
-                import logging
-                logging.warning(f"Failed to vectorize memory {memory_id}: {str(e)}")
+        update = MemoryRepository._merge_update(duplicate, memory_doc)
+        for attempt in range(2):
+            doc = collection.find_one_and_update(
+                {"memory_id": duplicate["memory_id"]},
+                update,
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER
+            )
+            if doc is not None:
+                return EpisodicMemory(**doc)
+            if attempt == 0:
+                write_buffer.flush("episodic_memory")
+        return None
+    
+    @staticmethod
+    def insert_memory(
+        memory_data: MemoryCreate,
+        importance_threshold: float = None,
+        retention_days: Optional[float] = None
+    ) -> EpisodicMemory:
+        """
+        Memory 삽입 (importance >= threshold면 long_term으로 자동 전환).
+        
+        long_term memory가 같은 NPC의 최근 memory와 거의 같으면(cosine >= MEMORY_DEDUP_THRESHOLD) 새 문서와
+        vector를 만들지 않고 기존 memory에 병합하여 반환합니다.
+        write buffer가 켜져 있으면 insert_many 배치로 모아서 저장합니다.
+        """
+        memory_doc = MemoryRepository._build_memory_doc(memory_data, importance_threshold, retention_days)
+        
+        if memory_doc["memory_type"] == "long_term":
+            duplicate = MemoryRepository._vectorize_long_term(memory_doc)
+            if duplicate is not None:
+                merged = MemoryRepository._merge_into(duplicate, memory_doc)
+                if merged is not None:
+                    return merged
+                # 병합 대상 memory가 이미 삭제됨 (남은 vector는 cascade delete job이 정리)
+                MemoryRepository._vectorize_long_term(memory_doc, dedup=False)
+        
+        write_buffer.add("episodic_memory", dict(memory_doc))
+        MemoryRepository._buffer_short_term(memory_doc)
         
         return EpisodicMemory(**memory_doc)
     
@@ -88,6 +180,31 @@ class MemoryRepository:
         
         return memories
     
+    @staticmethod
+    def _load_recent_short_term(npc_id: str, limit: int) -> List[Tuple[str, str, str]]:
+        """최근 short-term memory의 (memory_id, source, content)만 조회 (projection)."""
+        write_buffer.flush("episodic_memory")
+        collection = MemoryRepository._get_collection()
+        docs = collection.find(
+            {"npc_id": npc_id, "memory_type": "short_term"},
+            {"_id": 0, "memory_id": 1, "source": 1, "content": 1}
+        ).sort("created_at", -1).limit(limit)
+        return [(doc["memory_id"], doc["source"], doc["content"]) for doc in docs]
+    
+    @staticmethod
+    def get_recent_conversation(npc_id: str, limit: int = 10) -> List[str]:
+        """
+        최근 short-term memory limit개 중 observation 내용만 최신순으로 반환.
+        
+        hot NPC는 conversation buffer에서 바로 읽고, buffer가 없을 때만 Mongo를 조회합니다.
+        """
+        entries = conversation_buffer.recent(
+            npc_id,
+            limit,
+            lambda n: MemoryRepository._load_recent_short_term(npc_id, n)
+        )
+        return [content for _, source, content in entries if source == "observation"]
+    
     @staticmethod
     def get_short_term_memories(npc_id: str, limit: int = 50) -> List[EpisodicMemory]:
         """최근 short-term memory만 조회."""
@@ -102,22 +219,28 @@ class MemoryRepository:
     def convert_to_long_term(memory_id: str) -> Optional[EpisodicMemory]:
         """Memory를 수동으로 long-term으로 전환."""
         collection = MemoryRepository._get_collection()
-        result = collection.update_one(
+        doc = collection.find_one_and_update(
             {"memory_id": memory_id},
-            {"$set": {"memory_type": "long_term"}}
+            {"$set": {"memory_type": "long_term"}, "$unset": {"expire_at": ""}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.matched_count == 0:
+        if doc is None:
             return None
         
-        return MemoryRepository.get_memory_by_id(memory_id)
+        conversation_buffer.invalidate(doc["npc_id"])
+        return EpisodicMemory(**doc)
     
     @staticmethod
     def delete_memory(memory_id: str) -> bool:
         """Memory 삭제."""
         collection = MemoryRepository._get_collection()
-        result = collection.delete_one({"memory_id": memory_id})
-        return result.deleted_count > 0
+        doc = collection.find_one_and_delete({"memory_id": memory_id}, projection={"_id": 0, "npc_id": 1})
+        if doc is None:
+            return False
+        conversation_buffer.invalidate(doc["npc_id"])
+        return True
     
     @staticmethod
     def delete_memories_by_npc(npc_id: str, memory_type: Optional[str] = None) -> int:
@@ -127,4 +250,163 @@ class MemoryRepository:
         if memory_type:
             query["memory_type"] = memory_type
         result = collection.delete_many(query)
+        conversation_buffer.invalidate(npc_id)
+        return result.deleted_count
+
+
+class AsyncMemoryRepository:
+    """Episodic memory 작업 async repository (Motor)."""
+    
+    @staticmethod
+    def _get_collection():
+        return get_async_collection("episodic_memory")
+    
+    @staticmethod
+    async def insert_memory(
+        memory_data: MemoryCreate,
+        importance_threshold: float = None,
+        retention_days: Optional[float] = None
+    ) -> EpisodicMemory:
+        """Memory 삽입 (long_term vectorization과 중복 병합 판단은 worker thread에서 실행)."""
+        memory_doc = MemoryRepository._build_memory_doc(memory_data, importance_threshold, retention_days)
+        collection = AsyncMemoryRepository._get_collection()
+        
+        if memory_doc["memory_type"] == "long_term":
+            duplicate = await asyncio.to_thread(MemoryRepository._vectorize_long_term, memory_doc)
+            if duplicate is not None:
+                update = MemoryRepository._merge_update(duplicate, memory_doc)
+                for attempt in range(2):
+                    doc = await collection.find_one_and_update(
+                        {"memory_id": duplicate["memory_id"]},
+                        update,
+                        projection={"_id": 0},
+                        return_document=ReturnDocument.AFTER
+                    )
+                    if doc is not None:
+                        return EpisodicMemory(**doc)
+                    if attempt == 0:
+                        await asyncio.to_thread(write_buffer.flush, "episodic_memory")
+                await asyncio.to_thread(MemoryRepository._vectorize_long_term, memory_doc, False)
+        
+        await collection.insert_one(memory_doc)
+        memory_doc.pop("_id", None)
+        MemoryRepository._buffer_short_term(memory_doc)
+        
+        return EpisodicMemory(**memory_doc)
+    
+    @staticmethod
+    async def get_memory_by_id(memory_id: str) -> Optional[EpisodicMemory]:
+        """ID로 memory 조회."""
+        collection = AsyncMemoryRepository._get_collection()
+        doc = await collection.find_one({"memory_id": memory_id}, {"_id": 0})
+        
+        if doc is None:
+            return None
+        
+        return EpisodicMemory(**doc)
+    
+    @staticmethod
+    async def get_recent_memories(npc_id: str, limit: int = 50, memory_type: Optional[str] = None) -> List[EpisodicMemory]:
+        """NPC 최근 memory 조회 (memory_type이 None이면 모두 반환)."""
+        collection = AsyncMemoryRepository._get_collection()
+        
+        query = {"npc_id": npc_id}
+        if memory_type:
+            query["memory_type"] = memory_type
+        
+        docs = await collection.find(query, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(length=limit)
+        return [EpisodicMemory(**doc) for doc in docs]
+    
+    @staticmethod
+    async def get_memories_page(
+        npc_id: str,
+        limit: int = 50,
+        memory_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        exclude: Optional[List[str]] = None
+    ) -> Tuple[List[EpisodicMemory], Optional[str]]:
+        """
+        NPC memory 한 페이지 조회 ((created_at, memory_id) 내림차순 keyset pagination).
+        
+        Returns:
+            (memory 목록, 다음 페이지 cursor - 마지막 페이지면 None)
+        """
+        collection = AsyncMemoryRepository._get_collection()
+        query = {"npc_id": npc_id}
+        if memory_type:
+            query["memory_type"] = memory_type
+        query = keyset_filter(query, cursor, "memory_id")
+        
+        docs = await collection.find(query, exclusion_projection(exclude or [])).sort(
+            keyset_sort("memory_id")
+        ).limit(limit).to_list(length=limit)
+        
+        next_cursor = encode_cursor(docs[-1], "memory_id") if len(docs) == limit else None
+        return [EpisodicMemory(**doc) for doc in docs], next_cursor
+    
+    @staticmethod
+    async def iter_memories(
+        npc_id: str,
+        memory_type: Optional[str] = None,
+        exclude: Optional[List[str]] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[dict]:
+        """NPC memory 전체를 최신순으로 조회 (export용)."""
+        collection = AsyncMemoryRepository._get_collection()
+        query = {"npc_id": npc_id}
+        if memory_type:
+            query["memory_type"] = memory_type
+        
+        cursor = collection.find(query, exclusion_projection(exclude or [])).sort(
+            keyset_sort("memory_id")
+        ).batch_size(batch_size)
+        async for doc in cursor:
+            yield doc
+    
+    @staticmethod
+    async def get_short_term_memories(npc_id: str, limit: int = 50) -> List[EpisodicMemory]:
+        """최근 short-term memory만 조회."""
+        return await AsyncMemoryRepository.get_recent_memories(npc_id, limit, memory_type="short_term")
+    
+    @staticmethod
+    async def get_long_term_memories(npc_id: str, limit: int = 50) -> List[EpisodicMemory]:
+        """최근 long-term memory만 조회."""
+        return await AsyncMemoryRepository.get_recent_memories(npc_id, limit, memory_type="long_term")
+    
+    @staticmethod
+    async def convert_to_long_term(memory_id: str) -> Optional[EpisodicMemory]:
+        """Memory를 수동으로 long-term으로 전환."""
+        collection = AsyncMemoryRepository._get_collection()
+        doc = await collection.find_one_and_update(
+            {"memory_id": memory_id},
+            {"$set": {"memory_type": "long_term"}, "$unset": {"expire_at": ""}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+        
+        if doc is None:
+            return None
+        
+        conversation_buffer.invalidate(doc["npc_id"])
+        return EpisodicMemory(**doc)
+    
+    @staticmethod
+    async def delete_memory(memory_id: str) -> bool:
+        """Memory 삭제."""
+        collection = AsyncMemoryRepository._get_collection()
+        doc = await collection.find_one_and_delete({"memory_id": memory_id}, projection={"_id": 0, "npc_id": 1})
+        if doc is None:
+            return False
+        conversation_buffer.invalidate(doc["npc_id"])
+        return True
+    
+    @staticmethod
+    async def delete_memories_by_npc(npc_id: str, memory_type: Optional[str] = None) -> int:
+        """NPC의 모든 memory 삭제 (memory_type이 지정되면 해당 타입만)."""
+        collection = AsyncMemoryRepository._get_collection()
+        query = {"npc_id": npc_id}
+        if memory_type:
+            query["memory_type"] = memory_type
+        result = await collection.delete_many(query)
+        conversation_buffer.invalidate(npc_id)
         return result.deleted_count
@@ -2,7 +2,8 @@
 from typing import Optional
 from datetime import datetime
 import uuid
-from app.memory.mongo.client import get_collection
+from app.memory.mongo.client import get_collection, get_async_collection
+from app.memory.mongo.cache import entity_cache
 from app.schemas.npc import NPC, NPCCreate
 
 
@@ -14,8 +15,8 @@ class NPCRepository:
         return get_collection("npcs")
     
     @staticmethod
-    def create_npc(npc_data: NPCCreate) -> NPC:
-        """NPC 생성."""
+    def _build_npc_doc(npc_data: NPCCreate) -> dict:
+        """NPCCreate에서 저장할 문서 생성."""
         npc_id = f"npc_{uuid.uuid4().hex[:8]}"
         now = datetime.utcnow()
         
@@ -35,6 +36,12 @@ class NPCRepository:
             "created_at": now,
             "updated_at": now
         }
+        return npc_doc
+    
+    @staticmethod
+    def create_npc(npc_data: NPCCreate) -> NPC:
+        """NPC 생성."""
+        npc_doc = NPCRepository._build_npc_doc(npc_data)
         
         collection = NPCRepository._get_collection()
         collection.insert_one(npc_doc)
@@ -43,7 +50,11 @@ class NPCRepository:
     
     @staticmethod
     def get_npc_by_id(npc_id: str) -> Optional[NPC]:
-        """ID로 NPC 조회."""
+        """ID로 NPC 조회 (entity cache read-through)."""
+        return entity_cache.get_or_load("npc", npc_id, lambda: NPCRepository._load_npc(npc_id))
+    
+    @staticmethod
+    def _load_npc(npc_id: str) -> Optional[NPC]:
         collection = NPCRepository._get_collection()
         doc = collection.find_one({"npc_id": npc_id})
         
@@ -68,6 +79,7 @@ class NPCRepository:
                 }
             }
         )
+        entity_cache.invalidate("npc", npc_id)
         
         if result.matched_count == 0:
             return None
@@ -93,6 +105,7 @@ class NPCRepository:
         """NPC 삭제."""
         collection = NPCRepository._get_collection()
         result = collection.delete_one({"npc_id": npc_id})
+        entity_cache.invalidate("npc", npc_id)
         return result.deleted_count > 0
     
     @staticmethod
@@ -108,6 +121,7 @@ class NPCRepository:
                 }
             }
         )
+        entity_cache.invalidate("npc", npc_id)
         
         if result.matched_count == 0:
             return None
@@ -123,6 +137,7 @@ class NPCRepository:
             {"npc_id": npc_id},
             {"$set": updates}
         )
+        entity_cache.invalidate("npc", npc_id)
         
         if result.matched_count == 0:
             return None
@@ -148,4 +163,101 @@ class NPCRepository:
         """World ID로 모든 NPC 삭제."""
         collection = NPCRepository._get_collection()
         result = collection.delete_many({"world_id": world_id})
+        entity_cache.invalidate_kind("npc")
+        return result.deleted_count
+
+
+class AsyncNPCRepository:
+    """NPC 작업 async repository (Motor)."""
+    
+    @staticmethod
+    def _get_collection():
+        return get_async_collection("npcs")
+    
+    @staticmethod
+    async def create_npc(npc_data: NPCCreate) -> NPC:
+        """NPC 생성."""
+        npc_doc = NPCRepository._build_npc_doc(npc_data)
+        
+        collection = AsyncNPCRepository._get_collection()
+        await collection.insert_one(npc_doc)
+        
+        npc_doc.pop("_id", None)
+        return NPC(**npc_doc)
+    
+    @staticmethod
+    async def get_npc_by_id(npc_id: str) -> Optional[NPC]:
+        """ID로 NPC 조회 (entity cache read-through)."""
+        return await entity_cache.get_or_load_async("npc", npc_id, lambda: AsyncNPCRepository._load_npc(npc_id))
+    
+    @staticmethod
+    async def _load_npc(npc_id: str) -> Optional[NPC]:
+        collection = AsyncNPCRepository._get_collection()
+        doc = await collection.find_one({"npc_id": npc_id}, {"_id": 0})
+        
+        if doc is None:
+            return None
+        
+        return NPC(**doc)
+    
+    @staticmethod
+    async def list_npcs(limit: int = 100) -> list[NPC]:
+        """모든 NPC 목록 조회."""
+        collection = AsyncNPCRepository._get_collection()
+        docs = await collection.find({}, {"_id": 0}).limit(limit).to_list(length=limit)
+        return [NPC(**doc) for doc in docs]
+    
+    @staticmethod
+    async def get_npcs_by_world(world_id: str, limit: int = 100) -> list[NPC]:
+        """World ID로 NPC 목록 조회."""
+        collection = AsyncNPCRepository._get_collection()
+        docs = await collection.find({"world_id": world_id}, {"_id": 0}).limit(limit).to_list(length=limit)
+        return [NPC(**doc) for doc in docs]
+    
+    @staticmethod
+    async def get_npc_ids_by_world(world_id: str) -> list[str]:
+        """World에 속한 모든 NPC ID 조회 (projection, 개수 제한 없음)."""
+        collection = AsyncNPCRepository._get_collection()
+        return [doc["npc_id"] async for doc in collection.find({"world_id": world_id}, {"_id": 0, "npc_id": 1})]
+    
+    @staticmethod
+    async def update_npc_state(npc_id: str, new_state: dict) -> Optional[NPC]:
+        """NPC current_state 업데이트."""
+        return await AsyncNPCRepository.update_npc(npc_id, {"current_state": new_state})
+    
+    @staticmethod
+    async def update_npc_config(npc_id: str, config: dict) -> Optional[NPC]:
+        """NPC config 업데이트."""
+        return await AsyncNPCRepository.update_npc(npc_id, {"config": config})
+    
+    @staticmethod
+    async def update_npc(npc_id: str, updates: dict) -> Optional[NPC]:
+        """NPC 전체 업데이트 (config, current_state 등)."""
+        collection = AsyncNPCRepository._get_collection()
+        updates["updated_at"] = datetime.utcnow()
+        result = await collection.update_one(
+            {"npc_id": npc_id},
+            {"$set": updates}
+        )
+        entity_cache.invalidate("npc", npc_id)
+        
+        if result.matched_count == 0:
+            return None
+        
+        return await AsyncNPCRepository.get_npc_by_id(npc_id)
+    
+    @staticmethod
+    async def delete_npc(npc_id: str) -> bool:
+        """NPC 삭제."""
+        collection = AsyncNPCRepository._get_collection()
+        result = await collection.delete_one({"npc_id": npc_id})
+        entity_cache.invalidate("npc", npc_id)
+        return result.deleted_count > 0
+    
+    @staticmethod
+    async def delete_npcs_by_world(world_id: str) -> int:
+        """World ID로 모든 NPC 삭제."""
+        collection = AsyncNPCRepository._get_collection()
+        result = await collection.delete_many({"world_id": world_id})
+        entity_cache.invalidate_kind("npc")
         return result.deleted_count
@@ -2,7 +2,8 @@
 from typing import Optional, List
 import uuid
 from datetime import datetime
-from app.memory.mongo.client import get_collection
+from app.memory.mongo.client import get_collection, get_async_collection
+from app.memory.mongo.cache import entity_cache, invalidate_fact_lists
 from app.schemas.persona import (
     PersonaProfile, PersonaCreate,
     PersonaFact, PersonaFactCreate, PersonaFactUpdate, PersonaFactDimension
@@ -17,8 +18,8 @@ class PersonaRepository:
         return get_collection("persona_profiles")
     
     @staticmethod
-    def create_persona(persona_data: PersonaCreate) -> PersonaProfile:
-        """Persona profile 생성."""
+    def _build_persona_doc(persona_data: PersonaCreate) -> dict:
+        """PersonaCreate에서 저장할 문서 생성."""
         persona_id = persona_data.persona_id or f"persona_{uuid.uuid4().hex[:8]}"
         
         persona_doc = {
@@ -32,6 +33,12 @@ class PersonaRepository:
             "relationships": persona_data.relationships,
             "constraints": persona_data.constraints
         }
+        return persona_doc
+    
+    @staticmethod
+    def create_persona(persona_data: PersonaCreate) -> PersonaProfile:
+        """Persona profile 생성."""
+        persona_doc = PersonaRepository._build_persona_doc(persona_data)
         
         collection = PersonaRepository._get_collection()
         collection.insert_one(persona_doc)
@@ -40,7 +47,11 @@ class PersonaRepository:
     
     @staticmethod
     def get_persona_by_id(persona_id: str) -> Optional[PersonaProfile]:
-        """ID로 persona 조회."""
+        """ID로 persona 조회 (entity cache read-through)."""
+        return entity_cache.get_or_load("persona", persona_id, lambda: PersonaRepository._load_persona(persona_id))
+    
+    @staticmethod
+    def _load_persona(persona_id: str) -> Optional[PersonaProfile]:
         collection = PersonaRepository._get_collection()
         doc = collection.find_one({"persona_id": persona_id})
         
@@ -60,6 +71,7 @@ class PersonaRepository:
             {"persona_id": persona_id},
             {"$set": update_data}
         )
+        entity_cache.invalidate("persona", persona_id)
         
         if result.matched_count == 0:
             return None
@@ -75,11 +87,11 @@ class PersonaFactRepository:
         return get_collection("persona_facts")
     
     @staticmethod
-    def create_fact(fact_data: PersonaFactCreate) -> PersonaFact:
-        """Persona fact 생성."""
+    def _build_fact_doc(fact_data: PersonaFactCreate) -> dict:
+        """PersonaFactCreate에서 저장할 문서 생성."""
         fact_id = f"fact_{uuid.uuid4().hex[:8]}"
         
-        fact_doc = {
+        return {
             "fact_id": fact_id,
             "persona_id": fact_data.persona_id,
             "npc_id": fact_data.npc_id,
@@ -89,32 +101,44 @@ class PersonaFactRepository:
             "is_static": fact_data.is_static,
             "created_at": datetime.utcnow()
         }
+    
+    @staticmethod
+    def _parse_fact_doc(doc: dict) -> Optional[PersonaFact]:
+        """Mongo 문서를 PersonaFact로 변환 (알 수 없는 dimension이면 None)."""
+        doc.pop("_id", None)
+        if isinstance(doc.get("dimension"), str):
+            try:
+                doc["dimension"] = PersonaFactDimension(doc["dimension"])
+            except ValueError:
+                return None
+        return PersonaFact(**doc)
+    
+    @staticmethod
+    def _invalidate_lists_for(fact_docs: List[dict]) -> None:
+        """변경된 fact 문서들이 속한 persona/NPC의 fact 목록 캐시 invalidate."""
+        for persona_id, npc_id in {(doc.get("persona_id"), doc.get("npc_id")) for doc in fact_docs}:
+            invalidate_fact_lists(persona_id, npc_id)
+    
+    @staticmethod
+    def create_fact(fact_data: PersonaFactCreate) -> PersonaFact:
+        """Persona fact 생성."""
+        fact_doc = PersonaFactRepository._build_fact_doc(fact_data)
         
         collection = PersonaFactRepository._get_collection()
         collection.insert_one(fact_doc)
+        invalidate_fact_lists(fact_doc["persona_id"], fact_doc["npc_id"])
         
         return PersonaFact(**fact_doc)
     
     @staticmethod
     def create_facts_bulk(facts_data: List[PersonaFactCreate]) -> List[PersonaFact]:
         """여러 persona facts를 한 번에 생성."""
-        fact_docs = []
-        for fact_data in facts_data:
-            fact_id = f"fact_{uuid.uuid4().hex[:8]}"
-            fact_docs.append({
-                "fact_id": fact_id,
-                "persona_id": fact_data.persona_id,
-                "npc_id": fact_data.npc_id,
-                "dimension": fact_data.dimension.value,
-                "content": fact_data.content,
-                "source": fact_data.source,
-                "is_static": fact_data.is_static,
-                "created_at": datetime.utcnow()
-            })
+        fact_docs = [PersonaFactRepository._build_fact_doc(fact_data) for fact_data in facts_data]
         
         collection = PersonaFactRepository._get_collection()
         if fact_docs:
             collection.insert_many(fact_docs)
+        PersonaFactRepository._invalidate_lists_for(fact_docs)
         
         return [PersonaFact(**doc) for doc in fact_docs]
     
@@ -139,15 +163,23 @@ class PersonaFactRepository:
         
         return PersonaFact(**doc)
     
+    @staticmethod
+    def _filter_dimension(facts: List[PersonaFact], dimension: Optional[PersonaFactDimension]) -> List[PersonaFact]:
+        if dimension is None:
+            return facts
+        return [fact for fact in facts if fact.dimension == dimension]
+    
     @staticmethod
     def get_facts_by_persona(persona_id: str, dimension: Optional[PersonaFactDimension] = None) -> List[PersonaFact]:
-        """Persona ID로 facts 조회."""
+        """Persona ID로 facts 조회 (전체 목록을 entity cache에 두고 dimension은 메모리에서 필터)."""
+        facts = entity_cache.get_or_load(
+            "facts_by_persona", persona_id, lambda: PersonaFactRepository._load_facts({"persona_id": persona_id})
+        )
+        return PersonaFactRepository._filter_dimension(facts, dimension)
+    
+    @staticmethod
+    def _load_facts(query: dict) -> List[PersonaFact]:
         collection = PersonaFactRepository._get_collection()
-        query = {"persona_id": persona_id}
-        
-        if dimension:
-            query["dimension"] = dimension.value
-        
         docs = list(collection.find(query))
         
         facts = []
@@ -168,30 +200,11 @@ class PersonaFactRepository:
     
     @staticmethod
     def get_facts_by_npc(npc_id: str, dimension: Optional[PersonaFactDimension] = None) -> List[PersonaFact]:
-        """NPC ID로 facts 조회."""
-        collection = PersonaFactRepository._get_collection()
-        query = {"npc_id": npc_id}
-        
-        if dimension:
-            query["dimension"] = dimension.value
-        
-        docs = list(collection.find(query))
-        
-        facts = []
-        for doc in docs:
-            if "_id" in doc:
-                del doc["_id"]
-            
-            # dimension을 enum으로 변환
-            if isinstance(doc.get("dimension"), str):
-                try:
-                    doc["dimension"] = PersonaFactDimension(doc["dimension"])
-                except ValueError:
-                    continue
-            
-            facts.append(PersonaFact(**doc))
-        
-        return facts
+        """NPC ID로 facts 조회 (전체 목록을 entity cache에 두고 dimension은 메모리에서 필터)."""
+        facts = entity_cache.get_or_load(
+            "facts_by_npc", npc_id, lambda: PersonaFactRepository._load_facts({"npc_id": npc_id})
+        )
+        return PersonaFactRepository._filter_dimension(facts, dimension)
     
     @staticmethod
     def update_fact(fact_id: str, update_data: PersonaFactUpdate) -> Optional[PersonaFact]:
@@ -209,25 +222,196 @@ class PersonaFactRepository:
         if not update_dict:
             return PersonaFactRepository.get_fact_by_id(fact_id)
         
-        result = collection.update_one(
+        before = collection.find_one_and_update(
             {"fact_id": fact_id},
-            {"$set": update_dict}
+            {"$set": update_dict},
+            projection={"persona_id": 1, "npc_id": 1}
         )
         
-        if result.matched_count == 0:
+        if before is None:
             return None
         
+        PersonaFactRepository._invalidate_lists_for([before])
         return PersonaFactRepository.get_fact_by_id(fact_id)
     
     @staticmethod
     def delete_fact(fact_id: str) -> bool:
         """Persona fact 삭제."""
         collection = PersonaFactRepository._get_collection()
-        result = collection.delete_one({"fact_id": fact_id})
-        return result.deleted_count > 0
+        deleted = collection.find_one_and_delete({"fact_id": fact_id}, projection={"persona_id": 1, "npc_id": 1})
+        if deleted is None:
+            return False
+        PersonaFactRepository._invalidate_lists_for([deleted])
+        return True
     
     @staticmethod
     def count_facts_by_persona(persona_id: str) -> int:
         """Persona의 fact 개수 조회."""
         collection = PersonaFactRepository._get_collection()
         return collection.count_documents({"persona_id": persona_id})
+
+
+class AsyncPersonaRepository:
+    """Persona profile 작업 async repository (Motor)."""
+    
+    @staticmethod
+    def _get_collection():
+        return get_async_collection("persona_profiles")
+    
+    @staticmethod
+    async def create_persona(persona_data: PersonaCreate) -> PersonaProfile:
+        """Persona profile 생성."""
+        persona_doc = PersonaRepository._build_persona_doc(persona_data)
+        
+        collection = AsyncPersonaRepository._get_collection()
+        await collection.insert_one(persona_doc)
+        
+        persona_doc.pop("_id", None)
+        return PersonaProfile(**persona_doc)
+    
+    @staticmethod
+    async def get_persona_by_id(persona_id: str) -> Optional[PersonaProfile]:
+        """ID로 persona 조회 (entity cache read-through)."""
+        return await entity_cache.get_or_load_async(
+            "persona", persona_id, lambda: AsyncPersonaRepository._load_persona(persona_id)
+        )
+    
+    @staticmethod
+    async def _load_persona(persona_id: str) -> Optional[PersonaProfile]:
+        collection = AsyncPersonaRepository._get_collection()
+        doc = await collection.find_one({"persona_id": persona_id}, {"_id": 0})
+        
+        if doc is None:
+            return None
+        
+        return PersonaProfile(**doc)
+    
+    @staticmethod
+    async def update_persona(persona_id: str, update_data: dict) -> Optional[PersonaProfile]:
+        """Persona profile 업데이트."""
+        collection = AsyncPersonaRepository._get_collection()
+        result = await collection.update_one(
+            {"persona_id": persona_id},
+            {"$set": update_data}
+        )
+        entity_cache.invalidate("persona", persona_id)
+        
+        if result.matched_count == 0:
+            return None
+        
+        return await AsyncPersonaRepository.get_persona_by_id(persona_id)
+
+
+class AsyncPersonaFactRepository:
+    """Persona fact async repository (Motor)."""
+    
+    @staticmethod
+    def _get_collection():
+        return get_async_collection("persona_facts")
+    
+    @staticmethod
+    async def create_fact(fact_data: PersonaFactCreate) -> PersonaFact:
+        """Persona fact 생성."""
+        fact_doc = PersonaFactRepository._build_fact_doc(fact_data)
+        
+        collection = AsyncPersonaFactRepository._get_collection()
+        await collection.insert_one(fact_doc)
+        invalidate_fact_lists(fact_doc["persona_id"], fact_doc["npc_id"])
+        
+        fact_doc.pop("_id", None)
+        return PersonaFact(**fact_doc)
+    
+    @staticmethod
+    async def create_facts_bulk(facts_data: List[PersonaFactCreate]) -> List[PersonaFact]:
+        """여러 persona facts를 한 번에 생성."""
+        fact_docs = [PersonaFactRepository._build_fact_doc(fact_data) for fact_data in facts_data]
+        
+        collection = AsyncPersonaFactRepository._get_collection()
+        if fact_docs:
+            await collection.insert_many(fact_docs)
+        PersonaFactRepository._invalidate_lists_for(fact_docs)
+        
+        for doc in fact_docs:
+            doc.pop("_id", None)
+        return [PersonaFact(**doc) for doc in fact_docs]
+    
+    @staticmethod
+    async def get_fact_by_id(fact_id: str) -> Optional[PersonaFact]:
+        """ID로 fact 조회."""
+        collection = AsyncPersonaFactRepository._get_collection()
+        doc = await collection.find_one({"fact_id": fact_id})
+        
+        if doc is None:
+            return None
+        
+        return PersonaFactRepository._parse_fact_doc(doc)
+    
+    @staticmethod
+    async def _find_facts(query: dict) -> List[PersonaFact]:
+        collection = AsyncPersonaFactRepository._get_collection()
+        facts = []
+        async for doc in collection.find(query):
+            fact = PersonaFactRepository._parse_fact_doc(doc)
+            if fact is not None:
+                facts.append(fact)
+        return facts
+    
+    @staticmethod
+    async def get_facts_by_persona(persona_id: str, dimension: Optional[PersonaFactDimension] = None) -> List[PersonaFact]:
+        """Persona ID로 facts 조회 (전체 목록을 entity cache에 두고 dimension은 메모리에서 필터)."""
+        facts = await entity_cache.get_or_load_async(
+            "facts_by_persona", persona_id, lambda: AsyncPersonaFactRepository._find_facts({"persona_id": persona_id})
+        )
+        return PersonaFactRepository._filter_dimension(facts, dimension)
+    
+    @staticmethod
+    async def get_facts_by_npc(npc_id: str, dimension: Optional[PersonaFactDimension] = None) -> List[PersonaFact]:
+        """NPC ID로 facts 조회 (전체 목록을 entity cache에 두고 dimension은 메모리에서 필터)."""
+        facts = await entity_cache.get_or_load_async(
+            "facts_by_npc", npc_id, lambda: AsyncPersonaFactRepository._find_facts({"npc_id": npc_id})
+        )
+        return PersonaFactRepository._filter_dimension(facts, dimension)
+    
+    @staticmethod
+    async def update_fact(fact_id: str, update_data: PersonaFactUpdate) -> Optional[PersonaFact]:
+        """Persona fact 업데이트."""
+        collection = AsyncPersonaFactRepository._get_collection()
+        
+        update_dict = {}
+        if update_data.content is not None:
+            update_dict["content"] = update_data.content
+        if update_data.dimension is not None:
+            update_dict["dimension"] = update_data.dimension.value
+        if update_data.is_static is not None:
+            update_dict["is_static"] = update_data.is_static
+        
+        if not update_dict:
+            return await AsyncPersonaFactRepository.get_fact_by_id(fact_id)
+        
+        before = await collection.find_one_and_update(
+            {"fact_id": fact_id},
+            {"$set": update_dict},
+            projection={"persona_id": 1, "npc_id": 1}
+        )
+        
+        if before is None:
+            return None
+        
+        PersonaFactRepository._invalidate_lists_for([before])
+        return await AsyncPersonaFactRepository.get_fact_by_id(fact_id)
+    
+    @staticmethod
+    async def delete_fact(fact_id: str) -> bool:
+        """Persona fact 삭제."""
+        collection = AsyncPersonaFactRepository._get_collection()
+        deleted = await collection.find_one_and_delete({"fact_id": fact_id}, projection={"persona_id": 1, "npc_id": 1})
+        if deleted is None:
+            return False
+        PersonaFactRepository._invalidate_lists_for([deleted])
+        return True
+    
+    @staticmethod
+    async def count_facts_by_persona(persona_id: str) -> int:
+        """Persona의 fact 개수 조회."""
+        collection = AsyncPersonaFactRepository._get_collection()
+        return await collection.count_documents({"persona_id": persona_id})
@@ -1,8 +1,14 @@
 """Inference trace repository - CRUD 작업만."""
-from typing import List, Optional
+import asyncio
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 from datetime import datetime
 import uuid
-from app.memory.mongo.client import get_collection
+from app.memory.mongo.client import get_collection, get_async_collection
+from app.memory.mongo.write_buffer import write_buffer
+from app.memory.mongo.pagination import encode_cursor, exclusion_projection, keyset_filter, keyset_sort
+from app.memory.mongo.trace_compaction import compact_snapshot, expand_trace_doc, segment_ids_of, segment_store
+from app.core.config import settings
+from app.services.retention import expire_at
 from app.schemas.trace import InferenceTrace, TraceCreate
 
 
@@ -14,8 +20,8 @@ class TraceRepository:
         return get_collection("inference_traces")
     
     @staticmethod
-    def insert_trace(trace_data: TraceCreate) -> InferenceTrace:
-        """Inference trace 삽입."""
+    def _build_trace_doc(trace_data: TraceCreate, retention_days: Optional[float] = None) -> dict:
+        """TraceCreate에서 저장할 문서 생성 (retention에 따라 expire_at)."""
         trace_id = f"trace_{uuid.uuid4().hex[:8]}"
         now = datetime.utcnow()
         
@@ -24,67 +30,114 @@ class TraceRepository:
             "npc_id": trace_data.npc_id,
             "turn_id": trace_data.turn_id,
             "observation": trace_data.observation,
+            "observation_payload": trace_data.observation_payload,
             "retrieved_memories": trace_data.retrieved_memories,
             "retrieval_query_text": trace_data.retrieval_query_text,
             "retrieval_indices_searched": trace_data.retrieval_indices_searched,
             "retrieval_vector_ids": trace_data.retrieval_vector_ids,
             "retrieval_similarity_scores": trace_data.retrieval_similarity_scores,
+            "retrieval_relevance_scores": trace_data.retrieval_relevance_scores,
+            "retrieval_ranking_scores": trace_data.retrieval_ranking_scores,
             "persona_used": trace_data.persona_used,
             "world_used": trace_data.world_used,
             "llm_prompt_snapshot": trace_data.llm_prompt_snapshot,
+            "prompt_layout": trace_data.prompt_layout,
+            "prompt_prefix_hash": trace_data.prompt_prefix_hash,
+            "prompt_versions": trace_data.prompt_versions,
+            "llm_usage": trace_data.llm_usage,
+            "context_budget": trace_data.context_budget,
             "llm_output_raw": trace_data.llm_output_raw,
             "chosen_action": trace_data.chosen_action,
             "tool_arguments": trace_data.tool_arguments,
             "tool_execution_result": trace_data.tool_execution_result,
+            "stage_timings_ms": trace_data.stage_timings_ms,
             "created_at": now
         }
+        expires = expire_at(now, retention_days)
+        if expires is not None:
+            trace_doc["expire_at"] = expires
+        return trace_doc
+    
+    @staticmethod
+    def _compact_trace_doc(trace_doc: dict, segments: List[str]) -> Dict[str, str]:
+        """
+        저장용 문서의 llm_prompt_snapshot을 segment 참조 + 압축 텍스트(llm_prompt_compact)로 교체.
         
-        collection = TraceRepository._get_collection()
-        collection.insert_one(trace_doc)
+        Returns:
+            segment store에 저장할 {segment_id: text}
+        """
+        if not settings.trace_compaction_enabled or not trace_doc["llm_prompt_snapshot"]:
+            return {}
+        compact = compact_snapshot(trace_doc["llm_prompt_snapshot"], segments)
+        trace_doc["llm_prompt_snapshot"] = ""
+        trace_doc["llm_prompt_compact"] = {
+            "segment_ids": compact["segment_ids"],
+            "dynamic": compact["dynamic"]
+        }
+        return compact["segments"]
+    
+    @staticmethod
+    def _projection(exclude: Optional[List[str]] = None) -> Dict[str, int]:
+        """제외 필드 projection (llm_prompt_snapshot을 빼면 압축본도 읽지 않음)."""
+        exclude = exclude or []
+        extra = ["llm_prompt_compact"] if "llm_prompt_snapshot" in exclude else []
+        return exclusion_projection(exclude, extra)
+    
+    @staticmethod
+    def _expand_docs(docs: List[dict]) -> List[dict]:
+        """압축된 trace 문서의 prompt snapshot 복원 (segment는 한 번에 조회)."""
+        segment_ids = segment_ids_of(docs)
+        segment_texts = segment_store.get_many(segment_ids) if segment_ids else {}
+        return [expand_trace_doc(doc, segment_texts) for doc in docs]
+    
+    @staticmethod
+    def insert_trace(trace_data: TraceCreate, retention_days: Optional[float] = None) -> InferenceTrace:
+        """Inference trace 삽입 (write buffer가 켜져 있으면 배치로 저장)."""
+        trace_doc = TraceRepository._build_trace_doc(trace_data, retention_days)
+        trace = InferenceTrace(**trace_doc)
         
-        return InferenceTrace(**trace_doc)
+        segments = TraceRepository._compact_trace_doc(trace_doc, trace_data.llm_prompt_segments)
+        if segments:
+            segment_store.put(segments)
+        write_buffer.add("inference_traces", trace_doc)
+        
+        return trace
     
     @staticmethod
     def get_trace_by_id(trace_id: str) -> Optional[InferenceTrace]:
-        """ID로 trace 조회."""
+        """ID로 trace 조회 (없으면 write buffer를 flush한 뒤 한 번 더 조회)."""
         collection = TraceRepository._get_collection()
-        doc = collection.find_one({"trace_id": trace_id})
+        doc = collection.find_one({"trace_id": trace_id}, {"_id": 0})
+        if doc is None and write_buffer.enabled:
+            write_buffer.flush("inference_traces")
+            doc = collection.find_one({"trace_id": trace_id}, {"_id": 0})
         
         if doc is None:
             return None
         
-        if "_id" in doc:
-            del doc["_id"]
-        
-        return InferenceTrace(**doc)
+        return InferenceTrace(**TraceRepository._expand_docs([doc])[0])
     
     @staticmethod
-    def get_traces_by_npc(npc_id: str, limit: int = 100, skip: int = 0) -> List[InferenceTrace]:
+    def get_traces_by_npc(
+        npc_id: str,
+        limit: int = 100,
+        skip: int = 0,
+        exclude: Optional[List[str]] = None
+    ) -> List[InferenceTrace]:
         """NPC의 모든 trace 조회."""
         collection = TraceRepository._get_collection()
-        docs = collection.find({"npc_id": npc_id}).sort("created_at", -1).skip(skip).limit(limit)
-        
-        traces = []
-        for doc in docs:
-            if "_id" in doc:
-                del doc["_id"]
-            traces.append(InferenceTrace(**doc))
-        
-        return traces
+        docs = list(
+            collection.find({"npc_id": npc_id}, TraceRepository._projection(exclude))
+            .sort("created_at", -1).skip(skip).limit(limit)
+        )
+        return [InferenceTrace(**doc) for doc in TraceRepository._expand_docs(docs)]
     
     @staticmethod
     def get_traces_by_turn(turn_id: str) -> List[InferenceTrace]:
         """Turn의 모든 trace 조회."""
         collection = TraceRepository._get_collection()
-        docs = collection.find({"turn_id": turn_id}).sort("created_at", -1)
-        
-        traces = []
-        for doc in docs:
-            if "_id" in doc:
-                del doc["_id"]
-            traces.append(InferenceTrace(**doc))
-        
-        return traces
+        docs = list(collection.find({"turn_id": turn_id}, {"_id": 0}).sort("created_at", -1))
+        return [InferenceTrace(**doc) for doc in TraceRepository._expand_docs(docs)]
     
     @staticmethod
     def delete_trace(trace_id: str) -> bool:
@@ -99,3 +152,181 @@ class TraceRepository:
         collection = TraceRepository._get_collection()
         result = collection.delete_many({"npc_id": npc_id})
         return result.deleted_count
+    
+    # prompt cache 통계 계산에 필요한 필드만 조회
+    PROMPT_CACHE_PROJECTION = {"_id": 0, "prompt_layout": 1, "prompt_prefix_hash": 1, "llm_usage": 1}
+    
+    @staticmethod
+    def summarize_prompt_cache(docs: List[dict]) -> Dict[str, Any]:
+        """
+        prompt layout별 prefix 재사용률과 토큰 사용량 요약.
+        
+        Args:
+            docs: created_at 오름차순 trace 문서 (PROMPT_CACHE_PROJECTION 필드)
+        
+        Returns:
+            {layout: {turns, distinct_prefixes, prefix_reuse_rate, prompt_tokens, cached_tokens, cached_token_ratio}}
+        """
+        layouts: Dict[str, Dict[str, Any]] = {}
+        seen = set()
+        for doc in docs:
+            layout = doc.get("prompt_layout") or "unknown"
+            stats = layouts.setdefault(layout, {
+                "turns": 0, "prefixes": set(), "reused": 0, "prompt_tokens": 0, "cached_tokens": 0
+            })
+            stats["turns"] += 1
+            prefix = doc.get("prompt_prefix_hash")
+            if prefix:
+                if prefix in seen:
+                    stats["reused"] += 1
+                seen.add(prefix)
+                stats["prefixes"].add(prefix)
+            usage = doc.get("llm_usage") or {}
+            stats["prompt_tokens"] += int(usage.get("prompt_tokens", 0))
+            stats["cached_tokens"] += int(usage.get("cached_tokens", 0))
+        
+        return {
+            layout: {
+                "turns": stats["turns"],
+                "distinct_prefixes": len(stats["prefixes"]),
+                "prefix_reuse_rate": round(stats["reused"] / stats["turns"], 4),
+                "prompt_tokens": stats["prompt_tokens"],
+                "cached_tokens": stats["cached_tokens"],
+                "cached_token_ratio": round(stats["cached_tokens"] / stats["prompt_tokens"], 4)
+                if stats["prompt_tokens"] else 0.0
+            }
+            for layout, stats in layouts.items()
+        }
+
+
+class AsyncTraceRepository:
+    """Inference trace 작업 async repository (Motor)."""
+    
+    @staticmethod
+    def _get_collection():
+        return get_async_collection("inference_traces")
+    
+    @staticmethod
+    async def insert_trace(trace_data: TraceCreate, retention_days: Optional[float] = None) -> InferenceTrace:
+        """Inference trace 삽입."""
+        trace_doc = TraceRepository._build_trace_doc(trace_data, retention_days)
+        trace = InferenceTrace(**trace_doc)
+        
+        segments = TraceRepository._compact_trace_doc(trace_doc, trace_data.llm_prompt_segments)
+        if segments:
+            await segment_store.put_async(segments)
+        collection = AsyncTraceRepository._get_collection()
+        await collection.insert_one(trace_doc)
+        
+        return trace
+    
+    @staticmethod
+    async def _expand_docs(docs: List[dict]) -> List[dict]:
+        segment_ids = segment_ids_of(docs)
+        segment_texts = await segment_store.get_many_async(segment_ids) if segment_ids else {}
+        return [expand_trace_doc(doc, segment_texts) for doc in docs]
+    
+    @staticmethod
+    async def get_trace_by_id(trace_id: str) -> Optional[InferenceTrace]:
+        """ID로 trace 조회 (없으면 write buffer를 flush한 뒤 한 번 더 조회)."""
+        collection = AsyncTraceRepository._get_collection()
+        doc = await collection.find_one({"trace_id": trace_id}, {"_id": 0})
+        if doc is None and write_buffer.enabled:
+            await asyncio.to_thread(write_buffer.flush, "inference_traces")
+            doc = await collection.find_one({"trace_id": trace_id}, {"_id": 0})
+        
+        if doc is None:
+            return None
+        
+        return InferenceTrace(**(await AsyncTraceRepository._expand_docs([doc]))[0])
+    
+    @staticmethod
+    async def get_traces_by_npc(
+        npc_id: str,
+        limit: int = 100,
+        skip: int = 0,
+        exclude: Optional[List[str]] = None
+    ) -> List[InferenceTrace]:
+        """NPC의 모든 trace 조회."""
+        collection = AsyncTraceRepository._get_collection()
+        cursor = collection.find(
+            {"npc_id": npc_id}, TraceRepository._projection(exclude)
+        ).sort("created_at", -1).skip(skip).limit(limit)
+        docs = [doc async for doc in cursor]
+        return [InferenceTrace(**doc) for doc in await AsyncTraceRepository._expand_docs(docs)]
+    
+    @staticmethod
+    async def get_traces_page(
+        npc_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        exclude: Optional[List[str]] = None
+    ) -> Tuple[List[InferenceTrace], Optional[str]]:
+        """
+        NPC trace 한 페이지 조회 ((created_at, trace_id) 내림차순 keyset pagination).
+        
+        Returns:
+            (trace 목록, 다음 페이지 cursor - 마지막 페이지면 None)
+        """
+        collection = AsyncTraceRepository._get_collection()
+        query = keyset_filter({"npc_id": npc_id}, cursor, "trace_id")
+        docs = await collection.find(query, TraceRepository._projection(exclude)).sort(
+            keyset_sort("trace_id")
+        ).limit(limit).to_list(length=limit)
+        
+        next_cursor = encode_cursor(docs[-1], "trace_id") if len(docs) == limit else None
+        return [InferenceTrace(**doc) for doc in await AsyncTraceRepository._expand_docs(docs)], next_cursor
+    
+    @staticmethod
+    async def iter_traces(
+        npc_id: str,
+        exclude: Optional[List[str]] = None,
+        batch_size: int = 500
+    ) -> AsyncIterator[dict]:
+        """NPC trace 전체를 최신순으로 batch 단위 조회 (export용, prompt snapshot 복원)."""
+        collection = AsyncTraceRepository._get_collection()
+        cursor = collection.find({"npc_id": npc_id}, TraceRepository._projection(exclude)).sort(
+            keyset_sort("trace_id")
+        ).batch_size(batch_size)
+        
+        batch = []
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                for expanded in await AsyncTraceRepository._expand_docs(batch):
+                    yield expanded
+                batch = []
+        for expanded in await AsyncTraceRepository._expand_docs(batch):
+            yield expanded
+    
+    @staticmethod
+    async def get_traces_by_turn(turn_id: str) -> List[InferenceTrace]:
+        """Turn의 모든 trace 조회."""
+        collection = AsyncTraceRepository._get_collection()
+        cursor = collection.find({"turn_id": turn_id}, {"_id": 0}).sort("created_at", -1)
+        docs = [doc async for doc in cursor]
+        return [InferenceTrace(**doc) for doc in await AsyncTraceRepository._expand_docs(docs)]
+    
+    @staticmethod
+    async def delete_trace(trace_id: str) -> bool:
+        """Trace 삭제."""
+        collection = AsyncTraceRepository._get_collection()
+        result = await collection.delete_one({"trace_id": trace_id})
+        return result.deleted_count > 0
+    
+    @staticmethod
+    async def delete_traces_by_npc(npc_id: str) -> int:
+        """NPC의 모든 trace 삭제."""
+        collection = AsyncTraceRepository._get_collection()
+        result = await collection.delete_many({"npc_id": npc_id})
+        return result.deleted_count
+    
+    @staticmethod
+    async def get_prompt_cache_stats(npc_id: Optional[str] = None, limit: int = 1000) -> Dict[str, Any]:
+        """최근 limit개 trace의 prompt layout별 prefix 재사용률/토큰 사용량."""
+        collection = AsyncTraceRepository._get_collection()
+        query = {"npc_id": npc_id} if npc_id else {}
+        cursor = collection.find(query, TraceRepository.PROMPT_CACHE_PROJECTION).sort("created_at", -1).limit(limit)
+        docs = [doc async for doc in cursor]
+        docs.reverse()
+        return TraceRepository.summarize_prompt_cache(docs)
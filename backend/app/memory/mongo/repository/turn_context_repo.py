@@ -0,0 +1,165 @@
+"""Turn context repository - 턴에 필요한 NPC/persona/world/persona facts/최근 대화를 한 번에 조회."""
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.memory.mongo.client import get_collection
+from app.memory.mongo.cache import entity_cache, _MISSING
+from app.memory.mongo.conversation_buffer import conversation_buffer
+from app.memory.mongo.write_buffer import write_buffer
+from app.memory.mongo.repository.memory_repo import MemoryRepository
+from app.memory.mongo.repository.npc_repo import NPCRepository
+from app.memory.mongo.repository.persona_repo import PersonaRepository, PersonaFactRepository
+from app.memory.mongo.repository.world_repo import WorldRepository
+from app.schemas.npc import NPC
+from app.schemas.persona import PersonaProfile
+from app.schemas.world import WorldKnowledge
+
+
+class TurnContextRepository:
+    """
+    run_turn의 load_context 단계용 repository.
+
+    entity cache가 채워져 있으면 캐시만 사용하고, 하나라도 비어 있으면 npcs에서 시작하는
+    $lookup aggregation 한 번으로 NPC, persona, world, NPC의 persona facts, 최근 short-term
+    memory를 읽어 entity cache와 conversation buffer를 채웁니다. 이후 같은 턴의
+    get_*_by_id/get_facts_by_npc/get_recent_conversation 호출은 캐시에서 처리됩니다.
+    turn_context_aggregation이 꺼져 있으면 기존처럼 문서별 read-through 조회를 순서대로 합니다.
+    """
+
+    @staticmethod
+    def _pipeline(npc_id: str, recent_limit: int) -> List[Dict[str, Any]]:
+        # let/pipeline 형식의 $lookup은 MongoDB 3.6+ (episodic_memory index 사용은 5.0+)
+        return [
+            {"$match": {"npc_id": npc_id}},
+            {"$limit": 1},
+            {"$lookup": {
+                "from": "persona_profiles",
+                "localField": "persona_id",
+                "foreignField": "persona_id",
+                "as": "persona"
+            }},
+            {"$lookup": {
+                "from": "world_knowledge",
+                "localField": "world_id",
+                "foreignField": "world_id",
+                "as": "world"
+            }},
+            {"$lookup": {
+                "from": "persona_facts",
+                "localField": "npc_id",
+                "foreignField": "npc_id",
+                "as": "facts"
+            }},
+            {"$lookup": {
+                "from": "episodic_memory",
+                "let": {"npc_id": "$npc_id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$npc_id", "$$npc_id"]}, "memory_type": "short_term"}},
+                    {"$sort": {"created_at": -1}},
+                    {"$limit": recent_limit},
+                    {"$project": {"_id": 0, "memory_id": 1, "source": 1, "content": 1}}
+                ],
+                "as": "recent_memories"
+            }},
+            {"$project": {"_id": 0, "persona._id": 0, "world._id": 0, "facts._id": 0}}
+        ]
+
+    @staticmethod
+    def _from_cache(npc_id: str, recent_limit: int) -> Optional[Dict[str, Any]]:
+        """NPC/persona/world/facts가 모두 캐시되어 있으면 context 구성 (아니면 None)."""
+        npc = entity_cache.get("npc", npc_id)
+        if npc is _MISSING:
+            return None
+        persona = entity_cache.get("persona", npc.persona_id)
+        world = entity_cache.get("world", npc.world_id)
+        facts = entity_cache.get("facts_by_npc", npc_id)
+        if _MISSING in (persona, world, facts):
+            return None
+        return {
+            "npc": npc,
+            "persona": persona,
+            "world": world,
+            "facts": facts,
+            "recent_conversation": MemoryRepository.get_recent_conversation(npc_id, limit=recent_limit)
+        }
+
+    @staticmethod
+    def load_sequential(npc_id: str, recent_limit: int = 10) -> Optional[Dict[str, Any]]:
+        """문서별 read-through 조회 5번으로 turn context 구성 (aggregation 비활성화 시, 벤치마크 기준선)."""
+        npc = NPCRepository.get_npc_by_id(npc_id)
+        if npc is None:
+            return None
+        return {
+            "npc": npc,
+            "persona": PersonaRepository.get_persona_by_id(npc.persona_id),
+            "world": WorldRepository.get_world_by_id(npc.world_id),
+            "facts": PersonaFactRepository.get_facts_by_npc(npc_id),
+            "recent_conversation": MemoryRepository.get_recent_conversation(npc_id, limit=recent_limit)
+        }
+
+    @staticmethod
+    def load_turn_context(npc_id: str, recent_limit: int = 10) -> Optional[Dict[str, Any]]:
+        """
+        aggregation 한 번으로 turn context 조회 후 entity cache/conversation buffer 채움.
+
+        Returns:
+            {"npc", "persona", "world", "facts", "recent_conversation"} (NPC가 없으면 None,
+            persona/world가 없으면 해당 값이 None)
+        """
+        write_buffer.flush("episodic_memory")
+        sequence = entity_cache.sequence()
+        buffer_version = conversation_buffer.version(npc_id)
+
+        docs = list(get_collection("npcs").aggregate(
+            TurnContextRepository._pipeline(npc_id, max(recent_limit, conversation_buffer.capacity))
+        ))
+        if not docs:
+            return None
+        doc = docs[0]
+
+        persona_docs = doc.pop("persona")
+        world_docs = doc.pop("world")
+        fact_docs = doc.pop("facts")
+        memory_docs = doc.pop("recent_memories")
+
+        npc = NPC(**doc)
+        persona = PersonaProfile(**persona_docs[0]) if persona_docs else None
+        world = WorldKnowledge(**world_docs[0]) if world_docs else None
+        facts = [
+            fact for fact in (PersonaFactRepository._parse_fact_doc(fact_doc) for fact_doc in fact_docs)
+            if fact is not None
+        ]
+        entries = [(memory["memory_id"], memory["source"], memory["content"]) for memory in memory_docs]
+
+        # get_or_load와 마찬가지로 없는 문서는 캐시하지 않음
+        items = {("npc", npc_id): npc, ("facts_by_npc", npc_id): facts}
+        if persona is not None:
+            items[("persona", npc.persona_id)] = persona
+        if world is not None:
+            items[("world", npc.world_id)] = world
+        entity_cache.put_many(items, sequence)
+        conversation_buffer.fill(npc_id, entries, buffer_version)
+
+        return {
+            "npc": npc,
+            "persona": persona,
+            "world": world,
+            "facts": facts,
+            "recent_conversation": [
+                content for _, source, content in entries[:recent_limit] if source == "observation"
+            ]
+        }
+
+    @staticmethod
+    def get_turn_context(npc_id: str, recent_limit: int = 10) -> Optional[Dict[str, Any]]:
+        """
+        turn context 조회 (캐시 우선, 캐시가 비어 있으면 aggregation 한 번).
+
+        recent_conversation은 MemoryRepository.get_recent_conversation과 같은 형식입니다
+        (최근 short-term memory recent_limit개 중 observation 내용, 최신순).
+        """
+        if not settings.turn_context_aggregation:
+            return TurnContextRepository.load_sequential(npc_id, recent_limit)
+        context = TurnContextRepository._from_cache(npc_id, recent_limit)
+        if context is not None:
+            return context
+        return TurnContextRepository.load_turn_context(npc_id, recent_limit)
@@ -1,7 +1,8 @@
 """World repository - CRUD 작업만."""
 from typing import Optional
 import uuid
-from app.memory.mongo.client import get_collection
+from app.memory.mongo.client import get_collection, get_async_collection
+from app.memory.mongo.cache import entity_cache
 from app.schemas.world import WorldKnowledge, WorldCreate
 
 
@@ -13,8 +14,8 @@ class WorldRepository:
         return get_collection("world_knowledge")
     
     @staticmethod
-    def create_world(world_data: WorldCreate) -> WorldKnowledge:
-        """World knowledge 생성."""
+    def _build_world_doc(world_data: WorldCreate) -> dict:
+        """WorldCreate에서 저장할 문서 생성."""
         world_id = world_data.world_id or f"world_{uuid.uuid4().hex[:8]}"
         
         world_doc = {
@@ -25,6 +26,12 @@ class WorldRepository:
             "danger_levels": world_data.danger_levels,
             "global_constraints": world_data.global_constraints
         }
+        return world_doc
+    
+    @staticmethod
+    def create_world(world_data: WorldCreate) -> WorldKnowledge:
+        """World knowledge 생성."""
+        world_doc = WorldRepository._build_world_doc(world_data)
         
         collection = WorldRepository._get_collection()
         collection.insert_one(world_doc)
@@ -33,7 +40,11 @@ class WorldRepository:
     
     @staticmethod
     def get_world_by_id(world_id: str) -> Optional[WorldKnowledge]:
-        """ID로 world 조회."""
+        """ID로 world 조회 (entity cache read-through)."""
+        return entity_cache.get_or_load("world", world_id, lambda: WorldRepository._load_world(world_id))
+    
+    @staticmethod
+    def _load_world(world_id: str) -> Optional[WorldKnowledge]:
         collection = WorldRepository._get_collection()
         doc = collection.find_one({"world_id": world_id})
         
@@ -67,6 +78,7 @@ class WorldRepository:
             {"world_id": world_id},
             {"$set": update_data}
         )
+        entity_cache.invalidate("world", world_id)
         
         if result.matched_count == 0:
             return None
@@ -78,4 +90,69 @@ class WorldRepository:
         """World 삭제."""
         collection = WorldRepository._get_collection()
         result = collection.delete_one({"world_id": world_id})
+        entity_cache.invalidate("world", world_id)
+        return result.deleted_count > 0
+
+
+class AsyncWorldRepository:
+    """World knowledge 작업 async repository (Motor)."""
+    
+    @staticmethod
+    def _get_collection():
+        return get_async_collection("world_knowledge")
+    
+    @staticmethod
+    async def create_world(world_data: WorldCreate) -> WorldKnowledge:
+        """World knowledge 생성."""
+        world_doc = WorldRepository._build_world_doc(world_data)
+        
+        collection = AsyncWorldRepository._get_collection()
+        await collection.insert_one(world_doc)
+        
+        world_doc.pop("_id", None)
+        return WorldKnowledge(**world_doc)
+    
+    @staticmethod
+    async def get_world_by_id(world_id: str) -> Optional[WorldKnowledge]:
+        """ID로 world 조회 (entity cache read-through)."""
+        return await entity_cache.get_or_load_async("world", world_id, lambda: AsyncWorldRepository._load_world(world_id))
+    
+    @staticmethod
+    async def _load_world(world_id: str) -> Optional[WorldKnowledge]:
+        collection = AsyncWorldRepository._get_collection()
+        doc = await collection.find_one({"world_id": world_id}, {"_id": 0})
+        
+        if doc is None:
+            return None
+        
+        return WorldKnowledge(**doc)
+    
+    @staticmethod
+    async def list_worlds(limit: int = 100) -> list[WorldKnowledge]:
+        """모든 World 목록 조회."""
+        collection = AsyncWorldRepository._get_collection()
+        docs = await collection.find({}, {"_id": 0}).limit(limit).to_list(length=limit)
+        return [WorldKnowledge(**doc) for doc in docs]
+    
+    @staticmethod
+    async def update_world(world_id: str, update_data: dict) -> Optional[WorldKnowledge]:
+        """World knowledge 업데이트."""
+        collection = AsyncWorldRepository._get_collection()
+        result = await collection.update_one(
+            {"world_id": world_id},
+            {"$set": update_data}
+        )
+        entity_cache.invalidate("world", world_id)
+        
+        if result.matched_count == 0:
+            return None
+        
+        return await AsyncWorldRepository.get_world_by_id(world_id)
+    
+    @staticmethod
+    async def delete_world(world_id: str) -> bool:
+        """World 삭제."""
+        collection = AsyncWorldRepository._get_collection()
+        result = await collection.delete_one({"world_id": world_id})
+        entity_cache.invalidate("world", world_id)
         return result.deleted_count > 0
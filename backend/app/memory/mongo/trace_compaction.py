@@ -0,0 +1,308 @@
+"""Inference trace prompt snapshot 압축 - 반복되는 prompt segment 중복 제거 + 나머지 압축."""
+import hashlib
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+import zstandard
+from bson import Binary
+from pymongo.errors import DuplicateKeyError
+
+
+SEGMENT_COLLECTION = "prompt_segments"
+
+# process cache가 있어도 사용 중인 segment의 last_used_at을 이 간격마다 갱신
+SEGMENT_TOUCH_INTERVAL_S = 3600
+
+# 참조하는 trace가 없고 이 기간 동안 사용되지 않은 segment만 삭제 (touch 간격, write buffer 지연보다 충분히 길게)
+SEGMENT_GC_GRACE = timedelta(days=1)
+
+# 이보다 짧은 segment는 참조보다 그대로 압축하는 편이 작음
+MIN_SEGMENT_CHARS = 64
+
+# 이전 trace(segment 정보 없음)의 snapshot에서 dynamic 부분이 시작되는 header
+DYNAMIC_SECTION_HEADERS = ["Relevant Memories:", "No relevant memories.", "RECENT CONVERSATION:", "CURRENT OBSERVATION:"]
+
+
+def compress(data: bytes) -> Dict[str, Any]:
+    """zstd로 압축."""
+    return {"codec": "zstd", "data": Binary(zstandard.ZstdCompressor(level=10).compress(data))}
+
+
+def decompress(blob: Dict[str, Any]) -> bytes:
+    """zstd 또는 (zstandard가 필수 의존성이 되기 전에 저장된) zlib 압축본 복원."""
+    if blob["codec"] == "zstd":
+        return zstandard.ZstdDecompressor().decompress(bytes(blob["data"]))
+    return zlib.decompress(bytes(blob["data"]))
+
+
+def segment_id(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def split_legacy_sections(snapshot: str) -> List[str]:
+    """
+    segment 정보 없이 저장된 planning prompt snapshot에서 정적 section 추출.
+
+    PERSONA: 앞의 지침, PERSONA 본문, WORLD 본문(첫 dynamic header 전까지)을 반환합니다.
+    """
+    persona_start = snapshot.find("PERSONA:\n")
+    world_start = snapshot.find("\n\nWORLD:\n", persona_start)
+    if persona_start < 0 or world_start < 0:
+        return []
+    world_body_start = world_start + len("\n\nWORLD:\n")
+    dynamic_starts = [
+        index for index in (snapshot.find(f"\n\n{header}", world_body_start) for header in DYNAMIC_SECTION_HEADERS)
+        if index >= 0
+    ]
+    world_end = min(dynamic_starts) if dynamic_starts else len(snapshot)
+    return [
+        snapshot[:persona_start].rstrip("\n"),
+        snapshot[persona_start + len("PERSONA:\n"):world_start],
+        snapshot[world_body_start:world_end]
+    ]
+
+
+def compact_snapshot(snapshot: str, segments: Iterable[str]) -> Dict[str, Any]:
+    """
+    snapshot을 segment 참조 + 압축된 나머지 텍스트로 변환.
+
+    segments는 snapshot에 등장하는 순서대로 찾으며, 없거나 짧은 segment는 건너뜁니다.
+    segment id k개와 그 사이/앞뒤 텍스트 k+1개를 저장하므로 순서대로 이어 붙이면 원문이 됩니다.
+
+    Returns:
+        {"segment_ids": [...], "dynamic": {"codec", "data"}, "segments": {id: text}}
+        ("segments"는 segment store에 저장할 본문이며 trace 문서에는 넣지 않음)
+    """
+    segment_ids: List[str] = []
+    texts: Dict[str, str] = {}
+    dynamic: List[str] = []
+    cursor = 0
+    for segment in segments:
+        if len(segment) < MIN_SEGMENT_CHARS:
+            continue
+        start = snapshot.find(segment, cursor)
+        if start < 0:
+            continue
+        dynamic.append(snapshot[cursor:start])
+        seg_id = segment_id(segment)
+        segment_ids.append(seg_id)
+        texts[seg_id] = segment
+        cursor = start + len(segment)
+    dynamic.append(snapshot[cursor:])
+
+    return {
+        "segment_ids": segment_ids,
+        "dynamic": compress(json.dumps(dynamic, ensure_ascii=False).encode("utf-8")),
+        "segments": texts
+    }
+
+
+def expand_snapshot(compact: Dict[str, Any], segment_texts: Dict[str, str]) -> str:
+    """compact_snapshot 결과를 원문으로 복원."""
+    dynamic = json.loads(decompress(compact["dynamic"]).decode("utf-8"))
+    parts = [dynamic[0]]
+    for seg_id, text in zip(compact["segment_ids"], dynamic[1:]):
+        parts.append(segment_texts[seg_id])
+        parts.append(text)
+    return "".join(parts)
+
+
+class PromptSegmentStore:
+    """
+    content-addressed prompt segment 저장소 (prompt_segments collection).
+
+    segment는 내용 해시로 식별되어 변하지 않으므로, 조회한 본문과 최근 저장한 id를
+    process 안에서 LRU로 기억해 반복 upsert/조회를 생략합니다. 저장한 id도
+    SEGMENT_TOUCH_INTERVAL_S가 지나면 다시 upsert해 last_used_at을 갱신하므로, 사용 중인
+    segment는 sweep 대상이 되지 않습니다.
+    """
+
+    def __init__(self, max_cached: int = 1000):
+        self.max_cached = max_cached
+        self._texts: "OrderedDict[str, str]" = OrderedDict()
+        self._touched: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, texts: Dict[str, str]) -> None:
+        with self._lock:
+            for seg_id, text in texts.items():
+                self._texts[seg_id] = text
+                self._texts.move_to_end(seg_id)
+            while len(self._texts) > self.max_cached:
+                self._texts.popitem(last=False)
+
+    def _split_cached(self, segment_ids: Iterable[str]):
+        found: Dict[str, str] = {}
+        missing: List[str] = []
+        with self._lock:
+            for seg_id in segment_ids:
+                if seg_id in self._texts:
+                    found[seg_id] = self._texts[seg_id]
+                    self._texts.move_to_end(seg_id)
+                elif seg_id not in missing:
+                    missing.append(seg_id)
+        return found, missing
+
+    def _stale(self, segment_ids: Iterable[str]) -> List[str]:
+        """이 process가 SEGMENT_TOUCH_INTERVAL_S 안에 upsert하지 않은 segment id."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                seg_id for seg_id in segment_ids
+                if seg_id not in self._touched or now - self._touched[seg_id] >= SEGMENT_TOUCH_INTERVAL_S
+            ]
+
+    def _mark_touched(self, segment_ids: Iterable[str]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for seg_id in segment_ids:
+                self._touched[seg_id] = now
+                self._touched.move_to_end(seg_id)
+            while len(self._touched) > self.max_cached:
+                self._touched.popitem(last=False)
+
+    def _forget(self, segment_ids: Iterable[str]) -> None:
+        with self._lock:
+            for seg_id in segment_ids:
+                self._texts.pop(seg_id, None)
+                self._touched.pop(seg_id, None)
+
+    @staticmethod
+    def _segment_upsert(seg_id: str, text: str) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        return {
+            "$setOnInsert": {"segment_id": seg_id, "text": text, "size": len(text), "created_at": now},
+            "$set": {"last_used_at": now}
+        }
+
+    def put(self, texts: Dict[str, str]) -> None:
+        """최근에 저장하지 않은 segment upsert (last_used_at 갱신)."""
+        from app.memory.mongo.client import get_collection
+
+        stale = self._stale(texts)
+        collection = get_collection(SEGMENT_COLLECTION)
+        for seg_id in stale:
+            try:
+                collection.update_one(
+                    {"segment_id": seg_id},
+                    self._segment_upsert(seg_id, texts[seg_id]),
+                    upsert=True
+                )
+            except DuplicateKeyError:
+                pass  # 동시에 같은 segment를 저장한 경우
+        self._mark_touched(stale)
+        self._remember(texts)
+
+    async def put_async(self, texts: Dict[str, str]) -> None:
+        from app.memory.mongo.client import get_async_collection
+
+        stale = self._stale(texts)
+        collection = get_async_collection(SEGMENT_COLLECTION)
+        for seg_id in stale:
+            try:
+                await collection.update_one(
+                    {"segment_id": seg_id},
+                    self._segment_upsert(seg_id, texts[seg_id]),
+                    upsert=True
+                )
+            except DuplicateKeyError:
+                pass
+        self._mark_touched(stale)
+        self._remember(texts)
+
+    def get_many(self, segment_ids: Iterable[str]) -> Dict[str, str]:
+        from app.memory.mongo.client import get_collection
+
+        found, missing = self._split_cached(segment_ids)
+        if missing:
+            docs = get_collection(SEGMENT_COLLECTION).find(
+                {"segment_id": {"$in": missing}},
+                {"_id": 0, "segment_id": 1, "text": 1}
+            )
+            loaded = {doc["segment_id"]: doc["text"] for doc in docs}
+            self._remember(loaded)
+            found.update(loaded)
+        return found
+
+    async def get_many_async(self, segment_ids: Iterable[str]) -> Dict[str, str]:
+        from app.memory.mongo.client import get_async_collection
+
+        found, missing = self._split_cached(segment_ids)
+        if missing:
+            cursor = get_async_collection(SEGMENT_COLLECTION).find(
+                {"segment_id": {"$in": missing}},
+                {"_id": 0, "segment_id": 1, "text": 1}
+            )
+            loaded = {doc["segment_id"]: doc["text"] async for doc in cursor}
+            self._remember(loaded)
+            found.update(loaded)
+        return found
+
+
+    def sweep(self, now: datetime, preview: bool = False, batch_size: int = 1000) -> Dict[str, int]:
+        """
+        어떤 trace도 참조하지 않는 segment 삭제 (mark-and-sweep, retention job용).
+
+        SEGMENT_GC_GRACE 동안 사용되지 않은 segment를 batch로 읽어 inference_traces에서 참조 중인 id를
+        표시하고 나머지를 삭제합니다. 삭제 조건에 last_used_at을 다시 넣으므로 표시 이후 put으로
+        다시 사용된 segment는 남습니다.
+
+        Returns:
+            {"candidates", "unreferenced", "deleted"} (preview면 deleted는 0)
+        """
+        from app.memory.mongo.client import get_collection
+
+        segments = get_collection(SEGMENT_COLLECTION)
+        traces = get_collection("inference_traces")
+        cutoff = now - SEGMENT_GC_GRACE
+        idle = {"$or": [
+            {"last_used_at": {"$lt": cutoff}},
+            {"last_used_at": {"$exists": False}, "created_at": {"$lt": cutoff}}
+        ]}
+
+        report = {"candidates": 0, "unreferenced": 0, "deleted": 0}
+        last_id = None
+        while True:
+            query = idle if last_id is None else {**idle, "segment_id": {"$gt": last_id}}
+            ids = [
+                doc["segment_id"]
+                for doc in segments.find(query, {"_id": 0, "segment_id": 1}).sort("segment_id", 1).limit(batch_size)
+            ]
+            if not ids:
+                break
+            last_id = ids[-1]
+            referenced = set(traces.distinct(
+                "llm_prompt_compact.segment_ids", {"llm_prompt_compact.segment_ids": {"$in": ids}}
+            ))
+            unreferenced = [seg_id for seg_id in ids if seg_id not in referenced]
+            report["candidates"] += len(ids)
+            report["unreferenced"] += len(unreferenced)
+            if unreferenced and not preview:
+                report["deleted"] += segments.delete_many({**idle, "segment_id": {"$in": unreferenced}}).deleted_count
+                self._forget(unreferenced)
+        return report
+
+
+segment_store = PromptSegmentStore()
+
+
+def segment_ids_of(docs: Iterable[Dict[str, Any]]) -> List[str]:
+    """trace 문서들이 참조하는 segment id (중복 제거)."""
+    ids: Dict[str, None] = {}
+    for doc in docs:
+        compact: Optional[Dict[str, Any]] = doc.get("llm_prompt_compact")
+        if compact:
+            ids.update(dict.fromkeys(compact["segment_ids"]))
+    return list(ids)
+
+
+def expand_trace_doc(doc: Dict[str, Any], segment_texts: Dict[str, str]) -> Dict[str, Any]:
+    """압축된 trace 문서의 llm_prompt_snapshot 복원 (in-place)."""
+    compact = doc.pop("llm_prompt_compact", None)
+    if compact:
+        doc["llm_prompt_snapshot"] = expand_snapshot(compact, segment_texts)
+    return doc
@@ -0,0 +1,276 @@
+"""Memory/trace 문서용 write-behind buffer - insert_many 배치로 모아서 저장."""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from bson.errors import InvalidDocument
+from pymongo.errors import BulkWriteError, DocumentTooLarge, DuplicateKeyError, PyMongoError, WriteError
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class WriteBuffer:
+    """
+    collection별 insert 대기열을 batch_size개 또는 flush_interval_ms마다 insert_many로 저장.
+
+    at-least-once: 실패한 문서는 대기열 앞으로 되돌려 다음 flush에서 다시 시도합니다. 버퍼 대상
+    문서는 모두 unique id index(memory_id, trace_id)가 있으므로, 재시도 중 이미 저장된 문서의
+    duplicate key 오류는 성공으로 처리합니다. 대기열이 max_pending을 넘으면 add()를 호출한
+    thread에서 바로 flush합니다 (backpressure).
+
+    연결 오류는 횟수 제한 없이 재시도합니다. BSON으로 변환할 수 없거나 너무 큰 문서가 섞인 batch는
+    문서별로 다시 저장하고, 그 문서와 서버가 max_retries번 거부한 문서는 버리지 않고
+    dead_letter_path(JSONL)에 기록합니다.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        batch_size: int = 100,
+        flush_interval_ms: float = 200,
+        max_pending: int = 10000,
+        max_retries: int = 5,
+        dead_letter_path: str = ""
+    ):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.dead_letter_path = dead_letter_path
+        self._pending: Dict[str, deque] = {}
+        # 서버가 거부한 문서별 시도 횟수 (대기열에 있는 문서 객체의 id 기준)
+        self._rejections: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {"buffered": 0, "written": 0, "batches": 0, "retries": 0, "dead_lettered": 0}
+
+    def _pending_count_locked(self) -> int:
+        return sum(len(queue) for queue in self._pending.values())
+
+    def add(self, collection_name: str, doc: Dict[str, Any]) -> None:
+        """문서를 대기열에 추가 (비활성화 상태면 바로 insert_one)."""
+        if not self.enabled:
+            from app.memory.mongo.client import get_collection
+            get_collection(collection_name).insert_one(doc)
+            return
+
+        with self._lock:
+            self._pending.setdefault(collection_name, deque()).append(doc)
+            self._stats["buffered"] += 1
+            pending = self._pending_count_locked()
+
+        if pending >= self.max_pending:
+            self.flush()
+        elif pending >= self.batch_size:
+            self._wakeup.set()
+
+    def _take_batch(self, collection_name: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            queue = self._pending.get(collection_name)
+            if not queue:
+                return []
+            return [queue.popleft() for _ in range(min(self.batch_size, len(queue)))]
+
+    def _requeue(self, collection_name: str, docs: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._pending.setdefault(collection_name, deque()).extendleft(reversed(docs))
+            self._stats["retries"] += len(docs)
+
+    def _dead_letter(self, collection_name: str, rejected: List[Tuple[Dict[str, Any], str]]) -> None:
+        """저장할 수 없는 문서를 dead-letter JSONL에 추가 (기록하지 못하면 문서를 error 로그로 남김)."""
+        now = datetime.utcnow().isoformat()
+        lines = "".join(
+            json.dumps(
+                {"collection": collection_name, "error": error, "failed_at": now, "document": doc},
+                ensure_ascii=False,
+                default=str
+            ) + "\n"
+            for doc, error in rejected
+        )
+        with self._lock:
+            self._stats["dead_lettered"] += len(rejected)
+        logger.error(f"Dead-lettering {len(rejected)} buffered {collection_name} writes: {rejected[0][1]}")
+        if not self.dead_letter_path:
+            logger.error(f"No dead-letter path configured, documents follow:\n{lines}")
+            return
+        try:
+            os.makedirs(os.path.dirname(self.dead_letter_path) or ".", exist_ok=True)
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            logger.error(f"Failed to write dead-letter log ({e}), documents follow:\n{lines}")
+
+    def _reject(self, rejected: List[Tuple[Dict[str, Any], str]]) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], str]]]:
+        """서버가 거부한 문서를 (다시 시도할 문서, max_retries번 거부되어 dead-letter로 보낼 문서)로 나눔."""
+        retry, dead = [], []
+        with self._lock:
+            for doc, error in rejected:
+                attempts = self._rejections.get(id(doc), 0) + 1
+                if attempts >= self.max_retries:
+                    self._rejections.pop(id(doc), None)
+                    dead.append((doc, f"rejected {attempts} times: {error}"))
+                else:
+                    self._rejections[id(doc)] = attempts
+                    retry.append(doc)
+        return retry, dead
+
+    def _forget(self, docs: List[Dict[str, Any]]) -> None:
+        if self._rejections:
+            with self._lock:
+                for doc in docs:
+                    self._rejections.pop(id(doc), None)
+
+    def _write_each(self, collection, docs: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]], List[Tuple[Dict[str, Any], str]], List[Tuple[Dict[str, Any], str]]]:
+        """
+        문서별 insert_one (batch에 저장할 수 없는 문서가 섞였을 때).
+
+        Returns:
+            (저장된 수, 연결 오류로 저장하지 못한 문서, 서버가 거부한 (문서, 오류), 저장할 수 없는 (문서, 오류))
+        """
+        written, failed, rejected, invalid = 0, [], [], []
+        for position, doc in enumerate(docs):
+            try:
+                collection.insert_one(doc)
+                written += 1
+            except DuplicateKeyError:
+                written += 1
+            except (InvalidDocument, DocumentTooLarge) as e:
+                invalid.append((doc, f"{type(e).__name__}: {e}"))
+            except WriteError as e:
+                rejected.append((doc, str(e)))
+            except PyMongoError as e:
+                # 연결 오류면 남은 문서는 순서대로 다음 flush에서 다시 시도
+                logger.warning(f"Retrying {len(docs) - position} buffered writes: {e}")
+                failed = docs[position:]
+                break
+        return written, failed, rejected, invalid
+
+    def _write_batch(self, collection_name: str, docs: List[Dict[str, Any]]) -> bool:
+        """
+        batch 저장 (실패한 문서는 대기열로 되돌리고, 저장할 수 없는 문서는 dead-letter로 보냄).
+
+        Returns:
+            batch 전체가 처리되었으면 True
+        """
+        from app.memory.mongo.client import get_collection
+
+        collection = get_collection(collection_name)
+        rejected, invalid = [], []
+        try:
+            collection.insert_many(docs, ordered=False)
+            written, failed = len(docs), []
+        except BulkWriteError as e:
+            rejected = [
+                (docs[error["index"]], error.get("errmsg", str(error.get("code"))))
+                for error in e.details.get("writeErrors", [])
+                if error.get("code") != DUPLICATE_KEY_ERROR
+            ]
+            written, failed = len(docs) - len(rejected), []
+        except (InvalidDocument, DocumentTooLarge) as e:
+            # 문서 하나를 인코딩할 수 없어도 insert_many 전체가 실패하므로 문서별로 다시 저장
+            logger.warning(f"Writing {len(docs)} buffered {collection_name} documents one by one: {e}")
+            written, failed, rejected, invalid = self._write_each(collection, docs)
+        except PyMongoError as e:
+            written, failed = 0, docs
+            logger.warning(f"Retrying {len(docs)} buffered {collection_name} writes: {e}")
+
+        retry, dead = self._reject(rejected) if rejected else ([], [])
+        if retry:
+            logger.warning(f"Retrying {len(retry)} buffered {collection_name} writes: {rejected[0][1]}")
+        if dead or invalid:
+            self._dead_letter(collection_name, invalid + dead)
+        settled = {id(doc) for doc in failed + retry}
+        self._forget([doc for doc in docs if id(doc) not in settled])
+
+        with self._lock:
+            self._stats["written"] += written
+            self._stats["batches"] += 1
+        # 원래 순서대로 되돌림
+        failed = [doc for doc in docs if id(doc) in settled]
+        if failed:
+            self._requeue(collection_name, failed)
+            return False
+        return True
+
+    def flush(self, collection_name: Optional[str] = None) -> int:
+        """
+        대기 중인 문서를 모두 저장 시도 (collection별로 실패한 batch가 있으면 다음 flush로 미룸).
+
+        Args:
+            collection_name: 지정하면 해당 collection만 flush
+
+        Returns:
+            남아 있는 대기 문서 수
+        """
+        with self._flush_lock:
+            with self._lock:
+                collection_names = [collection_name] if collection_name else list(self._pending)
+            for name in collection_names:
+                while True:
+                    docs = self._take_batch(name)
+                    if not docs or not self._write_batch(name, docs):
+                        break
+        with self._lock:
+            return self._pending_count_locked()
+
+    def _run(self) -> None:
+        interval_s = self.flush_interval_ms / 1000
+        while not self._stop.is_set():
+            self._wakeup.wait(timeout=interval_s)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Write buffer flush failed: {e}")
+                time.sleep(interval_s)
+
+    def start(self) -> None:
+        """background flush thread 시작."""
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mongo-write-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> int:
+        """flush thread 종료 후 남은 문서 flush (shutdown용, 남은 대기 문서 수 반환)."""
+        if self._thread is not None:
+            self._stop.set()
+            self._wakeup.set()
+            self._thread.join(timeout=5)
+            self._thread = None
+        remaining = self.flush()
+        if remaining:
+            logger.error(f"Write buffer stopped with {remaining} unwritten documents")
+        return remaining
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "pending": self._pending_count_locked(),
+                "batch_size": self.batch_size,
+                "flush_interval_ms": self.flush_interval_ms,
+                **self._stats
+            }
+
+
+write_buffer = WriteBuffer(
+    enabled=settings.write_buffer_enabled,
+    batch_size=settings.write_buffer_batch_size,
+    flush_interval_ms=settings.write_buffer_flush_interval_ms,
+    max_pending=settings.write_buffer_max_pending,
+    max_retries=settings.write_buffer_max_retries,
+    dead_letter_path=settings.write_buffer_dead_letter_path
+)
@@ -76,6 +76,22 @@ class FAISSManager:
         
         return vector_ids
     
+    def remove_vectors(self, vector_ids: List[int]) -> int:
+        """
+        Index에서 vector 삭제.
+        
+        IndexFlat은 삭제 후 뒤쪽 vector의 id가 앞으로 당겨지므로 MetadataStore.remove와 함께 사용해야 합니다.
+        """
+        if self.index is None:
+            raise RuntimeError("Index not initialized. Call create_index() or load_index() first.")
+        
+        if not vector_ids:
+            return 0
+        
+        removed = self.index.remove_ids(np.asarray(sorted(set(vector_ids)), dtype=np.int64))
+        self.vector_count = self.index.ntotal
+        return int(removed)
+    
     def search(self, query_vector: np.ndarray, top_k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
         """
         Search for similar vectors.
@@ -110,13 +126,25 @@ class FAISSManager:
         
         return distances, indices
     
+    def reconstruct_vectors(self, vector_ids: List[int]) -> np.ndarray:
+        """저장된(정규화된) vector 조회, shape (len(vector_ids), D)."""
+        if self.index is None:
+            raise RuntimeError("Index not initialized. Call create_index() or load_index() first.")
+        
+        if not vector_ids:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        
+        return self.index.reconstruct_batch(np.asarray(vector_ids, dtype=np.int64))
+    
     def save_index(self) -> None:
         """Index를 디스크에 저장."""
         if self.index is None:
             raise RuntimeError("Index not initialized. Cannot save.")
         
         os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
-        faiss.write_index(self.index, self.index_path)
+        tmp_path = f"{self.index_path}.tmp"
+        faiss.write_index(self.index, tmp_path)
+        os.replace(tmp_path, self.index_path)
     
     def get_vector_count(self) -> int:
         """Index의 vector 개수 조회."""
@@ -0,0 +1,206 @@
+"""
+FAISS index별 in-process BM25 inverted index.
+
+Vector metadata(episodic content 요약, persona/world chunk, persona fact 내용)를 단어 단위로 색인하여
+이름, item/quest id처럼 embedding으로 잘 잡히지 않는 정확한 단어를 검색합니다. vector_id와 같은
+위치 번호를 사용하므로 검색 전에 색인된 레코드 전체를 metadata와 비교해, 뒤에 추가만 된 경우에는 새
+레코드만 색인하고 그 외의 변경은 다시 만듭니다. embedding 호출이 없으므로 embedding API가 느리거나
+실패해도 사용할 수 있습니다.
+"""
+import math
+import operator
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# BM25 parameters (Okapi 기본값)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """소문자 단어 토큰 (quest_001처럼 밑줄로 이어진 id는 한 토큰)."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def record_text(record: Dict[str, Any]) -> str:
+    """색인할 metadata 텍스트 (persona fact는 content, 나머지는 summary)."""
+    return record.get('content') or record.get('summary') or ''
+
+
+def _record_key(record: Dict[str, Any]) -> Tuple[Any, Any, str]:
+    return record.get('source_type'), record.get('source_id'), record_text(record)
+
+
+class LexicalIndex:
+    """metadata 레코드 목록에 대한 BM25 index (문서 번호 = vector_id)."""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_lengths: List[int] = []
+        self.total_length = 0
+        # 색인된 레코드 (위치 = vector_id)와 그 key - 같은 dict 객체면 key 비교를 생략
+        self._records: List[Dict[str, Any]] = []
+        self._keys: List[Tuple[Any, Any, str]] = []
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lengths: Optional[np.ndarray] = None
+        self._lock = threading.RLock()
+
+    @property
+    def count(self) -> int:
+        return len(self.doc_lengths)
+
+    def _extends(self, metadata: List[Dict[str, Any]]) -> bool:
+        """
+        metadata가 색인된 레코드 뒤에 추가만 된 목록인지 (모든 위치를 비교).
+
+        같은 dict 객체인 위치는 한 번에 건너뛰고, 다시 로드되어 객체가 바뀐 위치만 (source, 색인 텍스트)로
+        비교합니다. key가 같으면 새 객체를 기억하므로 같은 목록의 다음 검색은 identity 비교만 합니다.
+        """
+        count = self.count
+        if count > len(metadata):
+            return False
+        if all(map(operator.is_, self._records, metadata[:count])):
+            return True
+        for position in range(count):
+            record = metadata[position]
+            if record is self._records[position]:
+                continue
+            if _record_key(record) != self._keys[position]:
+                return False
+            self._records[position] = record
+        return True
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        for record in records:
+            doc_id = len(self.doc_lengths)
+            key = _record_key(record)
+            self._records.append(record)
+            self._keys.append(key)
+            tokens = tokenize(key[2])
+            for token in tokens:
+                docs = self.postings.setdefault(token, {})
+                docs[doc_id] = docs.get(doc_id, 0) + 1
+                self._arrays.pop(token, None)
+            self.doc_lengths.append(len(tokens))
+            self.total_length += len(tokens)
+        self._lengths = None
+
+    def sync(self, metadata: List[Dict[str, Any]]) -> None:
+        """
+        metadata와 일치하도록 색인 갱신.
+
+        파일 mtime 대신 레코드를 직접 비교하므로 mtime 해상도와 무관하게 중간 삭제, 위치의 레코드 교체,
+        삭제 후 추가를 모두 감지합니다. 레코드 dict의 색인 텍스트(content/summary)는 제자리에서 바꾸지
+        않아야 합니다 (중복 병합은 importance 등 색인하지 않는 필드만 갱신).
+        """
+        with self._lock:
+            if not self._extends(metadata):
+                self.postings = {}
+                self.doc_lengths = []
+                self.total_length = 0
+                self._records = []
+                self._keys = []
+                self._arrays = {}
+            self._append(metadata[self.count:])
+
+    def _posting_arrays(self, token: str) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(token)
+        if arrays is None:
+            docs = self.postings[token]
+            arrays = (
+                np.fromiter(docs.keys(), dtype=np.int64, count=len(docs)),
+                np.fromiter(docs.values(), dtype=np.float64, count=len(docs))
+            )
+            self._arrays[token] = arrays
+        return arrays
+
+    def search(
+        self,
+        query_text: str,
+        top_k: int = 10,
+        predicate: Optional[Callable[[int], bool]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        BM25 점수 상위 문서.
+
+        Args:
+            query_text: 검색 쿼리
+            top_k: 반환할 문서 수
+            predicate: 문서 번호를 받아 후보에 포함할지 판단 (점수 순으로 top_k개가 찰 때까지 적용)
+
+        Returns:
+            [(vector_id, score)] (점수 내림차순)
+        """
+        with self._lock:
+            count = self.count
+            tokens = [token for token in set(tokenize(query_text)) if token in self.postings]
+            if count == 0 or not tokens:
+                return []
+
+            if self._lengths is None:
+                self._lengths = np.asarray(self.doc_lengths, dtype=np.float64)
+            average_length = self.total_length / count or 1.0
+            norms = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths / average_length)
+
+            scores = np.zeros(count)
+            for token in tokens:
+                doc_ids, freqs = self._posting_arrays(token)
+                idf = math.log(1 + (count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+                scores[doc_ids] += idf * freqs * (BM25_K1 + 1) / (freqs + norms[doc_ids])
+
+        matched = np.flatnonzero(scores)
+        # 흔한 단어는 대부분의 문서에 매칭되므로 상위 일부만 정렬하고, predicate로 부족하면 범위를 넓힘
+        shortlist = max(top_k * 4, 64)
+        while len(matched) > shortlist:
+            head = matched[np.argpartition(-scores[matched], shortlist)[:shortlist]]
+            hits = self._collect(head, scores, top_k, predicate)
+            if len(hits) >= top_k:
+                return hits
+            shortlist *= 8
+        return self._collect(matched, scores, top_k, predicate)
+
+    @staticmethod
+    def _collect(
+        doc_ids: np.ndarray,
+        scores: np.ndarray,
+        top_k: int,
+        predicate: Optional[Callable[[int], bool]]
+    ) -> List[Tuple[int, float]]:
+        ranked = doc_ids[np.argsort(-scores[doc_ids], kind='stable')]
+        hits = []
+        for doc_id in ranked:
+            if predicate is not None and not predicate(int(doc_id)):
+                continue
+            hits.append((int(doc_id), float(scores[doc_id])))
+            if len(hits) >= top_k:
+                break
+        return hits
+
+
+_indexes: Dict[str, LexicalIndex] = {}
+_indexes_guard = threading.Lock()
+
+
+def search_index(
+    index_name: str,
+    metadata: List[Dict[str, Any]],
+    query_text: str,
+    top_k: int = 10,
+    predicate: Optional[Callable[[int], bool]] = None
+) -> List[Tuple[int, float]]:
+    """
+    index별 process 공유 BM25 index를 metadata와 일치하도록 갱신한 뒤 검색.
+
+    여러 Vectorizer가 서로 다른 시점의 metadata로 호출할 수 있으므로 갱신과 검색을 같은 lock 안에서 합니다.
+    """
+    with _indexes_guard:
+        index = _indexes.get(index_name)
+        if index is None:
+            index = _indexes[index_name] = LexicalIndex()
+    with index._lock:
+        index.sync(metadata)
+        return index.search(query_text, top_k, predicate)
@@ -15,6 +15,16 @@ class MetadataStore:
         self.meta_path = os.path.join(settings.faiss_meta_dir, f"{index_name}.jsonl")
         self.metadata: List[Dict[str, Any]] = []
     
+    @property
+    def metadata(self) -> List[Dict[str, Any]]:
+        return self._metadata
+    
+    @metadata.setter
+    def metadata(self, records: List[Dict[str, Any]]) -> None:
+        self._metadata = records
+        # npc_id별 episodic vector_id 목록 (필요할 때 만들고, add는 이어서 갱신, 그 외 변경은 다시 만듦)
+        self._episodic_by_npc: Optional[Dict[str, List[int]]] = None
+    
     def load(self) -> None:
         """JSONL 파일에서 메타데이터 로드."""
         self.metadata = []
@@ -31,9 +41,12 @@ class MetadataStore:
         """메타데이터를 JSONL 파일에 저장."""
         os.makedirs(os.path.dirname(self.meta_path), exist_ok=True)
         
-        with open(self.meta_path, 'w', encoding='utf-8') as f:
+        # 임시 파일에 쓴 뒤 교체 (동시에 load하는 reader가 잘린 파일을 읽지 않도록)
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             for record in self.metadata:
                 f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.meta_path)
     
     def add(self, record: Dict[str, Any]) -> int:
         """메타데이터 레코드 추가."""
@@ -43,15 +56,41 @@ class MetadataStore:
         vector_id = len(self.metadata)
         record['vector_id'] = vector_id
         self.metadata.append(record)
+        if self._episodic_by_npc is not None and record.get('source_type') == 'episodic':
+            self._episodic_by_npc.setdefault(record.get('npc_id'), []).append(vector_id)
         
         return vector_id
     
+    def remove(self, vector_ids: List[int]) -> int:
+        """메타데이터 레코드 삭제 후 남은 레코드의 vector_id를 위치 순서대로 다시 매김."""
+        targets = set(vector_ids)
+        kept = [record for i, record in enumerate(self.metadata) if i not in targets]
+        removed = len(self.metadata) - len(kept)
+        
+        for vector_id, record in enumerate(kept):
+            record['vector_id'] = vector_id
+        self.metadata = kept
+        
+        return removed
+    
     def get(self, vector_id: int) -> Optional[Dict[str, Any]]:
         """vector_id로 메타데이터 조회."""
         if 0 <= vector_id < len(self.metadata):
             return self.metadata[vector_id]
         return None
     
+    def recent_episodic_ids(self, npc_id: str, limit: int) -> List[int]:
+        """NPC의 episodic 레코드 vector_id 최신순 최대 limit개 (전체 metadata를 훑지 않음)."""
+        if self._episodic_by_npc is None:
+            by_npc: Dict[str, List[int]] = {}
+            for vector_id, record in enumerate(self.metadata):
+                if record.get('source_type') == 'episodic':
+                    by_npc.setdefault(record.get('npc_id'), []).append(vector_id)
+            self._episodic_by_npc = by_npc
+        if limit <= 0:
+            return []
+        return self._episodic_by_npc.get(npc_id, [])[-limit:][::-1]
+    
     def get_by_source_id(self, source_type: str, source_id: str) -> List[Dict[str, Any]]:
         """Source의 모든 메타데이터 레코드 조회."""
         return [
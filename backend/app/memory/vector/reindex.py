@@ -0,0 +1,439 @@
+"""
+Vector index 재구성 job.
+
+Mongo 문서를 _id 순서로 batch streaming하고 embedding_service.batch_size 단위로 나눈 텍스트를
+여러 thread에서 동시에 embedding하여 shadow index({index}.index.shadow, {index}.jsonl.shadow)에
+쌓습니다. 주기적으로 shadow 파일과 checkpoint({index}.reindex.json)를 저장하므로 process가
+중단되어도 마지막 checkpoint부터 이어서 구축합니다. 구축이 끝나면 index별 write lock 안에서
+shadow 파일을 live 파일로 교체하므로 재구성 중에도 기존 index로 검색할 수 있습니다.
+
+persona/world 수정 시에는 sync_source가 해당 문서의 chunk만 content hash로 비교하여 갱신합니다.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from bson import json_util
+from app.core.config import settings
+from app.services.embedding_service import embedding_service
+from app.memory.vector.faiss_manager import FAISSManager
+from app.memory.vector.metadata_store import MetadataStore
+from app.memory.vector.vectorizer import (
+    Vectorizer,
+    _write_lock,
+    episodic_record,
+    persona_records,
+    world_records,
+    persona_fact_record,
+)
+
+logger = logging.getLogger(__name__)
+
+Record = Tuple[str, Dict[str, Any]]
+
+INDEX_TYPES = ['episodic', 'persona', 'world']
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value or '')
+
+
+def _episodic_doc_records(doc: Dict[str, Any]) -> List[Record]:
+    text, metadata = episodic_record(
+        memory_id=doc['memory_id'],
+        npc_id=doc['npc_id'],
+        content=doc['content'],
+        importance=doc.get('importance', 0.5),
+        created_at=_isoformat(doc.get('created_at'))
+    )
+    # 중복 memory 병합 정보 (recency 점수에 사용)
+    if doc.get('last_seen_at'):
+        metadata['last_seen_at'] = _isoformat(doc['last_seen_at'])
+        metadata['repeat_count'] = doc.get('repeat_count', 0)
+    return [(text, metadata)]
+
+
+def _persona_doc_records(doc: Dict[str, Any]) -> List[Record]:
+    return persona_records(doc['persona_id'], {
+        'traits': doc.get('traits', []),
+        'habits': doc.get('habits', []),
+        'goals': doc.get('goals', []),
+        'background': doc.get('background', ''),
+        'speech_style': doc.get('speech_style', ''),
+        'constraints': doc.get('constraints', {}),
+        'created_at': _isoformat(doc.get('created_at'))
+    })
+
+
+def _fact_doc_records(doc: Dict[str, Any]) -> List[Record]:
+    return [persona_fact_record(doc)]
+
+
+def _world_doc_records(doc: Dict[str, Any]) -> List[Record]:
+    return world_records(doc['world_id'], {
+        'rules': doc.get('rules', {}),
+        'locations': doc.get('locations', {}),
+        'danger_levels': doc.get('danger_levels', {}),
+        'global_constraints': doc.get('global_constraints', {}),
+        'created_at': _isoformat(doc.get('created_at'))
+    })
+
+
+# index별 (collection, query, 문서 -> records) - persona index에는 persona fact vector도 포함
+SOURCES: Dict[str, List[Tuple[str, Dict[str, Any], Callable[[Dict[str, Any]], List[Record]]]]] = {
+    # 통합된(consolidated_into) memory는 summary memory로 대체되었으므로 제외
+    'episodic': [('episodic_memory', {"memory_type": "long_term", "consolidated_into": {"$exists": False}}, _episodic_doc_records)],
+    'persona': [
+        ('persona_profiles', {}, _persona_doc_records),
+        ('persona_facts', {}, _fact_doc_records),
+    ],
+    'world': [('world_knowledge', {}, _world_doc_records)],
+}
+
+
+# 문서 수정 시 incremental 동기화 대상: source_type -> (index, collection, id field, 문서 -> records)
+SYNC_SOURCES = {
+    'persona': ('persona', 'persona_profiles', 'persona_id', _persona_doc_records),
+    'world': ('world', 'world_knowledge', 'world_id', _world_doc_records),
+}
+
+# metadata source_type -> (collection, source_id field)
+SOURCE_COLLECTIONS = {
+    'episodic': ('episodic_memory', 'memory_id'),
+    'persona': ('persona_profiles', 'persona_id'),
+    'persona_fact': ('persona_facts', 'fact_id'),
+    'world': ('world_knowledge', 'world_id'),
+}
+
+# $in 한 번에 넣을 source_id 수
+SOURCE_ID_CHUNK = 500
+
+
+def _existing_sources(keys: List[Tuple[Any, Any]]) -> set:
+    """(source_type, source_id) 중 Mongo에 문서가 남아 있는 key."""
+    from app.memory.mongo.client import get_collection
+
+    existing = set()
+    by_type: Dict[Any, List[Any]] = {}
+    for source_type, source_id in keys:
+        by_type.setdefault(source_type, []).append(source_id)
+    for source_type, source_ids in by_type.items():
+        if source_type not in SOURCE_COLLECTIONS:
+            continue
+        collection_name, field = SOURCE_COLLECTIONS[source_type]
+        collection = get_collection(collection_name)
+        for i in range(0, len(source_ids), SOURCE_ID_CHUNK):
+            chunk = source_ids[i:i + SOURCE_ID_CHUNK]
+            for doc in collection.find({field: {"$in": chunk}}, {"_id": 0, field: 1}):
+                existing.add((source_type, doc[field]))
+    return existing
+
+
+def _record_key(metadata: Dict[str, Any]) -> Tuple[Any, Any]:
+    return metadata.get('source_type'), metadata.get('source_id')
+
+
+class ShadowIndex:
+    """재구성 중인 index의 shadow 파일과 checkpoint."""
+
+    def __init__(self, index_name: str):
+        self.index_name = index_name
+        self.faiss_manager = FAISSManager(index_name, settings.openai_embedding_dim)
+        self.metadata_store = MetadataStore(index_name)
+        self.live_index_path = self.faiss_manager.index_path
+        self.live_meta_path = self.metadata_store.meta_path
+        self.faiss_manager.index_path = f"{self.live_index_path}.shadow"
+        self.metadata_store.meta_path = f"{self.live_meta_path}.shadow"
+        self.checkpoint_path = os.path.join(settings.faiss_index_dir, f"{index_name}.reindex.json")
+
+    def load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """저장된 checkpoint (없거나 embedding dimension이 바뀌었으면 None)."""
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpoint = json_util.loads(f.read())
+        if checkpoint.get('dimension') != settings.openai_embedding_dim:
+            return None
+        return checkpoint
+
+    def start(self, checkpoint: Optional[Dict[str, Any]]) -> bool:
+        """
+        checkpoint 시점의 shadow index를 로드 (checkpoint나 shadow 파일이 없으면 빈 index).
+
+        Returns:
+            checkpoint부터 이어서 구축하는지 여부
+        """
+        if checkpoint is None or not self.faiss_manager.load_index():
+            self.faiss_manager.create_index()
+            self.metadata_store.clear()
+            return False
+
+        self.metadata_store.load()
+        # checkpoint 이후에 저장된 vector는 다시 구축하므로 잘라냄
+        count = checkpoint['count']
+        if self.faiss_manager.get_vector_count() < count or self.metadata_store.count() < count:
+            raise RuntimeError(f"Shadow index for {self.index_name} is behind its checkpoint")
+        self.faiss_manager.remove_vectors(list(range(count, self.faiss_manager.get_vector_count())))
+        self.metadata_store.metadata = self.metadata_store.metadata[:count]
+        return True
+
+    def add(self, records: List[Record], embeddings: np.ndarray) -> None:
+        self.faiss_manager.add_vectors(embeddings)
+        for _, metadata in records:
+            self.metadata_store.add(metadata)
+
+    def count(self) -> int:
+        return self.metadata_store.count()
+
+    def save_checkpoint(self, source_index: int, last_id: Any) -> None:
+        """shadow 파일 저장 후 checkpoint 기록 (checkpoint는 항상 저장된 shadow보다 앞서지 않음)."""
+        self.faiss_manager.save_index()
+        self.metadata_store.save()
+
+        checkpoint = {
+            'index_type': self.index_name,
+            'source_index': source_index,
+            'last_id': last_id,
+            'count': self.count(),
+            'dimension': settings.openai_embedding_dim,
+            'updated_at': datetime.utcnow()
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json_util.dumps(checkpoint))
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _catch_up(self, refreshed: set) -> int:
+        """
+        재구성 중 live index에 추가되어 shadow에 없는 source의 vector를 shadow로 복사.
+
+        refreshed source(재구성 중 sync_source로 갱신된 key)는 shadow의 vector를 버리고 live vector를
+        사용합니다. Mongo에서 이미 삭제된 source의 vector는 복사하지 않습니다.
+        """
+        live_index = FAISSManager(self.index_name, settings.openai_embedding_dim)
+        try:
+            if not live_index.load_index():
+                return 0
+        except ValueError:
+            # dimension이 바뀐 live index는 복사하지 않음
+            return 0
+        live_metadata = MetadataStore(self.index_name)
+        live_metadata.load()
+        if live_index.get_vector_count() != live_metadata.count():
+            logger.warning(f"Live index {self.index_name} is out of sync with its metadata; skipping catch-up")
+            return 0
+
+        outdated = [
+            vector_id for vector_id, metadata in enumerate(self.metadata_store.metadata)
+            if _record_key(metadata) in refreshed
+        ]
+        if outdated:
+            self.faiss_manager.remove_vectors(outdated)
+            self.metadata_store.remove(outdated)
+
+        built = {_record_key(metadata) for metadata in self.metadata_store.metadata}
+        candidates = [
+            vector_id for vector_id, metadata in enumerate(live_metadata.metadata)
+            if _record_key(metadata) not in built
+        ]
+        existing = _existing_sources(list({_record_key(live_metadata.metadata[i]) for i in candidates}))
+        missing = [vector_id for vector_id in candidates if _record_key(live_metadata.metadata[vector_id]) in existing]
+        if not missing:
+            return 0
+
+        vectors = np.vstack([live_index.index.reconstruct(vector_id) for vector_id in missing])
+        self.faiss_manager.add_vectors(vectors)
+        for vector_id in missing:
+            metadata = dict(live_metadata.metadata[vector_id])
+            self.metadata_store.add(metadata)
+        return len(missing)
+
+    def swap(self) -> int:
+        """
+        shadow index를 live index로 교체하고 checkpoint 삭제.
+
+        Returns:
+            교체 직전에 live index에서 복사한 vector 수
+        """
+        with _write_lock(self.index_name):
+            with _running_lock:
+                refreshed = _refreshed_sources.pop(self.index_name, set())
+            copied = self._catch_up(refreshed)
+            self.faiss_manager.save_index()
+            self.metadata_store.save()
+            # reader는 index mtime으로 변경을 감지하므로 메타데이터를 먼저 교체
+            os.replace(self.metadata_store.meta_path, self.live_meta_path)
+            os.replace(self.faiss_manager.index_path, self.live_index_path)
+        self.discard()
+        return copied
+
+    def discard(self) -> None:
+        """checkpoint와 남은 shadow 파일 삭제."""
+        for path in (self.checkpoint_path, self.faiss_manager.index_path, self.metadata_store.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _stream(collection_name: str, query: Dict[str, Any], last_id: Any, batch_size: int):
+    """_id 오름차순으로 last_id 이후 문서를 batch_size개씩 조회."""
+    from app.memory.mongo.client import get_collection
+
+    collection = get_collection(collection_name)
+    while True:
+        batch_query = dict(query)
+        if last_id is not None:
+            batch_query["_id"] = {"$gt": last_id}
+        docs = list(collection.find(batch_query).sort("_id", 1).limit(batch_size))
+        if not docs:
+            return
+        yield docs
+        last_id = docs[-1]["_id"]
+
+
+def _embed_parallel(pool: ThreadPoolExecutor, texts: List[str]) -> np.ndarray:
+    """batch_size개 단위로 나눈 텍스트를 pool에서 동시에 embedding (입력 순서 유지)."""
+    size = embedding_service.batch_size
+    slices = [texts[i:i + size] for i in range(0, len(texts), size)]
+    return np.vstack(list(pool.map(embedding_service.embed, slices)))
+
+
+def rebuild_index(job, index_type: str, resume: bool = True) -> Dict[str, Any]:
+    """
+    Mongo 문서로 index_type index 재구성 (JobManager.submit용).
+
+    Args:
+        job: 진행 상황을 기록할 Job
+        index_type: episodic, persona, world
+        resume: checkpoint가 있으면 이어서 구축 (False면 처음부터)
+
+    Returns:
+        {"index_type", "vectors_indexed", "documents", "copied_from_live", "resumed"}
+    """
+    from app.memory.mongo.write_buffer import write_buffer
+
+    with _running_lock:
+        _refreshed_sources[index_type] = set()
+
+    shadow = ShadowIndex(index_type)
+    checkpoint = shadow.load_checkpoint() if resume else None
+    if checkpoint is None:
+        shadow.discard()
+    if not shadow.start(checkpoint):
+        checkpoint = None
+
+    # 대기 중인 long-term memory insert가 streaming에서 빠지지 않도록 먼저 flush
+    write_buffer.flush()
+
+    start_source = checkpoint['source_index'] if checkpoint else 0
+    last_id = checkpoint['last_id'] if checkpoint else None
+    documents = 0
+    last_checkpoint = time.monotonic()
+    job.update(stage="building", resumed=checkpoint is not None, vectors=shadow.count(), documents=0)
+
+    with ThreadPoolExecutor(max_workers=settings.reindex_embed_concurrency, thread_name_prefix="reindex") as pool:
+        for source_index, (collection_name, query, to_records) in enumerate(SOURCES[index_type]):
+            if source_index < start_source:
+                continue
+            if source_index > start_source:
+                last_id = None
+
+            for docs in _stream(collection_name, query, last_id, settings.reindex_batch_size):
+                records = [record for doc in docs for record in to_records(doc)]
+                if records:
+                    shadow.add(records, _embed_parallel(pool, [text for text, _ in records]))
+                last_id = docs[-1]["_id"]
+                documents += len(docs)
+                job.update(source=collection_name, documents=documents, vectors=shadow.count())
+
+                if time.monotonic() - last_checkpoint >= settings.reindex_checkpoint_interval_s:
+                    shadow.save_checkpoint(source_index, last_id)
+                    last_checkpoint = time.monotonic()
+                    job.update(checkpoint_at=datetime.utcnow())
+
+    job.update(stage="swapping")
+    copied = shadow.swap()
+    job.update(stage="done", vectors=shadow.count())
+
+    return {
+        "index_type": index_type,
+        "vectors_indexed": shadow.count(),
+        "documents": documents,
+        "copied_from_live": copied,
+        "resumed": checkpoint is not None
+    }
+
+
+_running: Dict[str, Any] = {}
+# 재구성 중인 index별로 sync_source가 갱신한 (source_type, source_id)
+_refreshed_sources: Dict[str, set] = {}
+_running_lock = threading.Lock()
+
+
+def start_reindex(index_type: str, resume: bool = True) -> Tuple[Any, bool]:
+    """
+    index_type 재구성 job 시작.
+
+    Returns:
+        (job, started) - 같은 index의 재구성이 이미 실행 중이면 (그 job, False)
+    """
+    from app.services.jobs import job_manager
+
+    with _running_lock:
+        job = _running.get(index_type)
+        if job is not None and not job.finished:
+            return job, False
+        job = job_manager.submit("reindex", rebuild_index, index_type=index_type, resume=resume)
+        _running[index_type] = job
+        return job, True
+
+
+def resume_pending_reindexes() -> List[Any]:
+    """checkpoint가 남아 있는 (중단된) 재구성 job을 다시 시작."""
+    jobs = []
+    for index_type in INDEX_TYPES:
+        if ShadowIndex(index_type).load_checkpoint() is not None:
+            logger.info(f"Resuming interrupted reindex of {index_type} index")
+            job, _ = start_reindex(index_type, resume=True)
+            jobs.append(job)
+    return jobs
+
+
+def mark_refreshed(index_type: str, keys: List[Tuple[str, str]]) -> None:
+    """
+    index_type 재구성 중이면 (source_type, source_id)를 교체 시 live vector로 대체할 source로 표시.
+
+    live index를 바꾸기 전에 호출해야 shadow에 이미 들어간 이전 vector가 교체 후 남지 않습니다.
+    """
+    with _running_lock:
+        running = _running.get(index_type)
+        if running is not None and not running.finished:
+            _refreshed_sources.setdefault(index_type, set()).update(keys)
+
+
+def sync_source(job, source_type: str, source_id: str) -> Dict[str, Any]:
+    """
+    persona/world 문서의 현재 내용으로 chunk vector를 incremental 갱신 (JobManager.submit용).
+
+    여러 번 수정되어도 job마다 Mongo의 최신 문서를 읽으므로 마지막 수정 내용으로 수렴합니다.
+    문서가 삭제되었으면 source의 vector를 모두 제거합니다.
+
+    Returns:
+        {"index_type", "source_id", "kept", "added", "removed"}
+    """
+    from app.memory.mongo.client import get_collection
+
+    index_type, collection_name, field, to_records = SYNC_SOURCES[source_type]
+
+    # 재구성 중이면 교체 시 shadow 대신 이 source의 live vector를 사용하도록 표시 (live 갱신 전에 표시)
+    mark_refreshed(index_type, [(source_type, source_id)])
+
+    doc = get_collection(collection_name).find_one({field: source_id})
+    records = to_records(doc) if doc is not None else []
+    result = Vectorizer(index_type).sync_source_vectors(source_type, source_id, records)
+    job.update(**result)
+
+    return {"index_type": index_type, "source_id": source_id, **result}
@@ -1,9 +1,14 @@
 """Vector memory retrieval 전략."""
+import logging
 from typing import List, Dict, Any, Optional, Set
+import numpy as np
 from app.memory.vector.vectorizer import Vectorizer
+from app.core.config import settings
 from app.services.embedding_service import embedding_service
+from app.memory.vector.scoring import RetrievalWeights, score_candidates, mmr_select
 from app.schemas.persona import PersonaFactDimension
 
+logger = logging.getLogger(__name__)
 
 class VectorRetriever:
     """Vector index에서 관련 memory 검색."""
@@ -108,7 +113,7 @@ class VectorRetriever:
         
         for result in results:
             result = result.copy()
-            original_score = result.get('similarity_score', 0.0)
+            original_score = result.get('ranking_score', 0.0)
             
             # PersonaFact인 경우 부스팅
             if result.get('source_type') == 'persona_fact':
@@ -119,7 +124,7 @@ class VectorRetriever:
                 if fact_dimension and fact_dimension in relevant_dimensions:
                     boosted_score += dimension_boost
                 
-                result['similarity_score'] = boosted_score
+                result['ranking_score'] = boosted_score
                 result['original_score'] = original_score
                 result['boost_applied'] = True
             
@@ -127,21 +132,118 @@ class VectorRetriever:
         
         return boosted_results
     
+    @staticmethod
+    def _visible_to_npc(result: Dict[str, Any], npc_id: str) -> bool:
+        """NPC retrieval에 포함할 결과인지 (episodic은 npc_id 일치, PersonaFact는 npc_id 일치 또는 None)."""
+        source_type = result.get('source_type')
+        if source_type == 'persona_fact':
+            fact_npc_id = result.get('npc_id')
+            return fact_npc_id is None or fact_npc_id == npc_id
+        # 기존 persona (PersonaProfile chunks)와 World knowledge는 모두 포함
+        if source_type in ('persona', 'world'):
+            return True
+        return source_type == 'episodic' and result.get('npc_id') == npc_id
+    
+    @staticmethod
+    def _rescore(results: List[Dict[str, Any]], weights: RetrievalWeights) -> List[Dict[str, Any]]:
+        """weighted 점수로 ranking_score를 바꿔 정렬 (원래 점수는 relevance_score)."""
+        scores = score_candidates(results, weights)
+        for result, score in zip(results, scores):
+            result['relevance_score'] = result.get('ranking_score', 0.0)
+            result['ranking_score'] = float(score)
+        return sorted(results, key=lambda r: r['ranking_score'], reverse=True)
+    
+    @staticmethod
+    def _diversify(vectorizer: Vectorizer, results: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """저장된 후보 vector로 MMR 재정렬하여 top_k개 선택 (같은 관찰이 반복된 memory 중복 제거)."""
+        if len(results) <= 1 or vectorizer.faiss_manager.index is None:
+            return results[:top_k]
+        
+        vectors = vectorizer.faiss_manager.reconstruct_vectors([r['vector_id'] for r in results])
+        relevance = np.fromiter((r.get('ranking_score', 0.0) for r in results), dtype=np.float64, count=len(results))
+        order = mmr_select(relevance, vectors.astype(np.float64), top_k, settings.retrieval_mmr_lambda)
+        return [results[i] for i in order]
+    
+    @staticmethod
+    def _fuse(
+        vector_results: List[Dict[str, Any]],
+        lexical_results: List[Dict[str, Any]],
+        k: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Vector/BM25 후보를 reciprocal-rank fusion으로 합침.
+        
+        fusion_score는 sum(1 / (k + rank))를 두 목록 모두 1위일 때의 값으로 나눈 0~1 값이며 이후 정렬에
+        쓰는 ranking_score가 됩니다. similarity_score는 cosine 유사도 그대로 두고 (단어 검색에만 나온
+        후보는 None), BM25 점수는 lexical_score에 남깁니다.
+        
+        Returns:
+            fusion 점수 내림차순 결과 리스트
+        """
+        fused: Dict[Any, Dict[str, Any]] = {}
+        for rank, result in enumerate(vector_results, start=1):
+            entry = fused.setdefault(result.get('vector_id'), result)
+            entry['lexical_score'] = None
+            entry['fusion_score'] = 1.0 / (k + rank)
+        for rank, result in enumerate(lexical_results, start=1):
+            entry = fused.get(result.get('vector_id'))
+            if entry is None:
+                entry = fused[result.get('vector_id')] = result
+                entry['similarity_score'] = None
+                entry['fusion_score'] = 0.0
+            entry['lexical_score'] = result['lexical_score']
+            entry['fusion_score'] += 1.0 / (k + rank)
+        
+        for entry in fused.values():
+            entry['fusion_score'] *= (k + 1) / 2
+            entry['ranking_score'] = entry['fusion_score']
+        return sorted(fused.values(), key=lambda r: r['fusion_score'], reverse=True)
+    
+    @staticmethod
+    def _fill_similarity(vectorizer: Vectorizer, results: List[Dict[str, Any]], query_embedding: Optional[np.ndarray]) -> None:
+        """단어 검색에만 나온 후보의 cosine 유사도를 저장된 vector로 계산 (query embedding이 없으면 0)."""
+        missing = [result for result in results if result.get('similarity_score') is None]
+        if not missing:
+            return
+        if query_embedding is None or vectorizer.faiss_manager.index is None:
+            for result in missing:
+                result['similarity_score'] = 0.0
+            return
+        
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(query)
+        vectors = vectorizer.faiss_manager.reconstruct_vectors([result['vector_id'] for result in missing])
+        similarity = vectors @ (query / norm if norm > 0 else query)
+        for result, score in zip(missing, similarity):
+            result['similarity_score'] = float(score)
+    
     def retrieve(
         self,
         query_text: str,
         top_k_per_index: int = 5,
         indices: Optional[List[str]] = None,
-        observation: Optional[Dict[str, Any]] = None
+        observation: Optional[Dict[str, Any]] = None,
+        npc_id: Optional[str] = None,
+        weights: Optional[RetrievalWeights] = None
     ) -> Dict[str, Any]:
         """
         Vector index에서 관련 memory 검색 (PersonaFact 부스팅 포함).
         
+        RETRIEVAL_SCORER=weighted면 index마다 top_k × RETRIEVAL_CANDIDATE_MULTIPLIER개를 가져와
+        relevance/recency/importance 점수로 다시 정렬한 뒤 top_k개를 사용합니다. 모든 source가 같은 가중
+        평균 척도이므로 index 간 병합도 이 점수로 정렬하며, 재정렬 전 점수는 relevance_scores에 남깁니다.
+        RETRIEVAL_HYBRID=true면 같은 수의 BM25 후보를 함께 가져와 rank fusion하며, query embedding이
+        실패하면 BM25 후보만 사용합니다. 정렬은 ranking_score(fusion/부스팅/weighted 점수) 기준이고
+        similarity_score는 query와의 cosine 유사도로 남습니다. query embedding은 index 수와 관계없이 한 번만 계산합니다.
+        RETRIEVAL_MMR=true면 정렬된 후보에서 MMR로 서로 다른 top_k개를 고릅니다.
+        
         Args:
             query_text: 검색 쿼리 텍스트
             top_k_per_index: 각 인덱스당 가져올 결과 수
             indices: 검색할 인덱스 리스트
             observation: 현재 관찰 (dimension 추론용)
+            npc_id: 지정하면 이 NPC가 볼 수 있는 결과만 사용
+            weights: weighted 점수 가중치 (None이면 설정 기본값)
         
         Returns:
             검색 결과 딕셔너리
@@ -149,49 +251,79 @@ class VectorRetriever:
         if indices is None:
             indices = ['episodic', 'persona', 'world']
         
+        weighted = settings.retrieval_scorer == "weighted"
+        if weighted and weights is None:
+            weights = RetrievalWeights.for_npc()
+        hybrid = settings.retrieval_hybrid
+        diverse = settings.retrieval_mmr
+        over_fetch = weighted or hybrid or diverse
+        fetch_k = top_k_per_index * settings.retrieval_candidate_multiplier if over_fetch else top_k_per_index
+        
         # 관련 dimension 추론
         relevant_dimensions = self._infer_relevant_dimensions(query_text, observation)
         
+        vectorizers = {
+            'episodic': self.episodic_vectorizer,
+            'persona': self.persona_vectorizer,
+            'world': self.world_vectorizer
+        }
+        selected = [vectorizers[name] for name in indices if name in vectorizers]
+        
+        query_embedding = None
+        if any(vectorizer.faiss_manager.index is not None for vectorizer in selected):
+            try:
+                query_embedding = embedding_service.embed_single(query_text)
+            except Exception as e:
+                if not hybrid:
+                    raise
+                logger.warning(f"Query embedding failed, using keyword retrieval only: {e}")
+        
+        visible = (lambda result: self._visible_to_npc(result, npc_id)) if npc_id is not None else None
         all_results = []
-        vector_ids = []
-        similarity_scores = []
         
-        for index_name in indices:
-            if index_name == 'episodic':
-                results = self.episodic_vectorizer.search(query_text, top_k_per_index)
-            elif index_name == 'persona':
-                results = self.persona_vectorizer.search(query_text, top_k_per_index)
-            elif index_name == 'world':
-                results = self.world_vectorizer.search(query_text, top_k_per_index)
+        for vectorizer in selected:
+            results = []
+            if query_embedding is not None:
+                results = vectorizer.search_by_vector(query_embedding, fetch_k)
+            
+            if visible is not None:
+                results = [result for result in results if visible(result)]
+            
+            if hybrid:
+                lexical_results = vectorizer.lexical_search(query_text, fetch_k, visible)
+                results = self._fuse(results, lexical_results, settings.retrieval_rrf_k)
+                self._fill_similarity(vectorizer, results, query_embedding)
             else:
-                continue
+                for result in results:
+                    result['ranking_score'] = result['similarity_score']
             
-            for result in results:
-                all_results.append(result)
-                vector_ids.append(result.get('vector_id'))
-                similarity_scores.append(result.get('similarity_score', 0.0))
-        
-        # PersonaFact 부스팅 적용
-        all_results = self._boost_persona_facts(all_results, relevant_dimensions)
+            # PersonaFact 부스팅 적용
+            results = self._boost_persona_facts(results, relevant_dimensions)
+            
+            if weighted:
+                results = self._rescore(results, weights)
+            elif over_fetch:
+                results = sorted(results, key=lambda r: r['ranking_score'], reverse=True)
+            
+            if diverse:
+                results = self._diversify(vectorizer, results, top_k_per_index)
+            elif over_fetch:
+                results = results[:top_k_per_index]
+            
+            all_results.extend(results)
         
         # 가중치 적용된 점수로 재정렬
-        sorted_results = sorted(
-            zip(all_results, vector_ids, [r.get('similarity_score', 0.0) for r in all_results]),
-            key=lambda x: x[2],
-            reverse=True
-        )
-        
-        all_results = [r[0] for r in sorted_results]
-        vector_ids = [r[1] for r in sorted_results]
-        similarity_scores = [r[2] for r in sorted_results]
+        all_results = sorted(all_results, key=lambda r: r['ranking_score'], reverse=True)
         
         return {
             'query_text': query_text,
             'indices_searched': indices,
             'top_k': top_k_per_index,
-            'retrieved_vector_ids': vector_ids,
+            'retrieved_vector_ids': [r.get('vector_id') for r in all_results],
             'retrieved_sources': all_results,
-            'similarity_scores': similarity_scores,
+            'similarity_scores': [r.get('similarity_score', 0.0) for r in all_results],
+            'relevance_scores': [r.get('relevance_score', r['ranking_score']) for r in all_results],
+            'ranking_scores': [r['ranking_score'] for r in all_results],
             'relevant_dimensions': list(relevant_dimensions)
         }
     
@@ -200,7 +332,8 @@ class VectorRetriever:
         npc_id: str,
         query_text: str,
         top_k_per_index: int = 5,
-        observation: Optional[Dict[str, Any]] = None
+        observation: Optional[Dict[str, Any]] = None,
+        weights: Optional[RetrievalWeights] = None
     ) -> Dict[str, Any]:
         """
         특정 NPC의 memory 검색 (episodic memory는 npc_id로 필터링, PersonaFact 부스팅 포함).
@@ -210,55 +343,16 @@ class VectorRetriever:
             query_text: 검색 쿼리 텍스트
             top_k_per_index: 각 인덱스당 가져올 결과 수
             observation: 현재 관찰 (dimension 추론용)
+            weights: NPC별 weighted 점수 가중치 (RetrievalWeights.for_npc)
         
         Returns:
             검색 결과 딕셔너리
         """
-        results = self.retrieve(
+        return self.retrieve(
             query_text, 
             top_k_per_index, 
             ['episodic', 'persona', 'world'],
-            observation=observation
+            observation=observation,
+            npc_id=npc_id,
+            weights=weights
         )
-        
-        filtered_results = []
-        filtered_vector_ids = []
-        filtered_scores = []
-        
-        for result, vector_id, score in zip(
-            results['retrieved_sources'],
-            results['retrieved_vector_ids'],
-            results['similarity_scores']
-        ):
-            # PersonaFact는 npc_id가 일치하거나 None인 경우 포함
-            if result.get('source_type') == 'persona_fact':
-                fact_npc_id = result.get('npc_id')
-                if fact_npc_id is None or fact_npc_id == npc_id:
-                    filtered_results.append(result)
-                    filtered_vector_ids.append(vector_id)
-                    filtered_scores.append(score)
-            # 기존 persona (PersonaProfile chunks)는 모두 포함
-            elif result.get('source_type') == 'persona':
-                filtered_results.append(result)
-                filtered_vector_ids.append(vector_id)
-                filtered_scores.append(score)
-            # World knowledge는 모두 포함
-            elif result.get('source_type') == 'world':
-                filtered_results.append(result)
-                filtered_vector_ids.append(vector_id)
-                filtered_scores.append(score)
-            # Episodic memory는 npc_id로 필터링
-            elif result.get('source_type') == 'episodic' and result.get('npc_id') == npc_id:
-                filtered_results.append(result)
-                filtered_vector_ids.append(vector_id)
-                filtered_scores.append(score)
-        
-        return {
-            'query_text': query_text,
-            'indices_searched': results['indices_searched'],
-            'top_k': top_k_per_index,
-            'retrieved_vector_ids': filtered_vector_ids,
-            'retrieved_sources': filtered_results,
-            'similarity_scores': filtered_scores,
-            'relevant_dimensions': results.get('relevant_dimensions', [])
-        }
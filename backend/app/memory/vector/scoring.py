@@ -0,0 +1,146 @@
+"""Generative Agents 방식 retrieval 점수 - relevance, recency(지수 감쇠), importance 가중 합."""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import numpy as np
+from app.core.config import settings
+
+# recency 감쇠를 적용하는 source type (persona/world 지식은 시간이 지나도 그대로이므로 recency 1)
+TIMED_SOURCE_TYPES = {'episodic'}
+
+
+class RetrievalWeights:
+    """Retrieval 점수 가중치 (NPCConfig override가 없으면 설정 기본값)."""
+
+    # 가중치 이름 -> NPCConfig/설정 필드 이름
+    FIELDS = {
+        "relevance": "retrieval_relevance_weight",
+        "recency": "retrieval_recency_weight",
+        "importance": "retrieval_importance_weight",
+        "recency_decay": "retrieval_recency_decay",
+    }
+
+    def __init__(self, relevance: float, recency: float, importance: float, recency_decay: float):
+        self.relevance = relevance
+        self.recency = recency
+        self.importance = importance
+        self.recency_decay = recency_decay
+
+    @classmethod
+    def for_npc(cls, npc_config: Any = None) -> "RetrievalWeights":
+        """NPCConfig(또는 dict)의 override를 적용한 가중치."""
+        values = {}
+        for name, field in cls.FIELDS.items():
+            override = None
+            if isinstance(npc_config, dict):
+                override = npc_config.get(field)
+            elif npc_config is not None:
+                override = getattr(npc_config, field, None)
+            values[name] = override if override is not None else getattr(settings, field)
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """ISO 문자열/datetime을 naive UTC datetime으로 (해석할 수 없으면 None)."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def age_hours(created_at: List[Any], now: Optional[datetime] = None) -> np.ndarray:
+    """created_at 목록의 경과 시간(시간 단위, 해석할 수 없거나 미래면 0)."""
+    if not created_at:
+        return np.zeros(0)
+    now = np.datetime64(now or datetime.utcnow(), 'us')
+    try:
+        # naive ISO 문자열(datetime.utcnow().isoformat())은 한 번에 변환
+        times = np.array(created_at, dtype='datetime64[us]')
+    except (ValueError, TypeError):
+        times = np.array([_parse_timestamp(value) for value in created_at], dtype='datetime64[us]')
+    ages = (now - times) / np.timedelta64(1, 'h')
+    return np.clip(np.nan_to_num(ages, nan=0.0), 0.0, None)
+
+
+def score_candidates(
+    results: List[Dict[str, Any]],
+    weights: RetrievalWeights,
+    now: Optional[datetime] = None
+) -> np.ndarray:
+    """
+    후보 metadata의 retrieval 점수.
+
+    모든 source를 (relevance, recency, importance)의 같은 가중 평균으로 계산하여 index가 달라도 점수를
+    그대로 비교할 수 있습니다. episodic memory의 recency는 recency_decay^경과 시간, 나머지 source는 1이고,
+    importance는 metadata 값(persona/world는 1.0)입니다. relevance는 후보의 ranking_score(cosine 또는
+    fusion 점수, persona fact 부스팅 포함)입니다.
+
+    Returns:
+        results 순서의 점수 배열
+    """
+    count = len(results)
+    relevance = np.fromiter((r.get('ranking_score', 0.0) for r in results), dtype=np.float64, count=count)
+    total = weights.relevance + weights.recency + weights.importance
+    if total <= 0:
+        return relevance
+
+    importance = np.fromiter((r.get('importance', 0.5) for r in results), dtype=np.float64, count=count)
+    recency = np.ones(count)
+    timed = np.fromiter((r.get('source_type') in TIMED_SOURCE_TYPES for r in results), dtype=bool, count=count)
+    if timed.any():
+        positions = np.flatnonzero(timed)
+        # 중복 memory가 병합된 경우 마지막으로 관찰된 시점 기준
+        last_seen = [results[i].get('last_seen_at') or results[i].get('created_at') for i in positions]
+        recency[positions] = np.power(weights.recency_decay, age_hours(last_seen, now))
+
+    return (
+        weights.relevance * relevance
+        + weights.recency * recency
+        + weights.importance * np.clip(importance, 0.0, 1.0)
+    ) / total
+
+
+def mmr_select(relevance: np.ndarray, vectors: np.ndarray, top_k: int, mmr_lambda: float) -> List[int]:
+    """
+    Maximal marginal relevance 순서로 후보 top_k개 선택.
+
+    매 단계 lambda × relevance - (1 - lambda) × (이미 고른 후보와의 최대 cosine 유사도)가 가장 큰 후보를
+    고릅니다 (음의 유사도는 0으로 취급). 유사도 행렬은 한 번에 계산하고 최대 유사도는 고를 때마다 벡터 연산으로 갱신합니다.
+
+    Args:
+        relevance: 후보 점수 (최댓값이 1이 되도록 나눠서 사용)
+        vectors: 후보 벡터 (L2 정규화된 FAISS 저장 값)
+        top_k: 선택할 후보 수
+        mmr_lambda: 1이면 relevance 순서, 0에 가까울수록 다양성 우선
+
+    Returns:
+        선택된 후보 위치 (선택 순서)
+    """
+    count = len(relevance)
+    top_k = min(top_k, count)
+    if top_k <= 0:
+        return []
+
+    peak = relevance.max()
+    relevance = relevance / peak if peak > 0 else relevance
+    similarity = vectors @ vectors.T
+    max_similarity = np.zeros(count)
+    available = np.ones(count, dtype=bool)
+
+    selected = []
+    for _ in range(top_k):
+        marginal = mmr_lambda * relevance - (1 - mmr_lambda) * max_similarity
+        marginal[~available] = -np.inf
+        chosen = int(np.argmax(marginal))
+        selected.append(chosen)
+        available[chosen] = False
+        max_similarity = np.maximum(max_similarity, similarity[chosen])
+    return selected
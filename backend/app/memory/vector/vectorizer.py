@@ -1,12 +1,158 @@
 """다양한 source type에 대한 vectorization 파이프라인."""
+import hashlib
 import json
+import logging
+import os
+import threading
+import functools
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from app.services.embedding_service import embedding_service
 from app.memory.vector.faiss_manager import FAISSManager
 from app.memory.vector.metadata_store import MetadataStore
+from app.memory.vector.lexical import search_index
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# 다른 process가 저장 중이어서 vector 수와 메타데이터 수가 다를 때 다시 읽는 횟수
+LOAD_ATTEMPTS = 3
+
+
+# index별 쓰기 lock (turn이 worker thread에서 동시에 실행되므로 add + save를 직렬화)
+_write_locks: Dict[str, threading.Lock] = {}
+_write_locks_guard = threading.Lock()
+
+
+def _write_lock(index_name: str) -> threading.Lock:
+    with _write_locks_guard:
+        if index_name not in _write_locks:
+            _write_locks[index_name] = threading.Lock()
+        return _write_locks[index_name]
+
+
+def _serialized_write(method):
+    """
+    Index 쓰기 메서드를 index별 lock으로 직렬화.
+
+    다른 인스턴스가 그 사이 디스크에 저장했다면 먼저 다시 로드하여 그 변경을 덮어쓰지 않습니다.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with _write_lock(self.index_name):
+            self._refresh_if_stale()
+            result = method(self, *args, **kwargs)
+            self._loaded_mtime = self._disk_mtime()
+            return result
+    return wrapper
+
+
+def content_hash(text: str) -> str:
+    """Chunk embedding text hash (내용이 같은 chunk는 다시 embedding하지 않도록 metadata에 저장)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def episodic_record(memory_id: str, npc_id: str, content: str,
+                    importance: float, created_at: str) -> Tuple[str, Dict[str, Any]]:
+    """Long-term episodic memory의 (embedding text, metadata)."""
+    return content, {
+        'source_type': 'episodic',
+        'source_id': memory_id,
+        'npc_id': npc_id,
+        'importance': importance,
+        'created_at': created_at,
+        'summary': content[:200]
+    }
+
+
+def persona_records(persona_id: str, persona_data: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Persona profile chunk별 (embedding text, metadata)."""
+    chunks = []
+    
+    if persona_data.get('traits'):
+        chunks.append(('traits', f"Personality traits: {', '.join(persona_data['traits'])}"))
+    
+    if persona_data.get('habits'):
+        chunks.append(('habits', f"Behavioral habits: {', '.join(persona_data['habits'])}"))
+    
+    if persona_data.get('goals'):
+        chunks.append(('goals', f"Long-term goals: {', '.join(persona_data['goals'])}"))
+    
+    if persona_data.get('background'):
+        chunks.append(('background', f"Background: {persona_data['background']}"))
+    
+    if persona_data.get('speech_style'):
+        chunks.append(('speech_style', f"Speech style: {persona_data['speech_style']}"))
+    
+    if persona_data.get('constraints'):
+        chunks.append(('constraints', f"Constraints: {json.dumps(persona_data['constraints'])}"))
+    
+    return [
+        (chunk, {
+            'source_type': 'persona',
+            'source_id': persona_id,
+            'npc_id': None,
+            'importance': 1.0,
+            'created_at': persona_data.get('created_at', ''),
+            'summary': chunk[:200],
+            'chunk_type': label,
+            'content_hash': content_hash(chunk)
+        })
+        for label, chunk in chunks
+    ]
+
+
+def world_records(world_id: str, world_data: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """World knowledge chunk별 (embedding text, metadata)."""
+    chunks = []
+    rules = world_data.get('rules') or {}
+    
+    for law in rules.get('laws') or []:
+        chunks.append(('law', f"Law: {law}"))
+    
+    for faction_name, faction_desc in (rules.get('factions') or {}).items():
+        chunks.append(('faction', f"Faction {faction_name}: {faction_desc}"))
+    
+    for norm in rules.get('social_norms') or []:
+        chunks.append(('social_norm', f"Social norm: {norm}"))
+    
+    for loc_name, loc_info in (world_data.get('locations') or {}).items():
+        chunks.append(('location', f"Location {loc_name}: {json.dumps(loc_info)}"))
+    
+    if world_data.get('global_constraints'):
+        chunks.append(('global_constraints', f"Global constraints: {json.dumps(world_data['global_constraints'])}"))
+    
+    return [
+        (chunk, {
+            'source_type': 'world',
+            'source_id': world_id,
+            'npc_id': None,
+            'importance': 1.0,
+            'created_at': world_data.get('created_at', ''),
+            'summary': chunk[:200],
+            'chunk_type': label,
+            'content_hash': content_hash(chunk)
+        })
+        for label, chunk in chunks
+    ]
+
+
+def persona_fact_record(fact: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """PersonaFact의 (embedding text, metadata) - embedding text에 dimension 정보 포함."""
+    dimension = fact.get('dimension', 'characteristic')
+    content = fact.get('content', '')
+    return f"[{dimension}] persona fact: {content}", {
+        'source_type': 'persona_fact',
+        'source_id': fact.get('fact_id', ''),
+        'persona_id': fact.get('persona_id', ''),
+        'npc_id': fact.get('npc_id'),
+        'dimension': dimension,
+        'content': content,
+        'source': fact.get('source', 'PeaCoK'),
+        'importance': 1.0,  # PersonaFact는 항상 중요
+        'summary': content[:200]
+    }
+
 
 class Vectorizer:
     """다양한 source type의 vectorization 처리."""
@@ -16,87 +162,60 @@ class Vectorizer:
         self.index_name = index_name
         self.faiss_manager = FAISSManager(index_name, settings.openai_embedding_dim)
         self.metadata_store = MetadataStore(index_name)
+        self._loaded_mtime = None
         
-        if self.faiss_manager.load_index():
+        with _write_lock(index_name):
+            self._load()
+    
+    def _disk_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.faiss_manager.index_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _load(self) -> None:
+        """
+        디스크의 index와 메타데이터 로드 (index write lock 안에서 호출).
+
+        writer는 두 파일을 차례로 저장하고 remove_vectors는 vector_id를 다시 매기므로, 짝이 맞지 않는
+        파일을 읽으면 검색 결과가 다른 record에 연결됩니다. vector 수와 메타데이터 수가 다르면 다시 읽습니다.
+        """
+        for _ in range(LOAD_ATTEMPTS):
+            self._loaded_mtime = self._disk_mtime()
+            if not self.faiss_manager.load_index():
+                return
             self.metadata_store.load()
+            if self.faiss_manager.get_vector_count() == self.metadata_store.count():
+                return
+        logger.warning(
+            f"Index {self.index_name} has {self.faiss_manager.get_vector_count()} vectors but "
+            f"{self.metadata_store.count()} metadata records after {LOAD_ATTEMPTS} loads. Please reindex."
+        )
+        # 다음 쓰기/조회 때 다시 로드
+        self._loaded_mtime = None
     
-    def vectorize_episodic_memory(self, memory_id: str, npc_id: str, content: str, 
-                                   importance: float, created_at: str) -> int:
-        """Long-term episodic memory vectorization."""
-        if self.faiss_manager.index is None:
-            self.faiss_manager.create_index()
-        
-        embedding = embedding_service.embed_single(content)
-        vector_ids = self.faiss_manager.add_vectors(embedding)
-        vector_id = vector_ids[0]
-        
-        metadata = {
-            'source_type': 'episodic',
-            'source_id': memory_id,
-            'npc_id': npc_id,
-            'importance': importance,
-            'created_at': created_at,
-            'summary': content[:200]
-        }
-        self.metadata_store.add(metadata)
-        
-        self.faiss_manager.save_index()
-        self.metadata_store.save()
-        
-        return vector_id
+    def _refresh_if_stale(self) -> None:
+        """로드 이후 디스크의 index가 바뀌었으면 다시 로드."""
+        if self._disk_mtime() != self._loaded_mtime:
+            self._load()
     
-    def vectorize_persona_chunks(self, persona_id: str, persona_data: Dict[str, Any]) -> List[int]:
-        """Persona profile을 여러 chunk로 vectorization."""
+    def _add_records(
+        self,
+        records: List[Tuple[str, Dict[str, Any]]],
+        embeddings: Optional[np.ndarray] = None
+    ) -> List[int]:
+        """(embedding text, metadata) 목록을 배치 embedding 후 index와 메타데이터에 추가하고 저장."""
         if self.faiss_manager.index is None:
             self.faiss_manager.create_index()
         
-        chunks = []
-        chunk_labels = []
-        
-        if persona_data.get('traits'):
-            traits_text = f"Personality traits: {', '.join(persona_data['traits'])}"
-            chunks.append(traits_text)
-            chunk_labels.append('traits')
-        
-        if persona_data.get('habits'):
-            habits_text = f"Behavioral habits: {', '.join(persona_data['habits'])}"
-            chunks.append(habits_text)
-            chunk_labels.append('habits')
-        
-        if persona_data.get('goals'):
-            goals_text = f"Long-term goals: {', '.join(persona_data['goals'])}"
-            chunks.append(goals_text)
-            chunk_labels.append('goals')
-        
-        if persona_data.get('background'):
-            chunks.append(f"Background: {persona_data['background']}")
-            chunk_labels.append('background')
-        
-        if persona_data.get('speech_style'):
-            chunks.append(f"Speech style: {persona_data['speech_style']}")
-            chunk_labels.append('speech_style')
-        
-        if persona_data.get('constraints'):
-            constraints_text = f"Constraints: {json.dumps(persona_data['constraints'])}"
-            chunks.append(constraints_text)
-            chunk_labels.append('constraints')
-        
-        if not chunks:
+        if not records:
             return []
         
-        embeddings = embedding_service.embed(chunks)
+        if embeddings is None:
+            embeddings = embedding_service.embed([text for text, _ in records])
         vector_ids = self.faiss_manager.add_vectors(embeddings)
         
-        for i, (vector_id, chunk, label) in enumerate(zip(vector_ids, chunks, chunk_labels)):
-            metadata = {
-                'source_type': 'persona',
-                'source_id': persona_id,
-                'npc_id': None,
-                'importance': 1.0,
-                'created_at': persona_data.get('created_at', ''),
-                'summary': chunk[:200],
-                'chunk_type': label
-            }
+        for _, metadata in records:
             self.metadata_store.add(metadata)
         
         self.faiss_manager.save_index()
@@ -104,63 +223,119 @@ class Vectorizer:
         
         return vector_ids
     
-    def vectorize_world_chunks(self, world_id: str, world_data: Dict[str, Any]) -> List[int]:
-        """World knowledge를 여러 chunk로 vectorization."""
-        if self.faiss_manager.index is None:
-            self.faiss_manager.create_index()
-        
-        chunks = []
-        chunk_labels = []
-        
-        if world_data.get('rules', {}).get('laws'):
-            for law in world_data['rules']['laws']:
-                chunks.append(f"Law: {law}")
-                chunk_labels.append('law')
-        
-        if world_data.get('rules', {}).get('factions'):
-            for faction_name, faction_desc in world_data['rules']['factions'].items():
-                chunks.append(f"Faction {faction_name}: {faction_desc}")
-                chunk_labels.append('faction')
-        
-        if world_data.get('rules', {}).get('social_norms'):
-            for norm in world_data['rules']['social_norms']:
-                chunks.append(f"Social norm: {norm}")
-                chunk_labels.append('social_norm')
+    @_serialized_write
+    def vectorize_episodic_memory(self, memory_id: str, npc_id: str, content: str, 
+                                   importance: float, created_at: str) -> int:
+        """Long-term episodic memory vectorization."""
+        return self._add_records([episodic_record(memory_id, npc_id, content, importance, created_at)])[0]
+    
+    def _find_duplicate(self, npc_id: str, embedding: np.ndarray, threshold: float, window: int) -> Optional[Tuple[int, float]]:
+        """NPC의 최근 episodic vector window개 중 cosine 유사도가 threshold 이상인 가장 유사한 (vector_id, 유사도)."""
+        if self.faiss_manager.index is None or window <= 0:
+            return None
+        
+        vector_ids = self.metadata_store.recent_episodic_ids(npc_id, window)
+        if not vector_ids:
+            return None
+        
+        query = embedding / (np.linalg.norm(embedding) or 1.0)
+        similarities = self.faiss_manager.reconstruct_vectors(vector_ids) @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] < threshold:
+            return None
+        return vector_ids[best], float(similarities[best])
+    
+    @_serialized_write
+    def vectorize_or_merge_episodic_memory(
+        self,
+        memory_id: str,
+        npc_id: str,
+        content: str,
+        importance: float,
+        created_at: str,
+        threshold: float,
+        window: int,
+        importance_boost: float = 0.0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Long-term episodic memory vectorization (거의 같은 최근 memory가 있으면 새 vector 대신 병합).
         
-        if world_data.get('locations'):
-            for loc_name, loc_info in world_data['locations'].items():
-                loc_text = f"Location {loc_name}: {json.dumps(loc_info)}"
-                chunks.append(loc_text)
-                chunk_labels.append('location')
+        NPC의 최근 episodic vector window개 중 cosine 유사도가 threshold 이상인 것이 있으면 그 metadata의
+        importance(max 후 importance_boost 증가), last_seen_at, repeat_count만 갱신합니다.
         
-        if world_data.get('global_constraints'):
-            constraints_text = f"Global constraints: {json.dumps(world_data['global_constraints'])}"
-            chunks.append(constraints_text)
-            chunk_labels.append('global_constraints')
+        Returns:
+            병합했으면 {"memory_id", "vector_id", "importance", "similarity"}, 새로 추가했으면 None
+        """
+        text, metadata = episodic_record(memory_id, npc_id, content, importance, created_at)
+        embeddings = embedding_service.embed([text])
+        
+        duplicate = self._find_duplicate(npc_id, embeddings[0], threshold, window)
+        if duplicate is None:
+            self._add_records([(text, metadata)], embeddings)
+            return None
+        
+        vector_id, similarity = duplicate
+        record = self.metadata_store.metadata[vector_id]
+        record['importance'] = min(1.0, max(record.get('importance', 0.0), importance) + importance_boost)
+        record['last_seen_at'] = created_at
+        record['repeat_count'] = record.get('repeat_count', 0) + 1
+        self.metadata_store.save()
+        # index 파일은 그대로지만 mtime을 갱신하여 다른 인스턴스가 바뀐 metadata를 다시 로드하게 함
+        os.utime(self.faiss_manager.index_path)
+        
+        return {
+            'memory_id': record['source_id'],
+            'vector_id': vector_id,
+            'importance': record['importance'],
+            'similarity': similarity
+        }
+    
+    @_serialized_write
+    def vectorize_episodic_memories_bulk(self, memories: List[Dict[str, Any]]) -> List[int]:
+        """
+        여러 long-term episodic memory를 한 번에 벡터화 (중복 병합 없이 추가, index는 한 번만 저장).
         
-        if not chunks:
-            return []
+        Args:
+            memories: memory_id, npc_id, content, importance, created_at(ISO 문자열)을 포함한 딕셔너리 리스트
         
-        embeddings = embedding_service.embed(chunks)
-        vector_ids = self.faiss_manager.add_vectors(embeddings)
+        Returns:
+            vector_id 리스트
+        """
+        return self._add_records([
+            episodic_record(m['memory_id'], m['npc_id'], m['content'], m['importance'], m['created_at'])
+            for m in memories
+        ])
+    
+    def episodic_vectors(self, npc_id: str, memory_ids: List[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        NPC episodic memory의 저장된(정규화된) vector 조회 (embedding 호출 없음).
         
-        for i, (vector_id, chunk, label) in enumerate(zip(vector_ids, chunks, chunk_labels)):
-            metadata = {
-                'source_type': 'world',
-                'source_id': world_id,
-                'npc_id': None,
-                'importance': 1.0,
-                'created_at': world_data.get('created_at', ''),
-                'summary': chunk[:200],
-                'chunk_type': label
+        Returns:
+            (vector가 있는 memory_id 목록 - memory_ids 순서, vector 배열)
+        """
+        with _write_lock(self.index_name):
+            self._refresh_if_stale()
+            positions = {
+                record.get('source_id'): record['vector_id']
+                for record in self.metadata_store.metadata
+                if record.get('source_type') == 'episodic' and record.get('npc_id') == npc_id
             }
-            self.metadata_store.add(metadata)
-        
-        self.faiss_manager.save_index()
-        self.metadata_store.save()
-        
-        return vector_ids
+            found = [memory_id for memory_id in memory_ids if memory_id in positions]
+            if self.faiss_manager.index is None:
+                return [], np.zeros((0, self.faiss_manager.dimension), dtype=np.float32)
+            return found, self.faiss_manager.reconstruct_vectors([positions[memory_id] for memory_id in found])
+    
+    @_serialized_write
+    def vectorize_persona_chunks(self, persona_id: str, persona_data: Dict[str, Any]) -> List[int]:
+        """Persona profile을 여러 chunk로 vectorization."""
+        return self._add_records(persona_records(persona_id, persona_data))
     
+    @_serialized_write
+    def vectorize_world_chunks(self, world_id: str, world_data: Dict[str, Any]) -> List[int]:
+        """World knowledge를 여러 chunk로 vectorization."""
+        return self._add_records(world_records(world_id, world_data))
+    
+    @_serialized_write
     def vectorize_persona_fact(
         self, 
         fact_id: str, 
@@ -184,34 +359,16 @@ class Vectorizer:
         Returns:
             vector_id
         """
-        if self.faiss_manager.index is None:
-            self.faiss_manager.create_index()
-        
-        # 임베딩 텍스트: dimension 정보 포함
-        embedding_text = f"[{dimension}] persona fact: {content}"
-        
-        embedding = embedding_service.embed_single(embedding_text)
-        vector_ids = self.faiss_manager.add_vectors(embedding)
-        vector_id = vector_ids[0]
-        
-        metadata = {
-            'source_type': 'persona_fact',
-            'source_id': fact_id,
+        return self._add_records([persona_fact_record({
+            'fact_id': fact_id,
             'persona_id': persona_id,
             'npc_id': npc_id,
             'dimension': dimension,
             'content': content,
-            'source': source,
-            'importance': 1.0,  # PersonaFact는 항상 중요
-            'summary': content[:200]
-        }
-        self.metadata_store.add(metadata)
-        
-        self.faiss_manager.save_index()
-        self.metadata_store.save()
-        
-        return vector_id
+            'source': source
+        })])[0]
     
+    @_serialized_write
     def vectorize_persona_facts_bulk(
         self,
         facts: List[Dict[str, Any]]
@@ -226,43 +383,108 @@ class Vectorizer:
         Returns:
             vector_id 리스트
         """
+        return self._add_records([persona_fact_record(fact) for fact in facts])
+    
+    @_serialized_write
+    def sync_source_vectors(self, source_type: str, source_id: str,
+                            records: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, int]:
+        """
+        Source의 chunk vector를 records와 일치하도록 갱신 (바뀐 chunk만 embedding).
+
+        content_hash가 같은 기존 vector는 유지하고, records에 없는 vector는 삭제한 뒤
+        새 chunk만 embedding하여 추가합니다. records가 비어 있으면 source의 vector를 모두 삭제합니다.
+
+        Returns:
+            {"kept", "added", "removed"}
+        """
         if self.faiss_manager.index is None:
             self.faiss_manager.create_index()
         
-        if not facts:
-            return []
+        if self.faiss_manager.get_vector_count() != self.metadata_store.count():
+            raise RuntimeError(
+                f"Index {self.index_name} has {self.faiss_manager.get_vector_count()} vectors but "
+                f"{self.metadata_store.count()} metadata records. Please reindex."
+            )
+        
+        # 같은 내용의 chunk가 여러 개일 수 있으므로 hash별 남은 개수로 매칭
+        wanted: Dict[str, int] = {}
+        for text, _ in records:
+            digest = content_hash(text)
+            wanted[digest] = wanted.get(digest, 0) + 1
+        
+        stale = []
+        for vector_id, record in enumerate(self.metadata_store.metadata):
+            if record.get('source_type') != source_type or record.get('source_id') != source_id:
+                continue
+            digest = record.get('content_hash')
+            if wanted.get(digest, 0) > 0:
+                wanted[digest] -= 1
+            else:
+                stale.append(vector_id)
+        
+        added = []
+        for text, metadata in records:
+            digest = content_hash(text)
+            if wanted[digest] > 0:
+                wanted[digest] -= 1
+                added.append((text, metadata))
+        kept = len(records) - len(added)
+        
+        if not stale and not added:
+            return {"kept": kept, "added": 0, "removed": 0}
+        
+        if stale:
+            self.faiss_manager.remove_vectors(stale)
+            self.metadata_store.remove(stale)
+        
+        if added:
+            embeddings = embedding_service.embed([text for text, _ in added])
+            self.faiss_manager.add_vectors(embeddings)
+            for _, metadata in added:
+                self.metadata_store.add(metadata)
         
-        # 임베딩 텍스트 생성
-        embedding_texts = []
-        for fact in facts:
-            dimension = fact.get('dimension', 'characteristic')
-            content = fact.get('content', '')
-            embedding_text = f"[{dimension}] persona fact: {content}"
-            embedding_texts.append(embedding_text)
+        self.faiss_manager.save_index()
+        self.metadata_store.save()
         
-        # 배치 임베딩
-        embeddings = embedding_service.embed(embedding_texts)
-        vector_ids = self.faiss_manager.add_vectors(embeddings)
+        return {"kept": kept, "added": len(added), "removed": len(stale)}
+    
+    @_serialized_write
+    def remove_vectors(self, predicate: Callable[[Dict[str, Any]], bool]) -> int:
+        """
+        predicate에 맞는 메타데이터의 vector를 index와 메타데이터에서 함께 삭제 (한 번만 저장).
         
-        # 메타데이터 추가
-        for i, (fact, vector_id) in enumerate(zip(facts, vector_ids)):
-            metadata = {
-                'source_type': 'persona_fact',
-                'source_id': fact.get('fact_id', ''),
-                'persona_id': fact.get('persona_id', ''),
-                'npc_id': fact.get('npc_id'),
-                'dimension': fact.get('dimension', 'characteristic'),
-                'content': fact.get('content', ''),
-                'source': fact.get('source', 'PeaCoK'),
-                'importance': 1.0,
-                'summary': fact.get('content', '')[:200]
-            }
-            self.metadata_store.add(metadata)
+        재구성 중이면 삭제한 source를 먼저 refreshed로 표시하므로, shadow에 이미 들어간 vector가
+        교체 후 되살아나지 않습니다.
+        
+        Returns:
+            삭제된 vector 수
+        """
+        if self.faiss_manager.index is None:
+            return 0
+        
+        if self.faiss_manager.get_vector_count() != self.metadata_store.count():
+            raise RuntimeError(
+                f"Index {self.index_name} has {self.faiss_manager.get_vector_count()} vectors but "
+                f"{self.metadata_store.count()} metadata records. Please reindex."
+            )
+        
+        vector_ids = [i for i, record in enumerate(self.metadata_store.metadata) if predicate(record)]
+        if not vector_ids:
+            return 0
+        
+        from app.memory.vector.reindex import mark_refreshed
+        mark_refreshed(self.index_name, list({
+            (self.metadata_store.metadata[i].get('source_type'), self.metadata_store.metadata[i].get('source_id'))
+            for i in vector_ids
+        }))
+        
+        self.faiss_manager.remove_vectors(vector_ids)
+        self.metadata_store.remove(vector_ids)
         
         self.faiss_manager.save_index()
         self.metadata_store.save()
         
-        return vector_ids
+        return len(vector_ids)
     
     def reindex(self) -> None:
         """재인덱싱을 위해 초기화."""
@@ -279,6 +501,13 @@ class Vectorizer:
             return []
         
         query_embedding = embedding_service.embed_single(query_text)
+        return self.search_by_vector(query_embedding, top_k)
+    
+    def search_by_vector(self, query_embedding: np.ndarray, top_k: int = 10) -> List[Dict[str, Any]]:
+        """이미 계산한 query embedding으로 유사한 vector 검색 (여러 index에 같은 query를 쓸 때)."""
+        if self.faiss_manager.index is None:
+            return []
+        
         distances, indices = self.faiss_manager.search(query_embedding, top_k)
         
         results = []
@@ -293,3 +522,37 @@ class Vectorizer:
                 results.append(result)
         
         return results
+    
+    def lexical_search(
+        self,
+        query_text: str,
+        top_k: int = 10,
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25 단어 검색 (embedding 호출 없음).
+        
+        Args:
+            query_text: 검색 쿼리 텍스트
+            top_k: 반환할 결과 수
+            predicate: metadata를 받아 결과에 포함할지 판단
+        
+        Returns:
+            metadata 복사본 목록 (lexical_score 포함, 점수 내림차순)
+        """
+        metadata = self.metadata_store.metadata
+        hits = search_index(
+            self.index_name,
+            metadata,
+            query_text,
+            top_k,
+            (lambda vector_id: predicate(metadata[vector_id])) if predicate is not None else None
+        )
+        
+        results = []
+        for vector_id, score in hits:
+            result = metadata[vector_id].copy()
+            result['lexical_score'] = score
+            results.append(result)
+        
+        return results
@@ -0,0 +1,135 @@
+"""Prompt template registry - app/prompts/*.txt를 한 번 로드하고 mtime 변경 시 다시 로드."""
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROMPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class PromptTemplate:
+    """로드된 prompt template (version은 내용 해시)."""
+
+    def __init__(self, name: str, text: str, mtime_ns: int):
+        self.name = name
+        self.text = text
+        self.mtime_ns = mtime_ns
+        self.version = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+class PromptRegistry:
+    """
+    Prompt template registry.
+
+    REQUIRED_TEMPLATES의 template은 startup에서 모두 로드/검증하며, 응답 파서가 기대하는
+    JSON 키 등 필수 문자열이 빠져 있으면 실패합니다. reload_interval_s마다 파일 mtime을 확인해
+    바뀐 template만 다시 로드하고, 검증에 실패하면 이전 버전을 계속 사용합니다.
+    """
+
+    # template 이름 -> 반드시 포함해야 하는 문자열
+    REQUIRED_TEMPLATES: Dict[str, List[str]] = {
+        "system": [],
+        "planning": [],
+        "importance": ['"importance_score"', '"justification"'],
+        "reflection": ['"insights"', '"importance_score"', '"persona_fact_updates"'],
+        "consolidation": ['"summary"'],
+    }
+
+    def __init__(self, prompt_dir: str = PROMPT_DIR, reload_interval_s: float = 0.0):
+        self.prompt_dir = prompt_dir
+        self.reload_interval_s = reload_interval_s
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.prompt_dir, f"{name}.txt")
+
+    def _read(self, name: str) -> PromptTemplate:
+        """template 파일을 읽고 검증 (실패 시 ValueError)."""
+        path = self._path(name)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError as e:
+            raise ValueError(f"Prompt template '{name}' could not be read: {e}")
+
+        if not text.strip():
+            raise ValueError(f"Prompt template '{name}' is empty")
+        missing = [marker for marker in self.REQUIRED_TEMPLATES.get(name, []) if marker not in text]
+        if missing:
+            raise ValueError(f"Prompt template '{name}' is missing required text: {', '.join(missing)}")
+
+        return PromptTemplate(name, text, mtime_ns)
+
+    def load_all(self) -> Dict[str, str]:
+        """
+        모든 필수 template 로드 및 검증 (startup용, 하나라도 실패하면 ValueError).
+
+        Returns:
+            {template 이름: version}
+        """
+        templates = {name: self._read(name) for name in self.REQUIRED_TEMPLATES}
+        with self._lock:
+            self._templates = templates
+            self._last_check = time.monotonic()
+        logger.info(f"Loaded prompt templates: {self.versions()}")
+        return self.versions()
+
+    def _reload_changed(self) -> None:
+        for name, template in list(self._templates.items()):
+            try:
+                mtime_ns = os.stat(self._path(name)).st_mtime_ns
+            except OSError:
+                continue
+            if mtime_ns == template.mtime_ns:
+                continue
+            try:
+                self._templates[name] = self._read(name)
+                logger.info(f"Reloaded prompt template '{name}' (version {self._templates[name].version})")
+            except ValueError as e:
+                # 잘못 수정된 파일은 무시하고 이전 버전 유지 (같은 mtime으로 다시 시도하지 않도록 기록)
+                template.mtime_ns = mtime_ns
+                logger.error(f"Keeping previous prompt template '{name}': {e}")
+
+    def _ensure_fresh(self) -> None:
+        with self._lock:
+            if not self._templates:
+                self._templates = {name: self._read(name) for name in self.REQUIRED_TEMPLATES}
+                self._last_check = time.monotonic()
+                return
+            if self.reload_interval_s <= 0:
+                return
+            now = time.monotonic()
+            if now - self._last_check >= self.reload_interval_s:
+                self._last_check = now
+                self._reload_changed()
+
+    def get(self, name: str) -> PromptTemplate:
+        """이름으로 template 조회 (필요하면 변경된 파일을 다시 로드)."""
+        self._ensure_fresh()
+        template = self._templates.get(name)
+        if template is None:
+            raise ValueError(f"Prompt template '{name}' not registered")
+        return template
+
+    def get_text(self, name: str) -> str:
+        return self.get(name).text
+
+    def versions(self, names: Optional[List[str]] = None) -> Dict[str, str]:
+        """{template 이름: version} (names가 없으면 전체)."""
+        self._ensure_fresh()
+        return {
+            name: template.version
+            for name, template in self._templates.items()
+            if names is None or name in names
+        }
+
+
+prompt_registry = PromptRegistry(reload_interval_s=settings.prompt_reload_interval_s)
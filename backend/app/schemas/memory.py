@@ -46,6 +46,27 @@ class EpisodicMemory(BaseModel):
         description="Linked entity IDs (other NPCs, locations, items)"
     )
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    repeat_count: int = Field(
+        default=0,
+        ge=0,
+        description="Near-duplicate memories merged into this one instead of being stored separately"
+    )
+    last_seen_at: Optional[datetime] = Field(
+        default=None,
+        description="When a near-duplicate was last merged into this memory (used for recency)"
+    )
+    consolidated_from: List[str] = Field(
+        default_factory=list,
+        description="Memory IDs summarized into this memory by the consolidation job"
+    )
+    consolidated_into: Optional[str] = Field(
+        default=None,
+        description="Summary memory that replaced this memory (its vector is removed from the index)"
+    )
+    consolidation_checked_at: Optional[datetime] = Field(
+        default=None,
+        description="When the consolidation job found no similar memory to merge this one with"
+    )
     
     class Config:
         json_schema_extra = {
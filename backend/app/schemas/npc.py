@@ -30,6 +30,53 @@ class NPCConfig(BaseModel):
         le=10,
         description="Dimension당 최대 fact 개수"
     )
+    retrieval_relevance_weight: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        description="Retrieval 점수의 relevance 가중치 (None이면 RETRIEVAL_RELEVANCE_WEIGHT 설정)"
+    )
+    retrieval_recency_weight: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        description="Retrieval 점수의 recency 가중치 (None이면 RETRIEVAL_RECENCY_WEIGHT 설정)"
+    )
+    retrieval_importance_weight: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        description="Retrieval 점수의 importance 가중치 (None이면 RETRIEVAL_IMPORTANCE_WEIGHT 설정)"
+    )
+    retrieval_recency_decay: Optional[float] = Field(
+        default=None,
+        gt=0.0,
+        le=1.0,
+        description="시간당 recency 감쇠율 (None이면 RETRIEVAL_RECENCY_DECAY 설정)"
+    )
+    context_token_budget: Optional[int] = Field(
+        default=None,
+        ge=0,
+        le=128000,
+        description="Planning 컨텍스트 토큰 예산 (None이면 CONTEXT_TOKEN_BUDGET 설정, 0이면 고정 개수 제한 방식)"
+    )
+    short_term_memory_retention_days: Optional[float] = Field(
+        default=None,
+        ge=0,
+        description="단기 기억 보존 기간(일) (None이면 SHORT_TERM_MEMORY_RETENTION_DAYS 설정, 0이면 무기한)"
+    )
+    trace_retention_days: Optional[float] = Field(
+        default=None,
+        ge=0,
+        description="Inference trace 보존 기간(일) (None이면 TRACE_RETENTION_DAYS 설정, 0이면 무기한)"
+    )
+    consolidation_min_age_days: Optional[float] = Field(
+        default=None,
+        ge=0,
+        description="이 기간(일)보다 오래된 장기 기억을 요약 기억으로 통합 (None이면 MEMORY_CONSOLIDATION_MIN_AGE_DAYS 설정, 0이면 통합 안 함)"
+    )
+    consolidation_min_memories: Optional[int] = Field(
+        default=None,
+        ge=2,
+        description="통합 대상 기억이 이 개수 이상일 때만 통합 (None이면 MEMORY_CONSOLIDATION_MIN_MEMORIES 설정)"
+    )
 
 
 class NPCBase(BaseModel):
@@ -10,6 +10,10 @@ class InferenceTrace(BaseModel):
     npc_id: str = Field(..., description="NPC who made this decision")
     turn_id: str = Field(..., description="Turn identifier")
     observation: str = Field(default="", description="What the NPC observed")
+    observation_payload: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Raw observation JSON passed to the turn (for replay)"
+    )
     retrieved_memories: List[str] = Field(
         default_factory=list,
         description="Memory IDs that were retrieved (source IDs, not vector IDs)"
@@ -30,6 +34,14 @@ class InferenceTrace(BaseModel):
         default_factory=list,
         description="Similarity scores for retrieved vectors"
     )
+    retrieval_relevance_scores: List[float] = Field(
+        default_factory=list,
+        description="Relevance before weighted rescoring (fusion score or cosine, with persona fact boost)"
+    )
+    retrieval_ranking_scores: List[float] = Field(
+        default_factory=list,
+        description="Final scores the retrieved vectors were ordered by"
+    )
     persona_used: Optional[str] = Field(
         default=None,
         description="Persona ID that was used"
@@ -42,6 +54,26 @@ class InferenceTrace(BaseModel):
         default="",
         description="Full prompt sent to LLM (for debugging)"
     )
+    prompt_layout: str = Field(
+        default="",
+        description="Planning prompt layout (inline or stable_prefix)"
+    )
+    prompt_prefix_hash: str = Field(
+        default="",
+        description="Hash of tool schemas + first planning message (the provider-cacheable prefix)"
+    )
+    prompt_versions: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Prompt template versions (content hash per template) used for this turn"
+    )
+    llm_usage: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Planning call token usage (prompt/completion/total/cached tokens)"
+    )
+    context_budget: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Token budget of the planning context (total/used tokens and per-section allocated/used); empty when disabled"
+    )
     llm_output_raw: str = Field(
         default="",
         description="Raw LLM output"
@@ -58,6 +90,10 @@ class InferenceTrace(BaseModel):
         default_factory=dict,
         description="Result of tool execution (success, effect, error)"
     )
+    stage_timings_ms: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Per-stage latency of the turn up to trace write (ms)"
+    )
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Config:
@@ -84,15 +120,28 @@ class TraceCreate(BaseModel):
     npc_id: str = Field(..., description="NPC ID")
     turn_id: str = Field(..., description="Turn ID")
     observation: str = Field(default="", description="Observation")
+    observation_payload: Dict[str, Any] = Field(default_factory=dict)
     retrieved_memories: List[str] = Field(default_factory=list)
     retrieval_query_text: str = Field(default="")
     retrieval_indices_searched: List[str] = Field(default_factory=list)
     retrieval_vector_ids: List[int] = Field(default_factory=list)
     retrieval_similarity_scores: List[float] = Field(default_factory=list)
+    retrieval_relevance_scores: List[float] = Field(default_factory=list)
+    retrieval_ranking_scores: List[float] = Field(default_factory=list)
     persona_used: Optional[str] = None
     world_used: Optional[str] = None
     llm_prompt_snapshot: str = Field(default="")
+    llm_prompt_segments: List[str] = Field(
+        default_factory=list,
+        description="Static parts of llm_prompt_snapshot in order (stored once and referenced by hash)"
+    )
+    prompt_layout: str = Field(default="")
+    prompt_prefix_hash: str = Field(default="")
+    prompt_versions: Dict[str, str] = Field(default_factory=dict)
+    llm_usage: Dict[str, int] = Field(default_factory=dict)
+    context_budget: Dict[str, Any] = Field(default_factory=dict)
     llm_output_raw: str = Field(default="")
     chosen_action: str = Field(default="")
     tool_arguments: Dict[str, Any] = Field(default_factory=dict)
     tool_execution_result: Dict[str, Any] = Field(default_factory=dict)
+    stage_timings_ms: Dict[str, float] = Field(default_factory=dict)
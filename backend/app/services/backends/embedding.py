@@ -0,0 +1,73 @@
+"""Embedding backend 구현 (OpenAI, 결정적 hashing stub)."""
+import hashlib
+import re
+from typing import List
+import numpy as np
+from app.services.backends.latency import LatencyModel
+
+
+class OpenAIEmbeddingBackend:
+    """OpenAI embeddings API backend."""
+
+    def __init__(self, api_key: str, model: str):
+        from openai import OpenAI
+        self.client = OpenAI(api_key=api_key)
+        self.model = model
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        response = self.client.embeddings.create(
+            model=self.model,
+            input=texts
+        )
+        embeddings = [item.embedding for item in response.data]
+        return np.array(embeddings, dtype=np.float32)
+
+
+class HashingEmbeddingBackend:
+    """
+    Feature hashing 기반 결정적 embedding backend (오프라인/부하 테스트용).
+
+    단어 unigram과 문자 trigram을 blake2b로 해싱하여 고정 차원에 signed count로 누적한 뒤
+    L2 정규화합니다. 같은 텍스트는 항상 같은 벡터가 되고, 어휘가 겹치는 텍스트끼리는
+    cosine similarity가 높게 나오므로 retrieval 경로를 의미 있게 동작시킬 수 있습니다.
+    """
+
+    _TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(self, dimension: int, latency: LatencyModel = None):
+        self.dimension = dimension
+        self.latency = latency or LatencyModel()
+
+    @classmethod
+    def _features(cls, text: str) -> List[str]:
+        tokens = cls._TOKEN_PATTERN.findall(text.lower())
+        features = [f"w:{token}" for token in tokens]
+        for token in tokens:
+            padded = f"#{token}#"
+            features.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+        return features
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        features = self._features(text)
+        if not features:
+            # 빈 텍스트도 0 벡터가 아닌 결정적 단위 벡터로 매핑
+            features = ["<empty>"]
+
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            bucket = value % self.dimension
+            sign = 1.0 if (value >> 63) & 1 else -1.0
+            vector[bucket] += sign
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        self.latency.wait()
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.vstack([self._embed_one(text) for text in texts])
@@ -0,0 +1,52 @@
+"""Stub backend용 인위적 지연 주입."""
+import random
+import time
+from typing import Optional
+
+
+class LatencyModel:
+    """설정된 분포에 따라 지연 시간(ms)을 샘플링하고 주입."""
+
+    DISTRIBUTIONS = ("none", "constant", "uniform", "normal", "lognormal")
+
+    def __init__(
+        self,
+        distribution: str = "none",
+        mean_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution: {distribution}. "
+                f"Must be one of {', '.join(self.DISTRIBUTIONS)}"
+            )
+        self.distribution = distribution
+        self.mean_ms = max(0.0, mean_ms)
+        self.jitter_ms = max(0.0, jitter_ms)
+        self._rng = random.Random(seed)
+
+    def sample_ms(self) -> float:
+        """지연 시간 샘플 (ms, 음수는 0으로 clamp)."""
+        if self.distribution == "none" or self.mean_ms == 0.0:
+            return 0.0
+
+        if self.distribution == "constant":
+            value = self.mean_ms
+        elif self.distribution == "uniform":
+            value = self._rng.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)
+        elif self.distribution == "normal":
+            value = self._rng.gauss(self.mean_ms, self.jitter_ms)
+        else:
+            # lognormal: mean_ms를 중앙값으로, jitter_ms/mean_ms를 sigma로 사용 (긴 꼬리 재현)
+            sigma = self.jitter_ms / self.mean_ms if self.mean_ms > 0 else 0.0
+            value = self.mean_ms * self._rng.lognormvariate(0.0, sigma)
+
+        return max(0.0, value)
+
+    def wait(self) -> float:
+        """샘플링한 만큼 sleep하고 실제 지연(ms) 반환."""
+        delay_ms = self.sample_ms()
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+        return delay_ms
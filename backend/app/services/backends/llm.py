@@ -0,0 +1,447 @@
+"""Chat completion backend 구현 (OpenAI, 규칙 기반 stub, record/replay)."""
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import List, Dict, Any, Optional
+from app.services.backends.latency import LatencyModel
+
+
+def _approx_tokens(text: str) -> int:
+    """대략적인 토큰 수 (영문 기준 4 chars ≈ 1 token)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def _usage(messages: List[Dict[str, str]], completion: str, cached_tokens: int = 0) -> Dict[str, int]:
+    prompt_tokens = sum(_approx_tokens(m.get("content") or "") for m in messages)
+    completion_tokens = _approx_tokens(completion)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "cached_tokens": cached_tokens
+    }
+
+
+def prompt_prefix_hash(prefix_messages: List[Dict[str, str]], tools: Optional[List[Dict]] = None) -> str:
+    """
+    Provider prompt cache가 재사용할 수 있는 prefix(tool schema + 앞쪽 messages)의 해시.
+
+    tool 정의는 messages보다 앞에 직렬화되므로 전체 schema를 포함합니다.
+    """
+    payload = json.dumps(
+        {"tools": tools or [], "messages": prefix_messages},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class OpenAIChatBackend:
+    """OpenAI Chat Completions API backend."""
+
+    def __init__(self, api_key: str, model: str):
+        from openai import OpenAI
+        self.client = OpenAI(api_key=api_key)
+        self.model = model
+
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> Dict[str, Any]:
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+
+        if tools:
+            params["tools"] = tools
+            params["tool_choice"] = tool_choice
+
+        response = self.client.chat.completions.create(**params)
+        choice = response.choices[0]
+        message = choice.message
+
+        tool_calls = []
+        if message.tool_calls:
+            for tool_call in message.tool_calls:
+                tool_calls.append({
+                    "id": tool_call.id,
+                    "type": tool_call.type,
+                    "function": {
+                        "name": tool_call.function.name,
+                        "arguments": tool_call.function.arguments
+                    }
+                })
+
+        details = getattr(response.usage, "prompt_tokens_details", None)
+        return {
+            "content": message.content or "",
+            "tool_calls": tool_calls,
+            "finish_reason": choice.finish_reason,
+            "usage": {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens,
+                "cached_tokens": getattr(details, "cached_tokens", None) or 0
+            }
+        }
+
+
+class StubChatBackend:
+    """
+    규칙 기반 결정적 chat backend (오프라인/부하 테스트용).
+
+    system prompt로 호출 종류(planning, importance, reflection, memory 통합, NPC 생성)를 판별하고
+    항상 파싱 가능한 응답을 돌려줍니다. planning 호출에서는 observation 키워드로 tool을 고르고
+    tool의 JSON Schema에서 required 인자를 채워 유효한 tool call을 생성합니다.
+
+    Provider prompt cache를 흉내 내어, tool schema + 첫 message가 이전 호출과 같으면
+    그 토큰 수를 usage.cached_tokens로 보고합니다.
+    """
+
+    # observation 키워드 → 선호 tool (앞에서부터 매칭)
+    TOOL_RULES = [
+        (("attack", "attacked", "fight", "combat", "strike"), "defend"),
+        (("trade", "buy", "sell", "barter"), "trade"),
+        (("quest", "mission", "task"), "start_quest"),
+        (("moved", "follow", "go to", "travel"), "move_to"),
+    ]
+
+    # importance 휴리스틱 키워드
+    HIGH_IMPORTANCE_KEYWORDS = (
+        "attack", "kill", "death", "die", "betray", "steal", "quest", "ring",
+        "treasure", "secret", "danger", "gift", "love", "war"
+    )
+
+    _OBSERVATION_PATTERN = re.compile(r"CURRENT OBSERVATION:\s*\n(.+?)(?:\n\s*\n|$)", re.DOTALL)
+    _ACTOR_PATTERN = re.compile(r"^(\S+)\s")
+    _LOCATION_PATTERN = re.compile(r"\bat (\w+)")
+
+    def __init__(self, latency: LatencyModel = None):
+        self.latency = latency or LatencyModel()
+        self._seen_prefixes = set()
+        self._prefix_lock = threading.Lock()
+
+    def _cached_tokens(self, messages: List[Dict[str, str]], tools: Optional[List[Dict]]) -> int:
+        if not messages:
+            return 0
+        key = prompt_prefix_hash(messages[:1], tools)
+        with self._prefix_lock:
+            seen = key in self._seen_prefixes
+            self._seen_prefixes.add(key)
+        return _approx_tokens(messages[0].get("content") or "") if seen else 0
+
+    @staticmethod
+    def _stable_fraction(text: str) -> float:
+        """텍스트에서 [0, 1) 범위의 결정적 값 생성."""
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "little") / 2 ** 32
+
+    @staticmethod
+    def _classify(messages: List[Dict[str, str]], tools: Optional[List[Dict]]) -> str:
+        system = next((m.get("content") or "" for m in messages if m.get("role") == "system"), "")
+        if tools:
+            return "planning"
+        if '"insights"' in system:
+            return "reflection"
+        if '"summary"' in system:
+            return "consolidation"
+        if '"importance_score"' in system:
+            return "importance"
+        if "character designer" in system:
+            return "npc_generation"
+        return "generic"
+
+    def _observation(self, messages: List[Dict[str, str]]) -> str:
+        user = "\n".join(m.get("content") or "" for m in messages if m.get("role") == "user")
+        match = self._OBSERVATION_PATTERN.search(user)
+        if match:
+            return match.group(1).strip()
+        match = re.search(r"OBSERVATION:\s*\n(.+?)(?:\n\s*\n|$)", user, re.DOTALL)
+        return match.group(1).strip() if match else user.strip()
+
+    def _importance(self, text: str) -> float:
+        lowered = text.lower()
+        hits = sum(1 for kw in self.HIGH_IMPORTANCE_KEYWORDS if kw in lowered)
+        score = 0.3 + 0.2 * hits + 0.1 * self._stable_fraction(text)
+        return round(min(1.0, score), 3)
+
+    def _synthesize_value(self, name: str, schema: Dict[str, Any], hints: Dict[str, str]) -> Any:
+        if "enum" in schema and schema["enum"]:
+            return schema["enum"][0]
+
+        value_type = schema.get("type", "string")
+        if value_type == "object":
+            properties = schema.get("properties", {})
+            return {
+                key: self._synthesize_value(key, properties.get(key, {}), hints)
+                for key in schema.get("required", [])
+            }
+        if value_type == "array":
+            return [self._synthesize_value(name, schema.get("items", {}), hints)]
+        if value_type in ("integer", "number"):
+            return 1
+        if value_type == "boolean":
+            return True
+        return hints.get(name, f"{name}_001")
+
+    def _planning(self, messages: List[Dict[str, str]], tools: List[Dict]) -> Dict[str, Any]:
+        observation = self._observation(messages)
+        lowered = observation.lower()
+        available = {tool["function"]["name"]: tool["function"] for tool in tools if tool.get("function")}
+
+        actor_match = self._ACTOR_PATTERN.match(observation)
+        location_match = self._LOCATION_PATTERN.search(observation)
+        actor = actor_match.group(1) if actor_match else "player_001"
+
+        tool_name = None
+        for keywords, candidate in self.TOOL_RULES:
+            if candidate in available and any(kw in lowered for kw in keywords):
+                tool_name = candidate
+                break
+        if tool_name is None:
+            tool_name = "talk" if "talk" in available else ("wait" if "wait" in available else next(iter(available)))
+
+        hints = {
+            "target_id": actor,
+            "utterance": f"I hear you, {actor}. Let me think about that.",
+            "location_id": location_match.group(1) if location_match else "town_square",
+            "reason": "Responding to the current observation",
+        }
+        schema = available[tool_name].get("parameters", {})
+        arguments = self._synthesize_value(tool_name, schema, hints)
+
+        call_id = "call_" + hashlib.sha256(observation.encode("utf-8")).hexdigest()[:12]
+        content = f"Chose {tool_name} based on the current observation."
+        return {
+            "content": content,
+            "tool_calls": [{
+                "id": call_id,
+                "type": "function",
+                "function": {"name": tool_name, "arguments": json.dumps(arguments)}
+            }],
+            "finish_reason": "tool_calls"
+        }
+
+    def _json_reply(self, kind: str, messages: List[Dict[str, str]]) -> str:
+        observation = self._observation(messages)
+
+        if kind == "importance":
+            score = self._importance(observation)
+            return json.dumps({
+                "importance_score": score,
+                "justification": "Heuristic stub score based on event keywords."
+            })
+
+        if kind == "reflection":
+            score = self._importance(observation)
+            return json.dumps({
+                "insights": f"Reflecting on: {observation[:120]}",
+                "updated_goals": [],
+                "relationship_updates": {},
+                "importance_score": score,
+                "persona_fact_updates": []
+            })
+
+        if kind == "consolidation":
+            user = "\n".join(m.get("content") or "" for m in messages if m.get("role") == "user")
+            events = [line[2:].strip() for line in user.splitlines() if line.startswith("- ")]
+            return json.dumps({
+                "summary": f"Repeated {len(events)} times: {events[-1][:160] if events else user[:160]}"
+            })
+
+        if kind == "npc_generation":
+            return json.dumps({
+                "persona": {
+                    "name": "Stub Character",
+                    "traits": ["curious", "careful"],
+                    "habits": ["observes strangers"],
+                    "goals": ["keep the village safe"],
+                    "background": observation[:200],
+                    "speech_style": "Plain and direct",
+                    "relationships": {},
+                    "constraints": {"taboos": [], "moral_rules": []}
+                },
+                "world": {
+                    "title": "Stub World",
+                    "rules": {"laws": [], "factions": {}, "social_norms": []},
+                    "locations": {"town_square": {"type": "peaceful"}},
+                    "danger_levels": {"town_square": 0.1},
+                    "global_constraints": {}
+                },
+                "initial_state": {"emotion": "neutral", "location": "town_square", "goal": ""}
+            })
+
+        return f"Acknowledged: {observation[:200]}"
+
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> Dict[str, Any]:
+        self.latency.wait()
+
+        use_tools = bool(tools) and tool_choice != "none"
+        kind = self._classify(messages, tools if use_tools else None)
+
+        if kind == "planning":
+            result = self._planning(messages, tools)
+        else:
+            result = {
+                "content": self._json_reply(kind, messages),
+                "tool_calls": [],
+                "finish_reason": "stop"
+            }
+
+        completion = result["content"] + "".join(
+            call["function"]["arguments"] for call in result["tool_calls"]
+        )
+        result["usage"] = _usage(messages, completion, self._cached_tokens(messages, tools if use_tools else None))
+        return result
+
+
+def request_key(
+    messages: List[Dict[str, str]],
+    tools: Optional[List[Dict]] = None,
+    tool_choice: str = "auto"
+) -> str:
+    """Chat 요청을 식별하는 결정적 해시 (messages + tool 이름 + tool_choice)."""
+    tool_names = sorted(
+        tool.get("function", {}).get("name", "") for tool in (tools or [])
+    )
+    payload = json.dumps(
+        {"messages": messages, "tools": tool_names, "tool_choice": tool_choice},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RecordingChatBackend:
+    """
+    다른 backend를 감싸 모든 요청/응답을 JSONL cassette에 기록.
+
+    각 줄은 {"key", "kind", "latency_ms", "response"} 형식이며 ReplayChatBackend가 그대로 읽습니다.
+    """
+
+    def __init__(self, inner, cassette_path: str):
+        self.inner = inner
+        self.cassette_path = cassette_path
+        self._lock = threading.Lock()
+
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result = self.inner.chat(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        use_tools = bool(tools) and tool_choice != "none"
+        record = {
+            "key": request_key(messages, tools, tool_choice),
+            "kind": StubChatBackend._classify(messages, tools if use_tools else None),
+            "latency_ms": round((time.perf_counter() - started) * 1000.0, 3),
+            "response": result
+        }
+
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.cassette_path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.cassette_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        return result
+
+
+class ReplayChatBackend:
+    """
+    기록된 응답을 재생하는 chat backend.
+
+    응답 선택 순서:
+        1. prime()으로 호출 종류(kind)별로 지정된 응답 (trace replay에서 planning 응답 주입)
+        2. cassette에서 요청 key가 일치하는 응답
+        3. fallback backend (없으면 LookupError)
+
+    simulate_latency가 True이면 기록된 latency_ms만큼 대기합니다.
+    """
+
+    def __init__(self, cassette_path: Optional[str] = None, fallback=None, simulate_latency: bool = False):
+        self.fallback = fallback
+        self.simulate_latency = simulate_latency
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._primed: Dict[str, List[Dict[str, Any]]] = {}
+        self.stats = {"primed": 0, "cassette": 0, "fallback": 0}
+
+        if cassette_path and os.path.exists(cassette_path):
+            with open(cassette_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.records[record["key"]] = record
+
+    def prime(self, kind: str, response: Dict[str, Any], latency_ms: float = 0.0) -> None:
+        """다음 kind 호출에 반환할 응답 예약."""
+        self._primed.setdefault(kind, []).append({"response": response, "latency_ms": latency_ms})
+
+    def clear_primed(self) -> None:
+        self._primed = {}
+
+    def _replay(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        if self.simulate_latency and record.get("latency_ms"):
+            time.sleep(record["latency_ms"] / 1000.0)
+        return copy.deepcopy(record["response"])
+
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> Dict[str, Any]:
+        use_tools = bool(tools) and tool_choice != "none"
+        kind = StubChatBackend._classify(messages, tools if use_tools else None)
+
+        primed = self._primed.get(kind)
+        if primed:
+            self.stats["primed"] += 1
+            return self._replay(primed.pop(0))
+
+        record = self.records.get(request_key(messages, tools, tool_choice))
+        if record is not None:
+            self.stats["cassette"] += 1
+            return self._replay(record)
+
+        if self.fallback is None:
+            raise LookupError(f"No recorded {kind} response for this request")
+
+        self.stats["fallback"] += 1
+        return self.fallback.chat(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
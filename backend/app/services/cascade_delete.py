@@ -0,0 +1,112 @@
+"""NPC/World 삭제 시 종속 Mongo 문서와 FAISS vector cascade 삭제 (background job용)."""
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+
+
+# npc_id로 NPC를 참조하는 collection (persona_profiles/prompt_segments는 여러 NPC가 공유하므로 제외,
+# 참조가 끊긴 prompt_segments는 retention job이 정리)
+DEPENDENT_COLLECTIONS = ["episodic_memory", "inference_traces", "persona_facts"]
+
+# $in 한 번에 넣을 npc_id 수
+NPC_ID_CHUNK = 500
+
+
+def _chunks(values: List[str], size: int) -> List[List[str]]:
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+class CascadeDeleteService:
+    """
+    삭제된 NPC(및 World)의 memory, trace, persona fact, vector 정리.
+
+    NPC/World 문서는 route에서 바로 삭제하고, 이 job은 남은 종속 문서를 batch 단위
+    delete_many로 지운 뒤 index별로 vector를 한 번에 제거하고 저장합니다.
+    """
+
+    @staticmethod
+    def _delete_in_batches(collection_name: str, query: Dict[str, Any], on_batch) -> int:
+        """query에 맞는 문서를 cascade_delete_batch_size개씩 _id로 삭제 (batch마다 on_batch(삭제 수))."""
+        from app.memory.mongo.client import get_collection
+
+        collection = get_collection(collection_name)
+        deleted = 0
+        while True:
+            ids = [doc["_id"] for doc in collection.find(query, {"_id": 1}).limit(settings.cascade_delete_batch_size)]
+            if not ids:
+                break
+            batch_deleted = collection.delete_many({"_id": {"$in": ids}}).deleted_count
+            deleted += batch_deleted
+            on_batch(batch_deleted)
+        return deleted
+
+    @staticmethod
+    def _invalidate_caches(npc_ids: List[str]) -> None:
+        from app.memory.mongo.cache import entity_cache, invalidate_fact_lists
+        from app.memory.mongo.conversation_buffer import conversation_buffer
+
+        for npc_id in npc_ids:
+            entity_cache.invalidate("npc", npc_id)
+            conversation_buffer.invalidate(npc_id)
+        # persona별 fact 목록에도 NPC fact가 포함됨
+        invalidate_fact_lists()
+
+    @staticmethod
+    def _remove_vectors(npc_ids: List[str], world_id: Optional[str]) -> Dict[str, int]:
+        from app.memory.vector.vectorizer import Vectorizer
+
+        targets = set(npc_ids)
+        removed = {
+            "episodic": Vectorizer('episodic').remove_vectors(
+                lambda record: record.get('npc_id') in targets
+            ) if targets else 0,
+            "persona": Vectorizer('persona').remove_vectors(
+                lambda record: record.get('source_type') == 'persona_fact' and record.get('npc_id') in targets
+            ) if targets else 0,
+        }
+        if world_id:
+            removed["world"] = Vectorizer('world').remove_vectors(
+                lambda record: record.get('source_type') == 'world' and record.get('source_id') == world_id
+            )
+        return removed
+
+    @staticmethod
+    def delete_dependents(job, npc_ids: List[str], world_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        NPC들의 종속 문서/vector 삭제 (JobManager.submit용).
+
+        Args:
+            job: 진행 상황을 기록할 Job
+            npc_ids: 삭제된 NPC ID 목록
+            world_id: 삭제된 World ID (있으면 world vector도 제거)
+
+        Returns:
+            {"deleted": collection별 삭제 수, "vectors_removed": index별 제거 수}
+        """
+        from app.memory.mongo.client import get_collection
+        from app.memory.mongo.write_buffer import write_buffer
+
+        # 대기 중인 memory/trace insert가 삭제 후에 저장되지 않도록 먼저 flush
+        write_buffer.flush()
+
+        job.update(stage="counting")
+        totals = {name: 0 for name in DEPENDENT_COLLECTIONS}
+        for chunk in _chunks(npc_ids, NPC_ID_CHUNK):
+            for name in DEPENDENT_COLLECTIONS:
+                totals[name] += get_collection(name).count_documents({"npc_id": {"$in": chunk}})
+        deleted = {name: 0 for name in DEPENDENT_COLLECTIONS}
+        job.update(stage="documents", total=totals, deleted=dict(deleted))
+
+        for name in DEPENDENT_COLLECTIONS:
+            def report(count: int, name: str = name) -> None:
+                deleted[name] += count
+                job.update(deleted=dict(deleted))
+
+            for chunk in _chunks(npc_ids, NPC_ID_CHUNK):
+                CascadeDeleteService._delete_in_batches(name, {"npc_id": {"$in": chunk}}, report)
+        CascadeDeleteService._invalidate_caches(npc_ids)
+
+        job.update(stage="vectors")
+        vectors_removed = CascadeDeleteService._remove_vectors(npc_ids, world_id)
+        job.update(stage="done", vectors_removed=vectors_removed)
+
+        return {"deleted": deleted, "vectors_removed": vectors_removed}
@@ -0,0 +1,300 @@
+"""오래된 long-term episodic memory 통합 - embedding cluster별 LLM 요약 후 원본 vector 제거."""
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def consolidation_policy(npc_config: Any = None) -> Tuple[float, int]:
+    """
+    NPC에 적용할 (최소 경과 일수, 최소 대상 memory 수) - 경과 일수가 0이면 통합하지 않음.
+
+    NPCConfig(또는 dict)에 override가 있으면 그 값을, 없으면 설정 기본값을 사용합니다.
+    """
+    values = []
+    for field, setting in (
+        ("consolidation_min_age_days", "memory_consolidation_min_age_days"),
+        ("consolidation_min_memories", "memory_consolidation_min_memories"),
+    ):
+        override = None
+        if isinstance(npc_config, dict):
+            override = npc_config.get(field)
+        elif npc_config is not None:
+            override = getattr(npc_config, field, None)
+        values.append(override if override is not None else getattr(settings, setting))
+    return values[0], values[1]
+
+
+def cluster_by_similarity(vectors: np.ndarray, threshold: float, max_size: int) -> List[List[int]]:
+    """
+    정규화된 vector를 greedy하게 cluster로 묶음.
+
+    앞(오래된 memory)부터 아직 묶이지 않은 vector를 seed로 삼아, seed와 cosine 유사도가 threshold 이상인
+    vector를 유사도 순으로 최대 max_size개까지 묶습니다. 유사도 행렬은 한 번에 계산합니다.
+
+    Returns:
+        cluster별 위치 목록 (각 cluster는 위치 오름차순, 크기 1인 cluster 포함)
+    """
+    count = len(vectors)
+    similarity = vectors @ vectors.T
+    unassigned = np.ones(count, dtype=bool)
+    clusters = []
+    for seed in range(count):
+        if not unassigned[seed]:
+            continue
+        members = np.flatnonzero(unassigned & (similarity[seed] >= threshold))
+        members = members[members != seed]
+        if len(members) >= max_size:
+            members = members[np.argsort(-similarity[seed, members], kind='stable')[:max_size - 1]]
+        members = np.sort(np.append(members, seed))
+        unassigned[members] = False
+        clusters.append([int(i) for i in members])
+    return clusters
+
+
+class ConsolidationService:
+    """
+    NPC별 오래된 long-term memory를 요약 memory로 통합.
+
+    consolidation_min_age_days보다 오래된 memory가 consolidation_min_memories개 이상인 NPC에 대해
+    저장된 vector로 비슷한 memory를 묶고, 2개 이상인 cluster마다 LLM 요약을 reflection memory로 저장해
+    index에 추가합니다. 원본 memory는 Mongo에 consolidated_into로 표시해 남기고 vector만 제거합니다.
+    어느 cluster에도 묶이지 않은 memory는 consolidation_checked_at으로 표시하여 다음 실행이 같은
+    batch에 머무르지 않고 더 최근 memory로 넘어갑니다.
+    """
+
+    _stop = threading.Event()
+    _thread: Optional[threading.Thread] = None
+    _current = None
+    _submit_lock = threading.Lock()
+
+    @staticmethod
+    def _parse_summary(response: str) -> str:
+        """LLM 응답의 summary (JSON이 아니면 응답 텍스트)."""
+        response = (response or "").strip()
+        if response.startswith("```json"):
+            response = response[7:]
+        if response.startswith("```"):
+            response = response[3:]
+        if response.endswith("```"):
+            response = response[:-3]
+        response = response.strip()
+        try:
+            return str(json.loads(response).get("summary", "")).strip()
+        except (json.JSONDecodeError, AttributeError):
+            return response[:500]
+
+    @staticmethod
+    def _summarize(docs: List[Dict[str, Any]]) -> str:
+        """cluster memory들을 한 memory로 요약 (오래된 순서로 전달)."""
+        from app.services.llm_service import llm_service
+        from app.prompts.registry import prompt_registry
+
+        lines = [f"- [{doc['created_at']:%Y-%m-%d %H:%M}] {doc['content']}" for doc in docs]
+        messages = [
+            {"role": "system", "content": prompt_registry.get_text("consolidation")},
+            {"role": "user", "content": "MEMORIES (oldest first):\n" + "\n".join(lines)}
+        ]
+        return ConsolidationService._parse_summary(llm_service.call_simple(messages))
+
+    @staticmethod
+    def _summary_doc(npc_id: str, summary: str, docs: List[Dict[str, Any]], now: datetime) -> Dict[str, Any]:
+        """cluster 요약 memory 문서 (created_at은 가장 최근 원본 시각이라 recency가 원본과 이어짐)."""
+        from app.memory.mongo.repository.memory_repo import MemoryRepository
+        from app.schemas.memory import MemoryCreate
+
+        tags = {"consolidated"}
+        linked_entities = set()
+        for doc in docs:
+            tags.update(doc.get("tags") or [])
+            linked_entities.update(doc.get("linked_entities") or [])
+
+        memory_doc = MemoryRepository._build_memory_doc(
+            MemoryCreate(
+                npc_id=npc_id,
+                content=summary,
+                source="reflection",
+                importance=max(doc.get("importance", 0.0) for doc in docs),
+                tags=sorted(tags),
+                linked_entities=sorted(linked_entities)
+            ),
+            importance_threshold=0.0
+        )
+        memory_doc["created_at"] = max(doc["created_at"] for doc in docs)
+        memory_doc["consolidated_from"] = [doc["memory_id"] for doc in docs]
+        memory_doc["consolidated_at"] = now
+        return memory_doc
+
+    @staticmethod
+    def _consolidate_npc(vectorizer, npc_id: str, min_age_days: float, min_memories: int, now: datetime) -> Dict[str, Any]:
+        from app.memory.mongo.client import get_collection
+        from app.memory.vector.reindex import mark_refreshed
+
+        collection = get_collection("episodic_memory")
+        query = {
+            "npc_id": npc_id,
+            "memory_type": "long_term",
+            "created_at": {"$lt": now - timedelta(days=min_age_days)},
+            "consolidated_into": {"$exists": False},
+            "consolidated_from": {"$exists": False},
+            "consolidation_checked_at": {"$exists": False}
+        }
+        docs = list(collection.find(
+            query,
+            {"_id": 0, "memory_id": 1, "content": 1, "importance": 1, "tags": 1, "linked_entities": 1, "created_at": 1}
+        ).sort("created_at", 1).limit(settings.memory_consolidation_batch_size))
+        report = {"eligible": len(docs), "clusters": 0, "consolidated": 0, "failed": 0, "checked": 0}
+        if len(docs) < min_memories:
+            return report
+
+        # vector가 없는 memory(vectorization 실패)는 묶을 수 없으므로 제외
+        memory_ids, vectors = vectorizer.episodic_vectors(npc_id, [doc["memory_id"] for doc in docs])
+        by_id = {doc["memory_id"]: doc for doc in docs}
+        clusters = [
+            [by_id[memory_ids[i]] for i in cluster]
+            for cluster in cluster_by_similarity(
+                vectors,
+                settings.memory_consolidation_similarity,
+                settings.memory_consolidation_max_cluster_size
+            )
+            if len(cluster) > 1
+        ]
+        
+        # 묶이지 않은 memory(vector가 없는 memory 포함)는 확인 완료로 표시 (요약 실패 cluster는 다음 실행에서 재시도)
+        clustered = {doc["memory_id"] for cluster in clusters for doc in cluster}
+        unclustered = [doc["memory_id"] for doc in docs if doc["memory_id"] not in clustered]
+        if unclustered:
+            collection.update_many({"memory_id": {"$in": unclustered}}, {"$set": {"consolidation_checked_at": now}})
+        report["checked"] = len(unclustered)
+
+        summaries = []
+        for cluster in clusters:
+            try:
+                summary = ConsolidationService._summarize(cluster)
+            except Exception as e:
+                logger.warning(f"Failed to summarize {len(cluster)} memories of NPC {npc_id}: {e}")
+                summary = ""
+            if not summary:
+                report["failed"] += 1
+                continue
+            summaries.append(ConsolidationService._summary_doc(npc_id, summary, cluster, now))
+        if not summaries:
+            return report
+
+        collection.insert_many(summaries)
+        for memory_doc in summaries:
+            memory_doc.pop("_id", None)
+        vectorizer.vectorize_episodic_memories_bulk([
+            {**memory_doc, "created_at": memory_doc["created_at"].isoformat()} for memory_doc in summaries
+        ])
+
+        # 원본은 summary로 대체되었음을 표시하고 vector만 제거 (재구성 중이면 shadow에서도 제거되도록 먼저 표시)
+        originals = {memory_id for memory_doc in summaries for memory_id in memory_doc["consolidated_from"]}
+        mark_refreshed("episodic", [("episodic", memory_id) for memory_id in originals])
+        for memory_doc in summaries:
+            collection.update_many(
+                {"memory_id": {"$in": memory_doc["consolidated_from"]}},
+                {"$set": {"consolidated_into": memory_doc["memory_id"]}}
+            )
+        vectorizer.remove_vectors(
+            lambda record: record.get('source_type') == 'episodic' and record.get('source_id') in originals
+        )
+
+        report["clusters"] = len(summaries)
+        report["consolidated"] = len(originals)
+        report["summary_ids"] = [memory_doc["memory_id"] for memory_doc in summaries]
+        return report
+
+    @staticmethod
+    def run(job, npc_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        memory 통합 실행 (JobManager.submit용).
+
+        Args:
+            job: 진행 상황을 기록할 Job
+            npc_id: 지정하면 해당 NPC만 처리
+
+        Returns:
+            {"npcs", "clusters", "consolidated", "failed", "checked", "by_npc": {npc_id: {...}}}
+        """
+        from app.memory.mongo.client import get_collection
+        from app.memory.mongo.write_buffer import write_buffer
+        from app.memory.vector.vectorizer import Vectorizer
+        from app.services.retention import RetentionService
+
+        # 대기 중인 memory insert도 통합 대상에 포함되도록 먼저 flush
+        write_buffer.flush("episodic_memory")
+
+        now = datetime.utcnow()
+        npc_ids = [npc_id] if npc_id else get_collection("episodic_memory").distinct("npc_id", {"memory_type": "long_term"})
+        configs = RetentionService._npc_configs(npc_ids)
+        vectorizer = None
+
+        totals = {"npcs": 0, "clusters": 0, "consolidated": 0, "failed": 0, "checked": 0}
+        per_npc = {}
+        job.update(total_npcs=len(npc_ids), **totals)
+        for current_npc_id in npc_ids:
+            min_age_days, min_memories = consolidation_policy(configs.get(current_npc_id))
+            if not min_age_days:
+                continue
+            if vectorizer is None:
+                vectorizer = Vectorizer('episodic')
+            result = ConsolidationService._consolidate_npc(vectorizer, current_npc_id, min_age_days, min_memories, now)
+            totals["npcs"] += 1
+            for key in ("clusters", "consolidated", "failed", "checked"):
+                totals[key] += result[key]
+            if result["clusters"] or result["failed"] or result["checked"]:
+                per_npc[current_npc_id] = result
+            job.update(**totals)
+
+        return {**totals, "by_npc": per_npc}
+
+    @staticmethod
+    def submit(npc_id: Optional[str] = None) -> Tuple[Any, bool]:
+        """
+        통합 job 시작.
+
+        Returns:
+            (job, started) - 통합 job이 이미 실행 중이면 (그 job, False)
+        """
+        from app.services.jobs import job_manager
+
+        with ConsolidationService._submit_lock:
+            job = ConsolidationService._current
+            if job is not None and not job.finished:
+                return job, False
+            job = job_manager.submit("memory_consolidation", ConsolidationService.run, npc_id=npc_id)
+            ConsolidationService._current = job
+            return job, True
+
+    @staticmethod
+    def _loop() -> None:
+        interval_s = settings.memory_consolidation_interval_minutes * 60
+        while not ConsolidationService._stop.wait(timeout=interval_s):
+            try:
+                ConsolidationService.submit()
+            except Exception as e:
+                logger.error(f"Failed to submit memory consolidation: {e}")
+
+    @staticmethod
+    def start() -> None:
+        """memory_consolidation_interval_minutes마다 통합 job을 제출하는 daemon thread 시작."""
+        if settings.memory_consolidation_interval_minutes <= 0 or ConsolidationService._thread is not None:
+            return
+        ConsolidationService._stop.clear()
+        ConsolidationService._thread = threading.Thread(
+            target=ConsolidationService._loop, name="memory-consolidation", daemon=True
+        )
+        ConsolidationService._thread.start()
+
+    @staticmethod
+    def stop() -> None:
+        ConsolidationService._stop.set()
+        if ConsolidationService._thread is not None:
+            ConsolidationService._thread.join(timeout=5)
+            ConsolidationService._thread = None
@@ -1,32 +1,42 @@
-"""Embedding 서비스 - OpenAI embeddings API 래퍼."""
+"""Embedding 서비스 - embedding backend 래퍼."""
 from typing import List
 import numpy as np
-from openai import OpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential
 from app.core.config import settings
+from app.services.backends.latency import LatencyModel
+from app.services.backends.embedding import OpenAIEmbeddingBackend, HashingEmbeddingBackend
 
 
 class EmbeddingService:
-    """OpenAI API를 사용한 embedding 생성 서비스."""
+    """설정된 backend(OpenAI 또는 결정적 hashing)를 사용한 embedding 생성 서비스."""
     
     def __init__(self):
-        self.client = OpenAI(api_key=settings.openai_api_key)
         self.model = settings.openai_embedding_model
         self.dimension = settings.openai_embedding_dim
         self.batch_size = 100
+        self.backend = self._create_backend()
+    
+    def _create_backend(self):
+        """Settings.embedding_backend에 따라 embedding backend 생성."""
+        if settings.embedding_backend == "hashing":
+            return HashingEmbeddingBackend(self.dimension, LatencyModel(
+                settings.stub_latency_distribution,
+                settings.stub_embedding_latency_ms,
+                settings.stub_embedding_latency_jitter_ms,
+                seed=settings.stub_seed
+            ))
+        return OpenAIEmbeddingBackend(settings.openai_api_key, self.model)
+    
+    def set_backend(self, backend) -> None:
+        """Embedding backend 교체 (벤치마크 등)."""
+        self.backend = backend
     
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def _embed_batch(self, texts: List[str]) -> np.ndarray:
         """텍스트 배치 embedding."""
         cleaned_texts = [text.strip() for text in texts]
         
-        response = self.client.embeddings.create(
-            model=self.model,
-            input=cleaned_texts
-        )
-        
-        embeddings = [item.embedding for item in response.data]
-        embeddings_array = np.array(embeddings, dtype=np.float32)
+        embeddings_array = self.backend.embed(cleaned_texts)
         
         if embeddings_array.shape[1] != self.dimension:
             raise ValueError(
@@ -1,6 +1,6 @@
 from typing import List, Optional
 from datetime import datetime
-from app.database import get_database
+from app.memory.mongo.client import get_async_db
 from app.models.example import ExampleModel, ExampleCreate, ExampleUpdate
 from bson import ObjectId
 
@@ -9,7 +9,7 @@ class ExampleService:
     @staticmethod
     async def create_example(data: ExampleCreate) -> ExampleModel:
         """예제 생성"""
-        db = get_database()
+        db = get_async_db()
         example_dict = {
             "name": data.name,
             "description": data.description,
@@ -22,7 +22,7 @@ class ExampleService:
     @staticmethod
     async def get_example_by_id(example_id: str) -> Optional[ExampleModel]:
         """ID로 예제 조회"""
-        db = get_database()
+        db = get_async_db()
         example = await db.examples.find_one({"_id": ObjectId(example_id)})
         if example:
             example["id"] = str(example["_id"])
@@ -32,7 +32,7 @@ class ExampleService:
     @staticmethod
     async def get_all_examples() -> List[ExampleModel]:
         """모든 예제 조회"""
-        db = get_database()
+        db = get_async_db()
         examples = await db.examples.find().to_list(length=100)
         result = []
         for example in examples:
@@ -43,7 +43,7 @@ class ExampleService:
     @staticmethod
     async def update_example(example_id: str, data: ExampleUpdate) -> Optional[ExampleModel]:
         """예제 업데이트"""
-        db = get_database()
+        db = get_async_db()
         update_data = {k: v for k, v in data.model_dump(exclude_unset=True).items() if v is not None}
         if not update_data:
             return None
@@ -61,7 +61,7 @@ class ExampleService:
     @staticmethod
     async def delete_example(example_id: str) -> bool:
         """예제 삭제"""
-        db = get_database()
+        db = get_async_db()
         result = await db.examples.delete_one({"_id": ObjectId(example_id)})
         return result.deleted_count > 0
 
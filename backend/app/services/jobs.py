@@ -0,0 +1,132 @@
+"""In-process background job 실행 및 진행 상황 조회."""
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """실행 중인 작업이 update()로 진행 상황을 기록하는 background job."""
+
+    def __init__(self, job_type: str, params: Dict[str, Any]):
+        self.job_id = f"job_{uuid.uuid4().hex[:8]}"
+        self.job_type = job_type
+        self.params = params
+        self.status = "pending"
+        self.progress: Dict[str, Any] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def update(self, **progress: Any) -> None:
+        """진행 상황 필드 갱신 (전달한 key만 덮어씀)."""
+        with self._lock:
+            self.progress.update(progress)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "job_type": self.job_type,
+                "status": self.status,
+                "params": self.params,
+                "progress": dict(self.progress),
+                "result": self.result,
+                "error": self.error,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at
+            }
+
+
+class JobManager:
+    """
+    Thread pool에서 job을 실행하고 최근 job 상태를 보관.
+
+    상태는 process 메모리에만 있으므로 multi-worker 배포에서는 job을 시작한 worker에서만
+    조회됩니다. 완료된 job은 max_history개까지 유지합니다.
+    """
+
+    def __init__(self, max_workers: int = 2, max_history: int = 1000):
+        self.max_workers = max_workers
+        self.max_history = max_history
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+            return self._executor
+
+    def _run(self, job: Job, fn: Callable[..., Any]) -> None:
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        try:
+            job.result = fn(job, **job.params)
+            job.status = "completed"
+        except Exception as e:
+            logger.error(f"Job {job.job_id} ({job.job_type}) failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = datetime.utcnow()
+
+    def _trim_locked(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def submit(self, job_type: str, fn: Callable[..., Any], **params: Any) -> Job:
+        """
+        job 등록 후 background에서 실행.
+
+        Args:
+            job_type: job 종류 이름
+            fn: fn(job, **params) 형태의 작업 함수 (반환값이 job result)
+            params: 작업 함수 인자 (job 조회 결과에도 포함되므로 JSON 직렬화 가능한 값)
+        """
+        job = Job(job_type, params)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._trim_locked()
+        self._get_executor().submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, job_type: Optional[str] = None, status: Optional[str] = None, limit: int = 100) -> List[Job]:
+        """최근 job 목록 (최신순)."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        jobs = [
+            job for job in reversed(jobs)
+            if (job_type is None or job.job_type == job_type) and (status is None or job.status == status)
+        ]
+        return jobs[:limit]
+
+    def shutdown(self) -> None:
+        """대기 중인 job 취소 (실행 중인 job은 끝날 때까지 process 종료를 기다림)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+job_manager = JobManager(max_workers=settings.job_workers)
@@ -1,20 +1,50 @@
-"""LLM 서비스 - OpenAI Chat Completions 래퍼."""
+"""LLM 서비스 - Chat Completions backend 래퍼."""
 import json
 from typing import List, Dict, Any, Optional
-from openai import OpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential
 from app.core.config import settings
 from app.agents.tools.registry import tool_registry
+from app.services.backends.latency import LatencyModel
+from app.services.backends.llm import (
+    OpenAIChatBackend,
+    StubChatBackend,
+    RecordingChatBackend,
+    ReplayChatBackend,
+)
 
 
 class LLMService:
     """LLM 상호작용 서비스."""
     
     def __init__(self):
-        self.client = OpenAI(api_key=settings.openai_api_key)
         self.model = settings.openai_chat_model
         self.temperature = 0.3
         self.max_tokens = 2000
+        self.backend = self._create_backend()
+    
+    @staticmethod
+    def _create_stub_backend() -> StubChatBackend:
+        return StubChatBackend(LatencyModel(
+            settings.stub_latency_distribution,
+            settings.stub_llm_latency_ms,
+            settings.stub_llm_latency_jitter_ms,
+            seed=settings.stub_seed
+        ))
+    
+    def _create_backend(self):
+        """Settings.llm_backend에 따라 chat backend 생성."""
+        if settings.llm_backend == "stub":
+            return self._create_stub_backend()
+        if settings.llm_backend == "replay":
+            return ReplayChatBackend(settings.llm_cassette_path, fallback=self._create_stub_backend())
+        backend = OpenAIChatBackend(settings.openai_api_key, self.model)
+        if settings.llm_backend == "record":
+            return RecordingChatBackend(backend, settings.llm_cassette_path)
+        return backend
+    
+    def set_backend(self, backend) -> None:
+        """Chat backend 교체 (벤치마크, replay 등)."""
+        self.backend = backend
     
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def _call_llm(
@@ -23,25 +53,14 @@ class LLMService:
         tools: Optional[List[Dict]] = None,
         tool_choice: str = "auto"
     ) -> Dict[str, Any]:
-        """OpenAI Chat Completions API 호출."""
-        params = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": self.temperature,
-            "max_tokens": self.max_tokens
-        }
-        
-        if tools:
-            params["tools"] = tools
-            params["tool_choice"] = tool_choice
-        
-        response = self.client.chat.completions.create(**params)
-        
-        return {
-            "raw_response": response,
-            "message": response.choices[0].message,
-            "usage": response.usage
-        }
+        """Chat backend 호출 (content, tool_calls, finish_reason, usage 반환)."""
+        return self.backend.chat(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens
+        )
     
     def call_with_tools(
         self,
@@ -55,29 +74,11 @@ class LLMService:
         
         result = self._call_llm(messages, tools=tools, tool_choice="auto" if use_tools else "none")
         
-        message = result["message"]
-        tool_calls = []
-        
-        if message.tool_calls:
-            for tool_call in message.tool_calls:
-                tool_calls.append({
-                    "id": tool_call.id,
-                    "type": tool_call.type,
-                    "function": {
-                        "name": tool_call.function.name,
-                        "arguments": tool_call.function.arguments
-                    }
-                })
-        
         return {
-            "raw_output": message.content or "",
-            "tool_calls": tool_calls,
-            "finish_reason": result["raw_response"].choices[0].finish_reason,
-            "usage": {
-                "prompt_tokens": result["usage"].prompt_tokens,
-                "completion_tokens": result["usage"].completion_tokens,
-                "total_tokens": result["usage"].total_tokens
-            }
+            "raw_output": result["content"] or "",
+            "tool_calls": result["tool_calls"],
+            "finish_reason": result["finish_reason"],
+            "usage": result["usage"]
         }
     
     def call_simple(
@@ -86,7 +87,7 @@ class LLMService:
     ) -> str:
         """Tool 없이 간단한 LLM 호출 (reflection, importance scoring용)."""
         result = self._call_llm(messages, tools=None, tool_choice="none")
-        return result["message"].content or ""
+        return result["content"] or ""
     
     def parse_tool_call(self, tool_call: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Tool call 파싱 및 검증."""
@@ -0,0 +1,214 @@
+"""Short-term memory/inference trace retention - TTL 만료 및 만료 전 압축 파일 archival."""
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import zstandard
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# policy 이름 -> (collection, 대상 문서 filter, 기본 보존 기간 설정, NPCConfig override 필드)
+POLICIES: Dict[str, Dict[str, Any]] = {
+    "short_term_memory": {
+        "collection": "episodic_memory",
+        "filter": {"memory_type": "short_term"},
+        "setting": "short_term_memory_retention_days",
+        "npc_config_field": "short_term_memory_retention_days",
+    },
+    "traces": {
+        "collection": "inference_traces",
+        "filter": {},
+        "setting": "trace_retention_days",
+        "npc_config_field": "trace_retention_days",
+    },
+}
+
+
+def retention_days(policy: str, npc_config: Any = None) -> float:
+    """
+    NPC에 적용할 보존 기간(일, 0이면 무기한).
+
+    NPCConfig(또는 dict)에 override가 있으면 그 값을, 없으면 설정 기본값을 사용합니다.
+    """
+    spec = POLICIES[policy]
+    override = None
+    if isinstance(npc_config, dict):
+        override = npc_config.get(spec["npc_config_field"])
+    elif npc_config is not None:
+        override = getattr(npc_config, spec["npc_config_field"], None)
+    return override if override is not None else getattr(settings, spec["setting"])
+
+
+def expire_at(created_at: datetime, days: Optional[float]) -> Optional[datetime]:
+    """
+    TTL index가 삭제할 시각 (expire_at 필드 값).
+
+    archival이 켜져 있으면 archive 전에 삭제되지 않도록 None을 반환하고, retention job이
+    archive 후 직접 삭제합니다.
+    """
+    if not days or settings.retention_archive_dir:
+        return None
+    return created_at + timedelta(days=days)
+
+
+class RetentionService:
+    """
+    만료된 short-term memory/trace archive 및 삭제.
+
+    새 문서는 insert 시 expire_at이 기록되어 TTL index가 삭제하고, 이 job은 expire_at이 없는 문서
+    (이전 문서, archival 모드, NPC override 변경)를 created_at 기준으로 정리합니다. trace policy를
+    전체 NPC에 대해 실행하면 더 이상 참조되지 않는 prompt segment도 정리합니다.
+    """
+
+    BATCH_SIZE = 1000
+
+    _stop = threading.Event()
+    _thread: Optional[threading.Thread] = None
+    _run_lock = threading.Lock()
+
+    @staticmethod
+    def _npc_configs(npc_ids: List[str]) -> Dict[str, Any]:
+        from app.memory.mongo.client import get_collection
+
+        docs = get_collection("npcs").find({"npc_id": {"$in": npc_ids}}, {"_id": 0, "npc_id": 1, "config": 1})
+        return {doc["npc_id"]: doc.get("config") for doc in docs}
+
+    @staticmethod
+    def _archive_path(collection_name: str, npc_id: str, run_started: datetime) -> str:
+        directory = os.path.join(settings.retention_archive_dir, collection_name, npc_id)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{run_started.strftime('%Y%m%dT%H%M%S')}.jsonl.zst")
+
+    @staticmethod
+    def _write_archive(path: str, docs: List[Dict[str, Any]]) -> None:
+        """JSONL 압축 파일로 저장 (같은 run의 batch는 이어 붙임)."""
+        payload = "".join(json.dumps(doc, ensure_ascii=False, default=str) + "\n" for doc in docs).encode("utf-8")
+        compressed = zstandard.ZstdCompressor(level=10).compress(payload)
+        # zstd frame을 이어 붙인 파일도 하나의 stream으로 풀림
+        with open(path, "ab") as f:
+            f.write(compressed)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _expired_query(spec: Dict[str, Any], npc_id: str, cutoff: datetime) -> Dict[str, Any]:
+        return {**spec["filter"], "npc_id": npc_id, "created_at": {"$lt": cutoff}}
+
+    @staticmethod
+    def _process_npc(policy: str, npc_id: str, days: float, now: datetime, preview: bool) -> Dict[str, Any]:
+        from app.memory.mongo.client import get_collection
+
+        spec = POLICIES[policy]
+        collection = get_collection(spec["collection"])
+        cutoff = now - timedelta(days=days)
+        query = RetentionService._expired_query(spec, npc_id, cutoff)
+
+        if preview:
+            return {"expired": collection.count_documents(query), "archived": 0, "deleted": 0}
+
+        archive = bool(settings.retention_archive_dir)
+        path = RetentionService._archive_path(spec["collection"], npc_id, now) if archive else None
+        report = {"expired": 0, "archived": 0, "deleted": 0}
+        while True:
+            docs = list(collection.find(query).sort("created_at", 1).limit(RetentionService.BATCH_SIZE))
+            if not docs:
+                break
+            ids = [doc.pop("_id") for doc in docs]
+            report["expired"] += len(docs)
+            if archive:
+                if policy == "traces":
+                    from app.memory.mongo.repository.trace_repo import TraceRepository
+                    docs = TraceRepository._expand_docs(docs)
+                RetentionService._write_archive(path, docs)
+                report["archived"] += len(docs)
+            report["deleted"] += collection.delete_many({"_id": {"$in": ids}}).deleted_count
+
+        if report["deleted"] and policy == "short_term_memory":
+            from app.memory.mongo.conversation_buffer import conversation_buffer
+            conversation_buffer.invalidate(npc_id)
+        if path:
+            report["archive_path"] = path
+        return report
+
+    @staticmethod
+    def run(preview: bool = False, npc_id: Optional[str] = None, policies: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        retention 실행 (preview면 만료 대상 개수만 집계).
+
+        Args:
+            preview: True면 삭제/archive 없이 개수만 반환
+            npc_id: 지정하면 해당 NPC만 처리
+            policies: 처리할 policy 이름 (None이면 전체)
+
+        Returns:
+            {"preview", "started_at", "finished_at", "archive_dir", "policies": {policy: {...}},
+             "prompt_segments": {"candidates", "unreferenced", "deleted"} (trace policy를 전체 NPC에 실행한 경우)}
+        """
+        from app.memory.mongo.client import get_collection
+
+        now = datetime.utcnow()
+        report: Dict[str, Any] = {
+            "preview": preview,
+            "started_at": now,
+            "archive_dir": settings.retention_archive_dir or None,
+            "policies": {}
+        }
+        with RetentionService._run_lock:
+            for policy in policies or list(POLICIES):
+                spec = POLICIES[policy]
+                npc_ids = [npc_id] if npc_id else get_collection(spec["collection"]).distinct("npc_id", spec["filter"])
+                configs = RetentionService._npc_configs(npc_ids)
+                totals = {"npcs": 0, "expired": 0, "archived": 0, "deleted": 0}
+                per_npc = {}
+                for current_npc_id in npc_ids:
+                    days = retention_days(policy, configs.get(current_npc_id))
+                    if not days:
+                        continue
+                    result = RetentionService._process_npc(policy, current_npc_id, days, now, preview)
+                    totals["npcs"] += 1
+                    for key in ("expired", "archived", "deleted"):
+                        totals[key] += result[key]
+                    if result["expired"]:
+                        per_npc[current_npc_id] = {"retention_days": days, **result}
+                report["policies"][policy] = {**totals, "by_npc": per_npc}
+            # trace 삭제 경로(retention, TTL index, NPC 삭제)와 무관하게 남은 segment를 전역으로 정리
+            if npc_id is None and "traces" in report["policies"]:
+                from app.memory.mongo.trace_compaction import segment_store
+                report["prompt_segments"] = segment_store.sweep(now, preview=preview)
+        report["finished_at"] = datetime.utcnow()
+        return report
+
+    @staticmethod
+    def _loop() -> None:
+        interval_s = settings.retention_interval_minutes * 60
+        while not RetentionService._stop.wait(timeout=interval_s):
+            try:
+                report = RetentionService.run()
+                deleted = sum(policy["deleted"] for policy in report["policies"].values())
+                if deleted:
+                    logger.info(f"Retention removed {deleted} expired documents")
+                segments_deleted = report.get("prompt_segments", {}).get("deleted", 0)
+                if segments_deleted:
+                    logger.info(f"Retention removed {segments_deleted} unreferenced prompt segments")
+            except Exception as e:
+                logger.error(f"Retention run failed: {e}")
+
+    @staticmethod
+    def start() -> None:
+        """retention_interval_minutes마다 run()을 실행하는 daemon thread 시작."""
+        if settings.retention_interval_minutes <= 0 or RetentionService._thread is not None:
+            return
+        RetentionService._stop.clear()
+        RetentionService._thread = threading.Thread(target=RetentionService._loop, name="retention", daemon=True)
+        RetentionService._thread.start()
+
+    @staticmethod
+    def stop() -> None:
+        RetentionService._stop.set()
+        if RetentionService._thread is not None:
+            RetentionService._thread.join(timeout=5)
+            RetentionService._thread = None
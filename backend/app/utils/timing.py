@@ -0,0 +1,34 @@
+"""단계별 실행 시간 측정 유틸리티."""
+import time
+from typing import Dict
+
+
+class StageTimer:
+    """
+    연속된 단계의 소요 시간(ms)을 기록.
+
+    lap(name)을 호출할 때마다 직전 lap 이후 경과 시간을 name 단계에 누적합니다.
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._last = self._start
+        self.timings: Dict[str, float] = {}
+
+    def lap(self, stage: str) -> float:
+        """직전 lap 이후 경과 시간을 stage에 기록하고 반환 (ms)."""
+        now = time.perf_counter()
+        elapsed_ms = (now - self._last) * 1000.0
+        self.timings[stage] = self.timings.get(stage, 0.0) + elapsed_ms
+        self._last = now
+        return elapsed_ms
+
+    def total_ms(self) -> float:
+        """타이머 생성 이후 전체 경과 시간 (ms)."""
+        return (time.perf_counter() - self._start) * 1000.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """단계별 시간과 total을 소수점 3자리로 반환."""
+        result = {stage: round(ms, 3) for stage, ms in self.timings.items()}
+        result["total"] = round(self.total_ms(), 3)
+        return result
@@ -0,0 +1,167 @@
+"""벤치마크 공통 유틸리티 - 오프라인 환경 구성, 통계, 결과 저장/비교."""
+import json
+import os
+import platform
+import subprocess
+import tempfile
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+
+def configure_offline_environment(
+    workdir: Optional[str] = None,
+    embedding_dim: int = 256,
+    latency_distribution: str = "none",
+    llm_latency_ms: float = 0.0,
+    llm_latency_jitter_ms: float = 0.0,
+    embedding_latency_ms: float = 0.0,
+    embedding_latency_jitter_ms: float = 0.0,
+    seed: int = 0
+) -> str:
+    """
+    Stub backend와 임시 FAISS 디렉터리를 사용하도록 환경 변수 설정.
+
+    app 모듈은 import 시점에 Settings를 읽으므로 반드시 app import 전에 호출해야 합니다.
+
+    Returns:
+        FAISS 파일이 저장될 작업 디렉터리
+    """
+    workdir = workdir or tempfile.mkdtemp(prefix="npc_bench_")
+    os.environ.update({
+        "LLM_BACKEND": "stub",
+        "EMBEDDING_BACKEND": "hashing",
+        "OPENAI_EMBEDDING_DIM": str(embedding_dim),
+        "STUB_LATENCY_DISTRIBUTION": latency_distribution,
+        "STUB_LLM_LATENCY_MS": str(llm_latency_ms),
+        "STUB_LLM_LATENCY_JITTER_MS": str(llm_latency_jitter_ms),
+        "STUB_EMBEDDING_LATENCY_MS": str(embedding_latency_ms),
+        "STUB_EMBEDDING_LATENCY_JITTER_MS": str(embedding_latency_jitter_ms),
+        "STUB_SEED": str(seed),
+        "FAISS_INDEX_DIR": os.path.join(workdir, "indices"),
+        "FAISS_META_DIR": os.path.join(workdir, "meta"),
+        # mongomock은 let/pipeline $lookup을 지원하지 않음 (benchmarks.turn_context는 실제 MongoDB로 비교)
+        "TURN_CONTEXT_AGGREGATION": "false",
+    })
+    return workdir
+
+
+def install_mongo_standin(db_name: str = "npc_benchmark") -> None:
+    """
+    MongoClientManager/AsyncMongoClientManager에 mongomock 기반 in-process Mongo stand-in 주입.
+
+    sync(pymongo)와 async(Motor) repository가 같은 데이터를 보도록 하나의 mongomock client를 공유합니다.
+    """
+    import mongomock
+    from mongomock_motor import AsyncMongoMockClient
+    from app.memory.mongo.client import MongoClientManager, AsyncMongoClientManager
+
+    MongoClientManager._client = mongomock.MongoClient()
+    MongoClientManager._db = MongoClientManager._client[db_name]
+    AsyncMongoClientManager._client = AsyncMongoMockClient(mock_mongo_client=MongoClientManager._client)
+    AsyncMongoClientManager._db = AsyncMongoClientManager._client[db_name]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """선형 보간 percentile (sorted_values는 오름차순 정렬되어 있어야 함)."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """샘플 리스트의 count/mean/min/p50/p95/p99/max 요약."""
+    values = sorted(samples)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 3),
+        "min": round(values[0], 3),
+        "p50": round(percentile(values, 0.50), 3),
+        "p95": round(percentile(values, 0.95), 3),
+        "p99": round(percentile(values, 0.99), 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def git_revision() -> str:
+    """현재 git commit (없으면 'unknown')."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_metadata(config: Dict[str, Any]) -> Dict[str, Any]:
+    """결과 JSON에 포함할 실행 환경 메타데이터."""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+    }
+
+
+def save_results(path: str, results: Dict[str, Any]) -> None:
+    """결과를 JSON 파일로 저장."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_metrics(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    prefix: str = ""
+) -> List[Dict[str, Any]]:
+    """
+    두 결과의 숫자 metric을 재귀적으로 비교.
+
+    Returns:
+        [{metric, baseline, current, delta_pct}] 리스트
+    """
+    rows = []
+    for key, value in current.items():
+        name = f"{prefix}{key}"
+        base_value = baseline.get(key) if isinstance(baseline, dict) else None
+        if isinstance(value, dict):
+            rows.extend(compare_metrics(value, base_value or {}, prefix=f"{name}."))
+        elif key == "count":
+            continue
+        elif isinstance(value, (int, float)) and isinstance(base_value, (int, float)):
+            delta_pct = ((value - base_value) / base_value * 100.0) if base_value else 0.0
+            rows.append({
+                "metric": name,
+                "baseline": base_value,
+                "current": value,
+                "delta_pct": round(delta_pct, 2)
+            })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        print("No comparable metrics.")
+        return
+    width = max(len(row["metric"]) for row in rows)
+    print(f"{'metric'.ljust(width)}  {'baseline':>12}  {'current':>12}  {'delta':>9}")
+    for row in rows:
+        print(
+            f"{row['metric'].ljust(width)}  {row['baseline']:>12.3f}  "
+            f"{row['current']:>12.3f}  {row['delta_pct']:>+8.2f}%"
+        )
@@ -0,0 +1,174 @@
+"""벤치마크용 합성 world/NPC/memory 데이터 생성."""
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Any, List
+
+
+ACTORS = ["player_001", "player_002", "merchant_01", "guard_03", "orc_07"]
+LOCATIONS = ["town_square", "tavern", "forest_entrance", "castle_gate", "market"]
+DIALOGUES = [
+    "What is this ring?",
+    "Have you seen the blacksmith today?",
+    "The roads are dangerous at night.",
+    "I need help with a quest in the forest.",
+    "Would you trade your sword for some gold?",
+    "Hello there, friend!",
+    "Where can I find the old wizard?",
+    "Someone stole my horse last night.",
+]
+EVENT_TYPES = ["player_interaction", "player_interaction", "player_interaction", "combat", "movement", "quest"]
+
+
+def make_observation(rng: random.Random) -> Dict[str, Any]:
+    """무작위 observation 생성 (rng로 재현 가능)."""
+    event_type = rng.choice(EVENT_TYPES)
+    observation = {
+        "event_type": event_type,
+        "actor": rng.choice(ACTORS),
+        "action": "approached",
+        "location": rng.choice(LOCATIONS),
+        "details": {}
+    }
+    if event_type == "player_interaction":
+        observation["details"]["dialogue"] = rng.choice(DIALOGUES)
+    elif event_type == "combat":
+        observation["action"] = "attacked with a rusty blade"
+    elif event_type == "movement":
+        observation["action"] = "moved towards the gate"
+    else:
+        observation["action"] = "asked about the missing quest item"
+    return observation
+
+
+def synthesize_world(
+    num_npcs: int,
+    memories_per_npc: int,
+    long_term_ratio: float = 0.3,
+    facts_per_npc: int = 5,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    World 1개와 NPC N개(각자 persona 포함), NPC당 M개의 과거 memory를 생성하여
+    Mongo와 FAISS(episodic/persona/world)에 적재.
+
+    Memory는 repository의 insert_memory 대신 insert_many와 배치 embedding으로 적재하여
+    fixture 준비 시간을 줄입니다 (문서 형식은 MemoryRepository와 동일).
+
+    Returns:
+        {"world_id", "npc_ids", "persona_ids"}
+    """
+    from app.memory.mongo.client import get_collection
+    from app.memory.mongo.repository.npc_repo import NPCRepository
+    from app.memory.mongo.repository.persona_repo import PersonaRepository, PersonaFactRepository
+    from app.memory.mongo.repository.world_repo import WorldRepository
+    from app.memory.vector.vectorizer import Vectorizer
+    from app.services.embedding_service import embedding_service
+    from app.schemas.npc import NPCCreate
+    from app.schemas.persona import PersonaCreate, PersonaFactCreate, PersonaFactDimension
+    from app.schemas.world import WorldCreate
+
+    rng = random.Random(seed)
+
+    world = WorldRepository.create_world(WorldCreate(
+        world_id=f"world_bench_{uuid.uuid4().hex[:6]}",
+        title="Benchmark Realm",
+        rules={
+            "laws": ["No magic in public", "Respect the king", "No weapons in the tavern"],
+            "factions": {"wizards": "Neutral, protect balance", "orcs": "Hostile raiders"},
+            "social_norms": ["Greet with respect", "Offer help to travelers"]
+        },
+        locations={loc: {"type": "peaceful"} for loc in LOCATIONS},
+        danger_levels={loc: round(rng.random(), 2) for loc in LOCATIONS},
+        global_constraints={"magic_available": True}
+    ))
+    Vectorizer('world').vectorize_world_chunks(world.world_id, world.model_dump())
+
+    persona_vectorizer = Vectorizer('persona')
+    episodic_vectorizer = Vectorizer('episodic')
+    if episodic_vectorizer.faiss_manager.index is None:
+        episodic_vectorizer.faiss_manager.create_index()
+
+    dimensions = list(PersonaFactDimension)
+    memory_collection = get_collection("episodic_memory")
+    npc_ids, persona_ids = [], []
+    now = datetime.utcnow()
+
+    for n in range(num_npcs):
+        persona = PersonaRepository.create_persona(PersonaCreate(
+            persona_id=f"persona_bench_{uuid.uuid4().hex[:6]}",
+            name=f"Bench NPC {n}",
+            traits=rng.sample(["wise", "brave", "greedy", "kind", "patient", "curious"], 3),
+            habits=["smoking pipe", "counting coins"],
+            goals=["protect the village", "find the lost ring"],
+            background="A long-time resident of the benchmark realm.",
+            speech_style="Formal",
+            constraints={"taboos": ["killing innocents"], "moral_rules": ["help those in need"]}
+        ))
+        persona_vectorizer.vectorize_persona_chunks(persona.persona_id, persona.model_dump())
+
+        npc = NPCRepository.create_npc(NPCCreate(
+            name=persona.name,
+            role="villager",
+            persona_id=persona.persona_id,
+            world_id=world.world_id,
+            current_state={"emotion": "calm", "goal": "protect the village", "location": rng.choice(LOCATIONS)}
+        ))
+
+        facts = PersonaFactRepository.create_facts_bulk([
+            PersonaFactCreate(
+                persona_id=persona.persona_id,
+                npc_id=npc.npc_id,
+                dimension=dimensions[i % len(dimensions)],
+                content=f"Fact {i} about {persona.name}: {rng.choice(DIALOGUES)}"
+            )
+            for i in range(facts_per_npc)
+        ])
+        persona_vectorizer.vectorize_persona_facts_bulk([
+            {**fact.model_dump(), "dimension": fact.dimension.value} for fact in facts
+        ])
+
+        docs = []
+        for m in range(memories_per_npc):
+            importance = round(rng.random(), 3)
+            is_long_term = rng.random() < long_term_ratio
+            docs.append({
+                "memory_id": f"mem_{uuid.uuid4().hex[:8]}",
+                "npc_id": npc.npc_id,
+                "memory_type": "long_term" if is_long_term else "short_term",
+                "content": f"{rng.choice(ACTORS)} said: \"{rng.choice(DIALOGUES)}\" at {rng.choice(LOCATIONS)}",
+                "source": "observation",
+                "importance": max(importance, 0.7) if is_long_term else min(importance, 0.69),
+                "tags": ["observation"],
+                "linked_entities": [],
+                "created_at": now - timedelta(minutes=memories_per_npc - m)
+            })
+        if docs:
+            memory_collection.insert_many(docs)
+
+        long_term = [doc for doc in docs if doc["memory_type"] == "long_term"]
+        if long_term:
+            embeddings = embedding_service.embed([doc["content"] for doc in long_term])
+            episodic_vectorizer.faiss_manager.add_vectors(embeddings)
+            for doc in long_term:
+                episodic_vectorizer.metadata_store.add({
+                    'source_type': 'episodic',
+                    'source_id': doc["memory_id"],
+                    'npc_id': doc["npc_id"],
+                    'importance': doc["importance"],
+                    'created_at': doc["created_at"].isoformat(),
+                    'summary': doc["content"][:200]
+                })
+
+        npc_ids.append(npc.npc_id)
+        persona_ids.append(persona.persona_id)
+
+    episodic_vectorizer.faiss_manager.save_index()
+    episodic_vectorizer.metadata_store.save()
+
+    return {"world_id": world.world_id, "npc_ids": npc_ids, "persona_ids": persona_ids}
+
+
+def make_observations(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [make_observation(rng) for _ in range(count)]
@@ -0,0 +1,202 @@
+"""
+Turn API end-to-end 부하 벤치마크.
+
+FastAPI 앱을 in-process(ASGI)로 띄우고 mongomock 기반 Mongo stand-in과 stub LLM/embedding
+backend를 사용하여 합성 world(N NPC × M memory)에 대해 `/npc/{npc_id}/turn`을 지정한 동시성으로
+호출합니다. 처리량, p50/p95/p99 지연 시간, run_turn 단계별 소요 시간을 JSON으로 저장합니다.
+(world tick 엔드포인트는 현재 API에 없으므로 turn/act만 대상으로 합니다.)
+
+사용 예:
+    cd backend
+    python -m benchmarks.load_turn --npcs 20 --memories 500 --requests 400 --concurrency 16 \\
+        --llm-latency-ms 50 --output bench_results/turn.json
+    python -m benchmarks.load_turn ... --compare bench_results/turn.json
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import time
+from typing import Dict, Any, List
+
+from benchmarks.common import (
+    configure_offline_environment,
+    install_mongo_standin,
+    summarize,
+    run_metadata,
+    save_results,
+    load_results,
+    compare_metrics,
+    print_comparison,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="End-to-end turn API load benchmark")
+    parser.add_argument("--npcs", type=int, default=10, help="Number of NPCs to synthesize")
+    parser.add_argument("--memories", type=int, default=200, help="Historical memories per NPC")
+    parser.add_argument("--long-term-ratio", type=float, default=0.3, help="Fraction of memories stored as long-term")
+    parser.add_argument("--requests", type=int, default=200, help="Total measured turn requests")
+    parser.add_argument("--warmup", type=int, default=10, help="Warmup requests (not measured)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent in-flight requests")
+    parser.add_argument("--endpoint", choices=["turn", "act"], default="turn", help="Turn endpoint to drive")
+    parser.add_argument("--embedding-dim", type=int, default=256, help="Embedding dimension for the hashing backend")
+    parser.add_argument("--prompt-layout", choices=["inline", "stable_prefix"], default="inline",
+                        help="Planning prompt layout (stub backend reports simulated cached tokens)")
+    parser.add_argument("--write-buffer", action="store_true",
+                        help="Batch turn memory/trace inserts through the write-behind buffer")
+    parser.add_argument("--latency-distribution", default="none",
+                        choices=["none", "constant", "uniform", "normal", "lognormal"])
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--llm-latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--embedding-latency-ms", type=float, default=0.0)
+    parser.add_argument("--embedding-latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=None, help="Directory for FAISS files (default: temp dir)")
+    parser.add_argument("--output", default=None, help="Path to write JSON results")
+    parser.add_argument("--compare", default=None, help="Baseline JSON results to compare against")
+    return parser.parse_args()
+
+
+async def drive(app, npc_ids: List[str], observations: List[Dict[str, Any]],
+                endpoint: str, concurrency: int) -> Dict[str, Any]:
+    """observation 목록을 동시성 제한 하에 전송하고 요청별 결과 수집."""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    npc_cycle = itertools.cycle(npc_ids)
+    jobs = asyncio.Queue()
+    for observation in observations:
+        jobs.put_nowait((next(npc_cycle), observation))
+
+    latencies, stage_samples, errors = [], {}, []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def worker():
+            while True:
+                try:
+                    npc_id, observation = jobs.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                response = await client.post(f"/api/v1/npc/{npc_id}/{endpoint}", json=observation)
+                elapsed_ms = (time.perf_counter() - started) * 1000.0
+                if response.status_code != 200:
+                    errors.append({"status": response.status_code, "detail": response.text[:200]})
+                    continue
+                latencies.append(elapsed_ms)
+                for stage, ms in response.json().get("stage_timings_ms", {}).items():
+                    stage_samples.setdefault(stage, []).append(ms)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall_seconds = time.perf_counter() - started
+
+    return {
+        "latencies": latencies,
+        "stage_samples": stage_samples,
+        "errors": errors,
+        "wall_seconds": wall_seconds,
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from app.main import app
+    from benchmarks.fixtures import synthesize_world, make_observations
+
+    async with app.router.lifespan_context(app):
+        setup_started = time.perf_counter()
+        world = synthesize_world(
+            args.npcs, args.memories,
+            long_term_ratio=args.long_term_ratio,
+            seed=args.seed
+        )
+        setup_seconds = time.perf_counter() - setup_started
+
+        if args.warmup:
+            await drive(app, world["npc_ids"], make_observations(args.warmup, seed=args.seed + 1),
+                        args.endpoint, args.concurrency)
+
+        measured = await drive(app, world["npc_ids"], make_observations(args.requests, seed=args.seed + 2),
+                               args.endpoint, args.concurrency)
+
+        from app.memory.mongo.repository.trace_repo import TraceRepository
+        from app.memory.mongo.write_buffer import write_buffer
+        write_buffer.flush()
+        write_stats = write_buffer.stats()
+        trace_docs = list(TraceRepository._get_collection().find(
+            {}, TraceRepository.PROMPT_CACHE_PROJECTION
+        ).sort("created_at", 1))
+        prompt_cache = TraceRepository.summarize_prompt_cache(trace_docs)
+
+    completed = len(measured["latencies"])
+    return {
+        "meta": run_metadata(vars(args)),
+        "setup_seconds": round(setup_seconds, 3),
+        "summary": {
+            "requests": args.requests,
+            "completed": completed,
+            "errors": len(measured["errors"]),
+            "wall_seconds": round(measured["wall_seconds"], 3),
+            "throughput_rps": round(completed / measured["wall_seconds"], 3) if measured["wall_seconds"] else 0.0,
+            "latency_ms": summarize(measured["latencies"]),
+        },
+        "stages_ms": {
+            stage: summarize(samples) for stage, samples in sorted(measured["stage_samples"].items())
+        },
+        "prompt_cache": prompt_cache,
+        "write_buffer": write_stats,
+        "error_samples": measured["errors"][:10],
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    configure_offline_environment(
+        workdir=args.workdir,
+        embedding_dim=args.embedding_dim,
+        latency_distribution=args.latency_distribution,
+        llm_latency_ms=args.llm_latency_ms,
+        llm_latency_jitter_ms=args.llm_latency_jitter_ms,
+        embedding_latency_ms=args.embedding_latency_ms,
+        embedding_latency_jitter_ms=args.embedding_latency_jitter_ms,
+        seed=args.seed,
+    )
+    os.environ["PROMPT_LAYOUT"] = args.prompt_layout
+    os.environ["WRITE_BUFFER_ENABLED"] = "true" if args.write_buffer else "false"
+    install_mongo_standin()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results = asyncio.run(run(args))
+
+    summary = results["summary"]
+    latency = summary["latency_ms"]
+    print(f"completed={summary['completed']}/{summary['requests']} errors={summary['errors']} "
+          f"throughput={summary['throughput_rps']} req/s")
+    if latency.get("count"):
+        print(f"latency ms: p50={latency['p50']} p95={latency['p95']} p99={latency['p99']} max={latency['max']}")
+    for stage, stats in results["stages_ms"].items():
+        print(f"  {stage:<22} p50={stats['p50']:>9} p95={stats['p95']:>9}")
+    for layout, stats in results["prompt_cache"].items():
+        print(f"prompt cache [{layout}]: prefix_reuse={stats['prefix_reuse_rate']} "
+              f"cached_tokens={stats['cached_tokens']}/{stats['prompt_tokens']} ({stats['cached_token_ratio']})")
+    write_stats = results["write_buffer"]
+    if write_stats["enabled"]:
+        print(f"write buffer: written={write_stats['written']} batches={write_stats['batches']} "
+              f"retries={write_stats['retries']} pending={write_stats['pending']}")
+
+    if args.output:
+        save_results(args.output, results)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        print_comparison(compare_metrics(
+            {"summary": results["summary"], "stages_ms": results["stages_ms"]},
+            {"summary": baseline.get("summary", {}), "stages_ms": baseline.get("stages_ms", {})}
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Inference trace replay 하네스.
+
+저장된 turn(inference_traces)을 현재 파이프라인(run_turn)으로 다시 실행합니다. planning 호출에는
+trace에 기록된 LLM 출력(llm_output_raw, chosen_action, tool_arguments)을 그대로 주입하고,
+importance/reflection 호출은 record 모드로 만든 cassette(LLM_CASSETTE_PATH) 또는 stub으로 응답합니다.
+turn별 단계 latency를 원본 trace와 비교하고 retrieval/prompt/action divergence를 보고합니다.
+
+run_turn은 memory/trace를 기록하므로 반드시 snapshot DB(MONGODB_DB)와 FAISS 디렉터리 사본을 대상으로
+실행하세요. 재생 구간 시작 전에 뜬 snapshot에 trace를 시간순으로 재생하면 memory 상태 변화도 재현됩니다.
+
+사용 예:
+    cd backend
+    # 운영 DB에서 trace를 JSONL로 내보내기
+    python -m benchmarks.replay_traces --source-db ai_npc_framework --since 2025-01-01 --export traces.jsonl
+    # snapshot DB에서 재생하고 결과 저장
+    MONGODB_DB=npc_snapshot FAISS_INDEX_DIR=/tmp/snap/indices FAISS_META_DIR=/tmp/snap/meta \\
+        python -m benchmarks.replay_traces --traces-file traces.jsonl --output bench_results/replay.json
+    # 리팩터링 후 같은 snapshot으로 다시 재생하여 비교
+    ... python -m benchmarks.replay_traces --traces-file traces.jsonl --compare bench_results/replay.json
+"""
+import argparse
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from benchmarks.common import (
+    summarize,
+    run_metadata,
+    save_results,
+    load_results,
+    compare_metrics,
+    print_comparison,
+)
+
+
+_DIALOGUE_SUMMARY = re.compile(r'^(\S+) said: "(.*)"(?: at (\S+))?$', re.DOTALL)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay stored inference traces through the current pipeline")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--traces-file", help="JSONL file of exported trace documents")
+    source.add_argument("--source-db", help="Mongo database (on MONGODB_URI) to read inference_traces from")
+    parser.add_argument("--npc-id", default=None, help="Only replay traces of this NPC")
+    parser.add_argument("--since", default=None, help="Only traces created at/after this ISO timestamp")
+    parser.add_argument("--limit", type=int, default=0, help="Maximum number of traces (0 = all)")
+    parser.add_argument("--export", default=None, help="Write the selected traces to this JSONL file and exit")
+    parser.add_argument("--cassette", default=None, help="LLM cassette for non-planning calls (default: LLM_CASSETTE_PATH)")
+    parser.add_argument("--simulate-llm-latency", action="store_true",
+                        help="Sleep for the recorded LLM latency of replayed calls")
+    parser.add_argument("--max-divergences", type=int, default=50, help="Divergence samples kept in the report")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", default=None)
+    return parser.parse_args()
+
+
+def load_traces(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """JSONL 파일 또는 Mongo에서 trace를 created_at 오름차순으로 로드."""
+    since = datetime.fromisoformat(args.since) if args.since else None
+
+    if args.traces_file:
+        traces = []
+        with open(args.traces_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                trace = json.loads(line)
+                if isinstance(trace.get("created_at"), str):
+                    trace["created_at"] = datetime.fromisoformat(trace["created_at"])
+                if args.npc_id and trace.get("npc_id") != args.npc_id:
+                    continue
+                if since and trace["created_at"] < since:
+                    continue
+                traces.append(trace)
+        traces.sort(key=lambda t: t["created_at"])
+    else:
+        from app.memory.mongo.client import get_db
+        from app.memory.mongo.trace_compaction import SEGMENT_COLLECTION, expand_trace_doc, segment_ids_of
+
+        query: Dict[str, Any] = {}
+        if args.npc_id:
+            query["npc_id"] = args.npc_id
+        if since:
+            query["created_at"] = {"$gte": since}
+        source_db = get_db().client[args.source_db]
+        traces = list(source_db["inference_traces"].find(query, {"_id": 0}).sort("created_at", 1))
+
+        # 압축 저장된 prompt snapshot 복원
+        segment_ids = segment_ids_of(traces)
+        if segment_ids:
+            segment_texts = {
+                doc["segment_id"]: doc["text"]
+                for doc in source_db[SEGMENT_COLLECTION].find(
+                    {"segment_id": {"$in": segment_ids}}, {"_id": 0, "segment_id": 1, "text": 1}
+                )
+            }
+            traces = [expand_trace_doc(trace, segment_texts) for trace in traces]
+
+    if args.limit:
+        traces = traces[:args.limit]
+    return traces
+
+
+def export_traces(path: str, traces: List[Dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for trace in traces:
+            f.write(json.dumps(trace, ensure_ascii=False, default=str) + "\n")
+
+
+def reconstruct_observation(trace: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """
+    Trace에서 run_turn 입력 observation 복원.
+
+    observation_payload가 없는 이전 trace는 요약 문자열에서 근사 복원합니다.
+
+    Returns:
+        (observation, 원본 그대로인지 여부)
+    """
+    if trace.get("observation_payload"):
+        return trace["observation_payload"], True
+
+    summary = trace.get("observation", "")
+    match = _DIALOGUE_SUMMARY.match(summary)
+    if match:
+        observation = {
+            "event_type": "player_interaction",
+            "actor": match.group(1),
+            "details": {"dialogue": match.group(2)}
+        }
+        if match.group(3):
+            observation["location"] = match.group(3)
+        return observation, False
+
+    actor, _, rest = summary.partition(" ")
+    return {"event_type": "unknown", "actor": actor or "unknown", "action": rest or summary}, False
+
+
+def planning_response(trace: Dict[str, Any]) -> Dict[str, Any]:
+    """Trace에 기록된 planning 결과를 chat backend 응답 형식으로 변환."""
+    tool_calls = []
+    if trace.get("chosen_action"):
+        tool_calls.append({
+            "id": f"call_{trace['trace_id']}",
+            "type": "function",
+            "function": {
+                "name": trace["chosen_action"],
+                "arguments": json.dumps(trace.get("tool_arguments") or {}, ensure_ascii=False)
+            }
+        })
+    return {
+        "content": trace.get("llm_output_raw", ""),
+        "tool_calls": tool_calls,
+        "finish_reason": "tool_calls" if tool_calls else "stop",
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()[:16]
+
+
+def diff_traces(original: Dict[str, Any], replayed: Dict[str, Any]) -> Dict[str, Any]:
+    """원본/재생 trace의 retrieval, prompt, action 차이."""
+    original_ids = set(original.get("retrieved_memories") or [])
+    replayed_ids = set(replayed.get("retrieved_memories") or [])
+    union = original_ids | replayed_ids
+    jaccard = len(original_ids & replayed_ids) / len(union) if union else 1.0
+
+    divergences = {}
+    if original_ids != replayed_ids:
+        divergences["retrieval"] = {
+            "jaccard": round(jaccard, 3),
+            "missing": sorted(original_ids - replayed_ids),
+            "added": sorted(replayed_ids - original_ids)
+        }
+    elif (original.get("retrieved_memories") or []) != (replayed.get("retrieved_memories") or []):
+        divergences["retrieval_order"] = {
+            "original": original.get("retrieved_memories"),
+            "replayed": replayed.get("retrieved_memories")
+        }
+    if _digest(original.get("llm_prompt_snapshot")) != _digest(replayed.get("llm_prompt_snapshot")):
+        divergences["prompt"] = {
+            "original_chars": len(original.get("llm_prompt_snapshot") or ""),
+            "replayed_chars": len(replayed.get("llm_prompt_snapshot") or "")
+        }
+    if (original.get("chosen_action"), original.get("tool_arguments") or {}) != \
+            (replayed.get("chosen_action"), replayed.get("tool_arguments") or {}):
+        divergences["action"] = {
+            "original": {"action": original.get("chosen_action"), "arguments": original.get("tool_arguments")},
+            "replayed": {"action": replayed.get("chosen_action"), "arguments": replayed.get("tool_arguments")}
+        }
+    if (original.get("tool_execution_result") or {}).get("success") != \
+            (replayed.get("tool_execution_result") or {}).get("success"):
+        divergences["tool_result"] = {
+            "original": original.get("tool_execution_result"),
+            "replayed": replayed.get("tool_execution_result")
+        }
+    return {"jaccard": jaccard, "divergences": divergences}
+
+
+def replay(traces: List[Dict[str, Any]], backend, max_divergences: int) -> Dict[str, Any]:
+    from app.agents.run_turn import TurnOrchestrator
+    from app.memory.mongo.repository.trace_repo import TraceRepository
+
+    original_stages: Dict[str, List[float]] = {}
+    replay_stages: Dict[str, List[float]] = {}
+    divergence_counts: Dict[str, int] = {}
+    divergence_samples, errors, jaccards = [], [], []
+    replayed_count, approximate_observations = 0, 0
+
+    for trace in traces:
+        observation, exact = reconstruct_observation(trace)
+        if not exact:
+            approximate_observations += 1
+
+        backend.clear_primed()
+        backend.prime(
+            "planning",
+            planning_response(trace),
+            latency_ms=(trace.get("stage_timings_ms") or {}).get("llm_plan", 0.0)
+        )
+
+        try:
+            result = TurnOrchestrator.run_turn(trace["npc_id"], observation, turn_id=f"replay_{trace['turn_id']}")
+        except Exception as e:
+            errors.append({"trace_id": trace.get("trace_id"), "error": str(e)[:200]})
+            continue
+
+        replayed_count += 1
+        replayed = TraceRepository.get_trace_by_id(result["trace_id"]).model_dump()
+
+        for stage, ms in (trace.get("stage_timings_ms") or {}).items():
+            original_stages.setdefault(stage, []).append(ms)
+        for stage, ms in result.get("stage_timings_ms", {}).items():
+            replay_stages.setdefault(stage, []).append(ms)
+
+        diff = diff_traces(trace, replayed)
+        jaccards.append(diff["jaccard"])
+        for kind in diff["divergences"]:
+            divergence_counts[kind] = divergence_counts.get(kind, 0) + 1
+        if diff["divergences"] and len(divergence_samples) < max_divergences:
+            divergence_samples.append({
+                "trace_id": trace.get("trace_id"),
+                "replay_trace_id": result["trace_id"],
+                "npc_id": trace["npc_id"],
+                "observation_exact": exact,
+                **diff["divergences"]
+            })
+
+    stages = {}
+    for stage in sorted(set(original_stages) | set(replay_stages)):
+        original = summarize(original_stages.get(stage, []))
+        replayed = summarize(replay_stages.get(stage, []))
+        entry = {"original": original, "replay": replayed}
+        if original.get("count") and replayed.get("count") and original["p50"]:
+            entry["p50_delta_pct"] = round((replayed["p50"] - original["p50"]) / original["p50"] * 100.0, 2)
+        stages[stage] = entry
+
+    return {
+        "summary": {
+            "traces": len(traces),
+            "replayed": replayed_count,
+            "errors": len(errors),
+            "approximate_observations": approximate_observations,
+            "mean_retrieval_jaccard": round(sum(jaccards) / len(jaccards), 4) if jaccards else 1.0,
+            "divergences": divergence_counts,
+            "llm_responses": dict(backend.stats),
+        },
+        "stages_ms": stages,
+        "divergence_samples": divergence_samples,
+        "error_samples": errors[:10],
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    traces = load_traces(args)
+    if args.export:
+        export_traces(args.export, traces)
+        print(f"Exported {len(traces)} traces to {args.export}")
+        return
+
+    from app.core.config import settings
+    from app.services.llm_service import llm_service
+    from app.services.backends.llm import ReplayChatBackend
+
+    backend = ReplayChatBackend(
+        args.cassette or settings.llm_cassette_path,
+        fallback=llm_service._create_stub_backend(),
+        simulate_latency=args.simulate_llm_latency
+    )
+    llm_service.set_backend(backend)
+
+    report = replay(traces, backend, args.max_divergences)
+    results = {"meta": run_metadata(vars(args)), **report}
+
+    summary = report["summary"]
+    print(f"replayed={summary['replayed']}/{summary['traces']} errors={summary['errors']} "
+          f"approximate_observations={summary['approximate_observations']} "
+          f"mean_retrieval_jaccard={summary['mean_retrieval_jaccard']}")
+    print(f"divergences: {summary['divergences'] or 'none'}  llm responses: {summary['llm_responses']}")
+    for stage, entry in report["stages_ms"].items():
+        original, replayed = entry["original"], entry["replay"]
+        print(f"  {stage:<22} original p50={original.get('p50', '-'):>9} "
+              f"replay p50={replayed.get('p50', '-'):>9} delta={entry.get('p50_delta_pct', '-')}%")
+
+    if args.output:
+        save_results(args.output, results)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        replay_stages = {stage: entry["replay"] for stage, entry in report["stages_ms"].items()}
+        baseline_stages = {stage: entry["replay"] for stage, entry in baseline.get("stages_ms", {}).items()}
+        print_comparison(compare_metrics(replay_stages, baseline_stages))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Turn context 조회 벤치마크 - 문서별 조회 5번 vs $lookup aggregation 1번.
+
+TurnContextRepository.load_sequential(NPC/persona/world/persona facts/최근 대화 read-through 조회)과
+load_turn_context(npcs에서 시작하는 aggregation)를 entity cache와 conversation buffer를 비운
+cold 상태에서 측정하고, 캐시가 채워진 warm 상태의 get_turn_context도 함께 측정합니다.
+호출당 Mongo 명령(round trip) 수는 pymongo command monitoring으로 집계하고, 두 경로의 결과가
+같은지도 NPC별로 확인합니다.
+
+mongomock은 let/pipeline 형식의 $lookup을 지원하지 않으므로 실제 MongoDB가 필요합니다.
+--db database에 합성 데이터를 적재하고 실행 후 삭제합니다 (--keep-db로 유지).
+
+사용 예:
+    cd backend
+    python -m benchmarks.turn_context --mongo-uri mongodb://localhost:27017 --npcs 20 --memories 500 \\
+        --output bench_results/turn_context.json
+    python -m benchmarks.turn_context --mongo-uri mongodb://localhost:27017 --npcs 20 --memories 500 \\
+        --compare bench_results/turn_context.json
+"""
+import argparse
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks.common import (
+    configure_offline_environment,
+    summarize,
+    run_metadata,
+    save_results,
+    load_results,
+    compare_metrics,
+    print_comparison,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sequential vs aggregated turn context fetch benchmark")
+    parser.add_argument("--mongo-uri", default=os.environ.get("MONGODB_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default="npc_benchmark_turn_context", help="Scratch database (dropped afterwards)")
+    parser.add_argument("--keep-db", action="store_true", help="Keep the scratch database after the run")
+    parser.add_argument("--npcs", type=int, default=10, help="Number of NPCs to synthesize")
+    parser.add_argument("--memories", type=int, default=200, help="Historical memories per NPC")
+    parser.add_argument("--facts", type=int, default=15, help="Persona facts per NPC")
+    parser.add_argument("--repeat", type=int, default=200, help="Measured calls per mode")
+    parser.add_argument("--recent-limit", type=int, default=10, help="Recent short-term memories per turn")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=None, help="Directory for FAISS files (default: temp dir)")
+    parser.add_argument("--output", default=None, help="Path to write JSON results")
+    parser.add_argument("--compare", default=None, help="Baseline JSON results to compare against")
+    return parser.parse_args()
+
+
+def install_mongo_client(uri: str, db_name: str):
+    """command 수를 세는 listener를 붙인 pymongo client를 MongoClientManager에 주입."""
+    from pymongo import MongoClient, monitoring
+    from app.memory.mongo.client import MongoClientManager, client_options
+
+    class CommandCounter(monitoring.CommandListener):
+        def __init__(self):
+            self.count = 0
+
+        def started(self, event):
+            self.count += 1
+
+        def succeeded(self, event):
+            pass
+
+        def failed(self, event):
+            pass
+
+    counter = CommandCounter()
+    MongoClientManager._client = MongoClient(uri, event_listeners=[counter], **client_options())
+    MongoClientManager._db = MongoClientManager._client[db_name]
+    return counter
+
+
+def reset_caches() -> None:
+    from app.memory.mongo.cache import entity_cache
+    from app.memory.mongo.conversation_buffer import conversation_buffer
+
+    entity_cache.clear()
+    conversation_buffer.invalidate()
+
+
+def measure(
+    fn: Callable[[str], Any],
+    npc_ids: List[str],
+    repeat: int,
+    counter,
+    cold: bool
+) -> Dict[str, Any]:
+    """NPC를 번갈아 fn을 repeat번 호출한 지연 시간(ms)과 호출당 Mongo 명령 수."""
+    samples, commands = [], []
+    for i in range(repeat):
+        npc_id = npc_ids[i % len(npc_ids)]
+        if cold:
+            reset_caches()
+        before = counter.count
+        started = time.perf_counter()
+        fn(npc_id)
+        samples.append((time.perf_counter() - started) * 1000.0)
+        commands.append(counter.count - before)
+    return {
+        "latency_ms": summarize(samples),
+        "mongo_commands_per_call": round(sum(commands) / len(commands), 3) if commands else 0.0
+    }
+
+
+def normalize(context: Dict[str, Any]) -> Dict[str, Any]:
+    """두 경로 결과 비교용 (facts는 순서 무관)."""
+    return {
+        "npc": context["npc"].model_dump(),
+        "persona": context["persona"].model_dump() if context["persona"] else None,
+        "world": context["world"].model_dump() if context["world"] else None,
+        "facts": sorted(fact.fact_id for fact in context["facts"]),
+        "recent_conversation": context["recent_conversation"]
+    }
+
+
+def run(args: argparse.Namespace, counter) -> Dict[str, Any]:
+    from app.memory.mongo.indexes import IndexManager
+    from app.memory.mongo.repository.turn_context_repo import TurnContextRepository
+    from benchmarks.fixtures import synthesize_world
+
+    IndexManager.ensure_indexes()
+    started = time.perf_counter()
+    world = synthesize_world(
+        num_npcs=args.npcs,
+        memories_per_npc=args.memories,
+        facts_per_npc=args.facts,
+        seed=args.seed
+    )
+    fixture_s = time.perf_counter() - started
+    npc_ids = world["npc_ids"]
+    limit = args.recent_limit
+
+    mismatches = []
+    for npc_id in npc_ids:
+        reset_caches()
+        sequential = normalize(TurnContextRepository.load_sequential(npc_id, limit))
+        reset_caches()
+        aggregated = normalize(TurnContextRepository.load_turn_context(npc_id, limit))
+        if sequential != aggregated:
+            mismatches.append(npc_id)
+
+    modes = {
+        "sequential_cold": (lambda npc_id: TurnContextRepository.load_sequential(npc_id, limit), True),
+        "aggregation_cold": (lambda npc_id: TurnContextRepository.load_turn_context(npc_id, limit), True),
+        "sequential_warm": (lambda npc_id: TurnContextRepository.load_sequential(npc_id, limit), False),
+        "aggregation_warm": (lambda npc_id: TurnContextRepository.get_turn_context(npc_id, limit), False),
+    }
+    results = {}
+    for name, (fn, cold) in modes.items():
+        if not cold:
+            reset_caches()
+            for npc_id in npc_ids:
+                fn(npc_id)
+        results[name] = measure(fn, npc_ids, args.repeat, counter, cold)
+
+    return {
+        "meta": run_metadata({**vars(args), "mongo_uri": None}),
+        "fixture_seconds": round(fixture_s, 3),
+        "mismatched_npcs": mismatches,
+        "modes": results,
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    configure_offline_environment(workdir=args.workdir, seed=args.seed)
+    os.environ["MONGODB_URI"] = args.mongo_uri
+    os.environ["MONGODB_DB"] = args.db
+    os.environ["TURN_CONTEXT_AGGREGATION"] = "true"
+    counter = install_mongo_client(args.mongo_uri, args.db)
+
+    from app.memory.mongo.client import MongoClientManager
+
+    try:
+        results = run(args, counter)
+    finally:
+        if not args.keep_db:
+            MongoClientManager._client.drop_database(args.db)
+
+    if results["mismatched_npcs"]:
+        print(f"WARNING: sequential and aggregated contexts differ for {results['mismatched_npcs']}")
+    for name, stats in results["modes"].items():
+        latency = stats["latency_ms"]
+        print(f"{name:<18} p50={latency['p50']:>8} p95={latency['p95']:>8} "
+              f"mongo_commands/call={stats['mongo_commands_per_call']}")
+
+    if args.output:
+        save_results(args.output, results)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        print_comparison(compare_metrics(results["modes"], baseline.get("modes", {})))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Vector memory primitive 마이크로 벤치마크.
+
+FAISSManager(add_vectors/search/save_index/load_index), MetadataStore(load/save/get_by_source_id),
+Vectorizer.search, LexicalIndex(sync/search), VectorRetriever.retrieve_for_npc(_boost_persona_facts,
+정렬 포함)를 index 크기(1k~1M)와 차원 조합별로 측정합니다. retrieve_for_npc는 weighted(후보 over-fetch 후
+relevance/recency/importance 재정렬)와 similarity 점수 방식, BM25 hybrid를 끈 vector 전용 검색, MMR
+재정렬을 모두 측정하고, score_candidates/mmr_select만의 호출당 비용도 따로 측정합니다. 합성 벡터는 고정 seed의 정규분포에서 생성하고,
+질의 embedding은 hashing stub backend를 사용합니다.
+
+메모리 사용량이 --max-gb를 넘는 조합(예: 1M × 3072 float32 ≈ 12GB)은 건너뜁니다.
+
+사용 예:
+    cd backend
+    python -m benchmarks.vector_primitives --sizes 1000,10000,100000 --dims 256,1536 \\
+        --output bench_results/vector.json
+    python -m benchmarks.vector_primitives --sizes 1000,10000,100000 --dims 256,1536 \\
+        --compare bench_results/vector.json
+"""
+import argparse
+import itertools
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, List
+
+from benchmarks.common import (
+    configure_offline_environment,
+    summarize,
+    run_metadata,
+    save_results,
+    load_results,
+    compare_metrics,
+    print_comparison,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Vector memory primitive micro-benchmarks")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000", help="Comma-separated index sizes")
+    parser.add_argument("--dims", default="256,1536,3072", help="Comma-separated embedding dimensions")
+    parser.add_argument("--repeat", type=int, default=50, help="Repetitions for per-query operations")
+    parser.add_argument("--io-repeat", type=int, default=3, help="Repetitions for bulk/IO operations")
+    parser.add_argument("--top-k", type=int, default=5, help="top_k for search/retrieval")
+    parser.add_argument("--npcs", type=int, default=50, help="Distinct npc_ids in synthetic metadata")
+    parser.add_argument("--max-gb", type=float, default=4.0, help="Skip configs whose vectors exceed this size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=None)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", default=None)
+    return parser.parse_args()
+
+
+def measure(fn: Callable[[], Any], repeat: int, setup: Callable[[], Any] = None) -> Dict[str, float]:
+    """fn을 repeat번 실행한 호출당 소요 시간(ms) 요약 (setup은 측정에서 제외)."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return summarize(samples)
+
+
+def configure_dimension(dimension: int) -> None:
+    """Settings와 embedding 서비스의 차원을 dimension으로 전환."""
+    from app.core.config import settings
+    from app.services.embedding_service import embedding_service
+    from app.services.backends.embedding import HashingEmbeddingBackend
+
+    settings.openai_embedding_dim = dimension
+    embedding_service.dimension = dimension
+    embedding_service.set_backend(HashingEmbeddingBackend(dimension))
+
+
+def synthetic_metadata(size: int, npcs: int, source_type: str, rng) -> List[Dict[str, Any]]:
+    from app.schemas.persona import PersonaFactDimension
+
+    dimensions = [d.value for d in PersonaFactDimension]
+    base = datetime(2024, 1, 1)
+    records = []
+    for i in range(size):
+        record = {
+            'source_type': source_type,
+            'source_id': f"src_{i}",
+            'npc_id': f"npc_{i % npcs}",
+            'importance': float(rng.random()),
+            'created_at': (base + timedelta(minutes=i)).isoformat(),
+            'summary': f"Synthetic memory {i} about the ring and the forest",
+            'vector_id': i
+        }
+        if source_type == 'persona_fact':
+            record['dimension'] = dimensions[i % len(dimensions)]
+            record['persona_id'] = f"persona_{i % npcs}"
+        records.append(record)
+    return records
+
+
+def build_index(index_name: str, size: int, dimension: int, npcs: int, source_type: str, rng) -> None:
+    """합성 벡터/메타데이터로 index_name index를 만들어 디스크에 저장."""
+    import numpy as np
+    from app.memory.vector.faiss_manager import FAISSManager
+    from app.memory.vector.metadata_store import MetadataStore
+
+    manager = FAISSManager(index_name, dimension)
+    manager.create_index()
+    chunk = 50_000
+    for start in range(0, size, chunk):
+        count = min(chunk, size - start)
+        manager.add_vectors(rng.standard_normal((count, dimension)).astype(np.float32))
+    manager.save_index()
+
+    store = MetadataStore(index_name)
+    store.metadata = synthetic_metadata(size, npcs, source_type, rng)
+    store.save()
+
+
+def bench_config(size: int, dimension: int, args: argparse.Namespace) -> Dict[str, Any]:
+    import numpy as np
+    from app.memory.vector.faiss_manager import FAISSManager
+    from app.memory.vector.metadata_store import MetadataStore
+    from app.memory.vector.vectorizer import Vectorizer
+    from app.memory.vector.retriever import VectorRetriever
+    from app.memory.vector.scoring import RetrievalWeights, score_candidates, mmr_select
+    from app.memory.vector.lexical import LexicalIndex
+    from app.core.config import settings
+
+    configure_dimension(dimension)
+    rng = np.random.default_rng(args.seed)
+    results: Dict[str, Any] = {}
+
+    # FAISSManager.add_vectors: 빈 index에 size개 벌크 추가
+    vectors = rng.standard_normal((size, dimension)).astype(np.float32)
+    manager = FAISSManager("bench_primitives", dimension)
+    results["faiss.add_vectors"] = measure(
+        lambda: manager.add_vectors(vectors), args.io_repeat, setup=manager.create_index
+    )
+    del vectors
+
+    queries = rng.standard_normal((args.repeat, dimension)).astype(np.float32)
+    query_iter = itertools.count()
+    results["faiss.search"] = measure(
+        lambda: manager.search(queries[next(query_iter) % len(queries)], args.top_k), args.repeat
+    )
+    results["faiss.save_index"] = measure(manager.save_index, args.io_repeat)
+    loader = FAISSManager("bench_primitives", dimension)
+    results["faiss.load_index"] = measure(loader.load_index, args.io_repeat)
+    del manager, loader
+
+    # MetadataStore
+    store = MetadataStore("bench_primitives")
+    store.metadata = synthetic_metadata(size, args.npcs, 'episodic', rng)
+    results["metadata.save"] = measure(store.save, args.io_repeat)
+    results["metadata.load"] = measure(store.load, args.io_repeat)
+    source_ids = [f"src_{int(i)}" for i in rng.integers(0, size, args.repeat)]
+    source_iter = itertools.count()
+    results["metadata.get_by_source_id"] = measure(
+        lambda: store.get_by_source_id('episodic', source_ids[next(source_iter) % len(source_ids)]),
+        min(args.repeat, 20)
+    )
+    del store
+
+    # Vectorizer / VectorRetriever는 실제 index 이름(episodic/persona/world)을 사용
+    build_index('episodic', size, dimension, args.npcs, 'episodic', rng)
+    build_index('persona', max(size // 10, 100), dimension, args.npcs, 'persona_fact', rng)
+    build_index('world', 200, dimension, args.npcs, 'world', rng)
+
+    results["vectorizer.init"] = measure(lambda: Vectorizer('episodic'), args.io_repeat)
+    vectorizer = Vectorizer('episodic')
+    query_texts = [f"player asked about the ring near the forest {i}" for i in range(args.repeat)]
+    text_iter = itertools.count()
+    results["vectorizer.search"] = measure(
+        lambda: vectorizer.search(query_texts[next(text_iter) % len(query_texts)], args.top_k), args.repeat
+    )
+
+    # BM25 index: 전체 색인 후 검색 (합성 summary는 모두 ring/forest를 포함하므로 최악의 경우)
+    metadata = vectorizer.metadata_store.metadata
+    lexical = LexicalIndex()
+    results["lexical.sync"] = measure(lambda: lexical.sync(metadata), args.io_repeat, setup=lexical.__init__)
+    results["lexical.search"] = measure(
+        lambda: lexical.search(query_texts[next(text_iter) % len(query_texts)], args.top_k * settings.retrieval_candidate_multiplier),
+        args.repeat
+    )
+    del vectorizer, lexical
+
+    retriever = VectorRetriever()
+    observation = {"event_type": "player_interaction", "details": {"dialogue": "Do you remember my friend?"}}
+    variants = (
+        ("weighted", True, False, "retriever.retrieve_for_npc"),
+        ("similarity", True, False, "retriever.retrieve_for_npc_similarity"),
+        ("weighted", False, False, "retriever.retrieve_for_npc_vector_only"),
+        ("weighted", True, True, "retriever.retrieve_for_npc_mmr"),
+    )
+    for scorer, hybrid, mmr, key in variants:
+        settings.retrieval_scorer = scorer
+        settings.retrieval_hybrid = hybrid
+        settings.retrieval_mmr = mmr
+        retrieve_iter = itertools.count()
+        results[key] = measure(
+            lambda: retriever.retrieve_for_npc(
+                f"npc_{next(retrieve_iter) % args.npcs}",
+                "Do you remember my friend who wanted the ring?",
+                top_k_per_index=args.top_k,
+                observation=observation
+            ),
+            args.repeat
+        )
+    settings.retrieval_scorer = "weighted"
+    settings.retrieval_hybrid = True
+    settings.retrieval_mmr = False
+    results["retriever.init"] = measure(VectorRetriever, args.io_repeat)
+
+    candidates = synthetic_metadata(args.top_k * 3, args.npcs, 'persona_fact', rng)
+    for candidate in candidates:
+        candidate['ranking_score'] = float(rng.random())
+    relevant = {"relationship", "experience"}
+    results["retriever.boost_persona_facts"] = measure(
+        lambda: VectorRetriever._boost_persona_facts(candidates, relevant), args.repeat
+    )
+
+    # 한 index의 over-fetch 후보(top_k × multiplier) 재점수 비용
+    episodic_candidates = synthetic_metadata(args.top_k * settings.retrieval_candidate_multiplier, args.npcs, 'episodic', rng)
+    for candidate in episodic_candidates:
+        candidate['ranking_score'] = float(rng.random())
+    weights = RetrievalWeights.for_npc()
+    results["scoring.score_candidates"] = measure(
+        lambda: score_candidates(episodic_candidates, weights), args.repeat
+    )
+
+    candidate_vectors = rng.standard_normal((len(episodic_candidates), dimension))
+    candidate_vectors /= np.linalg.norm(candidate_vectors, axis=1, keepdims=True)
+    relevance = np.array([c['ranking_score'] for c in episodic_candidates])
+    results["scoring.mmr_select"] = measure(
+        lambda: mmr_select(relevance, candidate_vectors, args.top_k, settings.retrieval_mmr_lambda), args.repeat
+    )
+
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    workdir = configure_offline_environment(workdir=args.workdir, seed=args.seed)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    dims = [int(d) for d in args.dims.split(",") if d]
+    configs: Dict[str, Any] = {}
+
+    for dimension in dims:
+        for size in sizes:
+            gigabytes = size * dimension * 4 / 1024 ** 3
+            key = f"n{size}_d{dimension}"
+            if gigabytes > args.max_gb:
+                print(f"skip {key}: {gigabytes:.1f}GB exceeds --max-gb {args.max_gb}")
+                continue
+            started = time.perf_counter()
+            configs[key] = bench_config(size, dimension, args)
+            print(f"{key} done in {time.perf_counter() - started:.1f}s")
+            for op, stats in configs[key].items():
+                print(f"  {op:<40} p50={stats['p50']:>10} p95={stats['p95']:>10} ms")
+
+    results = {
+        "meta": run_metadata({**vars(args), "workdir": os.path.abspath(workdir)}),
+        "configs": configs,
+    }
+
+    if args.output:
+        save_results(args.output, results)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        print_comparison(compare_metrics(results["configs"], baseline.get("configs", {})))
+
+
+if __name__ == "__main__":
+    main()
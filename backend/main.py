@@ -1,35 +0,0 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
-from app.routers import router
-from app.database import connect_to_mongo, close_mongo_connection
-
-
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # 시작 시 실행
-    await connect_to_mongo()
-    yield
-    # 종료 시 실행
-    await close_mongo_connection()
-
-
-app = FastAPI(title="API", version="1.0.0", lifespan=lifespan)
-
-# CORS 설정
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:5174", "http://localhost:5173"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# 라우터 등록
-app.include_router(router, prefix="/api")
-
-
-@app.get("/")
-async def root():
-    return {"message": "API is running"}
-
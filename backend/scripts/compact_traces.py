@@ -0,0 +1,111 @@
+"""
+기존 inference trace의 llm_prompt_snapshot을 압축 형식(llm_prompt_compact)으로 migration.
+
+segment 정보 없이 저장된 snapshot은 PERSONA:/WORLD: header를 기준으로 planning 지침, persona,
+world section을 나눠 prompt_segments collection에 한 번만 저장하고, 나머지는 압축합니다.
+복원 결과가 원문과 다르면 해당 trace는 건너뜁니다. 여러 번 실행해도 안전합니다.
+
+사용 예:
+    cd backend
+    python -m scripts.compact_traces --dry-run
+    python -m scripts.compact_traces --batch-size 500
+"""
+import argparse
+import logging
+from typing import Any, Dict, List
+
+import bson
+from pymongo import UpdateOne
+
+from app.memory.mongo.client import MongoClientManager, get_collection
+from app.memory.mongo.trace_compaction import (
+    compact_snapshot,
+    expand_snapshot,
+    segment_store,
+    split_legacy_sections,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compact stored inference trace prompt snapshots")
+    parser.add_argument("--batch-size", type=int, default=500, help="Traces per bulk update")
+    parser.add_argument("--npc-id", default=None, help="Only migrate traces of this NPC")
+    parser.add_argument("--dry-run", action="store_true", help="Report the size reduction without writing")
+    return parser.parse_args()
+
+
+def migrate(batch_size: int = 500, npc_id: str = None, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    압축되지 않은 trace를 batch 단위로 변환.
+
+    Returns:
+        {"traces", "skipped", "segments", "bytes_before", "bytes_after", "reduction"}
+    """
+    collection = get_collection("inference_traces")
+    query: Dict[str, Any] = {
+        "llm_prompt_compact": {"$exists": False},
+        "llm_prompt_snapshot": {"$nin": ["", None]}
+    }
+    if npc_id:
+        query["npc_id"] = npc_id
+
+    report = {"traces": 0, "skipped": 0, "segments": 0, "bytes_before": 0, "bytes_after": 0}
+    seen_segments = set()
+    operations: List[UpdateOne] = []
+
+    def flush() -> None:
+        if operations and not dry_run:
+            collection.bulk_write(operations, ordered=False)
+        operations.clear()
+
+    cursor = collection.find(query, {"_id": 1, "trace_id": 1, "llm_prompt_snapshot": 1}).sort("_id", 1)
+    for doc in cursor:
+        snapshot = doc["llm_prompt_snapshot"]
+        compact = compact_snapshot(snapshot, split_legacy_sections(snapshot))
+        if expand_snapshot(compact, compact["segments"]) != snapshot:
+            report["skipped"] += 1
+            logger.warning(f"Skipping trace {doc['trace_id']}: reconstruction mismatch")
+            continue
+
+        new_segments = {seg_id: text for seg_id, text in compact["segments"].items() if seg_id not in seen_segments}
+        seen_segments.update(new_segments)
+        if new_segments and not dry_run:
+            segment_store.put(new_segments)
+
+        stored = {"segment_ids": compact["segment_ids"], "dynamic": compact["dynamic"]}
+        report["traces"] += 1
+        report["segments"] += len(new_segments)
+        report["bytes_before"] += len(bson.encode({"llm_prompt_snapshot": snapshot}))
+        report["bytes_after"] += len(bson.encode({"llm_prompt_snapshot": "", "llm_prompt_compact": stored}))
+        report["bytes_after"] += sum(len(text.encode("utf-8")) for text in new_segments.values())
+
+        operations.append(UpdateOne(
+            {"_id": doc["_id"], "llm_prompt_compact": {"$exists": False}},
+            {"$set": {"llm_prompt_snapshot": "", "llm_prompt_compact": stored}}
+        ))
+        if len(operations) >= batch_size:
+            flush()
+    flush()
+
+    report["reduction"] = round(report["bytes_before"] / report["bytes_after"], 2) if report["bytes_after"] else 0.0
+    return report
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    MongoClientManager.initialize()
+    try:
+        report = migrate(batch_size=args.batch_size, npc_id=args.npc_id, dry_run=args.dry_run)
+    finally:
+        MongoClientManager.close()
+
+    prefix = "[dry-run] " if args.dry_run else ""
+    print(f"{prefix}compacted={report['traces']} skipped={report['skipped']} new_segments={report['segments']}")
+    print(f"{prefix}prompt bytes: {report['bytes_before']} -> {report['bytes_after']} ({report['reduction']}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+테스트 공통 fixture - 오프라인 backend(hashing embedding, stub LLM)와 mongomock 사용.
+
+app 모듈은 import 시점에 Settings를 읽으므로 환경 변수를 먼저 설정합니다.
+"""
+import asyncio
+from benchmarks.common import configure_offline_environment
+
+configure_offline_environment()
+
+import pytest
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """테스트마다 새 mongomock DB, 임시 FAISS 디렉터리, 비어 있는 in-process cache 사용."""
+    from benchmarks.common import install_mongo_standin
+    from app.memory.mongo.cache import entity_cache
+    from app.memory.mongo.conversation_buffer import conversation_buffer
+    from app.memory.mongo.trace_compaction import segment_store
+    from app.memory.mongo.write_buffer import write_buffer
+    from app.memory.vector import lexical, reindex
+
+    monkeypatch.setattr(settings, "faiss_index_dir", str(tmp_path / "indices"))
+    monkeypatch.setattr(settings, "faiss_meta_dir", str(tmp_path / "meta"))
+    monkeypatch.setattr(write_buffer, "enabled", False)
+    monkeypatch.setattr(write_buffer, "dead_letter_path", str(tmp_path / "dead_letter.jsonl"))
+    install_mongo_standin(db_name="npc_test")
+
+    entity_cache.clear()
+    conversation_buffer.invalidate()
+    with segment_store._lock:
+        segment_store._texts.clear()
+        segment_store._touched.clear()
+    with write_buffer._lock:
+        write_buffer._pending.clear()
+        write_buffer._rejections.clear()
+    with lexical._indexes_guard:
+        lexical._indexes.clear()
+    with reindex._running_lock:
+        reindex._running.clear()
+        reindex._refreshed_sources.clear()
+    yield
+
+
+def run(coro):
+    """async repository/route를 동기 테스트에서 실행."""
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def api():
+    """ASGI app에 직접 요청하는 httpx client를 만드는 async context manager (lifespan 없음)."""
+    import httpx
+    from app.main import app
+
+    return lambda: httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
@@ -0,0 +1,177 @@
+"""NPC/World cascade delete job, jobs API, 삭제 후 vector index 로드."""
+import threading
+import time
+from datetime import datetime
+from app.memory.mongo.client import get_collection
+from app.memory.vector.metadata_store import MetadataStore
+from app.memory.vector.vectorizer import Vectorizer, _write_lock
+from app.services.embedding_service import embedding_service
+from tests.conftest import run
+
+WORLD_ID = "world_a"
+
+
+def _seed_npc(npc_id, world_id=WORLD_ID, memories=3):
+    """NPC 문서와 memory/trace/persona fact 문서, 그 vector를 생성."""
+    get_collection("npcs").insert_one({"npc_id": npc_id, "world_id": world_id, "persona_id": "persona_a"})
+    docs = [
+        {
+            "memory_id": f"mem_{npc_id}_{i}",
+            "npc_id": npc_id,
+            "memory_type": "long_term",
+            "content": f"{npc_id} remembers the harbor fire number {i}",
+            "importance": 0.5,
+            "created_at": datetime(2025, 1, 1, 0, i),
+        }
+        for i in range(memories)
+    ]
+    get_collection("episodic_memory").insert_many(docs)
+    get_collection("inference_traces").insert_one({"trace_id": f"trace_{npc_id}", "npc_id": npc_id})
+    get_collection("persona_facts").insert_one({"fact_id": f"fact_{npc_id}", "npc_id": npc_id})
+    Vectorizer("episodic").vectorize_episodic_memories_bulk([
+        {**doc, "created_at": doc["created_at"].isoformat()} for doc in docs
+    ])
+    Vectorizer("persona").vectorize_persona_fact(
+        f"fact_{npc_id}", "persona_a", npc_id, "characteristic", f"{npc_id} is wary of strangers"
+    )
+    return [doc["memory_id"] for doc in docs]
+
+
+def _seed_world():
+    get_collection("world_knowledge").insert_one({"world_id": WORLD_ID})
+    Vectorizer("world").vectorize_world_chunks(WORLD_ID, {"rules": {"laws": ["No fires in the harbor"]}})
+    Vectorizer("world").vectorize_world_chunks("world_b", {"rules": {"laws": ["Bells ring at dusk"]}})
+
+
+async def _wait_job(client, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = await client.get(f"/api/v1/jobs/{job_id}")
+        assert response.status_code == 200
+        job = response.json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        assert time.monotonic() < deadline, f"job {job_id} did not finish"
+        time.sleep(0.01)
+
+
+def _source_ids(index_name):
+    return [record["source_id"] for record in Vectorizer(index_name).metadata_store.metadata]
+
+
+def _assert_hits_match_records(index_name):
+    """검색 결과의 vector_id가 그 vector를 만든 record를 가리키는지 확인."""
+    vectorizer = Vectorizer(index_name)
+    vectors = vectorizer.faiss_manager.reconstruct_vectors(list(range(vectorizer.get_vector_count())))
+    for vector_id, vector in enumerate(vectors):
+        top = vectorizer.search_by_vector(vector, 1)[0]
+        assert top["vector_id"] == vector_id
+        assert top["source_id"] == vectorizer.metadata_store.metadata[vector_id]["source_id"]
+
+
+def test_delete_npc_job_removes_dependents_and_vectors(api):
+    _seed_npc("npc_gone")
+    kept = _seed_npc("npc_kept")
+
+    async def call():
+        async with api() as client:
+            response = await client.delete("/api/v1/npc/npc_gone")
+            assert response.status_code == 200
+            return response.json(), await _wait_job(client, response.json()["job_id"])
+
+    deleted, job = run(call())
+
+    assert deleted["npc_id"] == "npc_gone"
+    assert job["job_type"] == "cascade_delete"
+    assert job["status"] == "completed", job["error"]
+    assert job["result"]["deleted"] == {"episodic_memory": 3, "inference_traces": 1, "persona_facts": 1}
+    assert job["result"]["vectors_removed"] == {"episodic": 3, "persona": 1}
+    assert job["progress"]["stage"] == "done"
+    for name in ("episodic_memory", "inference_traces", "persona_facts"):
+        assert get_collection(name).count_documents({"npc_id": "npc_gone"}) == 0
+        assert get_collection(name).count_documents({"npc_id": "npc_kept"}) > 0
+
+    assert _source_ids("episodic") == kept
+    assert _source_ids("persona") == ["fact_npc_kept"]
+    _assert_hits_match_records("episodic")
+
+
+def test_delete_world_job_removes_npcs_and_world_vectors(api):
+    _seed_npc("npc_w1")
+    _seed_npc("npc_w2")
+    kept = _seed_npc("npc_other", world_id="world_b")
+    _seed_world()
+
+    async def call():
+        async with api() as client:
+            refused = await client.delete(f"/api/v1/world/{WORLD_ID}")
+            response = await client.delete(f"/api/v1/world/{WORLD_ID}", params={"delete_npcs": True})
+            return refused, response.json(), await _wait_job(client, response.json()["job_id"])
+
+    refused, deleted, job = run(call())
+
+    assert refused.status_code == 400
+    assert deleted["deleted_npcs"] == 2
+    assert job["status"] == "completed", job["error"]
+    assert job["result"]["vectors_removed"]["episodic"] == 6
+    assert job["result"]["vectors_removed"]["world"] == 1
+    assert _source_ids("episodic") == kept
+    assert _source_ids("world") == ["world_b"]
+    _assert_hits_match_records("episodic")
+
+
+def test_jobs_api_lists_and_reports_missing(api):
+    _seed_npc("npc_gone", memories=1)
+
+    async def call():
+        async with api() as client:
+            job_id = (await client.delete("/api/v1/npc/npc_gone")).json()["job_id"]
+            await _wait_job(client, job_id)
+            listed = await client.get("/api/v1/jobs", params={"job_type": "cascade_delete", "status": "completed"})
+            missing = await client.get("/api/v1/jobs/job_missing")
+            return job_id, listed, missing
+
+    job_id, listed, missing = run(call())
+
+    assert listed.status_code == 200
+    assert job_id in [job["job_id"] for job in listed.json()]
+    assert all(job["job_type"] == "cascade_delete" for job in listed.json())
+    assert missing.status_code == 404
+
+
+def test_load_waits_for_index_write_lock():
+    _seed_npc("npc_a")
+    loaded = []
+    lock = _write_lock("episodic")
+
+    with lock:
+        thread = threading.Thread(target=lambda: loaded.append(Vectorizer("episodic")))
+        thread.start()
+        thread.join(timeout=0.2)
+        # writer가 index와 메타데이터를 저장하는 동안에는 로드하지 않음
+        assert not loaded
+    thread.join(timeout=5)
+
+    assert loaded and loaded[0].get_vector_count() == loaded[0].metadata_store.count() == 3
+
+
+def test_load_rereads_mismatched_index_and_metadata(monkeypatch):
+    memory_ids = _seed_npc("npc_a")
+    load = MetadataStore.load
+    calls = []
+
+    def stale_then_current(self):
+        # 첫 번째 읽기는 다른 process가 index만 저장한 시점의 메타데이터
+        load(self)
+        calls.append(self.index_name)
+        if len(calls) == 1:
+            self.metadata = self.metadata[:-1]
+
+    monkeypatch.setattr(MetadataStore, "load", stale_then_current)
+
+    vectorizer = Vectorizer("episodic")
+
+    assert len(calls) == 2
+    assert [record["source_id"] for record in vectorizer.metadata_store.metadata] == memory_ids
+    query = embedding_service.embed_single("npc_a remembers the harbor fire number 2")
+    assert vectorizer.search_by_vector(query, 1)[0]["source_id"] == memory_ids[2]
@@ -0,0 +1,155 @@
+"""오래된 long-term memory 통합 - clustering, 실행 조건, 원본 vector 제거, batch 진행."""
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.memory.mongo.client import get_collection
+from app.memory.vector import reindex
+from app.memory.vector.vectorizer import Vectorizer
+from app.services.consolidation import ConsolidationService, cluster_by_similarity, consolidation_policy
+
+NPC_ID = "npc_a"
+OLD = datetime.utcnow() - timedelta(days=30)
+
+
+class _Job:
+    def __init__(self):
+        self.progress = {}
+
+    def update(self, **progress):
+        self.progress.update(progress)
+
+
+def _unit(*rows):
+    vectors = np.array(rows, dtype=np.float64)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_cluster_by_similarity_groups_around_oldest_seed():
+    vectors = _unit([1, 0, 0], [0, 1, 0], [0.99, 0.1, 0], [0.98, 0, 0.2], [0, 0.97, 0.2])
+
+    assert cluster_by_similarity(vectors, 0.9, 10) == [[0, 2, 3], [1, 4]]
+
+
+def test_cluster_by_similarity_caps_size_with_most_similar_members():
+    vectors = _unit([1, 0], [0.9, 0.1], [0.99, 0.01], [0.95, 0.05])
+
+    # seed 0 + 가장 비슷한 2개 (2, 3), 남은 1은 단독 cluster
+    assert cluster_by_similarity(vectors, 0.5, 3) == [[0, 2, 3], [1]]
+
+
+def test_cluster_by_similarity_keeps_dissimilar_singletons():
+    vectors = _unit([1, 0, 0], [0, 1, 0], [0, 0, 1])
+
+    assert cluster_by_similarity(vectors, 0.5, 10) == [[0], [1], [2]]
+
+
+def test_consolidation_policy_uses_npc_override(monkeypatch):
+    monkeypatch.setattr(settings, "memory_consolidation_min_age_days", 7)
+    monkeypatch.setattr(settings, "memory_consolidation_min_memories", 50)
+
+    assert consolidation_policy(None) == (7, 50)
+    assert consolidation_policy({"consolidation_min_age_days": 2}) == (2, 50)
+    assert consolidation_policy({"consolidation_min_age_days": None, "consolidation_min_memories": 3}) == (7, 3)
+
+
+def _seed(contents, start=OLD, npc_id=NPC_ID, first=0):
+    docs = [
+        {
+            "memory_id": f"mem_{npc_id}_{first + i:02d}",
+            "npc_id": npc_id,
+            "memory_type": "long_term",
+            "content": content,
+            "source": "observation",
+            "importance": 0.5 + i * 0.01,
+            "tags": [f"tag{i}"],
+            "linked_entities": [],
+            "created_at": start + timedelta(minutes=i),
+        }
+        for i, content in enumerate(contents)
+    ]
+    get_collection("episodic_memory").insert_many(docs)
+    Vectorizer("episodic").vectorize_episodic_memories_bulk([
+        {**doc, "created_at": doc["created_at"].isoformat()} for doc in docs
+    ])
+    return [doc["memory_id"] for doc in docs]
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(settings, "memory_consolidation_min_age_days", 7)
+    monkeypatch.setattr(settings, "memory_consolidation_min_memories", 2)
+    monkeypatch.setattr(settings, "memory_consolidation_similarity", 0.95)
+    monkeypatch.setattr(ConsolidationService, "_summarize", staticmethod(lambda docs: f"summary of {len(docs)}"))
+
+
+REPEATED = "The guard greeted the player at the north gate"
+
+
+def test_run_replaces_cluster_with_summary_and_removes_original_vectors(enabled):
+    memory_ids = _seed([REPEATED, "A storm flooded the harbor market", REPEATED, REPEATED])
+
+    result = ConsolidationService.run(_Job())
+
+    assert result["clusters"] == 1 and result["consolidated"] == 3 and result["checked"] == 1
+    summary_id = result["by_npc"][NPC_ID]["summary_ids"][0]
+    collection = get_collection("episodic_memory")
+    summary = collection.find_one({"memory_id": summary_id})
+    assert summary["content"] == "summary of 3"
+    assert summary["source"] == "reflection"
+    assert summary["consolidated_from"] == [memory_ids[0], memory_ids[2], memory_ids[3]]
+    assert summary["created_at"] == collection.find_one({"memory_id": memory_ids[3]})["created_at"]
+    assert sorted(summary["tags"]) == ["consolidated", "tag0", "tag2", "tag3"]
+    for memory_id in summary["consolidated_from"]:
+        assert collection.find_one({"memory_id": memory_id})["consolidated_into"] == summary_id
+
+    # 원본은 Mongo에 남고 vector만 제거, 묶이지 않은 memory와 요약 memory의 vector는 유지
+    source_ids = [record["source_id"] for record in Vectorizer("episodic").metadata_store.metadata]
+    assert source_ids == [memory_ids[1], summary_id]
+    # 재구성 대상에서도 제외
+    assert collection.count_documents(reindex.SOURCES["episodic"][0][1]) == 2
+
+
+def test_run_moves_past_unclustered_batch(enabled, monkeypatch):
+    monkeypatch.setattr(settings, "memory_consolidation_batch_size", 3)
+    unique = _seed(["A storm flooded the harbor", "The baker lost her cat", "Bandits raided the mill"])
+    _seed([REPEATED, REPEATED], start=OLD + timedelta(hours=1), first=3)
+
+    first = ConsolidationService.run(_Job(), npc_id=NPC_ID)
+    second = ConsolidationService.run(_Job(), npc_id=NPC_ID)
+
+    assert first["clusters"] == 0 and first["checked"] == 3
+    assert second["clusters"] == 1 and second["consolidated"] == 2
+    checked = get_collection("episodic_memory").find({"memory_id": {"$in": unique}})
+    assert all(doc.get("consolidation_checked_at") for doc in checked)
+
+
+def test_failed_summary_is_retried_next_run(enabled, monkeypatch):
+    _seed([REPEATED, REPEATED])
+    monkeypatch.setattr(ConsolidationService, "_summarize", staticmethod(lambda docs: ""))
+
+    failed = ConsolidationService.run(_Job())
+    assert failed["failed"] == 1 and failed["checked"] == 0
+
+    monkeypatch.setattr(ConsolidationService, "_summarize", staticmethod(lambda docs: "summary"))
+    assert ConsolidationService.run(_Job())["consolidated"] == 2
+
+
+def test_run_respects_policy(enabled, monkeypatch):
+    _seed([REPEATED, REPEATED])
+    _seed([REPEATED, REPEATED], npc_id="npc_b")
+    get_collection("npcs").insert_one({"npc_id": "npc_b", "config": {"consolidation_min_age_days": 0}})
+
+    # npc_b는 통합 비활성화, npc_a는 최소 개수 미만
+    monkeypatch.setattr(settings, "memory_consolidation_min_memories", 3)
+    result = ConsolidationService.run(_Job())
+    assert result["npcs"] == 1 and result["clusters"] == 0
+    assert Vectorizer("episodic").get_vector_count() == 4
+
+    # 기준보다 최근 memory는 대상 아님
+    monkeypatch.setattr(settings, "memory_consolidation_min_memories", 2)
+    monkeypatch.setattr(settings, "memory_consolidation_min_age_days", 60)
+    assert ConsolidationService.run(_Job())["clusters"] == 0
+
+    monkeypatch.setattr(settings, "memory_consolidation_min_age_days", 0)
+    assert ConsolidationService.run(_Job())["npcs"] == 0
@@ -0,0 +1,118 @@
+"""토큰 예산 - greedy packing, section 간 남은 토큰 이월, tiktoken encoding fallback."""
+import pytest
+from app.agents import context_budget
+from app.agents.context_budget import ContextBudget, count_tokens, pack_items
+
+
+@pytest.fixture(autouse=True)
+def approx_tokens(monkeypatch):
+    """tiktoken 설치 여부와 관계없이 4 chars ≈ 1 token 근사치로 계산."""
+    monkeypatch.setattr(context_budget, "tiktoken", None)
+    monkeypatch.setattr(context_budget, "_encoding", None)
+    monkeypatch.setattr(context_budget, "_encoding_loaded", False)
+
+
+class _FakeTiktoken:
+    """지정한 encoding 이름만 로드할 수 있는 tiktoken (나머지는 오프라인 다운로드 실패)."""
+
+    class Encoding:
+        def encode(self, text, disallowed_special=()):
+            return text.split()
+
+    def __init__(self, available=()):
+        self.available = set(available)
+        self.requested = []
+
+    def get_encoding(self, name):
+        self.requested.append(name)
+        if name not in self.available:
+            raise ConnectionError(f"cannot download {name}")
+        return self.Encoding()
+
+
+def test_count_tokens_approximates_four_chars_per_token():
+    assert count_tokens("") == 0
+    assert count_tokens("a") == 1
+    assert count_tokens("abcd") == 1
+    assert count_tokens("abcde") == 2
+    assert ContextBudget(100).as_dict()["tokenizer"] == "approx"
+
+
+def test_encoding_falls_back_to_cl100k(monkeypatch):
+    fake = _FakeTiktoken(available={"cl100k_base"})
+    monkeypatch.setattr(context_budget, "tiktoken", fake)
+
+    assert count_tokens("one two three four five") == 5
+    assert fake.requested == ["o200k_base", "cl100k_base"]
+    assert ContextBudget(100).as_dict()["tokenizer"] == "tiktoken"
+
+
+def test_offline_encoding_falls_back_to_approximation_once(monkeypatch):
+    fake = _FakeTiktoken()
+    monkeypatch.setattr(context_budget, "tiktoken", fake)
+
+    assert count_tokens("one two three four five") == 6
+    assert count_tokens("abcdefgh") == 2
+    # 실패한 다운로드를 토큰을 셀 때마다 다시 시도하지 않음
+    assert fake.requested == ["o200k_base", "cl100k_base"]
+    assert ContextBudget(100).as_dict()["tokenizer"] == "approx"
+
+
+def _text(tokens):
+    """줄바꿈을 포함해 정확히 tokens 토큰인 item text."""
+    return "x" * (tokens * 4 - 1)
+
+
+def test_pack_items_selects_by_score_and_returns_original_order():
+    items = [(_text(3), 0.1), (_text(4), 0.9), (_text(2), 0.5)]
+
+    assert pack_items(items, 9) == ([0, 1, 2], 9)
+    assert pack_items(items, 6) == ([1, 2], 6)
+
+
+def test_pack_items_keeps_trying_smaller_items_after_one_does_not_fit():
+    items = [(_text(5), 0.9), (_text(8), 0.8), (_text(2), 0.1)]
+
+    # 두 번째로 높은 item은 들어가지 않지만 뒤의 작은 item은 들어감
+    assert pack_items(items, 8) == ([0, 2], 7)
+    assert pack_items(items, 1) == ([], 0)
+    assert pack_items([], 10) == ([], 0)
+
+
+def test_unused_tokens_carry_over_to_next_section():
+    budget = ContextBudget(1000)
+
+    assert budget.available("persona") == 150
+    budget.consume("persona", 100)
+    assert budget.available("facts") == 200 + 50
+    budget.consume("facts", 250)
+    # 다 쓰면 이월 없음, 초과해도 음수로 이월하지 않음
+    assert budget.available("world") == 100
+    budget.consume("world", 130)
+    assert budget.available("memories") == 400
+
+    usage = budget.as_dict()
+    assert usage["used_tokens"] == 480
+    assert usage["sections"]["facts"] == {"allocated": 250, "used": 250}
+
+
+def test_select_reserves_header_tokens_from_section_budget():
+    budget = ContextBudget(100)
+    budget.consume("persona", 5)
+    budget.consume("facts", 20)
+    budget.consume("world", 10)
+    items = [(_text(10), 0.9), (_text(20), 0.8), (_text(15), 0.7)]
+
+    # memories: 40 + 앞 section에서 이월된 10 = 50, header 5를 빼면 45
+    assert budget.available("memories") == 50
+    assert budget.select("memories", items, reserved=5) == [0, 1, 2]
+    assert budget.select("memories", items, reserved=10) == [0, 1]
+
+
+def test_resume_continues_from_cached_section_usage():
+    usage = {"persona": {"allocated": 150, "used": 100}, "facts": {"allocated": 250, "used": 200}}
+
+    budget = ContextBudget.resume(1000, usage)
+
+    assert budget.usage == usage
+    assert budget.available("world") == 100 + 50
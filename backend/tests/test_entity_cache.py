@@ -0,0 +1,228 @@
+"""EntityCache version/sequence 보장, LRU eviction, repository 쓰기 시 invalidate, change stream 재연결 테스트."""
+import threading
+from pymongo.errors import AutoReconnect, OperationFailure
+from app.memory.mongo import client
+from app.memory.mongo.cache import ChangeStreamInvalidator, EntityCache, entity_cache, _MISSING
+from app.memory.mongo.client import get_collection
+from app.memory.mongo.repository.npc_repo import NPCRepository
+from app.memory.mongo.repository.persona_repo import PersonaFactRepository
+from app.schemas.npc import NPCCreate
+from app.schemas.persona import PersonaFactCreate, PersonaFactDimension, PersonaFactUpdate
+
+
+def test_put_is_dropped_when_invalidated_during_load():
+    cache = EntityCache(max_entries=10)
+    version = cache.version("npc", "n1")
+    cache.invalidate("npc", "n1")
+    cache.put("npc", "n1", {"name": "stale"}, version)
+    assert cache.get("npc", "n1") is _MISSING
+
+    cache.put("npc", "n1", {"name": "fresh"}, cache.version("npc", "n1"))
+    assert cache.get("npc", "n1") == {"name": "fresh"}
+
+
+def test_kind_invalidation_and_clear_bump_versions():
+    cache = EntityCache(max_entries=10)
+    version = cache.version("npc", "n1")
+    cache.invalidate_kind("npc")
+    cache.put("npc", "n1", "stale", version)
+    assert cache.get("npc", "n1") is _MISSING
+
+    version = cache.version("npc", "n1")
+    cache.clear()
+    cache.put("npc", "n1", "stale", version)
+    assert cache.get("npc", "n1") is _MISSING
+
+
+def test_get_returns_copy():
+    cache = EntityCache(max_entries=10)
+    cache.put("npc", "n1", {"state": {"hp": 1}}, cache.version("npc", "n1"))
+    cache.get("npc", "n1")["state"]["hp"] = 0
+    assert cache.get("npc", "n1") == {"state": {"hp": 1}}
+
+
+def test_put_many_requires_unchanged_sequence():
+    cache = EntityCache(max_entries=10)
+    items = {("npc", "n1"): "npc", ("persona", "p1"): "persona"}
+
+    sequence = cache.sequence()
+    cache.invalidate("world", "unrelated")
+    cache.put_many(items, sequence)
+    assert cache.get("npc", "n1") is _MISSING
+    assert cache.get("persona", "p1") is _MISSING
+
+    cache.put_many(items, cache.sequence())
+    assert cache.get("npc", "n1") == "npc"
+    assert cache.get("persona", "p1") == "persona"
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = EntityCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put("npc", key, key, cache.version("npc", key))
+    cache.get("npc", "a")
+    cache.put("npc", "c", "c", cache.version("npc", "c"))
+
+    assert cache.get("npc", "b") is _MISSING
+    assert cache.get("npc", "a") == "a"
+    assert cache.get("npc", "c") == "c"
+    assert cache.stats()["evictions"] == 1
+
+    cache.put_many({("npc", "d"): "d", ("npc", "e"): "e"}, cache.sequence())
+    assert cache.stats()["entries"] == 2
+    assert cache.get("npc", "a") is _MISSING
+
+
+def test_disabled_cache_always_loads():
+    cache = EntityCache(enabled=False)
+    calls = []
+    for _ in range(2):
+        cache.get_or_load("npc", "n1", lambda: calls.append(1) or "value")
+    assert len(calls) == 2
+
+
+def test_none_is_not_cached():
+    cache = EntityCache()
+    assert cache.get_or_load("npc", "n1", lambda: None) is None
+    assert cache.get_or_load("npc", "n1", lambda: "created") == "created"
+
+
+def _create_npc():
+    return NPCRepository.create_npc(NPCCreate(
+        name="Cached", role="villager", persona_id="persona_c", world_id="world_c"
+    ))
+
+
+def test_npc_update_and_delete_invalidate():
+    npc = _create_npc()
+    assert NPCRepository.get_npc_by_id(npc.npc_id).current_state == {}
+
+    # 캐시된 값이 쓰이는지 확인하기 위해 repository를 거치지 않고 문서 변경
+    get_collection("npcs").update_one({"npc_id": npc.npc_id}, {"$set": {"name": "Renamed"}})
+    assert NPCRepository.get_npc_by_id(npc.npc_id).name == "Cached"
+
+    NPCRepository.update_npc_state(npc.npc_id, {"emotion": "angry"})
+    cached = NPCRepository.get_npc_by_id(npc.npc_id)
+    assert cached.name == "Renamed"
+    assert cached.current_state["emotion"] == "angry"
+
+    NPCRepository.delete_npc(npc.npc_id)
+    assert NPCRepository.get_npc_by_id(npc.npc_id) is None
+
+
+def test_fact_changes_invalidate_fact_lists():
+    fact = PersonaFactRepository.create_fact(PersonaFactCreate(
+        persona_id="persona_c",
+        npc_id="npc_c",
+        dimension=PersonaFactDimension.GOAL_PLAN,
+        content="wants to open a bakery"
+    ))
+    assert [f.content for f in PersonaFactRepository.get_facts_by_npc("npc_c")] == ["wants to open a bakery"]
+    assert len(PersonaFactRepository.get_facts_by_persona("persona_c")) == 1
+    assert entity_cache.get("facts_by_npc", "npc_c") is not _MISSING
+
+    PersonaFactRepository.update_fact(fact.fact_id, PersonaFactUpdate(
+        content="wants to open a forge", dimension=PersonaFactDimension.EXPERIENCE
+    ))
+    assert [f.content for f in PersonaFactRepository.get_facts_by_npc("npc_c")] == ["wants to open a forge"]
+    assert PersonaFactRepository.get_facts_by_persona("persona_c", PersonaFactDimension.GOAL_PLAN) == []
+    assert len(PersonaFactRepository.get_facts_by_persona("persona_c", PersonaFactDimension.EXPERIENCE)) == 1
+
+    PersonaFactRepository.create_facts_bulk([PersonaFactCreate(
+        persona_id="persona_c",
+        npc_id="npc_c",
+        dimension=PersonaFactDimension.ROUTINE_HABIT,
+        content="bakes at dawn"
+    )])
+    assert len(PersonaFactRepository.get_facts_by_npc("npc_c")) == 2
+
+    PersonaFactRepository.delete_fact(fact.fact_id)
+    assert [f.content for f in PersonaFactRepository.get_facts_by_npc("npc_c")] == ["bakes at dawn"]
+    assert len(PersonaFactRepository.get_facts_by_persona("persona_c")) == 1
+
+
+class _Stream:
+    """events를 차례로 돌려주는 change stream (Exception이면 raise, 끝나면 감시 중지)."""
+
+    def __init__(self, events):
+        self.events = list(events)
+        self.resume_token = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def try_next(self):
+        if not self.events:
+            ChangeStreamInvalidator._stop.set()
+            return None
+        event = self.events.pop(0)
+        if isinstance(event, Exception):
+            raise event
+        self.resume_token = event["_id"]
+        return event
+
+
+class _WatchedCollection:
+    def __init__(self, *streams):
+        self.streams = list(streams)
+        self.resume_after = []
+
+    def watch(self, full_document=None, max_await_time_ms=None, resume_after=None):
+        self.resume_after.append(resume_after)
+        stream = self.streams.pop(0)
+        if isinstance(stream, Exception):
+            raise stream
+        return _Stream(stream)
+
+
+def _npc_event(token, npc_id):
+    return {"_id": {"_data": token}, "operationType": "update", "fullDocument": {"npc_id": npc_id}}
+
+
+def _watch(monkeypatch, collection):
+    monkeypatch.setattr(client, "get_collection", lambda name: collection)
+    monkeypatch.setattr(ChangeStreamInvalidator, "_stop", threading.Event())
+    monkeypatch.setattr(ChangeStreamInvalidator, "RECONNECT_DELAY_S", 0.001)
+    ChangeStreamInvalidator._watch("npcs")
+
+
+def test_change_stream_reconnects_from_resume_token_and_clears_cache(monkeypatch):
+    collection = _WatchedCollection(
+        [_npc_event("t1", "n1"), AutoReconnect("primary stepped down")],
+        AutoReconnect("no primary"),
+        [_npc_event("t2", "n2")],
+    )
+    for npc_id in ("n1", "n2", "n3"):
+        entity_cache.put("npc", npc_id, {"npc_id": npc_id}, entity_cache.version("npc", npc_id))
+
+    _watch(monkeypatch, collection)
+
+    # 끊기기 전 이벤트의 token부터 다시 감시
+    assert collection.resume_after == [None, {"_data": "t1"}, {"_data": "t1"}]
+    # 끊긴 동안 놓친 쓰기가 있을 수 있으므로 재연결 후 cache 전체를 비움
+    assert entity_cache.get("npc", "n3") is _MISSING
+
+
+def test_change_stream_restarts_without_lost_resume_token(monkeypatch):
+    collection = _WatchedCollection(
+        [_npc_event("t1", "n1"), OperationFailure("resume token not found", 286)],
+        [],
+    )
+
+    _watch(monkeypatch, collection)
+
+    assert collection.resume_after == [None, None]
+
+
+def test_change_stream_events_invalidate_without_clearing(monkeypatch):
+    collection = _WatchedCollection([_npc_event("t1", "n1")])
+    for npc_id in ("n1", "n2"):
+        entity_cache.put("npc", npc_id, {"npc_id": npc_id}, entity_cache.version("npc", npc_id))
+
+    _watch(monkeypatch, collection)
+
+    assert entity_cache.get("npc", "n1") is _MISSING
+    assert entity_cache.get("npc", "n2") == {"npc_id": "n2"}
@@ -0,0 +1,169 @@
+"""BM25 inverted index - 점수/순위와 metadata 변경 시 색인 갱신."""
+import math
+from app.memory.vector.lexical import BM25_B, BM25_K1, LexicalIndex, search_index, tokenize
+
+
+def _record(source_id, text, source_type="episodic"):
+    return {"source_type": source_type, "source_id": source_id, "summary": text}
+
+
+def _corpus():
+    return [
+        _record("m0", "The blacksmith forged a silver ring"),
+        _record("m1", "Aria met the blacksmith at the market"),
+        _record("m2", "quest_001 asks to find the lost ring in the forest"),
+        _record("m3", "It rained all day in the village"),
+    ]
+
+
+def _expected_score(index, doc_id, query):
+    """BM25 식을 직접 계산한 점수."""
+    count = index.count
+    average_length = index.total_length / count
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * index.doc_lengths[doc_id] / average_length)
+    score = 0.0
+    for token in set(tokenize(query)):
+        docs = index.postings.get(token, {})
+        if doc_id not in docs:
+            continue
+        idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+        score += idf * docs[doc_id] * (BM25_K1 + 1) / (docs[doc_id] + norm)
+    return score
+
+
+def test_bm25_scores_match_formula():
+    index = LexicalIndex()
+    index.sync(_corpus())
+
+    hits = index.search("silver ring", top_k=10)
+
+    assert [doc_id for doc_id, _ in hits] == [0, 2]
+    for doc_id, score in hits:
+        assert math.isclose(score, _expected_score(index, doc_id, "silver ring"))
+
+
+def test_rare_terms_outweigh_common_terms():
+    records = [_record(f"m{i}", "the guard walked the wall") for i in range(5)]
+    records.append(_record("m5", "the guard saw quest_001"))
+    index = LexicalIndex()
+    index.sync(records)
+
+    hits = index.search("guard quest_001", top_k=3)
+
+    # "guard"는 모든 문서에 있어 idf가 작고, quest_001이 있는 문서만 크게 앞섬
+    assert hits[0][0] == 5
+    assert hits[0][1] > 2 * hits[1][1]
+
+
+def test_exact_ids_and_unknown_terms():
+    index = LexicalIndex()
+    index.sync(_corpus())
+
+    assert [doc_id for doc_id, _ in index.search("QUEST_001", top_k=5)] == [2]
+    assert index.search("dragon", top_k=5) == []
+    assert LexicalIndex().search("ring", top_k=5) == []
+
+
+def test_predicate_fills_top_k_in_score_order():
+    index = LexicalIndex()
+    index.sync(_corpus())
+
+    hits = index.search("blacksmith ring", top_k=2, predicate=lambda doc_id: doc_id != 0)
+
+    assert [doc_id for doc_id, _ in hits] == [1, 2]
+
+
+def _assert_matches_fresh(index, metadata, query):
+    fresh = LexicalIndex()
+    fresh.sync(metadata)
+    assert index.search(query, top_k=10) == fresh.search(query, top_k=10)
+    assert index.doc_lengths == fresh.doc_lengths
+
+
+def test_sync_appends_new_records_only():
+    metadata = _corpus()
+    index = LexicalIndex()
+    index.sync(metadata[:2])
+    postings = index.postings
+
+    index.sync(metadata)
+
+    assert index.postings is postings
+    assert index.count == 4
+    _assert_matches_fresh(index, metadata, "ring blacksmith")
+
+
+def test_sync_rebuilds_after_mid_list_removal():
+    metadata = _corpus()
+    index = LexicalIndex()
+    index.sync(metadata)
+
+    # 중간 레코드 제거 후 vector_id가 앞으로 당겨진 목록 (처음/마지막 레코드는 그대로)
+    remaining = [metadata[0], metadata[2], metadata[3]]
+    index.sync(remaining)
+
+    assert [doc_id for doc_id, _ in index.search("ring", top_k=5)] == [0, 1]
+    assert index.search("aria", top_k=5) == []
+    _assert_matches_fresh(index, remaining, "ring aria")
+
+
+def test_sync_rebuilds_after_remove_and_append_with_same_count():
+    metadata = _corpus()
+    index = LexicalIndex()
+    index.sync(metadata)
+
+    # 한 개를 지우고 한 개를 추가해 개수가 같고 마지막 레코드만 바뀐 것처럼 보이는 경우
+    changed = [metadata[0], metadata[2], metadata[3], _record("m4", "Aria bought a lantern")]
+    index.sync(changed)
+
+    assert [doc_id for doc_id, _ in index.search("lantern aria", top_k=5)] == [3]
+    _assert_matches_fresh(index, changed, "ring rained lantern")
+
+
+def test_sync_detects_replaced_record_in_the_middle():
+    metadata = _corpus()
+    index = LexicalIndex()
+    index.sync(metadata)
+
+    replaced = list(metadata)
+    replaced[1] = _record("m9", "A dragon circled the tower")
+    index.sync(replaced)
+
+    assert [doc_id for doc_id, _ in index.search("dragon", top_k=5)] == [1]
+    assert index.search("market", top_k=5) == []
+
+
+def test_sync_keeps_postings_for_reloaded_equal_records():
+    metadata = _corpus()
+    index = LexicalIndex()
+    index.sync(metadata)
+    postings = index.postings
+
+    # JSONL을 다시 읽으면 내용은 같고 dict 객체만 새로 만들어짐
+    reloaded = [dict(record, importance=0.9) for record in metadata]
+    index.sync(reloaded)
+
+    assert index.postings is postings
+    assert all(a is b for a, b in zip(index._records, reloaded))
+    _assert_matches_fresh(index, reloaded, "ring blacksmith")
+
+
+def test_sync_rebuilds_when_metadata_shrinks():
+    metadata = _corpus()
+    index = LexicalIndex()
+    index.sync(metadata)
+
+    index.sync(metadata[:1])
+
+    assert index.count == 1
+    assert index.search("blacksmith", top_k=5)[0][0] == 0
+    assert index.search("aria", top_k=5) == []
+
+
+def test_search_index_shares_index_per_name():
+    metadata = _corpus()
+
+    assert [doc_id for doc_id, _ in search_index("episodic", metadata, "ring", 5)] == [0, 2]
+    metadata = metadata[1:]
+    assert [doc_id for doc_id, _ in search_index("episodic", metadata, "ring", 5)] == [1]
+    assert search_index("world", [], "ring", 5) == []
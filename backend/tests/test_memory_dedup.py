@@ -0,0 +1,134 @@
+"""중복 long-term memory 병합 - NPC별 최근 vector 목록, 병합/flush 후 재시도/삭제된 대상 fallback."""
+from app.memory.mongo.client import get_collection
+from app.memory.mongo.repository.memory_repo import AsyncMemoryRepository, MemoryRepository
+from app.memory.mongo.write_buffer import write_buffer
+from app.memory.vector.metadata_store import MetadataStore
+from app.memory.vector.vectorizer import Vectorizer
+from app.schemas.memory import MemoryCreate
+from tests.conftest import run
+
+CONTENT = "The blacksmith greeted the player at the forge"
+
+
+def _long_term(npc_id="npc_a", content=CONTENT, importance=0.8):
+    return MemoryCreate(npc_id=npc_id, content=content, source="observation", importance=importance)
+
+
+def _records(npc_ids):
+    return [{"source_type": "episodic", "source_id": f"mem_{i}", "npc_id": npc_id} for i, npc_id in enumerate(npc_ids)]
+
+
+def _scan(store, npc_id, limit):
+    """이전 구현과 같은 역순 전체 scan."""
+    ids = [r["vector_id"] for r in reversed(store.metadata) if r.get("source_type") == "episodic" and r.get("npc_id") == npc_id]
+    return ids[:limit]
+
+
+def test_recent_episodic_ids_tracks_add_and_remove():
+    store = MetadataStore("episodic")
+    for record in _records(["a", "b", "a", "a", "b"]):
+        store.add(record)
+    store.add({"source_type": "persona_fact", "source_id": "fact_1", "npc_id": "a"})
+
+    assert store.recent_episodic_ids("a", 2) == [3, 2]
+    assert store.recent_episodic_ids("b", 10) == [4, 1]
+    assert store.recent_episodic_ids("c", 10) == []
+    assert store.recent_episodic_ids("a", 0) == []
+
+    store.add({"source_type": "episodic", "source_id": "mem_9", "npc_id": "a"})
+    assert store.recent_episodic_ids("a", 2) == [6, 3]
+
+    # 삭제하면 vector_id가 다시 매겨지므로 목록도 다시 만듦
+    store.remove([0, 3])
+    for npc_id in ("a", "b"):
+        assert store.recent_episodic_ids(npc_id, 10) == _scan(store, npc_id, 10)
+
+
+def test_recent_episodic_ids_after_load_and_truncate():
+    store = MetadataStore("episodic")
+    for record in _records(["a", "b", "a"]):
+        store.add(record)
+    store.save()
+
+    loaded = MetadataStore("episodic")
+    loaded.load()
+    assert loaded.recent_episodic_ids("a", 5) == [2, 0]
+
+    loaded.metadata = loaded.metadata[:2]
+    assert loaded.recent_episodic_ids("a", 5) == [0]
+
+
+def test_duplicate_long_term_memory_is_merged():
+    first = MemoryRepository.insert_memory(_long_term())
+    second = MemoryRepository.insert_memory(_long_term(importance=0.75))
+
+    assert second.memory_id == first.memory_id
+    assert second.repeat_count == 1
+    assert second.last_seen_at is not None
+    assert second.importance >= first.importance
+    assert get_collection("episodic_memory").count_documents({"npc_id": "npc_a"}) == 1
+
+    vectorizer = Vectorizer("episodic")
+    assert vectorizer.get_vector_count() == 1
+    assert vectorizer.metadata_store.metadata[0]["repeat_count"] == 1
+
+
+def test_other_npcs_memories_are_not_merged():
+    MemoryRepository.insert_memory(_long_term(npc_id="npc_a"))
+    other = MemoryRepository.insert_memory(_long_term(npc_id="npc_b"))
+
+    assert other.repeat_count == 0
+    assert Vectorizer("episodic").get_vector_count() == 2
+
+
+def test_merge_flushes_buffered_target_then_retries(monkeypatch):
+    monkeypatch.setattr(write_buffer, "enabled", True)
+    collection = get_collection("episodic_memory")
+
+    first = MemoryRepository.insert_memory(_long_term())
+    assert collection.count_documents({}) == 0
+
+    merged = MemoryRepository.insert_memory(_long_term())
+
+    assert merged.memory_id == first.memory_id
+    assert merged.repeat_count == 1
+    assert collection.count_documents({}) == 1
+    assert not write_buffer._pending.get("episodic_memory")
+
+
+def test_async_merge_flushes_buffered_target_then_retries(monkeypatch):
+    monkeypatch.setattr(write_buffer, "enabled", True)
+
+    first = MemoryRepository.insert_memory(_long_term())
+    merged = run(AsyncMemoryRepository.insert_memory(_long_term()))
+
+    assert merged.memory_id == first.memory_id
+    assert merged.repeat_count == 1
+    assert get_collection("episodic_memory").count_documents({}) == 1
+
+
+def test_deleted_merge_target_falls_back_to_new_memory():
+    collection = get_collection("episodic_memory")
+    first = MemoryRepository.insert_memory(_long_term())
+    # 문서만 삭제되고 vector는 아직 남은 상태 (cascade delete job 전)
+    collection.delete_one({"memory_id": first.memory_id})
+
+    second = MemoryRepository.insert_memory(_long_term())
+
+    assert second.memory_id != first.memory_id
+    assert second.repeat_count == 0
+    assert collection.find_one({"memory_id": second.memory_id}) is not None
+    source_ids = [r["source_id"] for r in Vectorizer("episodic").metadata_store.metadata]
+    assert source_ids == [first.memory_id, second.memory_id]
+
+
+def test_async_deleted_merge_target_falls_back_to_new_memory():
+    collection = get_collection("episodic_memory")
+    first = MemoryRepository.insert_memory(_long_term())
+    collection.delete_one({"memory_id": first.memory_id})
+
+    second = run(AsyncMemoryRepository.insert_memory(_long_term()))
+
+    assert second.memory_id != first.memory_id
+    assert collection.count_documents({"memory_id": second.memory_id}) == 1
+    assert Vectorizer("episodic").get_vector_count() == 2
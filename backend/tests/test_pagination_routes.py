@@ -0,0 +1,91 @@
+"""trace/memory 목록 API의 pagination, limit 상한, 필드 제외 테스트."""
+from app.memory.mongo.repository.memory_repo import MemoryRepository
+from app.memory.mongo.repository.npc_repo import NPCRepository
+from app.memory.mongo.repository.trace_repo import TraceRepository
+from app.schemas.memory import MemoryCreate
+from app.schemas.npc import NPCCreate
+from app.schemas.trace import TraceCreate
+from tests.conftest import run
+
+
+def _seed_traces(npc_id: str, count: int) -> None:
+    for i in range(count):
+        TraceRepository.insert_trace(TraceCreate(
+            npc_id=npc_id,
+            turn_id=f"turn_{i}",
+            llm_prompt_snapshot=f"SYSTEM\nprompt {i}",
+            llm_prompt_segments=["SYSTEM\n"],
+            chosen_action="talk"
+        ))
+
+
+def _create_npc() -> str:
+    return NPCRepository.create_npc(NPCCreate(
+        name="Tester", role="villager", persona_id="persona_t", world_id="world_t"
+    )).npc_id
+
+
+def test_trace_cursor_page_omits_excluded_fields(api):
+    _seed_traces("npc_a", 3)
+
+    async def call():
+        async with api() as client:
+            return await client.get("/api/v1/npc/npc_a/traces", params={"limit": 2, "exclude": "llm_prompt_snapshot"})
+
+    response = run(call())
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body) == 2
+    assert all("llm_prompt_snapshot" not in trace for trace in body)
+    assert all(trace["chosen_action"] == "talk" for trace in body)
+    assert response.headers.get("X-Next-Cursor")
+
+
+def test_trace_offset_page_applies_exclude(api):
+    _seed_traces("npc_a", 3)
+
+    async def call():
+        async with api() as client:
+            return await client.get(
+                "/api/v1/npc/npc_a/traces",
+                params={"offset": 1, "exclude": "llm_prompt_snapshot,tool_execution_result"}
+            )
+
+    response = run(call())
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body) == 2
+    assert all("llm_prompt_snapshot" not in trace and "tool_execution_result" not in trace for trace in body)
+
+
+def test_trace_page_without_exclude_keeps_snapshot(api):
+    _seed_traces("npc_a", 1)
+
+    async def call():
+        async with api() as client:
+            return await client.get("/api/v1/npc/npc_a/traces")
+
+    body = run(call()).json()
+    assert body[0]["llm_prompt_snapshot"] == "SYSTEM\nprompt 0"
+
+
+def test_memory_page_omits_excluded_fields_and_caps_limit(api):
+    npc_id = _create_npc()
+    for i in range(2):
+        MemoryRepository.insert_memory(MemoryCreate(
+            npc_id=npc_id, content=f"memory {i}", source="observation", importance=0.2, tags=["observation"]
+        ))
+
+    async def call():
+        async with api() as client:
+            page = await client.get(f"/api/v1/npc/{npc_id}/memory", params={"exclude": "tags"})
+            too_large = await client.get(f"/api/v1/npc/{npc_id}/memory", params={"limit": 501})
+            recent_too_large = await client.get(f"/api/v1/npc/{npc_id}/memory/recent", params={"limit": 501})
+            return page, too_large, recent_too_large
+
+    page, too_large, recent_too_large = run(call())
+    assert page.status_code == 200
+    assert len(page.json()) == 2
+    assert all("tags" not in memory and "content" in memory for memory in page.json())
+    assert too_large.status_code == 422
+    assert recent_too_large.status_code == 422
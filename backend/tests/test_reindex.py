@@ -0,0 +1,222 @@
+"""Vector index 재구성 - shadow 구축, 재구성 중 쓰기/삭제 반영, checkpoint 이후 재개, 중복 실행 409."""
+import os
+import threading
+import time
+from datetime import datetime
+import pytest
+from app.core.config import settings
+from app.memory.mongo.client import get_collection
+from app.memory.vector import reindex
+from app.memory.vector.reindex import ShadowIndex, mark_refreshed, resume_pending_reindexes, start_reindex
+from app.memory.vector.vectorizer import Vectorizer, episodic_record
+from app.services.cascade_delete import CascadeDeleteService
+from app.services.embedding_service import embedding_service
+from tests.conftest import run
+
+
+def _memory_doc(i):
+    return {
+        "memory_id": f"mem_{i:03d}",
+        "npc_id": "npc_a",
+        "memory_type": "long_term",
+        "content": f"memory number {i} about the old mill",
+        "importance": 0.8,
+        "created_at": datetime(2025, 1, 1, 0, i),
+    }
+
+
+def _seed(count):
+    """Mongo long-term memory와 그 live vector를 함께 생성."""
+    docs = [_memory_doc(i) for i in range(count)]
+    get_collection("episodic_memory").insert_many(docs)
+    Vectorizer("episodic").vectorize_episodic_memories_bulk([
+        {**doc, "created_at": doc["created_at"].isoformat()} for doc in docs
+    ])
+    return [doc["memory_id"] for doc in docs]
+
+
+def _write_live(i):
+    """재구성 중 들어온 memory - Mongo 문서 저장 후 live index에 vectorization."""
+    doc = _memory_doc(i)
+    get_collection("episodic_memory").insert_one(doc)
+    Vectorizer("episodic").vectorize_episodic_memory(
+        doc["memory_id"], doc["npc_id"], doc["content"], doc["importance"], doc["created_at"].isoformat()
+    )
+    return doc["memory_id"]
+
+
+def _wait(job, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not job.finished:
+        assert time.monotonic() < deadline, f"job {job.job_id} did not finish"
+        time.sleep(0.01)
+    return job
+
+
+def _assert_live_index(expected_ids):
+    """live index에 memory마다 vector가 정확히 하나이고 저장된 vector가 그 memory의 embedding인지 확인."""
+    vectorizer = Vectorizer("episodic")
+    source_ids = [record["source_id"] for record in vectorizer.metadata_store.metadata]
+    assert sorted(source_ids) == sorted(expected_ids)
+    assert vectorizer.get_vector_count() == len(source_ids)
+    assert [record["vector_id"] for record in vectorizer.metadata_store.metadata] == list(range(len(source_ids)))
+
+    docs = {doc["memory_id"]: doc for doc in get_collection("episodic_memory").find({}, {"_id": 0})}
+    for vector_id, source_id in enumerate(source_ids):
+        text, _ = episodic_record(source_id, "npc_a", docs[source_id]["content"], 0.8, "")
+        top = vectorizer.search_by_vector(embedding_service.embed_single(text), 1)[0]
+        assert top["vector_id"] == vector_id
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    monkeypatch.setattr(settings, "reindex_batch_size", 2)
+    monkeypatch.setattr(settings, "reindex_embed_concurrency", 1)
+
+
+def test_writes_during_rebuild_end_up_in_swapped_index(small_batches, monkeypatch):
+    seeded = _seed(5)
+    expected = set(seeded)
+    embed_parallel = reindex._embed_parallel
+    calls = []
+
+    def embed_and_write(pool, texts):
+        # 첫 batch 구축 중 새 memory 저장 (문서 _id가 커서 streaming에도 포함됨)
+        calls.append(len(texts))
+        if len(calls) == 1:
+            expected.add(_write_live(10))
+        return embed_parallel(pool, texts)
+
+    swap = ShadowIndex.swap
+
+    def write_then_swap(self):
+        # streaming이 끝난 뒤 교체 직전의 쓰기: 새 memory 추가, 통합처럼 live vector 제거
+        expected.add(_write_live(11))
+        mark_refreshed("episodic", [("episodic", seeded[0])])
+        get_collection("episodic_memory").delete_one({"memory_id": seeded[0]})
+        Vectorizer("episodic").remove_vectors(lambda record: record["source_id"] == seeded[0])
+        expected.discard(seeded[0])
+        return swap(self)
+
+    monkeypatch.setattr(reindex, "_embed_parallel", embed_and_write)
+    monkeypatch.setattr(ShadowIndex, "swap", write_then_swap)
+
+    job, started = start_reindex("episodic", resume=False)
+    _wait(job)
+
+    assert started
+    assert job.status == "completed", job.error
+    assert job.result["copied_from_live"] == 1
+    _assert_live_index(expected)
+    assert not os.path.exists(ShadowIndex("episodic").checkpoint_path)
+
+
+class _Job:
+    def update(self, **progress):
+        pass
+
+
+def test_cascade_delete_during_rebuild_does_not_resurrect_vectors(small_batches, monkeypatch):
+    kept = _seed(3)
+    other = _memory_doc(20)
+    other.update(memory_id="mem_other", npc_id="npc_deleted")
+    get_collection("episodic_memory").insert_one(other)
+    Vectorizer("episodic").vectorize_episodic_memory(
+        "mem_other", "npc_deleted", other["content"], 0.8, other["created_at"].isoformat()
+    )
+    swap = ShadowIndex.swap
+
+    def delete_then_swap(self):
+        # shadow에는 이미 npc_deleted의 memory가 들어간 뒤 NPC 삭제 job이 실행됨
+        assert any(r["source_id"] == "mem_other" for r in self.metadata_store.metadata)
+        result = CascadeDeleteService.delete_dependents(_Job(), ["npc_deleted"])
+        assert result["vectors_removed"]["episodic"] == 1
+        return swap(self)
+
+    monkeypatch.setattr(ShadowIndex, "swap", delete_then_swap)
+
+    job, _ = start_reindex("episodic", resume=False)
+    _wait(job)
+
+    assert job.status == "completed", job.error
+    _assert_live_index(kept)
+
+
+def test_resume_after_stop_does_not_duplicate_or_drop(small_batches, monkeypatch):
+    memory_ids = _seed(7)
+    monkeypatch.setattr(settings, "reindex_checkpoint_interval_s", 0)
+    embed_parallel = reindex._embed_parallel
+    calls = []
+
+    def crash_on_third_batch(pool, texts):
+        calls.append(len(texts))
+        if len(calls) == 3:
+            raise RuntimeError("process stopped")
+        return embed_parallel(pool, texts)
+
+    monkeypatch.setattr(reindex, "_embed_parallel", crash_on_third_batch)
+    job, _ = start_reindex("episodic", resume=False)
+    _wait(job)
+    assert job.status == "failed"
+
+    shadow = ShadowIndex("episodic")
+    checkpoint = shadow.load_checkpoint()
+    assert checkpoint["count"] == 4
+    # checkpoint 뒤에 shadow 파일만 저장되고 멈춘 경우 (재개 시 checkpoint 이후 vector는 잘라냄)
+    shadow.start(checkpoint)
+    text, metadata = episodic_record("mem_005", "npc_a", "memory number 5 about the old mill", 0.8, "")
+    shadow.add([(text, metadata)], embedding_service.embed([text]))
+    shadow.faiss_manager.save_index()
+    shadow.metadata_store.save()
+
+    monkeypatch.setattr(reindex, "_embed_parallel", embed_parallel)
+    jobs = resume_pending_reindexes()
+
+    assert len(jobs) == 1
+    _wait(jobs[0])
+    assert jobs[0].status == "completed", jobs[0].error
+    assert jobs[0].result["resumed"] is True
+    assert jobs[0].result["vectors_indexed"] == 7
+    assert jobs[0].result["copied_from_live"] == 0
+    _assert_live_index(memory_ids)
+    assert shadow.load_checkpoint() is None
+    assert not os.path.exists(shadow.faiss_manager.index_path)
+    assert not os.path.exists(shadow.metadata_store.meta_path)
+
+
+def test_resume_without_checkpoint_starts_nothing():
+    _seed(2)
+
+    assert resume_pending_reindexes() == []
+
+
+def test_second_start_returns_409_while_running(api, monkeypatch):
+    release = threading.Event()
+
+    def blocked_rebuild(job, index_type, resume=True):
+        release.wait(timeout=10)
+        return {"index_type": index_type}
+
+    monkeypatch.setattr(reindex, "rebuild_index", blocked_rebuild)
+
+    async def call():
+        async with api() as client:
+            return [
+                await client.post("/api/v1/vector/reindex", params={"index_type": "episodic"})
+                for _ in range(2)
+            ] + [await client.post("/api/v1/vector/reindex", params={"index_type": "world"})]
+
+    try:
+        first, second, other = run(call())
+    finally:
+        release.set()
+
+    assert first.status_code == 200
+    assert second.status_code == 409
+    assert first.json()["job_id"] in second.json()["detail"]
+    assert other.status_code == 200
+
+    _wait(reindex._running["episodic"])
+    job, started = start_reindex("episodic")
+    _wait(job)
+    assert started
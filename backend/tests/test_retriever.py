@@ -0,0 +1,115 @@
+"""VectorRetriever - vector/BM25 reciprocal-rank fusion과 점수 필드."""
+import math
+import pytest
+from app.core.config import settings
+from app.memory.vector.retriever import VectorRetriever
+from app.memory.vector.vectorizer import Vectorizer
+from app.services.embedding_service import embedding_service
+
+NPC_ID = "npc_test"
+MEMORIES = [
+    "The blacksmith forged a silver ring for the captain",
+    "Aria asked about quest_001 near the old mill",
+    "It rained all day in the village square",
+    "The merchant sold bread and apples at dawn",
+]
+
+
+def _hit(vector_id, **scores):
+    return {"vector_id": vector_id, "source_type": "episodic", **scores}
+
+
+def test_fuse_sums_reciprocal_ranks():
+    k = 60
+    vector_results = [_hit(0, similarity_score=0.9), _hit(1, similarity_score=0.5)]
+    lexical_results = [_hit(1, lexical_score=4.0), _hit(2, lexical_score=2.0)]
+
+    fused = VectorRetriever._fuse(vector_results, lexical_results, k)
+
+    assert [r["vector_id"] for r in fused] == [1, 0, 2]
+    scale = (k + 1) / 2
+    assert math.isclose(fused[0]["fusion_score"], (1 / (k + 2) + 1 / (k + 1)) * scale)
+    assert math.isclose(fused[1]["fusion_score"], 1 / (k + 1) * scale)
+    assert math.isclose(fused[2]["fusion_score"], 1 / (k + 2) * scale)
+    assert all(r["ranking_score"] == r["fusion_score"] for r in fused)
+
+
+def test_fuse_keeps_cosine_in_similarity_score():
+    vector_results = [_hit(0, similarity_score=0.9), _hit(1, similarity_score=0.5)]
+    lexical_results = [_hit(1, lexical_score=4.0), _hit(2, lexical_score=2.0)]
+
+    by_id = {r["vector_id"]: r for r in VectorRetriever._fuse(vector_results, lexical_results, 60)}
+
+    assert by_id[0]["similarity_score"] == 0.9 and by_id[0]["lexical_score"] is None
+    assert by_id[1]["similarity_score"] == 0.5 and by_id[1]["lexical_score"] == 4.0
+    assert by_id[2]["similarity_score"] is None and by_id[2]["lexical_score"] == 2.0
+
+
+def test_fuse_top_of_both_lists_scores_one():
+    fused = VectorRetriever._fuse([_hit(0, similarity_score=0.3)], [_hit(0, lexical_score=1.0)], 10)
+
+    assert math.isclose(fused[0]["fusion_score"], 1.0)
+
+
+@pytest.fixture
+def episodic_index(monkeypatch):
+    monkeypatch.setattr(settings, "retrieval_scorer", "similarity")
+    monkeypatch.setattr(settings, "retrieval_hybrid", True)
+    monkeypatch.setattr(settings, "retrieval_mmr", False)
+    vectorizer = Vectorizer("episodic")
+    vectorizer.vectorize_episodic_memories_bulk([
+        {"memory_id": f"mem_{i}", "npc_id": NPC_ID, "content": content, "importance": 0.8,
+         "created_at": "2025-01-01T00:00:00"}
+        for i, content in enumerate(MEMORIES)
+    ])
+    return vectorizer
+
+
+def test_lexical_only_hits_get_cosine_from_stored_vectors(episodic_index):
+    query = "quest_001"
+    query_embedding = embedding_service.embed_single(query)
+    cosine = {r["vector_id"]: r["similarity_score"] for r in episodic_index.search_by_vector(query_embedding, len(MEMORIES))}
+    lexical_results = episodic_index.lexical_search(query, 5)
+
+    fused = VectorRetriever._fuse([], lexical_results, settings.retrieval_rrf_k)
+    VectorRetriever._fill_similarity(episodic_index, fused, query_embedding)
+
+    assert [r["source_id"] for r in fused] == ["mem_1"]
+    assert math.isclose(fused[0]["similarity_score"], cosine[fused[0]["vector_id"]], rel_tol=1e-5, abs_tol=1e-6)
+
+
+def test_hybrid_retrieve_ranks_by_fusion_and_reports_cosine(episodic_index):
+    query = "silver ring"
+    query_embedding = embedding_service.embed_single(query)
+    cosine = {r["vector_id"]: r["similarity_score"] for r in episodic_index.search_by_vector(query_embedding, len(MEMORIES))}
+
+    result = VectorRetriever().retrieve(query, top_k_per_index=2, indices=["episodic"], npc_id=NPC_ID)
+
+    sources = result["retrieved_sources"]
+    assert sources[0]["source_id"] == "mem_0"
+    assert result["ranking_scores"] == [r["fusion_score"] for r in sources]
+    assert result["ranking_scores"] == sorted(result["ranking_scores"], reverse=True)
+    for source, score in zip(sources, result["similarity_scores"]):
+        assert math.isclose(score, cosine[source["vector_id"]], rel_tol=1e-5, abs_tol=1e-6)
+
+
+def test_hybrid_retrieve_falls_back_to_keywords_when_embedding_fails(episodic_index, monkeypatch):
+    def fail(text):
+        raise RuntimeError("embedding API down")
+
+    monkeypatch.setattr(embedding_service, "embed_single", fail)
+
+    result = VectorRetriever().retrieve("quest_001", top_k_per_index=3, indices=["episodic"], npc_id=NPC_ID)
+
+    assert [r["source_id"] for r in result["retrieved_sources"]] == ["mem_1"]
+    assert result["similarity_scores"] == [0.0]
+    assert result["ranking_scores"][0] > 0
+
+
+def test_vector_only_retrieve_ranks_by_cosine(episodic_index, monkeypatch):
+    monkeypatch.setattr(settings, "retrieval_hybrid", False)
+
+    result = VectorRetriever().retrieve("silver ring", top_k_per_index=3, indices=["episodic"], npc_id=NPC_ID)
+
+    assert result["ranking_scores"] == result["similarity_scores"]
+    assert all("fusion_score" not in r for r in result["retrieved_sources"])
@@ -0,0 +1,93 @@
+"""Weighted retrieval 점수 - source 간 같은 척도, 기본 scorer, trace 기록."""
+import math
+from datetime import datetime, timedelta
+from app.core.config import Settings, settings
+from app.memory.mongo.repository.trace_repo import TraceRepository
+from app.memory.vector.retriever import VectorRetriever
+from app.memory.vector.scoring import RetrievalWeights, score_candidates
+from app.memory.vector.vectorizer import Vectorizer
+from app.schemas.trace import TraceCreate
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+WEIGHTS = RetrievalWeights(relevance=1.0, recency=1.0, importance=1.0, recency_decay=0.99)
+
+
+def _candidate(source_type, relevance, importance=1.0, hours_ago=0.0):
+    return {
+        "source_type": source_type,
+        "ranking_score": relevance,
+        "importance": importance,
+        "created_at": (NOW - timedelta(hours=hours_ago)).isoformat(),
+    }
+
+
+def test_weighted_average_formula():
+    scores = score_candidates([_candidate("episodic", 0.6, importance=0.4, hours_ago=10)], WEIGHTS, NOW)
+
+    assert math.isclose(scores[0], (0.6 + 0.99 ** 10 + 0.4) / 3)
+
+
+def test_all_sources_share_one_scale():
+    candidates = [
+        _candidate("episodic", 0.5, importance=1.0, hours_ago=0),
+        _candidate("persona_fact", 0.5),
+        _candidate("world", 0.5),
+        _candidate("episodic", 0.5, importance=0.2, hours_ago=500),
+    ]
+
+    scores = score_candidates(candidates, WEIGHTS, NOW)
+
+    # 같은 relevance의 새롭고 중요한 memory는 persona/world 지식과 같은 점수, 오래되고 사소한 memory는 낮음
+    assert math.isclose(scores[0], scores[1]) and math.isclose(scores[1], scores[2])
+    assert scores[3] < scores[0]
+    assert all(0.0 <= score <= 1.0 for score in scores)
+
+
+def test_knowledge_relevance_still_orders_against_memories():
+    candidates = [_candidate("persona", 0.9), _candidate("episodic", 0.3, importance=1.0, hours_ago=0)]
+
+    scores = score_candidates(candidates, WEIGHTS, NOW)
+
+    assert scores[0] > scores[1]
+
+
+def test_default_scorer_is_weighted():
+    assert Settings.model_fields["retrieval_scorer"].default == "weighted"
+    assert settings.retrieval_scorer == "weighted"
+
+
+def test_default_retrieve_rescores_and_keeps_pre_rescore_values():
+    vectorizer = Vectorizer("episodic")
+    recent = datetime.utcnow().isoformat()
+    stale = (datetime.utcnow() - timedelta(days=60)).isoformat()
+    vectorizer.vectorize_episodic_memories_bulk([
+        {"memory_id": "mem_old", "npc_id": "npc_a", "content": "the silver ring was lost", "importance": 0.1, "created_at": stale},
+        {"memory_id": "mem_new", "npc_id": "npc_a", "content": "a silver ring in the forge", "importance": 0.9, "created_at": recent},
+    ])
+
+    result = VectorRetriever().retrieve_for_npc("npc_a", "the silver ring was lost", top_k_per_index=2)
+
+    sources = result["retrieved_sources"]
+    by_id = {source["source_id"]: source for source in sources}
+    # cosine/fusion만으로는 mem_old가 앞서지만 weighted 점수는 recency/importance로 mem_new를 앞에 둠
+    assert by_id["mem_old"]["relevance_score"] > by_id["mem_new"]["relevance_score"]
+    assert [source["source_id"] for source in sources] == ["mem_new", "mem_old"]
+    assert result["relevance_scores"] == [source["relevance_score"] for source in sources]
+    assert result["ranking_scores"] == sorted(result["ranking_scores"], reverse=True)
+
+
+def test_trace_records_relevance_and_ranking_scores():
+    trace = TraceRepository.insert_trace(TraceCreate(
+        npc_id="npc_a",
+        turn_id="turn_1",
+        retrieval_vector_ids=[3, 1],
+        retrieval_similarity_scores=[0.42, 0.81],
+        retrieval_relevance_scores=[0.55, 0.81],
+        retrieval_ranking_scores=[0.9, 0.7],
+    ))
+
+    stored = TraceRepository.get_trace_by_id(trace.trace_id)
+
+    assert stored.retrieval_similarity_scores == [0.42, 0.81]
+    assert stored.retrieval_relevance_scores == [0.55, 0.81]
+    assert stored.retrieval_ranking_scores == [0.9, 0.7]
@@ -0,0 +1,106 @@
+"""trace prompt snapshot 압축/복원과 prompt segment sweep 테스트."""
+import zlib
+from datetime import datetime, timedelta
+from bson import Binary
+from app.memory.mongo.client import get_collection
+from app.memory.mongo.repository.trace_repo import TraceRepository
+from app.memory.mongo.trace_compaction import (
+    SEGMENT_COLLECTION,
+    SEGMENT_GC_GRACE,
+    compact_snapshot,
+    decompress,
+    expand_snapshot,
+    segment_id,
+    segment_store,
+)
+from app.schemas.trace import TraceCreate
+from app.services.retention import RetentionService
+
+SYSTEM = "SYSTEM PROMPT " * 10
+PERSONA = "PERSONA TEXT " * 10
+
+
+def _insert_trace(npc_id: str, segments) -> str:
+    snapshot = "".join(segments) + "\nCURRENT OBSERVATION: hi"
+    return TraceRepository.insert_trace(TraceCreate(
+        npc_id=npc_id, turn_id="turn", llm_prompt_snapshot=snapshot, llm_prompt_segments=segments
+    )).trace_id
+
+
+def _age_segments(days: float) -> None:
+    past = datetime.utcnow() - timedelta(days=days)
+    get_collection(SEGMENT_COLLECTION).update_many({}, {"$set": {"last_used_at": past, "created_at": past}})
+
+
+def _segment_ids():
+    return {doc["segment_id"] for doc in get_collection(SEGMENT_COLLECTION).find()}
+
+
+def test_compact_round_trip_uses_zstd():
+    snapshot = SYSTEM + "dynamic part" + PERSONA + "tail"
+    compact = compact_snapshot(snapshot, [SYSTEM, PERSONA])
+    assert compact["dynamic"]["codec"] == "zstd"
+    assert expand_snapshot(compact, compact["segments"]) == snapshot
+
+
+def test_legacy_zlib_blob_still_decompresses():
+    blob = {"codec": "zlib", "data": Binary(zlib.compress(b"legacy"))}
+    assert decompress(blob) == b"legacy"
+
+
+def test_sweep_deletes_only_idle_unreferenced_segments():
+    kept_trace = _insert_trace("npc_a", [SYSTEM])
+    deleted_trace = _insert_trace("npc_b", [PERSONA])
+    assert _segment_ids() == {segment_id(SYSTEM), segment_id(PERSONA)}
+
+    TraceRepository.delete_trace(deleted_trace)
+
+    # grace 기간 안의 segment는 참조가 없어도 남김
+    assert segment_store.sweep(datetime.utcnow())["candidates"] == 0
+
+    _age_segments(SEGMENT_GC_GRACE.days + 1)
+    preview = segment_store.sweep(datetime.utcnow(), preview=True)
+    assert preview == {"candidates": 2, "unreferenced": 1, "deleted": 0}
+    assert len(_segment_ids()) == 2
+
+    report = segment_store.sweep(datetime.utcnow(), batch_size=1)
+    assert report == {"candidates": 2, "unreferenced": 1, "deleted": 1}
+    assert _segment_ids() == {segment_id(SYSTEM)}
+    assert TraceRepository.get_trace_by_id(kept_trace).llm_prompt_snapshot.startswith(SYSTEM)
+
+
+def test_swept_segment_is_stored_again_on_reuse():
+    trace_id = _insert_trace("npc_a", [PERSONA])
+    TraceRepository.delete_trace(trace_id)
+    _age_segments(SEGMENT_GC_GRACE.days + 1)
+    assert segment_store.sweep(datetime.utcnow())["deleted"] == 1
+
+    # 삭제된 segment는 process cache에서도 빠지므로 다음 trace가 다시 저장
+    trace_id = _insert_trace("npc_a", [PERSONA])
+    assert _segment_ids() == {segment_id(PERSONA)}
+    assert TraceRepository.get_trace_by_id(trace_id).llm_prompt_snapshot.startswith(PERSONA)
+
+
+def test_recently_used_segment_survives_sweep(monkeypatch):
+    from app.memory.mongo import trace_compaction
+
+    trace_id = _insert_trace("npc_a", [SYSTEM])
+    TraceRepository.delete_trace(trace_id)
+    _age_segments(SEGMENT_GC_GRACE.days + 1)
+
+    # touch 간격이 지난 뒤 다시 사용하면 last_used_at이 갱신되어 sweep 대상에서 빠짐
+    monkeypatch.setattr(trace_compaction, "SEGMENT_TOUCH_INTERVAL_S", 0)
+    _insert_trace("npc_a", [SYSTEM])
+    assert segment_store.sweep(datetime.utcnow())["candidates"] == 0
+
+
+def test_retention_run_sweeps_segments_for_all_npcs_only():
+    trace_id = _insert_trace("npc_a", [SYSTEM])
+    TraceRepository.delete_trace(trace_id)
+    _age_segments(SEGMENT_GC_GRACE.days + 1)
+
+    assert "prompt_segments" not in RetentionService.run(npc_id="npc_a")
+    assert "prompt_segments" not in RetentionService.run(policies=["short_term_memory"])
+    report = RetentionService.run()
+    assert report["prompt_segments"]["deleted"] == 1
+    assert _segment_ids() == set()
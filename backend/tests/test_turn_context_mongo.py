@@ -0,0 +1,101 @@
+"""
+$lookup aggregation(load_turn_context)과 문서별 조회(load_sequential) 결과 비교.
+
+mongomock은 let/pipeline 형식의 $lookup을 지원하지 않으므로 실제 MongoDB가 필요합니다.
+TEST_MONGODB_URI(기본 mongodb://localhost:27017)에 연결할 수 없으면 건너뜁니다.
+"""
+import functools
+import os
+import uuid
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from app.memory.mongo.cache import entity_cache
+from app.memory.mongo.client import MongoClientManager, client_options
+from app.memory.mongo.conversation_buffer import conversation_buffer
+from app.memory.mongo.repository.memory_repo import MemoryRepository
+from app.memory.mongo.repository.npc_repo import NPCRepository
+from app.memory.mongo.repository.turn_context_repo import TurnContextRepository
+from app.schemas.memory import MemoryCreate
+from app.schemas.npc import NPCCreate
+from benchmarks.turn_context import normalize
+
+MONGODB_URI = os.getenv("TEST_MONGODB_URI", "mongodb://localhost:27017")
+
+
+@functools.lru_cache(maxsize=None)
+def _mongo_available() -> bool:
+    client = MongoClient(MONGODB_URI, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+        return True
+    except PyMongoError:
+        return False
+    finally:
+        client.close()
+
+
+@pytest.fixture
+def real_mongo(monkeypatch):
+    """임시 database를 쓰는 실제 MongoDB client 주입 (테스트 후 database 삭제)."""
+    if not _mongo_available():
+        pytest.skip(f"MongoDB is not available at {MONGODB_URI}")
+    client = MongoClient(MONGODB_URI, **client_options())
+
+    from app.memory.mongo.indexes import IndexManager
+
+    db_name = f"npc_test_{uuid.uuid4().hex[:8]}"
+    monkeypatch.setattr(MongoClientManager, "_client", client)
+    monkeypatch.setattr(MongoClientManager, "_db", client[db_name])
+    IndexManager.ensure_indexes()
+    yield client[db_name]
+    client.drop_database(db_name)
+    client.close()
+
+
+def _both(npc_id: str, limit: int = 10):
+    entity_cache.clear()
+    conversation_buffer.invalidate()
+    sequential = TurnContextRepository.load_sequential(npc_id, limit)
+    entity_cache.clear()
+    conversation_buffer.invalidate()
+    aggregated = TurnContextRepository.load_turn_context(npc_id, limit)
+    return sequential, aggregated
+
+
+def test_aggregation_matches_sequential_load(real_mongo):
+    from benchmarks.fixtures import synthesize_world
+
+    world = synthesize_world(num_npcs=3, memories_per_npc=40, facts_per_npc=6, seed=7)
+    for npc_id in world["npc_ids"]:
+        # observation이 아닌 최근 memory는 대화 히스토리에서 빠져야 함
+        MemoryRepository.insert_memory(MemoryCreate(
+            npc_id=npc_id, content="I decided to rest.", source="reflection", importance=0.2
+        ))
+        for limit in (3, 10):
+            sequential, aggregated = _both(npc_id, limit)
+            assert normalize(aggregated) == normalize(sequential)
+            assert len(aggregated["facts"]) == 6
+
+
+def test_aggregation_fills_caches_used_by_next_turn(real_mongo):
+    from benchmarks.fixtures import synthesize_world
+
+    npc_id = synthesize_world(num_npcs=1, memories_per_npc=20, seed=3)["npc_ids"][0]
+    _, aggregated = _both(npc_id)
+
+    # 캐시만으로 context를 구성할 수 있어야 함 (Mongo 조회 없이 같은 결과)
+    cached = TurnContextRepository._from_cache(npc_id, 10)
+    assert cached is not None
+    assert normalize(cached) == normalize(aggregated)
+
+
+def test_missing_persona_world_and_npc(real_mongo):
+    npc = NPCRepository.create_npc(NPCCreate(
+        name="Orphan", role="villager", persona_id="persona_missing", world_id="world_missing"
+    ))
+    sequential, aggregated = _both(npc.npc_id)
+    assert aggregated["persona"] is None and aggregated["world"] is None
+    assert normalize(aggregated) == normalize(sequential)
+
+    assert _both("npc_missing") == (None, None)
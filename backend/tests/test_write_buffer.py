@@ -0,0 +1,215 @@
+"""WriteBuffer 부분 실패 재시도, dead-letter와 trace 조회 read-your-writes 테스트."""
+import json
+from pymongo.errors import AutoReconnect, BulkWriteError, DocumentTooLarge, WriteError
+from app.memory.mongo import client
+from app.memory.mongo.client import get_collection
+from app.memory.mongo.repository.trace_repo import TraceRepository
+from app.memory.mongo.write_buffer import DUPLICATE_KEY_ERROR, WriteBuffer, write_buffer
+from app.schemas.trace import TraceCreate
+from tests.conftest import run
+
+
+class FlakyCollection:
+    """지정한 batch 위치에서 write error를 내는 insert_many (나머지 문서는 저장)."""
+
+    def __init__(self, errors=None, exception=None, too_large=()):
+        self.errors = errors or {}
+        self.exception = exception
+        self.too_large = set(too_large)
+        self.stored = []
+
+    def insert_one(self, doc):
+        if self.exception is not None:
+            raise self.exception
+        if doc["doc_id"] in self.too_large:
+            raise DocumentTooLarge("document too large")
+        code = self.errors.get(doc["doc_id"])
+        if code is not None:
+            raise WriteError(f"error {code}", code)
+        self.stored.append(doc["doc_id"])
+
+    def insert_many(self, docs, ordered=True):
+        assert ordered is False
+        if self.exception is not None:
+            raise self.exception
+        if any(doc["doc_id"] in self.too_large for doc in docs):
+            raise DocumentTooLarge("document too large")
+        write_errors = []
+        for i, doc in enumerate(docs):
+            code = self.errors.get(doc["doc_id"])
+            if code is None:
+                self.stored.append(doc["doc_id"])
+            else:
+                write_errors.append({"index": i, "code": code, "errmsg": f"error {code}"})
+        if write_errors:
+            raise BulkWriteError({"writeErrors": write_errors, "nInserted": len(docs) - len(write_errors)})
+
+
+def _buffer(monkeypatch, collection, batch_size=10, **kwargs):
+    monkeypatch.setattr(client, "get_collection", lambda name: collection)
+    return WriteBuffer(enabled=True, batch_size=batch_size, max_pending=1000, **kwargs)
+
+
+def _dead_letters(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _pending_ids(buffer, name="docs"):
+    return [doc["doc_id"] for doc in buffer._pending.get(name, [])]
+
+
+def test_mid_batch_error_requeues_only_unwritten_docs(monkeypatch):
+    collection = FlakyCollection(errors={"d1": 121, "d2": DUPLICATE_KEY_ERROR})
+    buffer = _buffer(monkeypatch, collection)
+    for i in range(4):
+        buffer.add("docs", {"doc_id": f"d{i}"})
+
+    assert buffer.flush() == 1
+    assert collection.stored == ["d0", "d3"]
+    assert _pending_ids(buffer) == ["d1"]
+    stats = buffer.stats()
+    assert stats["written"] == 3
+    assert stats["retries"] == 1
+
+    # 재시도 문서는 이후에 추가된 문서보다 앞에서 저장됨
+    buffer.add("docs", {"doc_id": "d4"})
+    collection.errors.clear()
+    assert buffer.flush() == 0
+    assert collection.stored == ["d0", "d3", "d1", "d4"]
+
+
+def test_failed_batch_stops_flush_and_keeps_order(monkeypatch):
+    collection = FlakyCollection(exception=AutoReconnect("primary stepped down"))
+    buffer = _buffer(monkeypatch, collection, batch_size=2)
+    for i in range(5):
+        buffer.add("docs", {"doc_id": f"d{i}"})
+
+    assert buffer.flush() == 5
+    assert _pending_ids(buffer) == ["d0", "d1", "d2", "d3", "d4"]
+
+    collection.exception = None
+    assert buffer.flush() == 0
+    assert collection.stored == ["d0", "d1", "d2", "d3", "d4"]
+
+
+def test_duplicate_key_on_retry_counts_as_written():
+    collection = get_collection("retry_docs")
+    collection.create_index("doc_id", unique=True)
+    collection.insert_one({"doc_id": "d0"})
+
+    buffer = WriteBuffer(enabled=True, batch_size=10)
+    buffer.add("retry_docs", {"doc_id": "d0"})
+    buffer.add("retry_docs", {"doc_id": "d1"})
+
+    assert buffer.flush() == 0
+    assert sorted(doc["doc_id"] for doc in collection.find()) == ["d0", "d1"]
+    assert buffer.stats()["retries"] == 0
+
+
+def test_unencodable_document_is_dead_lettered_and_batch_written(tmp_path):
+    collection = get_collection("retry_docs")
+    collection.create_index("doc_id", unique=True)
+    dead_letter_path = str(tmp_path / "dead" / "letters.jsonl")
+    buffer = WriteBuffer(enabled=True, batch_size=10, dead_letter_path=dead_letter_path)
+    buffer.add("retry_docs", {"doc_id": "d0"})
+    buffer.add("retry_docs", {"doc_id": "d1", "tags": {"not", "bson"}})
+    buffer.add("retry_docs", {"doc_id": "d2"})
+
+    assert buffer.flush() == 0
+    assert sorted(doc["doc_id"] for doc in collection.find()) == ["d0", "d2"]
+    letters = _dead_letters(dead_letter_path)
+    assert [letter["document"]["doc_id"] for letter in letters] == ["d1"]
+    assert letters[0]["collection"] == "retry_docs"
+    assert "InvalidDocument" in letters[0]["error"]
+    stats = buffer.stats()
+    assert stats["written"] == 2
+    assert stats["dead_lettered"] == 1
+
+
+def test_too_large_document_is_dead_lettered(monkeypatch, tmp_path):
+    collection = FlakyCollection(too_large={"d1"})
+    buffer = _buffer(monkeypatch, collection, dead_letter_path=str(tmp_path / "dead.jsonl"))
+    for i in range(3):
+        buffer.add("docs", {"doc_id": f"d{i}"})
+
+    assert buffer.flush() == 0
+    assert collection.stored == ["d0", "d2"]
+    assert [letter["document"]["doc_id"] for letter in _dead_letters(tmp_path / "dead.jsonl")] == ["d1"]
+
+
+def test_connection_error_during_one_by_one_write_keeps_rest(monkeypatch, tmp_path):
+    collection = FlakyCollection(too_large={"d0"})
+    buffer = _buffer(monkeypatch, collection, dead_letter_path=str(tmp_path / "dead.jsonl"))
+    for i in range(3):
+        buffer.add("docs", {"doc_id": f"d{i}"})
+    original = collection.insert_one
+
+    def drop_after_first(doc):
+        if doc["doc_id"] == "d2":
+            raise AutoReconnect("connection reset")
+        return original(doc)
+
+    monkeypatch.setattr(collection, "insert_one", drop_after_first)
+
+    assert buffer.flush() == 1
+    assert collection.stored == ["d1"]
+    assert _pending_ids(buffer) == ["d2"]
+
+
+def test_repeatedly_rejected_document_is_dead_lettered(monkeypatch, tmp_path):
+    collection = FlakyCollection(errors={"d1": 121})
+    buffer = _buffer(monkeypatch, collection, max_retries=3, dead_letter_path=str(tmp_path / "dead.jsonl"))
+    for i in range(3):
+        buffer.add("docs", {"doc_id": f"d{i}"})
+
+    assert buffer.flush() == 1
+    assert buffer.flush() == 1
+    assert _pending_ids(buffer) == ["d1"]
+    assert buffer.flush() == 0
+
+    assert collection.stored == ["d0", "d2"]
+    letters = _dead_letters(tmp_path / "dead.jsonl")
+    assert [letter["document"]["doc_id"] for letter in letters] == ["d1"]
+    assert "rejected 3 times" in letters[0]["error"]
+    assert buffer._rejections == {}
+
+
+def test_rejection_count_resets_when_document_is_written(monkeypatch):
+    collection = FlakyCollection(errors={"d0": 121})
+    buffer = _buffer(monkeypatch, collection, max_retries=2)
+    buffer.add("docs", {"doc_id": "d0"})
+
+    assert buffer.flush() == 1
+    collection.errors.clear()
+    assert buffer.flush() == 0
+    assert buffer._rejections == {}
+    assert buffer.stats()["dead_lettered"] == 0
+
+
+def test_get_trace_flushes_pending_buffer(monkeypatch, api):
+    monkeypatch.setattr(write_buffer, "enabled", True)
+    trace = TraceRepository.insert_trace(TraceCreate(
+        npc_id="npc_b",
+        turn_id="turn_b",
+        llm_prompt_snapshot="SYSTEM\nhello",
+        llm_prompt_segments=["SYSTEM\n"]
+    ))
+    assert write_buffer.stats()["pending"] == 1
+
+    async def call():
+        async with api() as http:
+            return await http.get(f"/api/v1/trace/{trace.trace_id}")
+
+    response = run(call())
+    assert response.status_code == 200
+    assert response.json()["llm_prompt_snapshot"] == "SYSTEM\nhello"
+    assert write_buffer.stats()["pending"] == 0
+
+
+def test_sync_get_trace_flushes_pending_buffer(monkeypatch):
+    monkeypatch.setattr(write_buffer, "enabled", True)
+    trace = TraceRepository.insert_trace(TraceCreate(npc_id="npc_b", turn_id="turn_b"))
+
+    assert TraceRepository.get_trace_by_id(trace.trace_id).trace_id == trace.trace_id
+    assert TraceRepository.get_trace_by_id("trace_missing") is None
@@ -42,7 +42,7 @@ export const npcApi = {
     const response = await api.get('/npc', { params: { limit } });
     return response.data;
   },
-  delete: async (npcId: string): Promise<{ status: string; npc_id: string }> => {
+  delete: async (npcId: string): Promise<{ status: string; npc_id: string; job_id: string }> => {
     const response = await api.delete(`/npc/${npcId}`);
     return response.data;
   },
@@ -121,7 +121,7 @@ export const vectorApi = {
     return response.data;
   },
 
-  reindex: async (indexType: 'episodic' | 'persona' | 'world'): Promise<{ status: string; vectors_indexed: number }> => {
+  reindex: async (indexType: 'episodic' | 'persona' | 'world'): Promise<{ status: string; index_type: string; job_id: string; resume: boolean }> => {
     const response = await api.post('/vector/reindex', null, {
       params: { index_type: indexType },
     });
@@ -204,7 +204,7 @@ export const worldApi = {
     const response = await api.put(`/world/${worldId}`, updates);
     return response.data;
   },
-  delete: async (worldId: string, deleteNpcs: boolean = false): Promise<{ status: string; world_id: string; deleted_npcs: number }> => {
+  delete: async (worldId: string, deleteNpcs: boolean = false): Promise<{ status: string; world_id: string; deleted_npcs: number; job_id: string }> => {
     const response = await api.delete(`/world/${worldId}`, {
       params: { delete_npcs: deleteNpcs }
     });